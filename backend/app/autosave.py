@@ -0,0 +1,308 @@
+"""
+Optimistic concurrency and write coalescing for entry saves.
+
+Every entry has a version (models.NoteEntry.version) that goes up when its title or content
+changes. Entry responses carry it, with the ETag `"<version>"`. A save sent with
+`If-Match: "<version>"` is rejected with 412 Precondition Failed (and the current ETag) when
+the entry has changed since, e.g. in another tab or on another device, instead of silently
+overwriting that change.
+
+The editor autosaves content every second or so while someone types, and each save was a
+full UPDATE and commit holding the database write lock that every other writer waits for.
+Versioned title/content saves are now coalesced in the process that receives them: the
+first is acknowledged right away with the version it will be written as, the ones that
+follow within AUTOSAVE_COALESCE_MS (sent with that version in If-Match) replace its fields,
+and the result is written once when the window ends. Pending saves are written before any
+other request is handled (flush_pending_saves is an app-wide dependency), so no read, export
+or other write sees an entry older than an acknowledged save. A background task writes them
+while the app is idle, and on shutdown. A write that fails leaves them pending, to be
+retried.
+
+Pending saves only exist in the process that acknowledged them, so coalescing is off when
+the app runs with more than one worker process (WEB_CONCURRENCY > 1, as start.sh sets it):
+the next autosave, or a read, may reach a worker that doesn't have them. Saves without
+If-Match, saves of other fields and content with inline media are always written
+immediately.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+import anyio
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session, undefer
+
+from app import models, schemas
+from app.database import begin_write, get_db
+from app.excerpts import make_excerpt
+from app.inline_media import has_inline_media
+
+logger = logging.getLogger(__name__)
+
+# How long a versioned autosave waits for the next one before it is written (0 turns coalescing off)
+AUTOSAVE_COALESCE_MS = float(os.getenv('AUTOSAVE_COALESCE_MS', '750'))
+# How soon the background task retries a write that failed
+RETRY_DELAY_SECONDS = 1.0
+
+COALESCED_FIELDS = frozenset({'title', 'content'})
+SAVE_ROUTE = '/api/entries/{entry_id}'
+
+
+def coalesce_window(workers: int | None = None) -> float:
+    """Seconds a versioned autosave waits for the next one: 0 (off) with more than one worker process."""
+    if workers is None:
+        workers = int(os.getenv('WEB_CONCURRENCY') or 1)
+    return AUTOSAVE_COALESCE_MS / 1000 if workers <= 1 else 0
+
+
+def entry_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(header: str | None) -> set[int] | None:
+    """The versions an If-Match header allows; None when it is missing or '*'."""
+    if header is None or header.strip() == '*':
+        return None
+    versions = set()
+    for tag in header.split(','):
+        # Compressed responses carry the ETag weakened (W/"3"); it still names the version
+        tag = tag.strip().removeprefix('W/').strip('"')
+        if not tag.isdigit():
+            raise HTTPException(status_code=400, detail='If-Match must name entry versions, e.g. "3"')
+        versions.add(int(tag))
+    return versions
+
+
+def conflict(version: int) -> HTTPException:
+    """412 for a save based on an older version, with the current ETag."""
+    return HTTPException(
+        status_code=412,
+        detail=f'Entry has changed since it was loaded (now version {version})',
+        headers={'ETag': entry_etag(version)},
+    )
+
+
+def check_version(version: int, allowed: set[int] | None) -> None:
+    """Raise 412 unless If-Match allows the entry's current version."""
+    if allowed is not None and version not in allowed:
+        raise conflict(version)
+
+
+@dataclass
+class PendingSave:
+    """Saves of one entry acknowledged but not written yet."""
+
+    entry_id: int
+    base_version: int  # The version in the database
+    fields: dict
+    response: dict  # The entry as acknowledged (schemas.NoteEntry with the fields applied)
+    due: float  # time.monotonic() when it is written
+
+    @property
+    def version(self) -> int:
+        return self.base_version + 1
+
+
+class SaveCoalescer:
+    """The pending autosaves of this process, by entry id."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._pending: dict[int, PendingSave] = {}
+        # Acknowledged versions that were never written (the entry changed elsewhere first)
+        self._dropped: dict[int, int] = {}
+        self._lock = threading.Lock()  # Guards the dicts
+        self._write_lock = threading.Lock()  # Held while pending saves are written
+
+    def can_coalesce(self, fields: dict, allowed: set[int] | None) -> bool:
+        """Whether a save is a versioned title/content save that can wait for the next one."""
+        return (
+            self.window_seconds > 0
+            and allowed is not None
+            and len(allowed) == 1
+            and bool(fields)
+            and fields.keys() <= COALESCED_FIELDS
+            and all(isinstance(value, str) for value in fields.values())
+            and not has_inline_media(fields.get('content'))
+        )
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def pending_content(self, entry_id: int) -> str | None:
+        """The content an entry has been acknowledged with, if that isn't written yet."""
+        with self._lock:
+            pending = self._pending.get(entry_id)
+            return pending.response['content'] if pending is not None else None
+
+    def save(self, db: Session, entry_id: int, fields: dict, expected_version: int) -> dict:
+        """Acknowledge a save to be written with the ones that follow it; returns the entry as saved."""
+        with self._lock:
+            pending = self._pending.get(entry_id)
+            if pending is not None and time.monotonic() < pending.due:
+                check_version(pending.version, {expected_version})
+                return self._merge(pending, fields)
+
+        # Nothing pending (or its window is over): start from the database
+        self.flush(db, only={entry_id})
+        entry = (
+            db.query(models.NoteEntry)
+            .options(undefer(models.NoteEntry.content))
+            .filter(models.NoteEntry.id == entry_id)
+            .first()
+        )
+        if not entry:
+            raise HTTPException(status_code=404, detail='Entry not found')
+        response = schemas.NoteEntry.model_validate(entry).model_dump()
+
+        with self._lock:
+            pending = self._pending.get(entry_id)
+            if pending is None:
+                # The version this client was given never made it to the database
+                if self._dropped.pop(entry_id, None) == expected_version:
+                    raise conflict(entry.version)
+                check_version(entry.version, {expected_version})
+                pending = PendingSave(entry_id, entry.version, {}, response, time.monotonic() + self.window_seconds)
+                self._pending[entry_id] = pending
+            else:
+                # Another save of the entry got in while this one read it
+                check_version(pending.version, {expected_version})
+            return self._merge(pending, fields)
+
+    def _merge(self, pending: PendingSave, fields: dict) -> dict:
+        pending.fields.update(fields)
+        pending.response.update(fields)
+        if 'content' in fields:
+            pending.response['excerpt'] = make_excerpt(fields['content'], pending.response['content_type'])
+        pending.response['version'] = pending.version
+        pending.response['updated_at'] = datetime.utcnow()
+        return dict(pending.response)
+
+    def flush(
+        self, db: Session, only: set[int] | None = None, exclude: int | None = None, due_only: bool = False
+    ) -> int:
+        """Write pending saves (those of `only`, all but `exclude`, or those due); returns how many were written."""
+        if not self._pending and not self._write_lock.locked():
+            return 0
+        # Requests that find a write in progress wait for it, so they read what it wrote
+        with self._write_lock:
+            with self._lock:
+                now = time.monotonic()
+                saves = [
+                    pending
+                    for entry_id, pending in self._pending.items()
+                    if (only is None or entry_id in only)
+                    and entry_id != exclude
+                    and (not due_only or pending.due <= now)
+                ]
+                for pending in saves:
+                    del self._pending[pending.entry_id]
+            if not saves:
+                return 0
+            return self._write(db, saves)
+
+    def _write(self, db: Session, saves: list[PendingSave]) -> int:
+        written = []
+        stale = []  # Changed elsewhere since they were acknowledged
+        try:
+            begin_write(db)
+            entries = {
+                entry.id: entry
+                for entry in db.query(models.NoteEntry)
+                .filter(models.NoteEntry.id.in_([pending.entry_id for pending in saves]))
+                .populate_existing()
+                .with_for_update()
+            }
+            for pending in saves:
+                entry = entries.get(pending.entry_id)
+                if entry is None:
+                    continue  # Deleted since
+                if entry.version != pending.base_version:
+                    logger.warning(
+                        'Dropped autosave of entry %d: changed elsewhere (version %d, saved from %d)',
+                        pending.entry_id,
+                        entry.version,
+                        pending.base_version,
+                    )
+                    stale.append(pending)
+                    continue
+                for key, value in pending.fields.items():
+                    setattr(entry, key, value)
+                entry.updated_at = pending.response['updated_at']
+                written.append(pending)
+            db.commit()
+        except Exception:
+            db.rollback()
+            stale_ids = {pending.entry_id for pending in stale}
+            retry = [pending for pending in saves if pending.entry_id not in stale_ids]
+            logger.exception('Writing %d autosaves failed; they stay pending and are retried', len(retry))
+            self._keep_pending(retry)
+            written = []
+        self._record_dropped(stale)
+        return len(written)
+
+    def _keep_pending(self, saves: list[PendingSave]) -> None:
+        """Put saves whose write failed back, so the next flush writes them."""
+        with self._lock:
+            for pending in saves:
+                pending.due = time.monotonic() + RETRY_DELAY_SECONDS
+                # Saves of the entry wait for this write, so none can have started a new pending save
+                self._pending.setdefault(pending.entry_id, pending)
+
+    def _record_dropped(self, saves: list[PendingSave]) -> None:
+        with self._lock:
+            for pending in saves:
+                self._dropped[pending.entry_id] = pending.version
+
+
+coalescer = SaveCoalescer(coalesce_window())
+
+
+async def flush_pending_saves(request: Request) -> None:
+    """
+    App-wide dependency: write pending autosaves before the request reads or writes anything.
+
+    A save of an entry leaves that entry's pending save to update_entry (which adds to it).
+    The database is only touched when something is pending, so /health works without it.
+    """
+    if not coalescer.has_pending():
+        return
+    keep = None
+    route = request.scope.get('route')
+    entry_id = request.path_params.get('entry_id', '')
+    if request.method in ('PUT', 'PATCH') and getattr(route, 'path', None) == SAVE_ROUTE and entry_id.isdigit():
+        keep = int(entry_id)
+    # Sessions from the same source as request handlers (tests override get_db)
+    sessions = request.app.dependency_overrides.get(get_db, get_db)
+    await anyio.to_thread.run_sync(flush_all, sessions, False, keep)
+
+
+def flush_all(sessions: Callable[[], Iterator[Session]], due_only: bool = False, exclude: int | None = None) -> int:
+    """Write pending autosaves with a session from sessions (a get_db-style generator function)."""
+    session_iter = sessions()
+    db = next(session_iter)
+    try:
+        return coalescer.flush(db, exclude=exclude, due_only=due_only)
+    finally:
+        session_iter.close()
+
+
+async def run_periodically(sessions: Callable[[], Iterator[Session]]) -> None:
+    """Write autosaves whose window is over, for when no request comes along to do it; until cancelled."""
+    interval = max(coalescer.window_seconds / 4, 0.05)
+    while True:
+        await asyncio.sleep(interval)
+        if not coalescer.has_pending():
+            continue
+        try:
+            await anyio.to_thread.run_sync(flush_all, sessions, True)
+        except Exception:
+            logger.exception('Writing pending autosaves failed')
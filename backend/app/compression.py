@@ -0,0 +1,207 @@
+"""
+Response compression.
+
+Entry responses are HTML inside JSON (day views, search, boards, backup exports) and shrink
+several times over when compressed, which matters for the Android client and remote
+deployments. CompressionMiddleware compresses responses with brotli when the client accepts
+it and the optional `brotli` package is installed, and with gzip otherwise.
+
+Streaming responses are compressed as they are sent. For incremental formats (NDJSON, event
+streams) every chunk is flushed, so clients still see each item as it is produced; other
+streams let the compressor fill its blocks. Left alone:
+- bodies smaller than MIN_COMPRESS_SIZE,
+- responses that are not text-like (images, audio, video, archives are already compressed),
+- responses that already have a Content-Encoding or advertise byte ranges: stored files are
+  served by app.file_delivery, which has its own precompressed gzip variants and Range support,
+- responses marked Cache-Control: no-transform.
+"""
+
+from __future__ import annotations
+
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # Close to gzip -6 in speed, smaller output
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'application/x-ndjson',
+    'application/msgpack',  # Entry HTML inside, as with JSON
+    'image/svg+xml',
+}
+# Streamed item by item: flush the compressor after every chunk
+INCREMENTAL_TYPES = {'application/x-ndjson', 'text/event-stream'}
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = _media_type(content_type)
+    return (
+        media_type.startswith('text/')
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith('+json')
+        or media_type.endswith('+xml')
+    )
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """The encoding to use for an Accept-Encoding header ('br', 'gzip' or None), honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get('*', 0.0)) > 0
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    if allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        compressed = self._compressor.compress(data)
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH) if flush else compressed
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        compressed = self._compressor.process(data)
+        return compressed + self._compressor.flush() if flush else compressed
+
+    def finish(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+_ENCODERS = {'gzip': _GzipEncoder, 'br': _BrotliEncoder}
+
+
+class CompressionMiddleware:
+    """Compresses text-like responses for clients that accept gzip or brotli."""
+
+    def __init__(self, app, minimum_size: int = MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = ''
+        for key, value in scope['headers']:
+            if key == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        flush_chunks = False
+
+        async def send_compressed(message):
+            nonlocal start_message, encoder, flush_chunks
+            if message['type'] == 'http.response.start':
+                # Hold the headers until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message['type'] != 'http.response.body' or start_message is None:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if encoder is None:
+                headers = start_message.get('headers', [])
+                if (not more_body and len(body) < self.minimum_size) or not _should_compress(headers):
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                encoder = _ENCODERS[encoding]()
+                flush_chunks = _media_type(_header(headers, b'content-type')) in INCREMENTAL_TYPES
+                headers = [(key, value) for key, value in headers if key != b'content-length']
+                headers.append((b'content-encoding', encoding.encode()))
+                headers = _add_vary(headers)
+                headers = [(key, _weak_etag(value) if key == b'etag' else value) for key, value in headers]
+                if not more_body:
+                    # Whole body in hand: compress it once and send a Content-Length
+                    compressed = encoder.finish(body)
+                    headers.append((b'content-length', str(len(compressed)).encode()))
+                    await send({**start_message, 'headers': headers})
+                    await send({'type': 'http.response.body', 'body': compressed})
+                    return
+                await send({**start_message, 'headers': headers})
+
+            if more_body:
+                chunk = encoder.compress(body, flush_chunks)
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            else:
+                await send({'type': 'http.response.body', 'body': encoder.finish(body)})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> str:
+    for key, value in headers:
+        if key == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def _should_compress(headers: list[tuple[bytes, bytes]]) -> bool:
+    if any(key in (b'content-encoding', b'accept-ranges', b'content-range') for key, _ in headers):
+        return False
+    if 'no-transform' in _header(headers, b'cache-control').lower():
+        return False
+    return is_compressible(_header(headers, b'content-type'))
+
+
+def _add_vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    for index, (key, value) in enumerate(headers):
+        if key == b'vary':
+            if b'accept-encoding' not in value.lower():
+                headers[index] = (key, value + b', Accept-Encoding')
+            return headers
+    return [*headers, (b'vary', b'Accept-Encoding')]
+
+
+def _weak_etag(value: bytes) -> bytes:
+    """The encoded body differs byte for byte, so a strong validator becomes a weak one."""
+    return value if value.startswith(b'W/') else b'W/' + value
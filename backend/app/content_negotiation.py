@@ -0,0 +1,149 @@
+"""
+MessagePack content negotiation.
+
+Encoding and parsing big entry lists as JSON is a measurable cost for the desktop and Android
+clients. Requests sent with `Accept: application/msgpack` get MessagePack instead of JSON from
+every route that uses the app's default response class (app.fast_json.FastJSONResponse). The
+structure is the same, and datetimes and dates are sent as the same ISO strings JSON carries.
+
+Request bodies sent as `Content-Type: application/msgpack` are decoded by MsgpackMiddleware and
+passed on to the routes as JSON. Bulk endpoints (entry merges, reorders, link preview batches)
+therefore accept them without changes.
+
+Error responses (HTTPException, validation errors) stay JSON; clients should check Content-Type.
+If the `msgpack` package is missing, requests are answered with JSON (Accept is only a
+preference) and MessagePack request bodies are rejected with 415.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+try:
+    import msgpack
+except ImportError:  # Listed in requirements.txt; without it the API is JSON only
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, 'application/x-msgpack', 'application/vnd.msgpack'}
+
+_respond_with_msgpack: ContextVar[bool] = ContextVar('respond_with_msgpack', default=False)
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(';', 1)[0].strip().lower()
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an Accept header asks for MessagePack at least as much as for JSON."""
+    msgpack_quality = 0.0
+    json_quality = 0.0
+    for media_range in accept.split(','):
+        media_type, _, params = media_range.partition(';')
+        media_type = media_type.strip().lower()
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, quality)
+        elif media_type == 'application/json':
+            json_quality = max(json_quality, quality)
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
+
+
+def wants_msgpack() -> bool:
+    """Whether the response to the current request should be MessagePack."""
+    return _respond_with_msgpack.get()
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    raise TypeError(f'Cannot encode {type(value).__name__} as MessagePack')
+
+
+def encode_msgpack(content: Any) -> bytes:
+    """MessagePack with the structure FastJSONResponse would send as JSON."""
+    return msgpack.packb(content, default=_encode_default)
+
+
+async def _read_body(receive) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        body.extend(message.get('body', b''))
+        if not message.get('more_body', False):
+            return bytes(body)
+
+
+class MsgpackMiddleware:
+    """Decodes MessagePack request bodies and records whether the client wants MessagePack back."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope['headers'])
+        if _media_type(headers.get(b'content-type', b'').decode('latin-1')) in MSGPACK_MEDIA_TYPES:
+            if msgpack is None:
+                response = JSONResponse({'detail': 'MessagePack request bodies are not supported'}, status_code=415)
+                await response(scope, receive, send)
+                return
+            try:
+                body = orjson.dumps(msgpack.unpackb(await _read_body(receive)), option=orjson.OPT_NON_STR_KEYS)
+            except (ValueError, TypeError):
+                response = JSONResponse({'detail': 'Invalid MessagePack request body'}, status_code=400)
+                await response(scope, receive, send)
+                return
+            scope = {**scope, 'headers': _json_body_headers(scope['headers'], len(body))}
+            receive = _replay(body, receive)
+
+        negotiate = msgpack is not None
+        token = _respond_with_msgpack.set(negotiate and prefers_msgpack(headers.get(b'accept', b'').decode('latin-1')))
+
+        async def send_with_vary(message):
+            # JSON and MessagePack responses depend on Accept; files and other responses don't
+            if negotiate and message['type'] == 'http.response.start':
+                response_headers = message.get('headers', [])
+                content_type = _media_type(dict(response_headers).get(b'content-type', b'').decode('latin-1'))
+                if content_type in ('application/json', MSGPACK_MEDIA_TYPE):
+                    message = {**message, 'headers': [*response_headers, (b'vary', b'Accept')]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_vary)
+        finally:
+            _respond_with_msgpack.reset(token)
+
+
+def _json_body_headers(headers: list[tuple[bytes, bytes]], length: int) -> list[tuple[bytes, bytes]]:
+    kept = [(key, value) for key, value in headers if key not in (b'content-type', b'content-length')]
+    return [*kept, (b'content-type', b'application/json'), (b'content-length', str(length).encode())]
+
+
+def _replay(body: bytes, receive):
+    """A receive callable that delivers body, then waits on the real one (for the disconnect)."""
+    sent = False
+
+    async def replay():
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    return replay
@@ -0,0 +1,55 @@
+"""
+Content patches: edits to an entry's content sent instead of the whole content.
+
+Entries can hold hundreds of KB of HTML, and every autosave used to upload all of it for a
+one-character change. A save can send `content_patch` instead of `content`:
+
+    {"base_hash": "<sha256 of the content edited>",
+     "ops": [1200, -3, "new text"],
+     "result_hash": "<sha256 of the content after the edit>"}
+
+Ops use the ot.js TextOperation format: a positive number keeps that many characters, a
+negative number deletes that many, a string is inserted. Whatever follows the last op is
+kept. Characters are counted in UTF-16 code units, as JavaScript string indices are, so
+the editor can compute ops from its strings directly. Hashes are hex SHA-256 of the UTF-8
+content.
+
+The server applies the ops to the entry's current content only if that content has the
+base hash (otherwise the client edited something else and must send the full content),
+and keeps the result only if it has the result hash.
+"""
+
+import hashlib
+
+
+class PatchError(ValueError):
+    """The ops don't apply to the content (out of range, or splitting a character)."""
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def apply_ops(content: str, ops: list[int | str]) -> str:
+    """content with ot.js-style ops applied (offsets in UTF-16 code units)."""
+    # Work on UTF-16 bytes: two per code unit, so offsets match JavaScript's
+    base = content.encode('utf-16-le')
+    parts = []
+    position = 0
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op.encode('utf-16-le'))
+            continue
+        if op == 0:
+            raise PatchError('Patch ops must not be 0')
+        end = position + 2 * abs(op)
+        if end > len(base):
+            raise PatchError(f'Patch op {op} runs past the end of the content')
+        if op > 0:
+            parts.append(base[position:end])
+        position = end
+    parts.append(base[position:])
+    try:
+        return b''.join(parts).decode('utf-16-le')
+    except UnicodeDecodeError:
+        raise PatchError('Patch ops split a character') from None
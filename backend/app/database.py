@@ -1,14 +1,108 @@
+import logging
 import os
+import sqlite3
+import time
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_database_url(url: str) -> str:
+    """Use the psycopg (v3) driver for PostgreSQL URLs given without one (e.g. postgres://user@host/db)."""
+    for prefix in ('postgres://', 'postgresql://'):
+        if url.startswith(prefix):
+            return 'postgresql+psycopg://' + url[len(prefix) :]
+    return url
+
+
+# Database URL - SQLite for local development; PostgreSQL (requirements-postgres.txt) for larger deployments
+DATABASE_URL = normalize_database_url(os.getenv('DATABASE_URL', 'sqlite:///./daily_notes.db'))
+
+# How long a SQLite writer waits for another writer's lock before retrying
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+# Extra attempts (with backoff) to take the write lock once the busy timeout runs out
+SQLITE_WRITE_RETRIES = int(os.getenv('SQLITE_WRITE_RETRIES', '3'))
+
+# Request methods whose sessions take the SQLite write lock up front
+READ_ONLY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def _sqlite_on_connect(dbapi_connection, connection_record):
+    # Let the 'begin' listener issue BEGIN itself (pysqlite's implicit transactions can't do BEGIN IMMEDIATE)
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers (in any worker process) run while one writer commits
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+    cursor.close()
+
+
+def _begin_immediate(driver_connection) -> None:
+    """Take the write lock, retrying with backoff if another writer holds it past the busy timeout."""
+    for attempt in range(SQLITE_WRITE_RETRIES + 1):
+        try:
+            driver_connection.execute('BEGIN IMMEDIATE')
+            return
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) or attempt == SQLITE_WRITE_RETRIES:
+                raise
+            delay = 0.05 * 2**attempt
+            logger.warning('SQLite write lock busy, retrying in %.2fs (attempt %d)', delay, attempt + 1)
+            time.sleep(delay)
+
+
+def _sqlite_on_begin(conn):
+    driver_connection = conn.connection.driver_connection
+    if conn.get_execution_options().get('sqlite_begin') == 'IMMEDIATE':
+        _begin_immediate(driver_connection)
+    else:
+        driver_connection.execute('BEGIN')
+
+
+def configure_sqlite(sqlite_engine: Engine) -> None:
+    """
+    Serialize writes on a SQLite engine.
+
+    Transactions opened through write_engine() start with BEGIN IMMEDIATE, so a writer
+    takes the database lock before reading anything and waits (busy_timeout, then
+    retries) instead of failing with "database is locked" when it later tries to
+    upgrade a stale read snapshot. Other transactions stay deferred and run
+    concurrently under WAL.
+    """
+    event.listen(sqlite_engine, 'connect', _sqlite_on_connect)
+    event.listen(sqlite_engine, 'begin', _sqlite_on_begin)
+
+
+def write_engine(base_engine: Engine) -> Engine:
+    """The engine with transactions that take the write lock up front (a no-op option for other databases)."""
+    return base_engine.execution_options(sqlite_begin='IMMEDIATE')
+
+
+def begin_write(db: Session) -> None:
+    """
+    Restart a session's transaction holding the write lock.
+
+    For requests that only sometimes write (e.g. a GET that may carry data forward):
+    decide with plain reads first, then call this before writing so the write never
+    has to upgrade a read snapshot that another writer has moved past.
+    """
+    if db.in_transaction():
+        db.commit()
+    db.connection(execution_options={'sqlite_begin': 'IMMEDIATE'})
 
-# Database URL - using SQLite for local development
-DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./daily_notes.db')
 
 # Create engine
-engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False} if 'sqlite' in DATABASE_URL else {})
+if DATABASE_URL.startswith('sqlite'):
+    engine = create_engine(DATABASE_URL, connect_args={'check_same_thread': False})
+    configure_sqlite(engine)
+else:
+    # Server databases: drop pooled connections the server closed (restarts, idle timeouts)
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
 # Create session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -18,8 +112,12 @@ Base = declarative_base()
 
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request = None):
+    # Writes (POST/PUT/PATCH/DELETE) lock for writing when their transaction begins
+    if request is not None and request.method not in READ_ONLY_METHODS:
+        db = SessionLocal(bind=write_engine(engine))
+    else:
+        db = SessionLocal()
     try:
         yield db
     finally:
@@ -1,5 +1,5 @@
 """
-Utility to ensure the SQLite database exists with the latest schema and defaults.
+Utility to ensure the database (SQLite file or PostgreSQL) exists with the latest schema and defaults.
 """
 
 import os
@@ -7,8 +7,11 @@ from pathlib import Path
 
 from sqlalchemy.orm import Session
 
-from app import models
-from app.database import Base, engine
+from app import database, models
+
+# Engines whose schema has already been created in this process. The desktop launcher,
+# the migration runner and app.main all ask for the schema; only the first call does work.
+_bootstrapped: set[str] = set()
 
 
 def _resolve_db_path() -> Path:
@@ -28,14 +31,28 @@ def _resolve_db_path() -> Path:
     return db_path
 
 
-def ensure_database() -> Path:
-    """Create the SQLite file, schema, and default settings row if missing."""
-    db_path = _resolve_db_path()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+def ensure_schema() -> None:
+    """Create any missing tables (at most once per process and database, safe across processes)."""
+    engine = database.engine
+    key = str(engine.url)
+    if key in _bootstrapped:
+        return
+    # Under the write lock, so worker processes starting together can't both try to create a table
+    with database.write_engine(engine).begin() as conn:
+        database.Base.metadata.create_all(bind=conn)
+    _bootstrapped.add(key)
+
+
+def ensure_database() -> Path | None:
+    """Create the SQLite file (if using SQLite), schema, and default settings row if missing."""
+    db_path = None
+    if database.engine.dialect.name == 'sqlite':
+        db_path = _resolve_db_path()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    Base.metadata.create_all(bind=engine)
+    ensure_schema()
 
-    with Session(engine) as session:
+    with Session(database.engine) as session:
         settings = session.query(models.AppSettings).filter(models.AppSettings.id == 1).first()
         if not settings:
             settings = models.AppSettings(
@@ -53,7 +70,7 @@ def ensure_database() -> Path:
             session.add(settings)
             session.commit()
 
-    print(f'✓ Database ready at {db_path}')
+    print(f'✓ Database ready at {db_path or database.engine.url.render_as_string(hide_password=True)}')
     return db_path
 
 
@@ -0,0 +1,141 @@
+"""
+Custom emoji image processing: normalising uploads and packing sprite sheets.
+
+All Pillow work runs in the shared image worker pool (see image_derivatives) so
+decoding and resizing never block the event loop. Sprite sheets are cached on
+disk under a name derived from the emoji set, so they are only rebuilt when an
+emoji is added, renamed away or deleted. Pillow is imported inside the worker
+functions so it stays off the startup path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import os
+from io import BytesIO
+from pathlib import Path
+
+from app.image_derivatives import DERIVATIVE_QUALITY, DERIVATIVES_DIRNAME, get_executor
+
+# Emoji size (all uploaded images are resized to this size)
+EMOJI_SIZE = (64, 64)
+
+SPRITE_PREFIX = 'emoji-sprite-'
+SPRITE_FORMATS = {'png': 'PNG', 'webp': 'WEBP'}
+
+_in_flight: dict[Path, asyncio.Future] = {}
+
+
+def normalize_emoji(contents: bytes, target: str) -> None:
+    """Decode, convert to RGBA, resize and save an uploaded emoji as PNG (runs in a worker)."""
+    from PIL import Image
+
+    image = Image.open(BytesIO(contents))
+
+    # Convert to RGBA if not already (to preserve transparency)
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+
+    # Resize to emoji size using high-quality resampling
+    image = image.resize(EMOJI_SIZE, Image.Resampling.LANCZOS)
+
+    tmp_target = f'{target}.{os.getpid()}.tmp'
+    image.save(tmp_target, 'PNG', optimize=True)
+    os.replace(tmp_target, target)
+
+
+def process_emoji_upload(contents: bytes, target: Path) -> None:
+    """Normalise an uploaded emoji into target in the image worker pool (waits on the calling thread)."""
+    get_executor().submit(normalize_emoji, contents, str(target)).result()
+
+
+def sprite_columns(count: int) -> int:
+    """Columns for a roughly square sheet holding count emojis."""
+    return max(1, math.ceil(math.sqrt(count)))
+
+
+def sprite_layout(names: list[str]) -> dict[str, tuple[int, int]]:
+    """Pixel offset of each emoji in the sheet, in the given order."""
+    columns = sprite_columns(len(names))
+    width, height = EMOJI_SIZE
+    return {name: ((index % columns) * width, (index // columns) * height) for index, name in enumerate(names)}
+
+
+def sprite_version(emojis: list[tuple[str, str]]) -> str:
+    """Stable hash of the (name, image filename) pairs making up a sheet."""
+    digest = hashlib.sha1()
+    for name, filename in emojis:
+        digest.update(f'{name}\0{filename}\n'.encode())
+    return digest.hexdigest()[:16]
+
+
+def sprite_dir(upload_dir: Path) -> Path:
+    return upload_dir / DERIVATIVES_DIRNAME
+
+
+def sprite_path(upload_dir: Path, version: str, fmt: str) -> Path:
+    return sprite_dir(upload_dir) / f'{SPRITE_PREFIX}{version}.{fmt}'
+
+
+def render_sprite_sheet(sources: list[str], targets: dict[str, str]) -> None:
+    """
+    Paste each source emoji into a grid and save it once per format (runs in a worker).
+
+    Missing or unreadable sources leave a transparent cell rather than failing the sheet.
+    """
+    from PIL import Image
+
+    columns = sprite_columns(len(sources))
+    rows = max(1, math.ceil(len(sources) / columns))
+    width, height = EMOJI_SIZE
+    sheet = Image.new('RGBA', (columns * width, rows * height), (0, 0, 0, 0))
+
+    for index, source in enumerate(sources):
+        try:
+            with Image.open(source) as emoji:
+                emoji = emoji.convert('RGBA')
+                if emoji.size != EMOJI_SIZE:
+                    emoji = emoji.resize(EMOJI_SIZE, Image.Resampling.LANCZOS)
+                sheet.paste(emoji, ((index % columns) * width, (index // columns) * height))
+        except OSError:
+            continue
+
+    for fmt, target in targets.items():
+        pil_format = SPRITE_FORMATS[fmt]
+        save_kwargs = {'optimize': True} if pil_format == 'PNG' else {'quality': DERIVATIVE_QUALITY}
+        tmp_target = f'{target}.{os.getpid()}.tmp'
+        sheet.save(tmp_target, pil_format, **save_kwargs)
+        os.replace(tmp_target, target)
+
+
+def _remove_stale_sprites(upload_dir: Path, version: str) -> None:
+    for path in sprite_dir(upload_dir).glob(f'{SPRITE_PREFIX}*'):
+        if not path.name.startswith(f'{SPRITE_PREFIX}{version}.'):
+            path.unlink(missing_ok=True)
+
+
+async def ensure_sprite_sheet(upload_dir: Path, version: str, sources: list[Path]) -> None:
+    """Build the sheet for this emoji set unless it is already on disk."""
+    targets = {fmt: sprite_path(upload_dir, version, fmt) for fmt in SPRITE_FORMATS}
+    if all(target.exists() for target in targets.values()):
+        return
+
+    # Concurrent pickers opening at once share one build
+    key = targets['png']
+    pending = _in_flight.get(key)
+    if pending is None:
+        sprite_dir(upload_dir).mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(
+            get_executor(),
+            render_sprite_sheet,
+            [str(source) for source in sources],
+            {fmt: str(target) for fmt, target in targets.items()},
+        )
+        _in_flight[key] = pending
+        pending.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    await asyncio.shield(pending)
+    _remove_stale_sprites(upload_dir, version)
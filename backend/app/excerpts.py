@@ -0,0 +1,39 @@
+"""
+Plain-text excerpts of entry content for card and list views.
+
+NoteEntry.content is a deferred column: rich text can be hundreds of KB of HTML with
+embedded media markup. Each entry also stores a short plain-text excerpt (kept up to
+date whenever its content is saved), and list-style endpoints return that instead of
+the content when called with view=card.
+"""
+
+import re
+from html import unescape
+from typing import Literal
+
+# Characters kept in an excerpt (cut at a word boundary, with an ellipsis)
+EXCERPT_LENGTH = 280
+
+# How entries are returned by list-style endpoints: 'card' = excerpt only, 'full' = with content
+EntryView = Literal['card', 'full']
+
+_SKIPPED_ELEMENTS = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def make_excerpt(content: str | None, content_type: str | None = 'rich_text', length: int = EXCERPT_LENGTH) -> str:
+    """The first `length` characters of an entry's text (HTML tags and entities removed for rich text)."""
+    if not content:
+        return ''
+    text = content
+    if content_type != 'code':
+        # Tags become spaces so text from adjacent blocks doesn't run together
+        text = unescape(_TAGS.sub(' ', _SKIPPED_ELEMENTS.sub(' ', text)))
+    text = _WHITESPACE.sub(' ', text).strip()
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if ' ' in cut[length // 2 :]:
+        cut = cut[: cut.rindex(' ')]
+    return cut.rstrip() + '…'
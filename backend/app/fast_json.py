@@ -0,0 +1,32 @@
+"""
+orjson-encoded JSON responses.
+
+FastAPI normally validates a route's return value against its response_model, converts it
+with jsonable_encoder and then encodes it with the stdlib json module. For the big list
+responses (search, boards, notes, reminders) that is most of the request time.
+
+FastJSONResponse is the app's default response class, so every route is encoded by orjson.
+Routers that assemble their response from row projections (app.projections) return a
+FastJSONResponse themselves: FastAPI passes a returned Response through untouched, so those
+dicts skip validation and are encoded once. They must already have the shape of the
+route's response_model (the integration tests check this).
+
+Clients that ask for MessagePack get it from the same responses (see app.content_negotiation).
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from app.content_negotiation import MSGPACK_MEDIA_TYPE, encode_msgpack, wants_msgpack
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (or MessagePack, when the request asked for it)."""
+
+    def render(self, content: Any) -> bytes:
+        if wants_msgpack():
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return encode_msgpack(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
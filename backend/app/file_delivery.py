@@ -0,0 +1,196 @@
+"""
+HTTP delivery for stored files: cache headers, conditional requests, byte ranges
+and precompressed (gzip) variants.
+
+Uploaded files are stored under uuid (or content hash) names and never rewritten,
+so they can be cached by the browser forever. Everything else is revalidated with an ETag.
+"""
+
+from __future__ import annotations
+
+import gzip
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+import anyio
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from app.image_derivatives import DERIVATIVES_DIRNAME
+
+# Files named by uuid (uploads, background images, emojis and their derivatives) or by content
+# hash (media extracted from entries by app.inline_media) never change
+IMMUTABLE_NAME = re.compile(
+    r'^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}|inline-[0-9a-f]{32})(\.|$)',
+    re.IGNORECASE,
+)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Text-like formats worth serving gzip-compressed; images/video/archives are already compressed
+COMPRESSIBLE_EXTENSIONS = {
+    '.txt',
+    '.md',
+    '.csv',
+    '.json',
+    '.ipynb',
+    '.html',
+    '.htm',
+    '.css',
+    '.js',
+    '.xml',
+    '.svg',
+    '.sh',
+    '.py',
+    '.log',
+}
+MIN_COMPRESS_SIZE = 1024
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+def make_etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def cache_control_for(path: Path) -> str:
+    return IMMUTABLE_CACHE_CONTROL if IMMUTABLE_NAME.match(path.name) else REVALIDATE_CACHE_CONTROL
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match / If-Range header against our ETag."""
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return etag in candidates
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single `bytes=` range into inclusive (start, end).
+
+    Returns None for headers we ignore (malformed or multi-range), which means the
+    full file is served. Raises ValueError for a syntactically valid but
+    unsatisfiable range.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last N bytes
+        if end is None:
+            return None
+        if end == 0:
+            raise ValueError('Empty suffix range')
+        return max(0, size - end), size - 1
+    if end is not None and start > end:
+        return None
+    if start >= size:
+        raise ValueError('Range start beyond end of file')
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+def _compress_file(source: Path, target: Path) -> bool:
+    """Write a gzip copy of source; returns False when compression isn't worth it."""
+    data = source.read_bytes()
+    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(compressed) >= len(data) * 0.9:
+        return False
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+    tmp_target.write_bytes(compressed)
+    os.replace(tmp_target, target)
+    return True
+
+
+async def _gzip_variant(path: Path, stat: os.stat_result) -> Path | None:
+    """Return a cached gzip copy of the file, creating it in a worker thread if needed."""
+    if stat.st_size < MIN_COMPRESS_SIZE:
+        return None
+    target = path.parent / DERIVATIVES_DIRNAME / f'{path.name}.gz'
+    if target.exists() and target.stat().st_mtime_ns >= stat.st_mtime_ns:
+        return target
+    if await anyio.to_thread.run_sync(_compress_file, path, target):
+        return target
+    return None
+
+
+async def _iter_range(path: Path, start: int, length: int):
+    async with await anyio.open_file(path, 'rb') as f:
+        await f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def file_response(
+    request: Request, path: Path, media_type: str | None = None, cache_control: str | None = None
+) -> Response:
+    """
+    Build the response for a stored file, honouring If-None-Match, Range/If-Range
+    and Accept-Encoding: gzip.
+
+    cache_control overrides the name-based default (for content-addressed files
+    that aren't named by uuid).
+    """
+    stat = path.stat()
+    etag = make_etag(stat)
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    headers = {
+        'ETag': etag,
+        'Cache-Control': cache_control or cache_control_for(path),
+        'Accept-Ranges': 'bytes',
+    }
+
+    compressible = path.suffix.lower() in COMPRESSIBLE_EXTENSIONS
+    gzip_etag = etag[:-1] + '-gz"'
+    if compressible:
+        headers['Vary'] = 'Accept-Encoding'
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        for candidate in (etag, gzip_etag) if compressible else (etag,):
+            if _etag_matches(if_none_match, candidate):
+                return Response(status_code=304, headers={**headers, 'ETag': candidate})
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if range_header and (not if_range or _etag_matches(if_range, etag)):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{stat.st_size}'})
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            headers['Content-Length'] = str(length)
+            return StreamingResponse(
+                _iter_range(path, start, length), status_code=206, media_type=media_type, headers=headers
+            )
+
+    if compressible and 'gzip' in request.headers.get('accept-encoding', '').lower():
+        gzip_path = await _gzip_variant(path, stat)
+        if gzip_path is not None:
+            # Ranges apply to the identity encoding only
+            headers.pop('Accept-Ranges')
+            headers['Content-Encoding'] = 'gzip'
+            headers['ETag'] = gzip_etag
+            return FileResponse(gzip_path, media_type=media_type, headers=headers)
+
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat)
@@ -0,0 +1,97 @@
+"""
+Shared async HTTP client for outbound requests (link previews).
+
+A single pooled client is reused across requests so repeated previews of the same
+host share TCP/TLS connections, and reads are capped so a large page never gets
+downloaded in full just to read its <head>.
+
+httpx is only imported when the first outbound request is made, keeping it off
+the startup path.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+# Overall per-request timeout in seconds (connect + read), matching the old requests timeout
+REQUEST_TIMEOUT = 5.0
+
+# Connection pool limits for the shared client (httpx.Limits arguments)
+POOL_LIMITS = {'max_connections': 50, 'max_keepalive_connections': 20, 'keepalive_expiry': 30.0}
+
+# Never read more than this many bytes of a response body
+MAX_HEAD_BYTES = 512 * 1024
+
+HEAD_END = b'</head>'
+
+# After the head, read and drop at most this much of the rest of the body so the connection
+# can go back to the pool; a longer rest is cheaper to abandon with the connection
+REUSE_DRAIN_BYTES = 64 * 1024
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+
+        _client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            timeout=httpx.Timeout(REQUEST_TIMEOUT),
+            limits=httpx.Limits(**POOL_LIMITS),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def fetch_head(url: str, max_bytes: int = MAX_HEAD_BYTES) -> tuple[str, bytes]:
+    """
+    Fetch a page and return (final_url, body) where body stops right after </head>.
+
+    The response is streamed and the connection released as soon as the end of the
+    head is seen or max_bytes have been read (kept for reuse when only a short rest of
+    the body is left to read). Raises httpx.HTTPStatusError for
+    non-2xx responses and other httpx errors for transport failures.
+    """
+    client = get_http_client()
+    async with client.stream('GET', url) as response:
+        response.raise_for_status()
+
+        buffer = bytearray()
+        chunks = response.aiter_bytes()
+        async for chunk in chunks:
+            # Search only the tail that could contain a tag split across chunks
+            search_from = max(0, len(buffer) - len(HEAD_END))
+            buffer.extend(chunk)
+            end = buffer[search_from:].lower().find(HEAD_END)
+            if end != -1:
+                del buffer[search_from + end + len(HEAD_END) :]
+                break
+            if len(buffer) >= max_bytes:
+                del buffer[max_bytes:]
+                break
+
+        # A connection can only be reused once its response has been read to the end
+        content_length = response.headers.get('content-length', '')
+        if content_length.isdigit() and int(content_length) - response.num_bytes_downloaded <= REUSE_DRAIN_BYTES:
+            async for _ in chunks:
+                pass
+
+        return str(response.url), bytes(buffer)
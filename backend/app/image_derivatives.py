@@ -0,0 +1,147 @@
+"""
+Resized / re-encoded variants of uploaded images (thumbnails, WebP).
+
+Derivatives are generated lazily on first request, cached on disk next to the
+uploads, and rendered in a process pool so Pillow work never runs on the event loop.
+Pillow itself is only imported inside the worker functions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Widths we generate; requested widths are rounded up to the next one so the cache stays bounded
+DERIVATIVE_WIDTHS = (160, 320, 640, 1280, 1920)
+
+# Output formats selectable via ?format=
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', 'image/webp', '.webp'),
+    'jpeg': ('JPEG', 'image/jpeg', '.jpg'),
+    'png': ('PNG', 'image/png', '.png'),
+}
+
+# Source types we know how to resize; anything else (svg, animated gif, video) is served as-is
+RESIZABLE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff'}
+
+DERIVATIVE_QUALITY = 82
+
+# Subdirectory of the upload dir holding generated files
+DERIVATIVES_DIRNAME = '.derivatives'
+
+_executor: ProcessPoolExecutor | None = None
+_in_flight: dict[Path, asyncio.Future] = {}
+# Variants that came out as the original (small enough already, animated, unreadable), by source mtime
+_use_original: dict[Path, float] = {}
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Return the shared image worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        max_workers = int(os.getenv('IMAGE_WORKERS', '0')) or min(2, os.cpu_count() or 1)
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the worker pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def snap_width(width: int) -> int:
+    """Round a requested width up to the nearest generated size."""
+    for candidate in DERIVATIVE_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return DERIVATIVE_WIDTHS[-1]
+
+
+def derivative_path(source: Path, width: int | None, fmt: str | None) -> Path:
+    """Cache location for a given source/width/format combination."""
+    extension = DERIVATIVE_FORMATS[fmt][2] if fmt else source.suffix.lower()
+    size_part = f'w{width}' if width else 'full'
+    return source.parent / DERIVATIVES_DIRNAME / f'{source.stem}.{size_part}{extension}'
+
+
+def render_derivative(source: str, target: str, width: int | None, fmt: str | None) -> bool:
+    """
+    Render a derivative in a worker process.
+
+    Returns False when the original should be served instead (the image is
+    already small enough and no format change was requested).
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        if getattr(image, 'is_animated', False):
+            return False
+
+        needs_resize = width is not None and image.width > width
+        if not needs_resize and fmt is None:
+            return False
+
+        # Apply camera orientation before resizing so thumbnails aren't sideways
+        image = ImageOps.exif_transpose(image)
+        if needs_resize:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        pil_format = (
+            DERIVATIVE_FORMATS[fmt][0]
+            if fmt
+            else (Image.registered_extensions().get(Path(source).suffix.lower()) or 'PNG')
+        )
+        if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        # Write to a temp file then rename so readers never see a partial image
+        tmp_target = f'{target}.{os.getpid()}.tmp'
+        save_kwargs = {'optimize': True} if pil_format in ('PNG', 'JPEG') else {}
+        if pil_format in ('WEBP', 'JPEG'):
+            save_kwargs['quality'] = DERIVATIVE_QUALITY
+        image.save(tmp_target, pil_format, **save_kwargs)
+        os.replace(tmp_target, target)
+    return True
+
+
+async def get_derivative(source: Path, width: int | None, fmt: str | None) -> Path:
+    """
+    Return the path to serve for the requested variant, generating it if needed.
+
+    Falls back to the original file for non-resizable types or when no variant is needed.
+    """
+    if source.suffix.lower() not in RESIZABLE_EXTENSIONS or (width is None and fmt is None):
+        return source
+
+    target = derivative_path(source, width, fmt)
+    source_mtime = source.stat().st_mtime
+    if _use_original.get(target) == source_mtime:
+        return source
+    if target.exists() and target.stat().st_mtime >= source_mtime:
+        return target
+
+    # Concurrent requests for the same variant share one render
+    pending = _in_flight.get(target)
+    if pending is None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+        pending = loop.run_in_executor(get_executor(), render_derivative, str(source), str(target), width, fmt)
+        _in_flight[target] = pending
+        pending.add_done_callback(lambda _: _in_flight.pop(target, None))
+
+    try:
+        rendered = await asyncio.shield(pending)
+    except Exception:
+        # Corrupt or unsupported image - serve the original rather than failing the request
+        rendered = False
+    if not rendered:
+        # Remembered so later requests for this variant don't go back to the pool
+        _use_original[target] = source_mtime
+        return source
+    return target
@@ -0,0 +1,82 @@
+"""
+Moves media embedded in entry HTML as base64 data URIs into the upload store.
+
+The editor can inline camera captures and pasted screenshots as data:image/...;base64
+blobs. Left in NoteEntry.content they bloat every row, content search, backup export and
+rollover comparison, so content is rewritten when it is saved to point at
+/api/uploads/files/<name> instead. Files are named after a hash of their bytes: the same
+image pasted twice (or carried forward by the rollover) is stored once, and re-running
+the extraction is harmless.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from app.storage_paths import get_upload_dir
+
+UPLOAD_URL_PREFIX = '/api/uploads/files/'
+
+# Quoted data URIs of images, audio and video (other data URIs are left alone)
+_DATA_URI = re.compile(
+    r'(?P<quote>["\'])data:(?P<mime>(?:image|audio|video)/[\w.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]*)(?P=quote)',
+    re.IGNORECASE,
+)
+_EXTENSIONS = {'image/jpeg': '.jpg', 'image/svg+xml': '.svg', 'image/webp': '.webp'}
+
+
+def has_inline_media(content: str | None) -> bool:
+    """Whether content embeds media that extract_inline_media would move."""
+    return bool(content) and 'base64,' in content and _DATA_URI.search(content) is not None
+
+
+def store_media(data: bytes, mime: str, upload_dir: Path, created: list[Path] | None = None) -> str:
+    """
+    Save bytes to the upload store under a content-addressed name; returns the file name.
+    A file written (rather than found already stored) is appended to created.
+    """
+    extension = _EXTENSIONS.get(mime) or mimetypes.guess_extension(mime) or ''
+    filename = f'inline-{hashlib.sha256(data).hexdigest()[:32]}{extension}'
+    target = upload_dir / filename
+    if not target.exists():
+        # Write then rename, so a concurrent reader never sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=upload_dir, prefix='.inline-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        if created is not None:
+            created.append(target)
+    return filename
+
+
+def extract_inline_media(content: str, upload_dir: Path | None = None, created: list[Path] | None = None) -> str:
+    """
+    Content with every embedded media data URI replaced by the URL of a stored upload.
+    Files newly written to the store are appended to created (see store_media).
+    """
+    if not has_inline_media(content):
+        return content
+    upload_dir = upload_dir or get_upload_dir()
+
+    def replace(match: re.Match) -> str:
+        try:
+            data = base64.b64decode(re.sub(r'\s+', '', match['data']), validate=True)
+        except (binascii.Error, ValueError):
+            return match[0]  # Not valid base64: leave it as it was
+        if not data:
+            return match[0]
+        filename = store_media(data, match['mime'].lower(), upload_dir, created)
+        return f'{match["quote"]}{UPLOAD_URL_PREFIX}{filename}{match["quote"]}'
+
+    return _DATA_URI.sub(replace, content)
@@ -1,32 +1,57 @@
+import asyncio
+import logging
 import os
 
-from fastapi import FastAPI
+import anyio
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import DataError
 
-from app.database import Base, engine
-from app.routers import (
-    app_settings,
-    background_images,
-    backup,
-    custom_emojis,
-    entries,
-    goals,
-    labels,
-    link_preview,
-    lists,
-    notes,
-    reminders,
-    reports,
-    search,
-    search_history,
-    uploads,
-)
+from app import autosave, compression, content_negotiation, metrics, revisions, rollover, slow_queries, startup_timing
+from app.database import get_db
+from app.db_init import ensure_schema
+from app.fast_json import FastJSONResponse
+from app.http_client import close_http_client
+from app.image_derivatives import shutdown_executor
+
+with startup_timing.phase('router_import'):
+    from app import models
+    from app.routers import (
+        admin,
+        app_settings,
+        background_images,
+        backup,
+        custom_emojis,
+        day,
+        entries,
+        goals,
+        labels,
+        link_preview,
+        lists,
+        notes,
+        reminders,
+        reports,
+        search,
+        search_history,
+        uploads,
+    )
 
-# Create database tables only if not in test mode
+# Create database tables only if not in test mode (a no-op if the launcher already did)
 if os.getenv('TESTING') != 'true':
-    Base.metadata.create_all(bind=engine)
+    with startup_timing.phase('schema'):
+        ensure_schema()
 
-app = FastAPI(title='Track the Thing API', version='1.0.0')
+logger = logging.getLogger(__name__)
+
+# orjson encoding for every route (see app.fast_json); coalesced autosaves are written before
+# other requests are handled (see app.autosave)
+app = FastAPI(
+    title='Track the Thing API',
+    version='1.0.0',
+    default_response_class=FastJSONResponse,
+    dependencies=[Depends(autosave.flush_pending_saves)],
+)
 
 # Configure CORS
 # Allow all origins for now (restrict in production if needed)
@@ -38,6 +63,29 @@ app.add_middleware(
     allow_headers=['*'],
 )
 
+# Accept: application/msgpack responses and MessagePack request bodies (see app.content_negotiation)
+app.add_middleware(content_negotiation.MsgpackMiddleware)
+
+# gzip (or brotli) for text-like responses; uploaded media is left alone (see app.compression)
+app.add_middleware(compression.CompressionMiddleware)
+
+# Per-route latency, SQL statement counts and Server-Timing headers (see /metrics)
+metrics.install_sql_hooks()
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Opt-in capture of slow statements with their query plans (see /api/admin/slow-queries)
+slow_queries.install_slow_query_hooks()
+
+# Earlier states of entries, kept on edit, delete and merge (see app.revisions)
+revisions.install_revision_hooks()
+
+
+@app.exception_handler(DataError)
+async def invalid_data(request: Request, exc: DataError):
+    """Values the database can't store (e.g. NUL characters in PostgreSQL text) are a bad request, not a crash."""
+    return JSONResponse(status_code=400, content={'detail': 'Invalid data'})
+
+
 # Include routers
 app.include_router(notes.router, prefix='/api/notes', tags=['notes'])
 app.include_router(entries.router, prefix='/api/entries', tags=['entries'])
@@ -54,6 +102,95 @@ app.include_router(custom_emojis.router)
 app.include_router(app_settings.router)
 app.include_router(goals.router)
 app.include_router(reminders.router)
+app.include_router(admin.router)
+app.include_router(day.router)
+
+
+def _run_first_query():
+    """Open a session and load settings, so connection setup and mapper configuration happen before traffic."""
+    # Use the same session source as request handlers (tests override get_db)
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    db = next(sessions)
+    try:
+        db.query(models.AppSettings).first()
+    finally:
+        sessions.close()
+
+
+@app.on_event('startup')
+async def warm_up():
+    if startup_timing.is_ready():
+        return
+    try:
+        with startup_timing.phase('first_query'):
+            await anyio.to_thread.run_sync(_run_first_query)
+    except Exception as e:
+        # Keep serving (so /health/ready can report why) but don't claim readiness
+        startup_timing.mark_failed(f'First query failed: {e}')
+        return
+    startup_timing.mark_ready()
+
+
+def _sessions():
+    """Sessions from the same source as request handlers (tests override get_db)."""
+    return app.dependency_overrides.get(get_db, get_db)()
+
+
+_rollover_task: asyncio.Task | None = None
+
+
+@app.on_event('startup')
+async def start_rollover():
+    """Carry pinned entries onto today now, then keep the upcoming days up to date in the background."""
+    global _rollover_task
+    # Like schema creation, not in test mode (tests drive app.rollover directly)
+    if os.getenv('TESTING') == 'true':
+        return
+    try:
+        with startup_timing.phase('rollover'):
+            await anyio.to_thread.run_sync(rollover.run_rollover, _sessions)
+    except Exception as e:
+        # Days are still readable; the next scheduled run retries
+        logger.error('Startup rollover failed: %s', e)
+    _rollover_task = asyncio.create_task(rollover.run_periodically(_sessions, rollover.ROLLOVER_INTERVAL_SECONDS))
+
+
+@app.on_event('shutdown')
+async def stop_rollover():
+    if _rollover_task is not None:
+        _rollover_task.cancel()
+
+
+_autosave_task: asyncio.Task | None = None
+
+
+@app.on_event('startup')
+async def start_autosave_writer():
+    """Write coalesced autosaves when their window ends, even if no other request comes in."""
+    global _autosave_task
+    # Not in test mode (tests flush app.autosave through requests)
+    if os.getenv('TESTING') == 'true':
+        return
+    _autosave_task = asyncio.create_task(autosave.run_periodically(_sessions))
+
+
+@app.on_event('shutdown')
+async def stop_autosave_writer():
+    """Write the autosaves still pending before the process exits."""
+    if _autosave_task is not None:
+        _autosave_task.cancel()
+    if autosave.coalescer.has_pending():
+        await anyio.to_thread.run_sync(autosave.flush_all, _sessions)
+
+
+@app.on_event('shutdown')
+async def shutdown_http_client():
+    await close_http_client()
+
+
+@app.on_event('shutdown')
+def shutdown_image_workers():
+    shutdown_executor()
 
 
 @app.get('/')
@@ -64,3 +201,15 @@ async def root():
 @app.get('/health')
 async def health():
     return {'status': 'healthy'}
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+async def get_metrics():
+    """Per-route request metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render_prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@app.get('/health/ready')
+async def health_ready():
+    """Readiness with per-phase startup timings; 503 until startup has finished"""
+    return JSONResponse(startup_timing.report(), status_code=200 if startup_timing.is_ready() else 503)
@@ -0,0 +1,202 @@
+"""
+Per-request performance metrics.
+
+MetricsMiddleware times every HTTP request. SQLAlchemy event hooks attribute SQL
+statements, SQL time and ORM rows loaded to the request that issued them. Totals
+are aggregated per route and exposed in Prometheus text format on /metrics.
+Each response also gets a Server-Timing header, so query counts show up in the
+browser's network panel (an N+1 regression shows up as a jump in `db` count).
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Mapper
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class RequestStats:
+    """Counters for the request currently being handled."""
+
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    rows_loaded: int = 0
+    scope: dict | None = field(default=None, repr=False)
+
+    @property
+    def route(self) -> str | None:
+        """'METHOD /route/{template}' once routing has happened, else the raw path."""
+        if self.scope is None:
+            return None
+        route = self.scope.get('route')
+        return f"{self.scope['method']} {getattr(route, 'path', None) or self.scope['path']}"
+
+
+@dataclass
+class RouteMetrics:
+    """Aggregated counters for one (method, route, status) combination."""
+
+    requests: int = 0
+    latency_seconds: float = 0.0
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    sql_statements: int = 0
+    sql_seconds: float = 0.0
+    rows_loaded: int = 0
+    response_bytes: int = 0
+
+    def observe(self, latency: float, stats: RequestStats, response_bytes: int) -> None:
+        self.requests += 1
+        self.latency_seconds += latency
+        index = bisect_left(LATENCY_BUCKETS, latency)
+        if index < len(LATENCY_BUCKETS):
+            self.latency_buckets[index] += 1
+        self.sql_statements += stats.sql_statements
+        self.sql_seconds += stats.sql_seconds
+        self.rows_loaded += stats.rows_loaded
+        self.response_bytes += response_bytes
+
+
+# Stats for the in-flight request (copied into the worker thread running sync handlers)
+_current: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+_routes: dict[tuple[str, str, int], RouteMetrics] = {}
+
+
+def current_stats() -> RequestStats | None:
+    return _current.get()
+
+
+def reset_metrics() -> None:
+    """Forget all aggregated metrics (used by tests)."""
+    _routes.clear()
+
+
+# --- SQLAlchemy hooks ---------------------------------------------------------
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_start_time'].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_statements += 1
+        stats.sql_seconds += time.perf_counter() - started
+
+
+def _on_load(target, context):
+    stats = _current.get()
+    if stats is not None:
+        stats.rows_loaded += 1
+
+
+def install_sql_hooks() -> None:
+    """Register the engine/mapper listeners (safe to call more than once)."""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Mapper, 'load', _on_load)
+
+
+# --- ASGI middleware ----------------------------------------------------------
+
+
+def server_timing(latency: float, stats: RequestStats) -> str:
+    return (
+        f'app;dur={latency * 1000:.1f}, '
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_statements} queries, {stats.rows_loaded} rows"'
+    )
+
+
+class MetricsMiddleware:
+    """Times requests, adds Server-Timing and records per-route metrics."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope=scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        response_bytes = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, response_bytes
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = list(message.get('headers', []))
+                headers.append((b'server-timing', server_timing(time.perf_counter() - started, stats).encode()))
+                headers.append((b'timing-allow-origin', b'*'))
+                message = {**message, 'headers': headers}
+            elif message['type'] == 'http.response.body':
+                response_bytes += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current.reset(token)
+            route = scope.get('route')
+            # Unmatched paths are grouped together so random URLs can't grow the metrics table
+            path = getattr(route, 'path', None) or 'unmatched'
+            key = (scope['method'], path, status_code)
+            metrics = _routes.get(key)
+            if metrics is None:
+                metrics = _routes[key] = RouteMetrics()
+            metrics.observe(time.perf_counter() - started, stats, response_bytes)
+
+
+# --- Prometheus exposition ----------------------------------------------------
+
+
+def _labels(method: str, route: str, status: int) -> str:
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'method="{method}",route="{route}",status="{status}"'
+
+
+def render_prometheus() -> str:
+    """All route metrics in Prometheus text exposition format."""
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by route.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (method, route, status), metrics in sorted(_routes.items()):
+        labels = _labels(method, route, status)
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, metrics.latency_buckets):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.requests}')
+        lines.append(f'http_request_duration_seconds_sum{{{labels}}} {metrics.latency_seconds:.6f}')
+        lines.append(f'http_request_duration_seconds_count{{{labels}}} {metrics.requests}')
+
+    counters = (
+        ('http_sql_statements_total', 'SQL statements executed while handling requests.', 'sql_statements', 'd'),
+        ('http_sql_seconds_total', 'Time spent executing SQL while handling requests.', 'sql_seconds', '.6f'),
+        ('http_orm_rows_loaded_total', 'ORM objects loaded while handling requests.', 'rows_loaded', 'd'),
+        ('http_response_bytes_total', 'Response body bytes sent.', 'response_bytes', 'd'),
+    )
+    for name, help_text, attribute, number_format in counters:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for (method, route, status), metrics in sorted(_routes.items()):
+            value = format(getattr(metrics, attribute), number_format)
+            lines.append(f'{name}{{{_labels(method, route, status)}}} {value}')
+
+    return '\n'.join(lines) + '\n'
@@ -1,9 +1,26 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, Text, and_
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Table,
+    Text,
+    and_,
+    event,
+    inspect,
+    text,
+)
+from sqlalchemy.orm import Session, deferred, object_session, relationship
 
 from app.database import Base
+from app.excerpts import make_excerpt
+from app.inline_media import extract_inline_media
 
 # Association table for many-to-many relationship between notes and labels
 note_labels = Table(
@@ -66,8 +83,8 @@ class List(Base):
     description = Column(Text, default='')
     color = Column(String, default='#3b82f6')  # Hex color code
     order_index = Column(Integer, default=0)  # For ordering lists
-    is_archived = Column(Integer, default=0)  # 0 = false, 1 = true (for SQLite compatibility)
-    is_kanban = Column(Integer, default=0)  # 0 = false, 1 = true (Kanban board column)
+    is_archived = Column(Boolean, default=False)  # Stored as 0/1 on SQLite
+    is_kanban = Column(Boolean, default=False)  # Kanban board column
     kanban_order = Column(Integer, default=0)  # For ordering Kanban columns
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -144,38 +161,118 @@ class DailyNote(Base):
     labels = relationship('Label', secondary=note_labels, back_populates='notes')
 
 
+# Text search configuration for entry content on PostgreSQL. 'simple' does no stemming and
+# keeps stop words, so every word a user can type is findable (like the SQLite LIKE search).
+SEARCH_CONFIG = 'simple'
+CONTENT_SEARCH_VECTOR = f"to_tsvector('{SEARCH_CONFIG}'::regconfig, content)"
+
+
 class NoteEntry(Base):
     """Model for individual content entries within a day"""
 
     __tablename__ = 'note_entries'
+    __table_args__ = (
+        # Full-text index for search on PostgreSQL; SQLite has no tsvector and keeps the LIKE search
+        Index('ix_note_entries_content_fts', text(CONTENT_SEARCH_VECTOR), postgresql_using='gin').ddl_if(
+            dialect='postgresql'
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     daily_note_id = Column(Integer, ForeignKey('daily_notes.id'), nullable=False)
     title = Column(String, default='')  # Optional title for the entry
-    content = Column(Text, nullable=False)  # Rich text content (HTML)
+    # Rich text content (HTML). Deferred: loaded on first access or with undefer(NoteEntry.content)
+    content = deferred(Column(Text, nullable=False))
+    excerpt = Column(Text, default='')  # Plain-text start of content for card/list views (set on save)
     content_type = Column(String, default='rich_text')  # rich_text, code, markdown
     order_index = Column(Integer, default=0)  # For ordering entries within a day
-    include_in_report = Column(Integer, default=0)  # 0 = false, 1 = true (for SQLite compatibility)
-    is_important = Column(Integer, default=0)  # 0 = false, 1 = true (starred/important)
-    is_completed = Column(Integer, default=0)  # 0 = false, 1 = true (completed checkbox)
-    is_dev_null = Column(Integer, default=0)  # 0 = false, 1 = true (marked as /dev/null - discarded)
-    is_pinned = Column(Integer, default=0)  # 0 = false, 1 = true (pinned - auto-copy to next day)
+    include_in_report = Column(Boolean, default=False)  # Stored as 0/1 on SQLite
+    is_important = Column(Boolean, default=False)  # Starred/important
+    is_completed = Column(Boolean, default=False)  # Completed checkbox
+    is_dev_null = Column(Boolean, default=False)  # Marked as /dev/null - discarded
+    is_pinned = Column(Boolean, default=False)  # Pinned - auto-copy to next day
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Counts changes to title/content (see _bump_version); saves sent with If-Match are checked against it
+    version = Column(Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     daily_note = relationship('DailyNote', back_populates='entries')
     labels = relationship('Label', secondary=entry_labels, back_populates='entries')
     lists = relationship('List', secondary=entry_lists, back_populates='entries')
     reminder = relationship(
-        'Reminder', 
-        back_populates='entry', 
-        uselist=False, 
+        'Reminder',
+        back_populates='entry',
+        uselist=False,
         cascade='all, delete-orphan',
-        primaryjoin='and_(NoteEntry.id==Reminder.entry_id, Reminder.is_dismissed==0)'
+        primaryjoin='and_(NoteEntry.id==Reminder.entry_id, Reminder.is_dismissed==False)',
     )
 
 
+# Session.info key for upload files written by _process_content in the current transaction
+_INLINE_MEDIA_WRITTEN = 'inline_media_written'
+
+
+@event.listens_for(NoteEntry, 'before_insert')
+@event.listens_for(NoteEntry, 'before_update')
+def _process_content(mapper, connection, entry):
+    """
+    When content (or its type) is written: move embedded base64 media into the upload store
+    and recompute the excerpt. Unloaded content means it didn't change.
+    """
+    state = inspect(entry)
+    changed = state.attrs.content.history.has_changes() or state.attrs.content_type.history.has_changes()
+    if changed and 'content' in state.dict:
+        if entry.content_type != 'code':
+            session = object_session(entry)
+            created = session.info.setdefault(_INLINE_MEDIA_WRITTEN, []) if session is not None else None
+            content = extract_inline_media(entry.content, created=created)
+            if content != entry.content:
+                entry.content = content
+        entry.excerpt = make_excerpt(entry.content, entry.content_type)
+
+
+@event.listens_for(Session, 'after_commit')
+def _keep_inline_media(session):
+    """Committed content references the files written for it: stop tracking them."""
+    session.info.pop(_INLINE_MEDIA_WRITTEN, None)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_inline_media(session):
+    """Remove files written for content that was rolled back, so they aren't left as orphans."""
+    for path in session.info.pop(_INLINE_MEDIA_WRITTEN, []):
+        path.unlink(missing_ok=True)
+
+
+@event.listens_for(NoteEntry, 'before_update')
+def _bump_version(mapper, connection, entry):
+    """A new version for every change to the text (title or content); flags, order and moves keep it."""
+    state = inspect(entry)
+    if state.attrs.content.history.has_changes() or state.attrs.title.history.has_changes():
+        entry.version = (entry.version or 1) + 1
+
+
+class EntryRevision(Base):
+    """An earlier state of an entry's text, kept by app.revisions (also once the entry is deleted)"""
+
+    __tablename__ = 'entry_revisions'
+    __table_args__ = (Index('ix_entry_revisions_entry_id_id', 'entry_id', 'id'),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    entry_id = Column(Integer, nullable=False)  # No foreign key: revisions outlive their entry
+    note_date = Column(String, nullable=False)  # The day the entry was on (YYYY-MM-DD)
+    reason = Column(String, nullable=False)  # edit, restore, merge or delete
+    title = Column(String, default='')
+    content_type = Column(String, default='rich_text')
+    version = Column(Integer, nullable=False)  # The entry's version in this state
+    size = Column(Integer, nullable=False)  # Length of the content
+    # NULL: data is the compressed content (a snapshot); else a compressed delta against that snapshot
+    snapshot_id = Column(Integer, nullable=True)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Reminder(Base):
     """Model for reminders - date-time based alerts for note entries"""
 
@@ -184,7 +281,7 @@ class Reminder(Base):
     id = Column(Integer, primary_key=True, index=True)
     entry_id = Column(Integer, ForeignKey('note_entries.id', ondelete='CASCADE'), nullable=False)
     reminder_datetime = Column(String, nullable=False)  # ISO format datetime string
-    is_dismissed = Column(Integer, default=0)  # 0 = false, 1 = true (for SQLite compatibility)
+    is_dismissed = Column(Boolean, default=False)  # Stored as 0/1 on SQLite
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -212,6 +309,19 @@ class CustomEmoji(Base):
     image_url = Column(String, nullable=False)  # Path to uploaded image
     category = Column(String, default='Custom')  # Category for organization
     keywords = Column(String, default='')  # Comma-separated keywords for search
-    is_deleted = Column(Integer, default=0)  # 0 = false, 1 = true (soft delete for backward compatibility)
+    is_deleted = Column(Boolean, default=False)  # Soft delete for backward compatibility
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class BackgroundImage(Base):
+    """Model for uploaded background images (file lives in the static background-images directory)"""
+
+    __tablename__ = 'background_images'
+
+    id = Column(String, primary_key=True, index=True)  # uuid, also the file stem
+    filename = Column(String, unique=True, nullable=False)  # Stored filename: <uuid><ext>
+    original_filename = Column(String, default='')
+    content_type = Column(String, default='')
+    size = Column(Integer, default=0)  # Bytes
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
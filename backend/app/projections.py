@@ -0,0 +1,130 @@
+"""
+Row projections for the list-style endpoints.
+
+Loading ORM objects (identity map, instrumented attributes, relationship collections) costs
+more than the response built from them. These helpers select only the columns a response
+needs and group related labels and lists with one query per relationship, returning plain
+dicts in the shape of the schemas, ready for app.fast_json.FastJSONResponse.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import Column, Table, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.excerpts import EntryView
+
+LABEL_COLUMNS = (models.Label.id, models.Label.name, models.Label.color, models.Label.created_at)
+LIST_COLUMNS = (
+    models.List.id,
+    models.List.name,
+    models.List.description,
+    models.List.color,
+    models.List.order_index,
+    models.List.is_archived,
+    models.List.is_kanban,
+    models.List.kanban_order,
+    models.List.created_at,
+    models.List.updated_at,
+)
+ENTRY_COLUMNS = (
+    models.NoteEntry.id,
+    models.NoteEntry.daily_note_id,
+    models.NoteEntry.title,
+    models.NoteEntry.excerpt,
+    models.NoteEntry.content_type,
+    models.NoteEntry.order_index,
+    models.NoteEntry.include_in_report,
+    models.NoteEntry.is_important,
+    models.NoteEntry.is_completed,
+    models.NoteEntry.is_pinned,
+    models.NoteEntry.created_at,
+    models.NoteEntry.updated_at,
+    models.NoteEntry.version,
+)
+
+# Keeps IN (...) lists well under database parameter limits
+ID_BATCH_SIZE = 500
+
+
+def entry_columns(view: EntryView) -> tuple:
+    """Entry columns for a view; content is only read for view='full'."""
+    return ENTRY_COLUMNS + (models.NoteEntry.content,) if view == 'full' else ENTRY_COLUMNS
+
+
+def label_row(row) -> dict:
+    """A schemas.Label from a row of LABEL_COLUMNS."""
+    return {'id': row.id, 'name': row.name, 'color': row.color, 'created_at': row.created_at}
+
+
+def list_row(row) -> dict:
+    """A list's columns from a row of LIST_COLUMNS (schemas.ListResponse adds entry_count and labels)."""
+    return {
+        'id': row.id,
+        'name': row.name,
+        'description': row.description,
+        'color': row.color,
+        'order_index': row.order_index,
+        'is_archived': bool(row.is_archived),
+        'is_kanban': bool(row.is_kanban),
+        'kanban_order': row.kanban_order,
+        'created_at': row.created_at,
+        'updated_at': row.updated_at,
+    }
+
+
+def id_batches(ids: Iterable[int]) -> Iterable[list[int]]:
+    """Distinct ids in chunks of ID_BATCH_SIZE, for IN (...) filters."""
+    ids = list(dict.fromkeys(ids))
+    for start in range(0, len(ids), ID_BATCH_SIZE):
+        yield ids[start : start + ID_BATCH_SIZE]
+
+
+def _grouped(db: Session, owner: Column, columns: tuple, join_table: Table, join_on, owner_ids, build, order_by):
+    grouped = defaultdict(list)
+    for batch in id_batches(owner_ids):
+        query = (
+            select(owner.label('owner_id'), *columns)
+            .join(join_table, join_on)
+            .where(owner.in_(batch))
+            .order_by(owner, *order_by)
+        )
+        for row in db.execute(query):
+            grouped[row.owner_id].append(build(row))
+    return grouped
+
+
+def _labels_by(db: Session, association: Table, owner_key: str, owner_ids) -> dict[int, list[dict]]:
+    owner = association.c[owner_key]
+    on = models.Label.id == association.c.label_id
+    return _grouped(db, owner, LABEL_COLUMNS, models.Label, on, owner_ids, label_row, (models.Label.id,))
+
+
+def labels_by_entry(db: Session, entry_ids) -> dict[int, list[dict]]:
+    """Each entry's labels, keyed by entry id."""
+    return _labels_by(db, models.entry_labels, 'entry_id', entry_ids)
+
+
+def labels_by_note(db: Session, note_ids) -> dict[int, list[dict]]:
+    """Each daily note's labels, keyed by note id."""
+    return _labels_by(db, models.note_labels, 'note_id', note_ids)
+
+
+def labels_by_list(db: Session, list_ids) -> dict[int, list[dict]]:
+    """Each list's labels, keyed by list id."""
+    return _labels_by(db, models.list_labels, 'list_id', list_ids)
+
+
+def lists_by_entry(db: Session, entry_ids) -> dict[int, list[dict]]:
+    """The lists (and kanban columns) each entry is on, keyed by entry id."""
+    owner = models.entry_lists.c.entry_id
+    on = models.List.id == models.entry_lists.c.list_id
+    return _grouped(db, owner, LIST_COLUMNS, models.List, on, entry_ids, list_row, (models.List.id,))
+
+
+def list_entry_count():
+    """How many entries a list holds, as a correlated subquery to select with LIST_COLUMNS."""
+    list_id = models.entry_lists.c.list_id
+    return select(func.count()).where(list_id == models.List.id).scalar_subquery().label('entry_count')
@@ -0,0 +1,246 @@
+"""
+Entry revision history.
+
+An autosave used to replace an entry's content for good, and deleting an entry (directly,
+by merging it with delete_originals, or with its day) lost it. Earlier states of an entry's
+title and content are now kept in entry_revisions, where they can be listed and restored
+(GET /api/entries/{entry_id}/revisions, POST .../revisions/{revision_id}/restore, and
+GET /api/entries/deleted for entries that no longer exist).
+
+What is recorded:
+- before an edit changes the text, the state it replaces, at most once per
+  REVISION_INTERVAL_SECONDS per entry: an editing session that autosaves every second
+  keeps a state every few minutes, not one per save,
+- before a delete, merge or restore, the state it replaces (always).
+
+How it is stored: a revision is either a snapshot (the zlib-compressed content) or a delta
+against the entry's latest snapshot (the spans of the snapshot that are kept plus the text
+inserted, compressed). A new snapshot is taken every SNAPSHOT_EVERY revisions, or when a
+delta would save little. Each entry keeps about MAX_REVISIONS_PER_ENTRY revisions: the
+oldest snapshot and its deltas are dropped together once there are more.
+
+Revisions are recorded by mapper events (install_revision_hooks), so every ORM write path
+is covered: saves, coalesced autosaves, content patches, merges and deletes. Bulk SQL, such
+as a full backup restore, is not.
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import re
+import zlib
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import delete, event, func, insert, inspect, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+
+# Edits record the state they replace only if the entry has no revision this recent
+REVISION_INTERVAL_SECONDS = float(os.getenv('REVISION_INTERVAL_SECONDS', '300'))
+MAX_REVISIONS_PER_ENTRY = int(os.getenv('MAX_REVISIONS_PER_ENTRY', '50'))
+SNAPSHOT_EVERY = 10
+# Longer content is always stored whole (diffing it would slow saves down)
+MAX_DELTA_LENGTH = 1_000_000
+COMPRESSION_LEVEL = 6
+
+# HTML diffs well in tag-sized pieces: split after each '>' and newline
+_TOKENS = re.compile(r'[^>\n]*[>\n]|[^>\n]+')
+_REASON = '_revision_reason'
+
+_entries = models.NoteEntry.__table__
+_notes = models.DailyNote.__table__
+_revisions = models.EntryRevision.__table__
+
+
+def mark(entry: models.NoteEntry, reason: str) -> None:
+    """Record the state the next change to entry replaces with this reason, however recent the last revision."""
+    setattr(entry, _REASON, reason)
+
+
+def _offsets(tokens: list[str]) -> list[int]:
+    offsets = [0]
+    for token in tokens:
+        offsets.append(offsets[-1] + len(token))
+    return offsets
+
+
+def _common_prefix(a: str, b: str, limit: int) -> int:
+    """Length of the common prefix of a and b, up to limit (binary search: slice compares run in C)."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle :] == b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def make_delta(base: str, content: str) -> list[list[int] | str]:
+    """content as [start, end] spans of base and inserted strings."""
+    # An autosave usually changes one place: only the part between what is kept is diffed
+    prefix = _common_prefix(base, content, min(len(base), len(content)))
+    suffix = _common_suffix(base, content, min(len(base), len(content)) - prefix)
+    base_end, end = len(base) - suffix, len(content) - suffix
+    base_tokens = _TOKENS.findall(base, prefix, base_end)
+    tokens = _TOKENS.findall(content, prefix, end)
+    base_offsets = [offset + prefix for offset in _offsets(base_tokens)]
+    offsets = [offset + prefix for offset in _offsets(tokens)]
+
+    delta = [[0, prefix]] if prefix else []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, base_tokens, tokens).get_opcodes():
+        if tag == 'equal':
+            delta.append([base_offsets[i1], base_offsets[i2]])
+        elif j2 > j1:
+            delta.append(content[offsets[j1] : offsets[j2]])
+    if suffix:
+        delta.append([base_end, len(base)])
+    return delta
+
+
+def apply_delta(base: str, delta: list[list[int] | str]) -> str:
+    return ''.join(base[part[0] : part[1]] if isinstance(part, list) else part for part in delta)
+
+
+def _unpack_text(data: bytes) -> str:
+    return zlib.decompress(data).decode('utf-8')
+
+
+def revision_content(db: Session, revision: models.EntryRevision) -> str:
+    """The content an entry had in a revision."""
+    if revision.snapshot_id is None:
+        return _unpack_text(revision.data)
+    snapshot = db.query(models.EntryRevision).filter(models.EntryRevision.id == revision.snapshot_id).one()
+    return apply_delta(_unpack_text(snapshot.data), orjson.loads(zlib.decompress(revision.data)))
+
+
+def _encode(connection: Connection, entry_id: int, content: str) -> tuple[int | None, bytes]:
+    """(snapshot id, data) to store content with: a delta against the latest snapshot, or a new snapshot."""
+    whole = zlib.compress(content.encode('utf-8'), COMPRESSION_LEVEL)
+    snapshot = connection.execute(
+        select(_revisions.c.id, _revisions.c.data)
+        .where(_revisions.c.entry_id == entry_id, _revisions.c.snapshot_id.is_(None))
+        .order_by(_revisions.c.id.desc())
+        .limit(1)
+    ).first()
+    if snapshot is None or len(content) > MAX_DELTA_LENGTH:
+        return None, whole
+    deltas = connection.execute(
+        select(func.count()).select_from(_revisions).where(_revisions.c.snapshot_id == snapshot.id)
+    ).scalar()
+    if deltas >= SNAPSHOT_EVERY - 1:
+        return None, whole
+    base = _unpack_text(snapshot.data)
+    if len(base) > MAX_DELTA_LENGTH:
+        return None, whole
+    delta = zlib.compress(orjson.dumps(make_delta(base, content)), COMPRESSION_LEVEL)
+    # Not worth reading the snapshot back for
+    if len(delta) > len(whole) // 2:
+        return None, whole
+    return snapshot.id, delta
+
+
+def _prune(connection: Connection, entry_id: int) -> None:
+    """Drop the oldest snapshots (with their deltas) while the entry has more than MAX_REVISIONS_PER_ENTRY."""
+    total = connection.execute(
+        select(func.count()).select_from(_revisions).where(_revisions.c.entry_id == entry_id)
+    ).scalar()
+    if total <= MAX_REVISIONS_PER_ENTRY:
+        return
+    snapshot_ids = (
+        connection.execute(
+            select(_revisions.c.id)
+            .where(_revisions.c.entry_id == entry_id, _revisions.c.snapshot_id.is_(None))
+            .order_by(_revisions.c.id)
+        )
+        .scalars()
+        .all()
+    )
+    # The latest snapshot stays: new deltas are made against it
+    for snapshot_id in snapshot_ids[:-1]:
+        if total <= MAX_REVISIONS_PER_ENTRY:
+            break
+        total -= connection.execute(
+            delete(_revisions).where(or_(_revisions.c.id == snapshot_id, _revisions.c.snapshot_id == snapshot_id))
+        ).rowcount
+
+
+def record(connection: Connection, entry_id: int, reason: str, force: bool = False) -> bool:
+    """Store the entry's current (about to be replaced) state as a revision; returns whether one was stored."""
+    current = connection.execute(
+        select(_entries.c.title, _entries.c.content, _entries.c.content_type, _entries.c.version, _notes.c.date)
+        .join_from(_entries, _notes, _entries.c.daily_note_id == _notes.c.id)
+        .where(_entries.c.id == entry_id)
+    ).first()
+    if current is None:
+        return False
+    now = datetime.utcnow()
+    if not force:
+        latest = connection.execute(
+            select(func.max(_revisions.c.created_at)).where(_revisions.c.entry_id == entry_id)
+        ).scalar()
+        if latest is not None and now - latest < timedelta(seconds=REVISION_INTERVAL_SECONDS):
+            return False
+
+    content = current.content or ''
+    snapshot_id, data = _encode(connection, entry_id, content)
+    connection.execute(
+        insert(_revisions).values(
+            entry_id=entry_id,
+            note_date=current.date,
+            reason=reason,
+            title=current.title or '',
+            content_type=current.content_type,
+            version=current.version,
+            size=len(content),
+            snapshot_id=snapshot_id,
+            data=data,
+            created_at=now,
+        )
+    )
+    _prune(connection, entry_id)
+    return True
+
+
+def _before_update(mapper, connection, entry):
+    reason = entry.__dict__.pop(_REASON, None)
+    state = inspect(entry)
+    if state.attrs.content.history.has_changes() or state.attrs.title.history.has_changes():
+        record(connection, entry.id, reason or 'edit', force=reason is not None)
+
+
+def _before_delete(mapper, connection, entry):
+    record(connection, entry.id, entry.__dict__.pop(_REASON, None) or 'delete', force=True)
+
+
+def _before_insert(mapper, connection, entry):
+    # SQLite hands the highest id out again once its row is deleted (note_entries has no
+    # AUTOINCREMENT); a new entry must not take over the history of a deleted one
+    if entry.id is not None or connection.dialect.name != 'sqlite':
+        return
+    last_revised = connection.execute(select(func.max(_revisions.c.entry_id))).scalar()
+    if last_revised is not None and last_revised >= (connection.execute(select(func.max(_entries.c.id))).scalar() or 0):
+        entry.id = last_revised + 1
+
+
+def install_revision_hooks() -> None:
+    """Register the mapper listeners that record revisions (safe to call more than once)."""
+    if not event.contains(models.NoteEntry, 'before_update', _before_update):
+        event.listen(models.NoteEntry, 'before_update', _before_update)
+        event.listen(models.NoteEntry, 'before_delete', _before_delete)
+        event.listen(models.NoteEntry, 'before_insert', _before_insert)
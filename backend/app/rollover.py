@@ -0,0 +1,174 @@
+"""
+Day rollover: carries pinned entries forward onto a day.
+
+Pinned entries are materialized once per date: by the background job (at startup,
+every ROLLOVER_INTERVAL_SECONDS and at midnight, for today and the next
+ROLLOVER_DAYS_AHEAD days), on the first read of any other day (GET /api/day/{date}/context,
+/api/notes/{date} and /api/entries/note/{date}), and on demand
+(POST /api/notes/{date}/rollover). Materializing checks with reads first and only takes
+the write lock when there is something to copy, so reads of a day that is already
+up to date stay plain reads. It is idempotent, so requests and worker processes doing
+it at the same time (serialized by the write lock) copy each entry once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable, Iterator
+from datetime import date as date_type
+from datetime import datetime, time, timedelta
+
+import anyio
+import sqlalchemy
+from sqlalchemy.orm import Session, undefer
+
+from app import models
+from app.database import begin_write
+
+logger = logging.getLogger(__name__)
+
+# How often the background job re-checks the upcoming days (new pins, the date changing)
+ROLLOVER_INTERVAL_SECONDS = float(os.getenv('ROLLOVER_INTERVAL_SECONDS', '300'))
+# Days after today to materialize as well (covers clients in time zones ahead of the server)
+ROLLOVER_DAYS_AHEAD = int(os.getenv('ROLLOVER_DAYS_AHEAD', '1'))
+
+
+def pinned_copies_needed(date: str, db: Session) -> bool:
+    """Whether materialize_pinned_entries would write anything (reads only)."""
+    pinned_keys = (
+        db.query(models.NoteEntry.content, models.NoteEntry.title)
+        .join(models.DailyNote)
+        .filter(models.NoteEntry.is_pinned.is_(True))
+        .filter(models.DailyNote.date < date)
+        .all()
+    )
+    if not pinned_keys:
+        return False
+
+    note = db.query(models.DailyNote).filter(models.DailyNote.date == date).first()
+    if not note:
+        return True
+
+    existing_keys = set(
+        db.query(models.NoteEntry.content, models.NoteEntry.title)
+        .filter(models.NoteEntry.daily_note_id == note.id)
+        .all()
+    )
+    return any(tuple(key) not in existing_keys for key in pinned_keys)
+
+
+def materialize_pinned_entries(date: str, db: Session) -> int:
+    """
+    Copy pinned entries from previous days onto the specified date if they don't already exist.
+
+    Creates the day's note when there is something to copy. Returns the number of entries copied.
+    """
+    # Most days have nothing to copy; only take the write lock when something will be written
+    if not pinned_copies_needed(date, db):
+        return 0
+    begin_write(db)
+
+    # Get or create the daily note for this date
+    note = db.query(models.DailyNote).filter(models.DailyNote.date == date).first()
+    if not note:
+        note = models.DailyNote(date=date)
+        db.add(note)
+        db.flush()
+
+    # Get all pinned entries from before this date
+    all_pinned = (
+        db.query(models.NoteEntry)
+        .options(undefer(models.NoteEntry.content))
+        .join(models.DailyNote)
+        .filter(models.NoteEntry.is_pinned.is_(True))
+        .filter(models.DailyNote.date < date)
+        .all()
+    )
+
+    # Check against ALL entries of the day, not just pinned ones, to avoid creating duplicates of unpinned entries
+    existing_content = {
+        tuple(key)
+        for key in db.query(models.NoteEntry.content, models.NoteEntry.title).filter(
+            models.NoteEntry.daily_note_id == note.id
+        )
+    }
+
+    copied = 0
+    for pinned_entry in all_pinned:
+        content_key = (pinned_entry.content, pinned_entry.title)
+        if content_key in existing_content:
+            continue
+
+        new_entry = models.NoteEntry(
+            daily_note_id=note.id,
+            title=pinned_entry.title,
+            content=pinned_entry.content,
+            content_type=pinned_entry.content_type,
+            order_index=pinned_entry.order_index,
+            include_in_report=pinned_entry.include_in_report,
+            is_important=pinned_entry.is_important,
+            is_completed=False,  # Reset completion status for new day
+            is_pinned=True,  # Keep it pinned
+        )
+        db.add(new_entry)
+        db.flush()  # Flush to assign ID
+        # Add to set to prevent duplicates within this loop
+        existing_content.add(content_key)
+        copied += 1
+
+        # Copy labels and list associations with direct SQL to avoid lazy loading
+        db.execute(
+            sqlalchemy.text(
+                'INSERT INTO entry_labels (entry_id, label_id) SELECT :new_id, label_id FROM entry_labels '
+                'WHERE entry_id = :old_id'
+            ),
+            {'new_id': new_entry.id, 'old_id': pinned_entry.id},
+        )
+        db.execute(
+            sqlalchemy.text(
+                'INSERT INTO entry_lists (entry_id, list_id) SELECT :new_id, list_id FROM entry_lists '
+                'WHERE entry_id = :old_id'
+            ),
+            {'new_id': new_entry.id, 'old_id': pinned_entry.id},
+        )
+
+    db.commit()
+    return copied
+
+
+def rollover_dates(today: date_type | None = None) -> list[str]:
+    """Dates the background job keeps materialized: today and the next ROLLOVER_DAYS_AHEAD days."""
+    today = today or date_type.today()
+    return [(today + timedelta(days=offset)).isoformat() for offset in range(ROLLOVER_DAYS_AHEAD + 1)]
+
+
+def run_rollover(sessions: Callable[[], Iterator[Session]], today: date_type | None = None) -> dict[str, int]:
+    """Materialize pinned entries for the rollover dates; returns {date: entries copied}."""
+    session_iter = sessions()
+    db = next(session_iter)
+    try:
+        copied = {date: materialize_pinned_entries(date, db) for date in rollover_dates(today)}
+    finally:
+        session_iter.close()
+    if any(copied.values()):
+        logger.info('Rollover copied pinned entries: %s', copied)
+    return copied
+
+
+def next_run_delay(interval: float, now: datetime | None = None) -> float:
+    """Seconds until the next run: interval, or less when the date changes sooner."""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+    return min(interval, (midnight - now).total_seconds())
+
+
+async def run_periodically(sessions: Callable[[], Iterator[Session]], interval: float) -> None:
+    """Re-run the rollover every interval seconds and at midnight until cancelled (errors are logged, not raised)."""
+    while True:
+        await asyncio.sleep(next_run_delay(interval))
+        try:
+            await anyio.to_thread.run_sync(run_rollover, sessions)
+        except Exception:
+            logger.exception('Scheduled rollover failed')
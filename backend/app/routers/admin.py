@@ -0,0 +1,40 @@
+"""
+API routes for diagnostics (slow-query log)
+"""
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from app import slow_queries
+
+router = APIRouter(prefix='/api/admin', tags=['admin'])
+
+
+class SlowQueryConfig(BaseModel):
+    threshold_ms: float | None = Field(None, ge=0)  # None disables capture
+
+
+@router.get('/slow-queries')
+def get_slow_queries():
+    """Get captured slow queries (newest first) and the current threshold"""
+    threshold_ms = slow_queries.get_threshold_ms()
+    return {
+        'enabled': threshold_ms is not None,
+        'threshold_ms': threshold_ms,
+        'capacity': slow_queries.SLOW_QUERY_BUFFER_SIZE,
+        'queries': slow_queries.recent(),
+    }
+
+
+@router.put('/slow-queries/config')
+def configure_slow_queries(config: SlowQueryConfig):
+    """Enable, change or disable (threshold_ms = null) slow-query capture at runtime"""
+    slow_queries.set_threshold_ms(config.threshold_ms)
+    return {'enabled': config.threshold_ms is not None, 'threshold_ms': config.threshold_ms}
+
+
+@router.delete('/slow-queries')
+def clear_slow_queries():
+    """Empty the slow-query buffer"""
+    slow_queries.clear()
+    return {'message': 'Slow query log cleared'}
@@ -11,6 +11,24 @@ from ..database import get_db
 router = APIRouter(prefix='/api/settings', tags=['settings'])
 
 
+def settings_to_response(settings: models.AppSettings) -> dict:
+    """Settings row as an AppSettingsResponse dict (empty columns get their defaults)."""
+    return {
+        'id': settings.id,
+        'sprint_goals': settings.sprint_goals,
+        'quarterly_goals': settings.quarterly_goals,
+        'sprint_start_date': settings.sprint_start_date or '',
+        'sprint_end_date': settings.sprint_end_date or '',
+        'quarterly_start_date': settings.quarterly_start_date or '',
+        'quarterly_end_date': settings.quarterly_end_date or '',
+        'emoji_library': settings.emoji_library or 'emoji-picker-react',
+        'sprint_name': settings.sprint_name or 'Sprint',
+        'daily_goal_end_time': settings.daily_goal_end_time or '17:00',
+        'created_at': settings.created_at.isoformat(),
+        'updated_at': settings.updated_at.isoformat(),
+    }
+
+
 @router.get('', response_model=schemas.AppSettingsResponse)
 def get_app_settings(db: Session = Depends(get_db)):
     """Get application settings (sprint goals, quarterly goals, dates)"""
@@ -34,20 +52,7 @@ def get_app_settings(db: Session = Depends(get_db)):
         db.commit()
         db.refresh(settings)
 
-    return {
-        'id': settings.id,
-        'sprint_goals': settings.sprint_goals,
-        'quarterly_goals': settings.quarterly_goals,
-        'sprint_start_date': settings.sprint_start_date or '',
-        'sprint_end_date': settings.sprint_end_date or '',
-        'quarterly_start_date': settings.quarterly_start_date or '',
-        'quarterly_end_date': settings.quarterly_end_date or '',
-        'emoji_library': settings.emoji_library or 'emoji-picker-react',
-        'sprint_name': settings.sprint_name or 'Sprint',
-        'daily_goal_end_time': settings.daily_goal_end_time or '17:00',
-        'created_at': settings.created_at.isoformat(),
-        'updated_at': settings.updated_at.isoformat(),
-    }
+    return settings_to_response(settings)
 
 
 @router.patch('', response_model=schemas.AppSettingsResponse)
@@ -93,17 +98,4 @@ def update_app_settings(settings_update: schemas.AppSettingsUpdate, db: Session
 
     db.commit()
     db.refresh(settings)
-    return {
-        'id': settings.id,
-        'sprint_goals': settings.sprint_goals,
-        'quarterly_goals': settings.quarterly_goals,
-        'sprint_start_date': settings.sprint_start_date or '',
-        'sprint_end_date': settings.sprint_end_date or '',
-        'quarterly_start_date': settings.quarterly_start_date or '',
-        'quarterly_end_date': settings.quarterly_end_date or '',
-        'emoji_library': settings.emoji_library or 'emoji-picker-react',
-        'sprint_name': settings.sprint_name or 'Sprint',
-        'daily_goal_end_time': settings.daily_goal_end_time or '17:00',
-        'created_at': settings.created_at.isoformat(),
-        'updated_at': settings.updated_at.isoformat(),
-    }
+    return settings_to_response(settings)
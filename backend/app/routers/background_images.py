@@ -1,11 +1,14 @@
-import json
 import os
 import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
+from app import models
+from app.database import get_db
+from app.file_delivery import file_response
 from app.storage_paths import get_static_dir
 
 router = APIRouter()
@@ -15,33 +18,42 @@ router = APIRouter()
 BACKGROUNDS_DIR = Path(get_static_dir()) / 'background-images'
 BACKGROUNDS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Metadata file to track uploaded images
-METADATA_FILE = BACKGROUNDS_DIR / 'metadata.json'
+# Cached listing per database: {database url: (stamp, images)}
+# The stamp (row count + newest created_at) is one indexed aggregate query, so writes made by
+# other worker processes still invalidate this process's cache.
+_listing_cache: dict[str, tuple[tuple, list[dict]]] = {}
+
+
+def image_to_dict(image: models.BackgroundImage) -> dict:
+    """Serialize a background image row to the API shape"""
+    return {
+        'id': image.id,
+        'filename': image.filename,
+        'original_filename': image.original_filename,
+        'url': f'/api/background-images/image/{image.filename}',
+        'content_type': image.content_type,
+        'size': image.size,
+    }
 
 
-def load_metadata() -> list[dict]:
-    """Load metadata about uploaded images"""
-    if METADATA_FILE.exists():
-        with open(METADATA_FILE) as f:
-            return json.load(f)
-    return []
+def _listing_stamp(db: Session) -> tuple:
+    return tuple(db.query(func.count(models.BackgroundImage.id), func.max(models.BackgroundImage.created_at)).one())
 
 
-def save_metadata(metadata: list[dict]):
-    """Save metadata about uploaded images"""
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+def invalidate_listing_cache():
+    """Drop cached listings (called after every write)"""
+    _listing_cache.clear()
 
 
 @router.post('/upload')
-async def upload_background_image(file: UploadFile = File(...)):
+def upload_background_image(file: UploadFile = File(...), db: Session = Depends(get_db)):
     """Upload a background image"""
     # Validate file type
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail='File must be an image')
 
     # Validate file size (max 10MB)
-    contents = await file.read()
+    contents = file.file.read()
     if len(contents) > 10 * 1024 * 1024:
         raise HTTPException(status_code=400, detail='File size must be less than 10MB')
 
@@ -51,65 +63,76 @@ async def upload_background_image(file: UploadFile = File(...)):
     unique_filename = f'{unique_id}{file_extension}'
     file_path = BACKGROUNDS_DIR / unique_filename
 
-    # Save file
-    with open(file_path, 'wb') as f:
+    # Save file (write then rename so a partially written image is never served)
+    tmp_path = file_path.with_name(f'.{unique_filename}.tmp')
+    with open(tmp_path, 'wb') as f:
         f.write(contents)
-
-    # Update metadata
-    metadata = load_metadata()
-    image_data = {
-        'id': unique_id,
-        'filename': unique_filename,
-        'original_filename': file.filename,
-        'url': f'/api/background-images/image/{unique_filename}',
-        'content_type': file.content_type,
-        'size': len(contents),
-    }
-    metadata.append(image_data)
-    save_metadata(metadata)
-
-    return image_data
+    os.replace(tmp_path, file_path)
+
+    # Record metadata as a single-row insert, so concurrent uploads can't overwrite each other
+    image = models.BackgroundImage(
+        id=unique_id,
+        filename=unique_filename,
+        original_filename=file.filename,
+        content_type=file.content_type,
+        size=len(contents),
+    )
+    try:
+        db.add(image)
+        db.commit()
+    except Exception:
+        db.rollback()
+        file_path.unlink(missing_ok=True)
+        raise
+    finally:
+        invalidate_listing_cache()
+
+    return image_to_dict(image)
 
 
 @router.get('/list')
-async def list_background_images() -> list[dict]:
+def list_background_images(db: Session = Depends(get_db)) -> list[dict]:
     """Get list of all uploaded background images"""
-    return load_metadata()
+    cache_key = str(db.get_bind().url)
+    stamp = _listing_stamp(db)
+
+    cached = _listing_cache.get(cache_key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    images = db.query(models.BackgroundImage).order_by(models.BackgroundImage.created_at).all()
+    listing = [image_to_dict(image) for image in images]
+    _listing_cache[cache_key] = (stamp, listing)
+    return listing
 
 
 @router.get('/image/{filename}')
-async def get_background_image(filename: str):
+async def get_background_image(filename: str, request: Request):
     """Get a specific background image"""
     file_path = BACKGROUNDS_DIR / filename
 
-    if not file_path.exists():
+    if not file_path.exists() or not file_path.is_file():
         raise HTTPException(status_code=404, detail='Image not found')
 
-    return FileResponse(file_path)
+    return await file_response(request, file_path)
 
 
 @router.delete('/{image_id}')
-async def delete_background_image(image_id: str):
+def delete_background_image(image_id: str, db: Session = Depends(get_db)):
     """Delete a background image"""
-    metadata = load_metadata()
-
-    # Find the image in metadata
-    image_data = None
-    for img in metadata:
-        if img['id'] == image_id:
-            image_data = img
-            break
+    image = db.query(models.BackgroundImage).filter(models.BackgroundImage.id == image_id).first()
 
-    if not image_data:
+    if not image:
         raise HTTPException(status_code=404, detail='Image not found')
 
-    # Delete the file
-    file_path = BACKGROUNDS_DIR / image_data['filename']
+    filename = image.filename
+    db.delete(image)
+    db.commit()
+    invalidate_listing_cache()
+
+    # Delete the file only once the row is gone, so the listing never points at a missing file
+    file_path = BACKGROUNDS_DIR / filename
     if file_path.exists():
         file_path.unlink()
 
-    # Update metadata
-    metadata = [img for img in metadata if img['id'] != image_id]
-    save_metadata(metadata)
-
     return {'message': 'Image deleted successfully'}
@@ -7,7 +7,7 @@ from html import unescape
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app import models
 from app.database import get_db
@@ -22,7 +22,11 @@ async def export_data(db: Session = Depends(get_db)):
     """Export all data as JSON"""
 
     # Get all notes with entries and labels
-    notes = db.query(models.DailyNote).all()
+    notes = (
+        db.query(models.DailyNote)
+        .options(selectinload(models.DailyNote.entries).undefer(models.NoteEntry.content))
+        .all()
+    )
     labels = db.query(models.Label).all()
     lists = db.query(models.List).all()
     custom_emojis = db.query(models.CustomEmoji).all()
@@ -221,7 +225,12 @@ async def export_markdown(db: Session = Depends(get_db)):
     """Export all data as Markdown for LLM consumption"""
 
     # Get all notes with entries and labels, sorted by date
-    notes = db.query(models.DailyNote).order_by(models.DailyNote.date).all()
+    notes = (
+        db.query(models.DailyNote)
+        .options(selectinload(models.DailyNote.entries).undefer(models.NoteEntry.content))
+        .order_by(models.DailyNote.date)
+        .all()
+    )
     labels = db.query(models.Label).all()
 
     # Build markdown content
@@ -336,11 +345,11 @@ async def export_markdown(db: Session = Depends(get_db)):
 
 
 @router.post('/import')
-async def import_data(file: UploadFile = File(...), replace: bool = False, db: Session = Depends(get_db)):
+def import_data(file: UploadFile = File(...), replace: bool = False, db: Session = Depends(get_db)):
     """Import data from JSON backup file"""
 
     try:
-        content = await file.read()
+        content = file.file.read()
         data = json.loads(content)
 
         # Validate data structure
@@ -399,7 +408,7 @@ async def import_data(file: UploadFile = File(...), replace: bool = False, db: S
                             image_url=emoji_data['image_url'],
                             category=emoji_data.get('category', 'Custom'),
                             keywords=emoji_data.get('keywords', ''),
-                            is_deleted=1 if emoji_data.get('is_deleted', False) else 0,
+                            is_deleted=bool(emoji_data.get('is_deleted', False)),
                             created_at=datetime.fromisoformat(emoji_data['created_at'])
                             if 'created_at' in emoji_data
                             else datetime.utcnow(),
@@ -435,7 +444,7 @@ async def import_data(file: UploadFile = File(...), replace: bool = False, db: S
                             new_reminder = models.Reminder(
                                 entry_id=reminder_data['entry_id'],
                                 reminder_datetime=reminder_data['reminder_datetime'],
-                                is_dismissed=1 if reminder_data.get('is_dismissed', False) else 0,
+                                is_dismissed=bool(reminder_data.get('is_dismissed', False)),
                                 created_at=datetime.fromisoformat(reminder_data['created_at'])
                                 if 'created_at' in reminder_data
                                 else datetime.utcnow(),
@@ -570,8 +579,8 @@ async def import_data(file: UploadFile = File(...), replace: bool = False, db: S
                         description=list_data.get('description', ''),
                         color=list_data.get('color', '#3b82f6'),
                         order_index=list_data.get('order_index', 0),
-                        is_archived=1 if list_data.get('is_archived', False) else 0,
-                        is_kanban=1 if list_data.get('is_kanban', False) else 0,
+                        is_archived=bool(list_data.get('is_archived', False)),
+                        is_kanban=bool(list_data.get('is_kanban', False)),
                         kanban_order=list_data.get('kanban_order', 0),
                         created_at=datetime.fromisoformat(list_data['created_at'])
                         if 'created_at' in list_data
@@ -628,10 +637,10 @@ async def import_data(file: UploadFile = File(...), replace: bool = False, db: S
                         content=entry_data['content'],
                         content_type=entry_data.get('content_type', 'rich_text'),
                         order_index=entry_data.get('order_index', 0),
-                        include_in_report=1 if entry_data.get('include_in_report', False) else 0,
-                        is_important=1 if entry_data.get('is_important', False) else 0,
-                        is_completed=1 if entry_data.get('is_completed', False) else 0,
-                        is_pinned=1 if entry_data.get('is_pinned', False) else 0,
+                        include_in_report=bool(entry_data.get('include_in_report', False)),
+                        is_important=bool(entry_data.get('is_important', False)),
+                        is_completed=bool(entry_data.get('is_completed', False)),
+                        is_pinned=bool(entry_data.get('is_pinned', False)),
                         created_at=datetime.fromisoformat(entry_data['created_at'])
                         if 'created_at' in entry_data
                         else datetime.utcnow(),
@@ -684,7 +693,7 @@ async def import_data(file: UploadFile = File(...), replace: bool = False, db: S
 
 
 @router.post('/full-restore')
-async def full_restore(
+def full_restore(
     backup_file: UploadFile = File(...),
     files_archive: UploadFile = File(...),
     replace: bool = False,
@@ -707,7 +716,7 @@ async def full_restore(
 
     try:
         # Step 1: Restore data from JSON
-        content = await backup_file.read()
+        content = backup_file.file.read()
         data = json.loads(content)
 
         # Validate data structure
@@ -898,10 +907,10 @@ async def full_restore(
                     content=entry_data['content'],
                     content_type=entry_data.get('content_type', 'rich_text'),
                     order_index=entry_data.get('order_index', 0),
-                    include_in_report=1 if entry_data.get('include_in_report', False) else 0,
-                    is_important=1 if entry_data.get('is_important', False) else 0,
-                    is_completed=1 if entry_data.get('is_completed', False) else 0,
-                    is_pinned=1 if entry_data.get('is_pinned', False) else 0,
+                    include_in_report=bool(entry_data.get('include_in_report', False)),
+                    is_important=bool(entry_data.get('is_important', False)),
+                    is_completed=bool(entry_data.get('is_completed', False)),
+                    is_pinned=bool(entry_data.get('is_pinned', False)),
                     created_at=datetime.fromisoformat(entry_data['created_at'])
                     if 'created_at' in entry_data
                     else datetime.utcnow(),
@@ -933,7 +942,7 @@ async def full_restore(
         stats['data_restore'] = data_stats
 
         # Step 2: Restore files from ZIP
-        files_content = await files_archive.read()
+        files_content = files_archive.file.read()
         zip_buffer = io.BytesIO(files_content)
 
         files_restored = 0
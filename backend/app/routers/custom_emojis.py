@@ -5,14 +5,25 @@ API routes for custom emoji management
 import os
 import uuid
 from datetime import datetime
-from io import BytesIO
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from PIL import Image
+import anyio
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from sqlalchemy.orm import Session
 
 from .. import models, schemas
 from ..database import get_db
+from ..emoji_images import (
+    EMOJI_SIZE,
+    SPRITE_FORMATS,
+    SPRITE_PREFIX,
+    ensure_sprite_sheet,
+    process_emoji_upload,
+    sprite_columns,
+    sprite_layout,
+    sprite_path,
+    sprite_version,
+)
+from ..file_delivery import IMMUTABLE_CACHE_CONTROL, file_response
 from ..storage_paths import get_upload_dir
 
 router = APIRouter(prefix='/api/custom-emojis', tags=['custom-emojis'])
@@ -23,9 +34,6 @@ UPLOAD_DIR = get_upload_dir()
 # Maximum file size: 500KB
 MAX_FILE_SIZE = 500 * 1024
 
-# Emoji size (resize all uploaded images to this size)
-EMOJI_SIZE = (64, 64)
-
 
 @router.get('', response_model=list[schemas.CustomEmojiResponse])
 def get_custom_emojis(include_deleted: bool = False, db: Session = Depends(get_db)):
@@ -33,7 +41,7 @@ def get_custom_emojis(include_deleted: bool = False, db: Session = Depends(get_d
     query = db.query(models.CustomEmoji)
 
     if not include_deleted:
-        query = query.filter(models.CustomEmoji.is_deleted == 0)
+        query = query.filter(models.CustomEmoji.is_deleted.is_(False))
 
     emojis = query.order_by(models.CustomEmoji.name).all()
 
@@ -52,6 +60,67 @@ def get_custom_emojis(include_deleted: bool = False, db: Session = Depends(get_d
     ]
 
 
+def _active_emojis(db: Session) -> list[dict]:
+    """The active custom emojis (by name) as the sprite sheet lists them"""
+    emojis = (
+        db.query(models.CustomEmoji)
+        .filter(models.CustomEmoji.is_deleted.is_(False))
+        .order_by(models.CustomEmoji.name)
+        .all()
+    )
+    return [
+        {
+            'id': emoji.id,
+            'name': emoji.name,
+            'image_url': emoji.image_url,
+            'category': emoji.category,
+            'keywords': emoji.keywords,
+        }
+        for emoji in emojis
+    ]
+
+
+@router.get('/sprite', response_model=schemas.CustomEmojiSpriteSheet)
+async def get_custom_emoji_sprite(db: Session = Depends(get_db)):
+    """
+    Get all active custom emojis packed into one sprite sheet.
+
+    Returns the emoji metadata with each emoji's offset in the sheet. The sheet is
+    built in the image worker pool the first time a given emoji set is requested and
+    served from disk afterwards.
+    """
+    # The query blocks, so it runs in a worker thread rather than on the event loop
+    emojis = await anyio.to_thread.run_sync(_active_emojis, db)
+
+    filenames = [emoji['image_url'].split('/')[-1] for emoji in emojis]
+    version = sprite_version([(emoji['name'], filename) for emoji, filename in zip(emojis, filenames)])
+    await ensure_sprite_sheet(UPLOAD_DIR, version, [UPLOAD_DIR / filename for filename in filenames])
+
+    layout = sprite_layout([emoji['name'] for emoji in emojis])
+    return {
+        'version': version,
+        'size': EMOJI_SIZE[0],
+        'columns': sprite_columns(len(emojis)),
+        'image_url': f'/api/custom-emojis/sprite/{SPRITE_PREFIX}{version}.png',
+        'webp_url': f'/api/custom-emojis/sprite/{SPRITE_PREFIX}{version}.webp',
+        'emojis': [{**emoji, 'x': layout[emoji['name']][0], 'y': layout[emoji['name']][1]} for emoji in emojis],
+    }
+
+
+@router.get('/sprite/{filename}')
+async def get_custom_emoji_sprite_image(filename: str, request: Request):
+    """Serve a generated sprite sheet (named by version, so it can be cached forever)"""
+    stem, _, fmt = filename.rpartition('.')
+    if not stem.startswith(SPRITE_PREFIX) or fmt not in SPRITE_FORMATS:
+        raise HTTPException(status_code=404, detail='Sprite sheet not found')
+
+    file_path = sprite_path(UPLOAD_DIR, stem.removeprefix(SPRITE_PREFIX), fmt)
+    if not file_path.is_file():
+        raise HTTPException(status_code=404, detail='Sprite sheet not found')
+
+    return await file_response(request, file_path, cache_control=IMMUTABLE_CACHE_CONTROL)
+
+
 @router.get('/{emoji_id}', response_model=schemas.CustomEmojiResponse)
 def get_custom_emoji(emoji_id: int, db: Session = Depends(get_db)):
     """Get a single custom emoji by ID"""
@@ -73,7 +142,7 @@ def get_custom_emoji(emoji_id: int, db: Session = Depends(get_db)):
 
 
 @router.post('', response_model=schemas.CustomEmojiResponse)
-async def create_custom_emoji(
+def create_custom_emoji(
     name: str = Form(...),
     category: str = Form('Custom'),
     keywords: str = Form(''),
@@ -92,7 +161,7 @@ async def create_custom_emoji(
         raise HTTPException(status_code=400, detail=f'File must be one of: {", ".join(allowed_extensions)}')
 
     # Read file contents
-    contents = await file.read()
+    contents = file.file.read()
 
     # Validate file size
     if len(contents) > MAX_FILE_SIZE:
@@ -103,24 +172,12 @@ async def create_custom_emoji(
     if existing_emoji:
         raise HTTPException(status_code=400, detail='Emoji with this name already exists')
 
-    # Open and resize image
+    # Resize in the image worker pool so large uploads don't block other requests
+    # (always saved as PNG to preserve transparency)
+    unique_filename = f'{uuid.uuid4()}.png'
+    file_path = UPLOAD_DIR / unique_filename
     try:
-        image = Image.open(BytesIO(contents))
-
-        # Convert to RGBA if not already (to preserve transparency)
-        if image.mode != 'RGBA':
-            image = image.convert('RGBA')
-
-        # Resize to emoji size using high-quality resampling
-        image = image.resize(EMOJI_SIZE, Image.Resampling.LANCZOS)
-
-        # Generate unique filename (always save as PNG to preserve transparency)
-        unique_filename = f'{uuid.uuid4()}.png'
-        file_path = UPLOAD_DIR / unique_filename
-
-        # Save resized image
-        image.save(file_path, 'PNG', optimize=True)
-
+        process_emoji_upload(contents, file_path)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f'Failed to process image: {str(e)}')
 
@@ -131,7 +188,7 @@ async def create_custom_emoji(
         image_url=image_url,
         category=category,
         keywords=keywords,
-        is_deleted=0,
+        is_deleted=False,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
     )
@@ -217,7 +274,7 @@ def delete_custom_emoji(emoji_id: int, permanent: bool = False, db: Session = De
         return {'message': 'Custom emoji permanently deleted', 'id': emoji_id}
     else:
         # Soft delete (mark as deleted)
-        emoji.is_deleted = 1
+        emoji.is_deleted = True
         emoji.updated_at = datetime.utcnow()
         db.commit()
 
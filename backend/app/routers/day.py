@@ -0,0 +1,114 @@
+"""
+API route for the day context: everything the day view needs for one date in a single request
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, selectinload, undefer
+
+from .. import models, rollover, schemas
+from ..database import get_db
+from .app_settings import settings_to_response
+from .goals import calculate_days_remaining
+
+router = APIRouter(prefix='/api/day', tags=['day'])
+
+
+def _goal_for_date(db: Session, model_class, date: str) -> dict | None:
+    """The goal active on the date, else the next upcoming one (as GET /api/goals/{kind}/{date})."""
+    goal = (
+        db.query(model_class)
+        .filter(model_class.end_date >= date)
+        .order_by(case((model_class.start_date <= date, 0), else_=1), model_class.start_date)
+        .first()
+    )
+    if not goal:
+        return None
+    return {
+        'id': goal.id,
+        'text': goal.text,
+        'start_date': goal.start_date,
+        'end_date': goal.end_date,
+        'created_at': goal.created_at,
+        'updated_at': goal.updated_at,
+        'days_remaining': calculate_days_remaining(goal.end_date, date),
+    }
+
+
+def _list_response(lst: models.List, entry_counts: Counter) -> dict:
+    return {
+        'id': lst.id,
+        'name': lst.name,
+        'description': lst.description,
+        'color': lst.color,
+        'order_index': lst.order_index,
+        'is_archived': bool(lst.is_archived),
+        'is_kanban': bool(lst.is_kanban),
+        'kanban_order': lst.kanban_order,
+        'created_at': lst.created_at,
+        'updated_at': lst.updated_at,
+        'entry_count': entry_counts[lst.id],
+        'labels': lst.labels,
+    }
+
+
+@router.get('/{date}/context', response_model=schemas.DayContext)
+def get_day_context(date: str, db: Session = Depends(get_db)):
+    """
+    Get the note, entries, goals, settings, labels, lists and Kanban columns for a date.
+
+    Replaces the separate page-load requests of the day view. Relationships are loaded
+    with one batched query each, so the number of queries doesn't grow with the
+    number of entries or lists. A day without a note (and no pinned entries to carry
+    onto it) returns note = null.
+    """
+    rollover.materialize_pinned_entries(date, db)
+    note = (
+        db.query(models.DailyNote)
+        .options(
+            selectinload(models.DailyNote.labels),
+            selectinload(models.DailyNote.entries).options(
+                undefer(models.NoteEntry.content),
+                selectinload(models.NoteEntry.labels),
+                selectinload(models.NoteEntry.lists).selectinload(models.List.labels),
+                selectinload(models.NoteEntry.reminder),
+            ),
+        )
+        .filter(models.DailyNote.date == date)
+        .first()
+    )
+    if note:
+        for entry in note.entries:
+            entry.daily_note_date = note.date
+
+    all_lists = (
+        db.query(models.List)
+        .options(selectinload(models.List.labels))
+        .filter(models.List.is_archived.is_(False))
+        .order_by(models.List.order_index, models.List.created_at)
+        .all()
+    )
+    entry_counts = Counter(
+        dict(db.query(models.entry_lists.c.list_id, func.count()).group_by(models.entry_lists.c.list_id).all())
+    )
+    # Same order as GET /api/lists/kanban
+    kanban_columns = sorted(
+        (lst for lst in all_lists if lst.is_kanban),
+        key=lambda lst: (lst.kanban_order or 0, lst.created_at or datetime.min),
+    )
+
+    settings = db.query(models.AppSettings).filter(models.AppSettings.id == 1).first()
+
+    return {
+        'date': date,
+        'note': note,
+        'sprint_goal': _goal_for_date(db, models.SprintGoal, date),
+        'quarterly_goal': _goal_for_date(db, models.QuarterlyGoal, date),
+        'settings': settings_to_response(settings) if settings else None,
+        'labels': db.query(models.Label).order_by(models.Label.name).all(),
+        'lists': [_list_response(lst, entry_counts) for lst in all_lists if not lst.is_kanban],
+        'kanban_columns': [_list_response(lst, entry_counts) for lst in kanban_columns],
+    }
@@ -1,108 +1,29 @@
 from datetime import datetime
 
-import sqlalchemy
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, defer, undefer
 
-from app import models, schemas
+from app import autosave, models, revisions, rollover, schemas
+from app.content_patch import PatchError, apply_ops, content_hash
 from app.database import get_db
+from app.fast_json import FastJSONResponse
 
 router = APIRouter()
 
 
-def copy_pinned_entries_to_date(date: str, db: Session):
-    """
-    Copy pinned entries from previous days to the specified date if they don't already exist.
-    This is called when getting entries for a date to ensure pinned entries carry forward.
-    """
-    # Get or create the daily note for this date
-    note = db.query(models.DailyNote).filter(models.DailyNote.date == date).first()
-    if not note:
-        note = models.DailyNote(date=date)
-        db.add(note)
-        db.commit()
-        db.refresh(note)
-
-    # Get all pinned entries from before this date
-    all_pinned = (
-        db.query(models.NoteEntry)
-        .join(models.DailyNote)
-        .filter(models.NoteEntry.is_pinned == 1)
-        .filter(models.DailyNote.date < date)
-        .all()
-    )
-
-    if not all_pinned:
-        return
-
-    # Get existing entry IDs for this date to avoid duplicates
-    existing_entries = db.query(models.NoteEntry).filter(models.NoteEntry.daily_note_id == note.id).all()
-
-    # Create a set of content hashes to check for duplicates
-    # Check against ALL entries, not just pinned ones, to avoid creating duplicates of unpinned entries
-    existing_pinned_content = {(entry.content, entry.title) for entry in existing_entries}
-
-    # Copy each pinned entry if it doesn't already exist for this date
-    for pinned_entry in all_pinned:
-        content_key = (pinned_entry.content, pinned_entry.title)
-
-        if content_key not in existing_pinned_content:
-            # Create a copy of the pinned entry for this date
-            new_entry = models.NoteEntry(
-                daily_note_id=note.id,
-                title=pinned_entry.title,
-                content=pinned_entry.content,
-                content_type=pinned_entry.content_type,
-                order_index=pinned_entry.order_index,
-                include_in_report=pinned_entry.include_in_report,
-                is_important=pinned_entry.is_important,
-                is_completed=0,  # Reset completion status for new day
-                is_pinned=1,  # Keep it pinned
-            )
-            db.add(new_entry)
-            db.flush()  # Flush to assign ID
-            # Add to set to prevent duplicates within this loop
-            existing_pinned_content.add(content_key)
-
-            # Copy labels using direct SQL insert to avoid lazy loading
-            label_rows = db.execute(
-                sqlalchemy.text('SELECT label_id FROM entry_labels WHERE entry_id = :old_id'),
-                {'old_id': pinned_entry.id},
-            ).fetchall()
-
-            for row in label_rows:
-                db.execute(
-                    sqlalchemy.text('INSERT INTO entry_labels (entry_id, label_id) VALUES (:new_id, :label_id)'),
-                    {'new_id': new_entry.id, 'label_id': row[0]},
-                )
-
-            # Copy list associations using direct SQL insert
-            list_rows = db.execute(
-                sqlalchemy.text('SELECT list_id FROM entry_lists WHERE entry_id = :old_id'), {'old_id': pinned_entry.id}
-            ).fetchall()
-
-            for row in list_rows:
-                db.execute(
-                    sqlalchemy.text('INSERT INTO entry_lists (entry_id, list_id) VALUES (:new_id, :list_id)'),
-                    {'new_id': new_entry.id, 'list_id': row[0]},
-                )
-
-    db.commit()
-
-
 @router.get('/note/{date}', response_model=list[schemas.NoteEntry])
 def get_entries_for_date(date: str, db: Session = Depends(get_db)):
-    """Get all entries for a specific date"""
-    # First, copy any pinned entries from previous days
-    copy_pinned_entries_to_date(date, db)
-
+    """Get all entries for a specific date (an empty list for a day without a note)"""
+    rollover.materialize_pinned_entries(date, db)
     note = db.query(models.DailyNote).filter(models.DailyNote.date == date).first()
     if not note:
-        raise HTTPException(status_code=404, detail='Note not found for this date')
+        return []
 
     # Order by order_index descending (higher values first), then by created_at descending (newest first)
     entries = (
         db.query(models.NoteEntry)
+        .options(undefer(models.NoteEntry.content))
         .filter(models.NoteEntry.daily_note_id == note.id)
         .order_by(models.NoteEntry.order_index.desc(), models.NoteEntry.created_at.desc())
         .all()
@@ -131,26 +52,69 @@ def create_entry(date: str, entry: schemas.NoteEntryCreate, db: Session = Depend
 
 @router.put('/{entry_id}', response_model=schemas.NoteEntry)
 @router.patch('/{entry_id}', response_model=schemas.NoteEntry)
-def update_entry(entry_id: int, entry_update: schemas.NoteEntryUpdate, db: Session = Depends(get_db)):
-    """Update a specific entry"""
-    db_entry = db.query(models.NoteEntry).filter(models.NoteEntry.id == entry_id).first()
+def update_entry(
+    entry_id: int,
+    entry_update: schemas.NoteEntryUpdate,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    Update a specific entry.
+
+    With If-Match: "<version>" the save only applies to that version of the entry (412 otherwise),
+    and title/content saves are coalesced with the ones that follow them (see app.autosave).
+    Content can be sent as a content_patch against the current content (see app.content_patch).
+    """
+    allowed_versions = autosave.parse_if_match(if_match)
+    update_data = entry_update.model_dump(exclude_unset=True, exclude={'content_patch'})
+    if entry_update.content_patch is not None:
+        if 'content' in update_data:
+            raise HTTPException(status_code=400, detail='Send either content or content_patch, not both')
+        update_data['content'] = _patched_content(db, entry_id, entry_update.content_patch)
+    if autosave.coalescer.can_coalesce(update_data, allowed_versions):
+        saved = autosave.coalescer.save(db, entry_id, update_data, *allowed_versions)
+        return FastJSONResponse(saved, headers={'ETag': autosave.entry_etag(saved['version'])})
+
+    # Write anything still pending for the entry first, so this save applies on top of it
+    autosave.coalescer.flush(db, only={entry_id})
+    query = db.query(models.NoteEntry).filter(models.NoteEntry.id == entry_id)
+    if allowed_versions is not None:
+        query = query.with_for_update()  # Nothing changes the entry between the check and the write
+    db_entry = query.first()
     if not db_entry:
         raise HTTPException(status_code=404, detail='Entry not found')
+    autosave.check_version(db_entry.version, allowed_versions)
 
-    update_data = entry_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
-        # Handle boolean to integer conversion for SQLite
         if key in ['include_in_report', 'is_important', 'is_completed', 'is_pinned']:
-            setattr(db_entry, key, 1 if value else 0)
-        else:
-            setattr(db_entry, key, value)
+            value = bool(value)
+        setattr(db_entry, key, value)
 
     db_entry.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(db_entry)
+    response.headers['ETag'] = autosave.entry_etag(db_entry.version)
     return db_entry
 
 
+def _patched_content(db: Session, entry_id: int, patch: schemas.ContentPatch) -> str:
+    """The entry's current content (including a pending autosave) with the patch applied and verified."""
+    base = autosave.coalescer.pending_content(entry_id)
+    if base is None:
+        base = db.query(models.NoteEntry.content).filter(models.NoteEntry.id == entry_id).scalar()
+        if base is None:
+            raise HTTPException(status_code=404, detail='Entry not found')
+    if content_hash(base) != patch.base_hash:
+        raise HTTPException(status_code=409, detail='Content patch is for different content; send the full content')
+    try:
+        content = apply_ops(base, patch.ops)
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if content_hash(content) != patch.result_hash:
+        raise HTTPException(status_code=422, detail='Content patch did not produce the expected content')
+    return content
+
+
 @router.delete('/{entry_id}', status_code=204)
 def delete_entry(entry_id: int, db: Session = Depends(get_db)):
     """
@@ -171,13 +135,13 @@ def delete_entry(entry_id: int, db: Session = Depends(get_db)):
     )
 
     # Check if ANY of the matching entries are pinned
-    has_pinned = any(entry.is_pinned == 1 for entry in all_matching)
+    has_pinned = any(entry.is_pinned for entry in all_matching)
 
     if has_pinned:
         # Unpin all matching entries to prevent them from being copied forward
         for entry in all_matching:
-            if entry.is_pinned == 1:
-                entry.is_pinned = 0
+            if entry.is_pinned:
+                entry.is_pinned = False
 
         db.commit()
 
@@ -223,7 +187,7 @@ def toggle_pin(entry_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail='Entry not found')
 
     # Toggle the pinned status
-    db_entry.is_pinned = 0 if db_entry.is_pinned else 1
+    db_entry.is_pinned = not db_entry.is_pinned
     db_entry.updated_at = datetime.utcnow()
 
     db.commit()
@@ -231,12 +195,30 @@ def toggle_pin(entry_id: int, db: Session = Depends(get_db)):
     return db_entry
 
 
+@router.get('/deleted', response_model=list[schemas.EntryRevision])
+def list_deleted_entries(db: Session = Depends(get_db)):
+    """The last revision of each deleted entry, newest first (restore it to bring the entry back)"""
+    latest = (
+        select(func.max(models.EntryRevision.id))
+        .where(models.EntryRevision.entry_id.not_in(select(models.NoteEntry.id)))
+        .group_by(models.EntryRevision.entry_id)
+    )
+    return (
+        db.query(models.EntryRevision)
+        .options(defer(models.EntryRevision.data))
+        .filter(models.EntryRevision.id.in_(latest))
+        .order_by(models.EntryRevision.id.desc())
+        .all()
+    )
+
+
 @router.get('/{entry_id}', response_model=schemas.NoteEntry)
-def get_entry(entry_id: int, db: Session = Depends(get_db)):
+def get_entry(entry_id: int, response: Response, db: Session = Depends(get_db)):
     """Get a specific entry by ID"""
     entry = db.query(models.NoteEntry).filter(models.NoteEntry.id == entry_id).first()
     if not entry:
         raise HTTPException(status_code=404, detail='Entry not found')
+    response.headers['ETag'] = autosave.entry_etag(entry.version)
     return entry
 
 
@@ -249,6 +231,7 @@ def merge_entries(merge_request: schemas.MergeEntriesRequest, db: Session = Depe
     # Fetch all entries to merge
     entries = (
         db.query(models.NoteEntry)
+        .options(undefer(models.NoteEntry.content))
         .filter(models.NoteEntry.id.in_(merge_request.entry_ids))
         .order_by(models.NoteEntry.created_at.asc())
         .all()
@@ -288,9 +271,9 @@ def merge_entries(merge_request: schemas.MergeEntriesRequest, db: Session = Depe
         content=merged_content,
         content_type=merged_content_type,
         order_index=entries[0].order_index,
-        include_in_report=1 if include_in_report else 0,
-        is_important=1 if is_important else 0,
-        is_completed=1 if is_completed else 0,
+        include_in_report=bool(include_in_report),
+        is_important=bool(is_important),
+        is_completed=bool(is_completed),
         created_at=entries[0].created_at,  # Use earliest created_at
     )
 
@@ -305,9 +288,85 @@ def merge_entries(merge_request: schemas.MergeEntriesRequest, db: Session = Depe
     # Delete original entries if requested
     if merge_request.delete_originals:
         for entry in entries:
+            revisions.mark(entry, 'merge')
             db.delete(entry)
 
     db.commit()
     db.refresh(merged_entry)
 
     return merged_entry
+
+
+@router.get('/{entry_id}/revisions', response_model=list[schemas.EntryRevision])
+def list_revisions(entry_id: int, db: Session = Depends(get_db)):
+    """Earlier states of an entry, newest first (also once it is deleted; see app.revisions)"""
+    return (
+        db.query(models.EntryRevision)
+        .options(defer(models.EntryRevision.data))
+        .filter(models.EntryRevision.entry_id == entry_id)
+        .order_by(models.EntryRevision.id.desc())
+        .all()
+    )
+
+
+def _get_revision(db: Session, entry_id: int, revision_id: int) -> models.EntryRevision:
+    revision = (
+        db.query(models.EntryRevision)
+        .filter(models.EntryRevision.id == revision_id, models.EntryRevision.entry_id == entry_id)
+        .first()
+    )
+    if not revision:
+        raise HTTPException(status_code=404, detail='Revision not found')
+    return revision
+
+
+@router.get('/{entry_id}/revisions/{revision_id}', response_model=schemas.EntryRevisionDetail)
+def get_revision(entry_id: int, revision_id: int, db: Session = Depends(get_db)):
+    """An earlier state of an entry, with its content"""
+    revision = _get_revision(db, entry_id, revision_id)
+    return {
+        **schemas.EntryRevision.model_validate(revision).model_dump(),
+        'content': revisions.revision_content(db, revision),
+    }
+
+
+@router.post('/{entry_id}/revisions/{revision_id}/restore', response_model=schemas.NoteEntry)
+def restore_revision(entry_id: int, revision_id: int, response: Response, db: Session = Depends(get_db)):
+    """
+    Put an entry's title and content back to an earlier state (the state replaced becomes a revision too).
+    A deleted entry is created again, with its id, on the day it was on; its labels and lists are not restored.
+    """
+    revision = _get_revision(db, entry_id, revision_id)
+    content = revisions.revision_content(db, revision)
+
+    db_entry = db.query(models.NoteEntry).filter(models.NoteEntry.id == entry_id).first()
+    if db_entry:
+        revisions.mark(db_entry, 'restore')
+        db_entry.title = revision.title
+        db_entry.content = content
+        db_entry.content_type = revision.content_type
+        db_entry.updated_at = datetime.utcnow()
+    else:
+        note = db.query(models.DailyNote).filter(models.DailyNote.date == revision.note_date).first()
+        if not note:
+            note = models.DailyNote(date=revision.note_date)
+            db.add(note)
+            db.flush()
+        # Past every version a client may have been given for it
+        last_version = (
+            db.query(func.max(models.EntryRevision.version)).filter(models.EntryRevision.entry_id == entry_id).scalar()
+        )
+        db_entry = models.NoteEntry(
+            id=entry_id,
+            daily_note_id=note.id,
+            title=revision.title,
+            content=content,
+            content_type=revision.content_type,
+            version=last_version + 1,
+        )
+        db.add(db_entry)
+
+    db.commit()
+    db.refresh(db_entry)
+    response.headers['ETag'] = autosave.entry_etag(db_entry.version)
+    return db_entry
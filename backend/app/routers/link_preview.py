@@ -1,15 +1,35 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import re
+import time
+from collections import OrderedDict, defaultdict
+from urllib.parse import urljoin, urlparse
+
 from fastapi import APIRouter
-from pydantic import BaseModel, HttpUrl
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
+
+from app.http_client import fetch_head
 
 router = APIRouter()
 
+# Successful previews are cached in memory so repeat lookups skip the network
+PREVIEW_CACHE_TTL = 6 * 60 * 60  # seconds
+PREVIEW_CACHE_MAX_ITEMS = 1000
+
+# Batch limits: total URLs per request, concurrent fetches, and concurrent fetches per host
+BATCH_MAX_URLS = 50
+BATCH_CONCURRENCY = 8
+BATCH_PER_HOST_CONCURRENCY = 2
+
 
 class LinkPreviewRequest(BaseModel):
     url: HttpUrl
 
 
+class LinkPreviewBatchRequest(BaseModel):
+    urls: list[HttpUrl] = Field(..., max_length=BATCH_MAX_URLS)
+
+
 class LinkPreviewResponse(BaseModel):
     url: str
     title: str | None = None
@@ -18,119 +38,139 @@ class LinkPreviewResponse(BaseModel):
     site_name: str | None = None
 
 
-@router.post('/preview', response_model=LinkPreviewResponse)
-async def get_link_preview(request: LinkPreviewRequest):
-    """Fetch metadata for a given URL"""
-    url = str(request.url)
+_preview_cache: OrderedDict[str, tuple[float, LinkPreviewResponse]] = OrderedDict()
+
+
+def parse_preview(html: bytes, url: str, domain: str, is_google_doc: bool = False) -> LinkPreviewResponse:
+    """Extract preview metadata from the <head> of a page"""
+    # Imported here so BeautifulSoup/lxml only load once a preview is actually requested
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'lxml')
+
+    # Extract metadata
+    preview = LinkPreviewResponse(url=url, site_name=domain)
+
+    # Try Open Graph tags first (most social media sites use these)
+    og_title = soup.find('meta', property='og:title')
+    og_description = soup.find('meta', property='og:description')
+    og_image = soup.find('meta', property='og:image')
+    og_site_name = soup.find('meta', property='og:site_name')
+
+    # Try Twitter card tags as fallback
+    twitter_title = soup.find('meta', attrs={'name': 'twitter:title'})
+    twitter_description = soup.find('meta', attrs={'name': 'twitter:description'})
+    twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
+
+    # Title
+    if og_title:
+        preview.title = og_title.get('content')
+    elif twitter_title:
+        preview.title = twitter_title.get('content')
+    elif soup.title:
+        title_text = soup.title.string
+        # For Google Docs, clean up the title (it often has " - Google Docs" suffix)
+        if is_google_doc and title_text:
+            title_text = title_text.replace(' - Google Docs', '').replace(' - Google Drive', '').strip()
+            if title_text and title_text != 'Google Docs':
+                preview.title = title_text
+
+    # Description
+    if og_description:
+        preview.description = og_description.get('content')
+    elif twitter_description:
+        preview.description = twitter_description.get('content')
+    else:
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        if meta_desc:
+            preview.description = meta_desc.get('content')
+
+    # Image
+    if og_image:
+        preview.image = og_image.get('content')
+    elif twitter_image:
+        preview.image = twitter_image.get('content')
+
+    # Make image URL absolute if it's relative
+    if preview.image and not preview.image.startswith('http'):
+        preview.image = urljoin(url, preview.image)
+
+    # Site name
+    if og_site_name:
+        preview.site_name = og_site_name.get('content')
+
+    # If we couldn't get any meaningful data, return basic preview
+    if not preview.title and not preview.description:
+        preview.title = domain
+        preview.description = 'Link preview not available'
+
+    return preview
+
+
+def get_cached_preview(url: str) -> LinkPreviewResponse | None:
+    """Return a cached preview if present and not expired"""
+    cached = _preview_cache.get(url)
+    if cached is None:
+        return None
+    expires_at, preview = cached
+    if expires_at < time.monotonic():
+        _preview_cache.pop(url, None)
+        return None
+    _preview_cache.move_to_end(url)
+    return preview
+
+
+def cache_preview(url: str, preview: LinkPreviewResponse):
+    """Store a preview, evicting the least recently used entries beyond the size limit"""
+    _preview_cache[url] = (time.monotonic() + PREVIEW_CACHE_TTL, preview)
+    _preview_cache.move_to_end(url)
+    while len(_preview_cache) > PREVIEW_CACHE_MAX_ITEMS:
+        _preview_cache.popitem(last=False)
+
+
+def clear_preview_cache():
+    """Drop all cached previews"""
+    _preview_cache.clear()
+
+
+async def fetch_preview(url: str) -> LinkPreviewResponse:
+    """Fetch a URL's <head> and build its preview, falling back to a basic preview on errors"""
+    cached = get_cached_preview(url)
+    if cached is not None:
+        return cached
+
+    import httpx
 
     # Extract domain info for fallback
-    from urllib.parse import urlparse
-
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc.replace('www.', '')
+    domain = urlparse(url).netloc.replace('www.', '')
 
     try:
         # Special handling for Google Docs/Drive
         is_google_doc = 'docs.google.com' in domain or 'drive.google.com' in domain
 
-        # Fetch the URL with a timeout
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
-        # For Google Docs, try to get the export/preview page which might have more info
-        if is_google_doc and '/document/d/' in url:
-            # Try to extract document ID and get title from export page
-            import re
-
-            doc_id_match = re.search(r'/document/d/([a-zA-Z0-9-_]+)', url)
-            if doc_id_match:
-                doc_id = doc_id_match.group(1)
-                # Try the preview URL which sometimes has the title
-                preview_url = f'https://docs.google.com/document/d/{doc_id}/preview'
-                try:
-                    response = requests.get(preview_url, headers=headers, timeout=5, allow_redirects=True)
-                    if response.status_code != 200:
-                        # Fallback to original URL
-                        response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
-                except Exception:
-                    response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
-            else:
-                response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
+        # For Google Docs, try the preview page first which sometimes has the title
+        doc_id_match = re.search(r'/document/d/([a-zA-Z0-9-_]+)', url) if is_google_doc else None
+        if doc_id_match:
+            preview_url = f'https://docs.google.com/document/d/{doc_id_match.group(1)}/preview'
+            try:
+                _, html = await fetch_head(preview_url)
+            except httpx.HTTPError:
+                # Fallback to original URL
+                _, html = await fetch_head(url)
         else:
-            response = requests.get(url, headers=headers, timeout=5, allow_redirects=True)
-
-        response.raise_for_status()
-
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'lxml')
-
-        # Extract metadata
-        preview = LinkPreviewResponse(url=url, site_name=domain)
-
-        # Try Open Graph tags first (most social media sites use these)
-        og_title = soup.find('meta', property='og:title')
-        og_description = soup.find('meta', property='og:description')
-        og_image = soup.find('meta', property='og:image')
-        og_site_name = soup.find('meta', property='og:site_name')
-
-        # Try Twitter card tags as fallback
-        twitter_title = soup.find('meta', attrs={'name': 'twitter:title'})
-        twitter_description = soup.find('meta', attrs={'name': 'twitter:description'})
-        twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-
-        # Title
-        if og_title:
-            preview.title = og_title.get('content')
-        elif twitter_title:
-            preview.title = twitter_title.get('content')
-        elif soup.title:
-            title_text = soup.title.string
-            # For Google Docs, clean up the title (it often has " - Google Docs" suffix)
-            if is_google_doc and title_text:
-                title_text = title_text.replace(' - Google Docs', '').replace(' - Google Drive', '').strip()
-                if title_text and title_text != 'Google Docs':
-                    preview.title = title_text
-
-        # Description
-        if og_description:
-            preview.description = og_description.get('content')
-        elif twitter_description:
-            preview.description = twitter_description.get('content')
-        else:
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            if meta_desc:
-                preview.description = meta_desc.get('content')
-
-        # Image
-        if og_image:
-            preview.image = og_image.get('content')
-        elif twitter_image:
-            preview.image = twitter_image.get('content')
-
-        # Make image URL absolute if it's relative
-        if preview.image and not preview.image.startswith('http'):
-            from urllib.parse import urljoin
-
-            preview.image = urljoin(url, preview.image)
-
-        # Site name
-        if og_site_name:
-            preview.site_name = og_site_name.get('content')
-
-        # If we couldn't get any meaningful data, return basic preview
-        if not preview.title and not preview.description:
-            preview.title = domain
-            preview.description = 'Link preview not available'
+            _, html = await fetch_head(url)
 
+        preview = parse_preview(html, url, domain, is_google_doc)
+        # Only successful fetches are cached so transient failures get retried
+        cache_preview(url, preview)
         return preview
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         # Return basic preview on timeout
         return LinkPreviewResponse(
             url=url, title=domain, description='Link preview not available (timeout)', site_name=domain
         )
-    except requests.exceptions.RequestException:
+    except httpx.HTTPError:
         # Return basic preview on request errors (404, 403, etc.)
         return LinkPreviewResponse(
             url=url,
@@ -141,3 +181,54 @@ async def get_link_preview(request: LinkPreviewRequest):
     except Exception:
         # Return basic preview on any other error
         return LinkPreviewResponse(url=url, title=domain, description='Link preview not available', site_name=domain)
+
+
+@router.post('/preview', response_model=LinkPreviewResponse)
+async def get_link_preview(request: LinkPreviewRequest):
+    """Fetch metadata for a given URL"""
+    return await fetch_preview(str(request.url))
+
+
+async def _stream_previews(urls: list[str]):
+    """Yield previews as NDJSON lines: cache hits first, then misses as each fetch completes"""
+    misses = []
+    for url in urls:
+        cached = get_cached_preview(url)
+        if cached is not None:
+            yield cached.model_dump_json() + '\n'
+        else:
+            misses.append(url)
+
+    if not misses:
+        return
+
+    limit = asyncio.Semaphore(BATCH_CONCURRENCY)
+    host_limits: defaultdict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(BATCH_PER_HOST_CONCURRENCY)
+    )
+
+    async def fetch_one(url: str) -> LinkPreviewResponse:
+        # Take the per-host slot first so a busy host doesn't hold a global slot while waiting
+        async with host_limits[urlparse(url).netloc], limit:
+            return await fetch_preview(url)
+
+    tasks = [asyncio.create_task(fetch_one(url)) for url in misses]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            preview = await next_done
+            yield preview.model_dump_json() + '\n'
+    finally:
+        # Client disconnected or stream finished - don't leave fetches running
+        for task in tasks:
+            task.cancel()
+
+
+@router.post('/batch')
+async def get_link_previews(request: LinkPreviewBatchRequest):
+    """
+    Fetch metadata for many URLs in one request.
+    Streams newline-delimited JSON, one preview per line, as each preview resolves.
+    """
+    # Deduplicate while preserving order
+    urls = list(dict.fromkeys(str(url) for url in request.urls))
+    return StreamingResponse(_stream_previews(urls), media_type='application/x-ndjson')
@@ -2,13 +2,18 @@
 API routes for lists (Trello-style boards for organizing note entries)
 """
 
+import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 
-from .. import models, schemas
+from .. import models, projections, schemas
 from ..database import get_db
+from ..excerpts import EntryView
+from ..fast_json import FastJSONResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/api/lists', tags=['lists'])
 
@@ -20,12 +25,12 @@ router = APIRouter(prefix='/api/lists', tags=['lists'])
 
 @router.get('/kanban', response_model=list[schemas.ListResponse])
 def get_kanban_boards(db: Session = Depends(get_db)):
-    """Get all Kanban board columns (lists with is_kanban=1)."""
+    """Get all Kanban board columns (lists with is_kanban set)."""
     kanban_lists = (
         db.query(models.List)
         .options(joinedload(models.List.labels))
-        .filter(models.List.is_kanban == 1)
-        .filter(models.List.is_archived == 0)
+        .filter(models.List.is_kanban.is_(True))
+        .filter(models.List.is_archived.is_(False))
         .order_by(models.List.kanban_order, models.List.created_at)
         .all()
     )
@@ -54,7 +59,7 @@ def initialize_kanban(db: Session = Depends(get_db)):
     Initialize Kanban board with default columns if none exist.
     Creates: To Do, In Progress, Done.
     """
-    existing_kanban = db.query(models.List).filter(models.List.is_kanban == 1).first()
+    existing_kanban = db.query(models.List).filter(models.List.is_kanban.is_(True)).first()
     if existing_kanban:
         raise HTTPException(status_code=400, detail='Kanban board already initialized')
 
@@ -84,10 +89,10 @@ def initialize_kanban(db: Session = Depends(get_db)):
             name=col_data['name'],
             description=col_data['description'],
             color=col_data['color'],
-            is_kanban=1,
+            is_kanban=True,
             kanban_order=col_data['kanban_order'],
             order_index=0,
-            is_archived=0,
+            is_archived=False,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
@@ -140,10 +145,10 @@ def get_all_lists(include_archived: bool = False, db: Session = Depends(get_db))
     query = db.query(models.List).options(joinedload(models.List.labels))
 
     # Exclude Kanban columns from regular lists
-    query = query.filter(models.List.is_kanban == 0)
+    query = query.filter(models.List.is_kanban.is_(False))
 
     if not include_archived:
-        query = query.filter(models.List.is_archived == 0)
+        query = query.filter(models.List.is_archived.is_(False))
 
     lists = query.order_by(models.List.order_index, models.List.created_at).all()
 
@@ -165,74 +170,62 @@ def get_all_lists(include_archived: bool = False, db: Session = Depends(get_db))
 
 
 @router.get('/{list_id}', response_model=schemas.ListWithEntries)
-def get_list(list_id: int, db: Session = Depends(get_db)):
+def get_list(
+    list_id: int,
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
+    db: Session = Depends(get_db),
+):
     """Get a single list with all its entries and labels."""
-    lst = (
-        db.query(models.List)
-        .options(
-            joinedload(models.List.entries).joinedload(models.NoteEntry.daily_note),
-            joinedload(models.List.entries).joinedload(models.NoteEntry.labels),
-            joinedload(models.List.entries).joinedload(models.NoteEntry.lists),
-            joinedload(models.List.labels),
-        )
-        .filter(models.List.id == list_id)
-        .first()
-    )
-
-    if not lst:
+    list_row = db.query(*projections.LIST_COLUMNS).filter(models.List.id == list_id).first()
+    if not list_row:
         raise HTTPException(status_code=404, detail='List not found')
 
-    return {
-        'id': lst.id,
-        'name': lst.name,
-        'description': lst.description,
-        'color': lst.color,
-        'order_index': lst.order_index,
-        'is_archived': bool(lst.is_archived),
-        'is_kanban': bool(lst.is_kanban),
-        'kanban_order': lst.kanban_order,
-        'created_at': lst.created_at,
-        'updated_at': lst.updated_at,
-        'entry_count': len(lst.entries),
-        'labels': lst.labels,
-        'entries': [
-            {
-                'id': entry.id,
-                'daily_note_id': entry.daily_note_id,
-                'daily_note_date': entry.daily_note.date if entry.daily_note else None,  # Add date for navigation
-                'title': entry.title,
-                'content': entry.content,
-                'content_type': entry.content_type,
-                'order_index': entry.order_index,
-                'include_in_report': bool(entry.include_in_report),
-                'is_important': bool(entry.is_important),
-                'is_completed': bool(entry.is_completed),
-                'created_at': entry.created_at,
-                'updated_at': entry.updated_at,
-                'labels': [
-                    {
-                        'id': label.id,
-                        'name': label.name,
-                        'color': label.color,
-                        'created_at': label.created_at,
-                    }
-                    for label in entry.labels
-                ],
-                'lists': [
-                    {
-                        'id': entry_list.id,
-                        'name': entry_list.name,
-                        'color': entry_list.color,
-                        'is_kanban': bool(entry_list.is_kanban),
-                        'created_at': entry_list.created_at,
-                        'updated_at': entry_list.updated_at,
-                    }
-                    for entry_list in entry.lists
-                ],
-            }
-            for entry in lst.entries
-        ],
-    }
+    # Entries as column rows, in the list's order (order_index, then when they were added)
+    entry_rows = (
+        db.query(*projections.entry_columns(view), models.DailyNote.date)
+        .join(models.entry_lists, models.entry_lists.c.entry_id == models.NoteEntry.id)
+        .outerjoin(models.DailyNote, models.DailyNote.id == models.NoteEntry.daily_note_id)
+        .filter(models.entry_lists.c.list_id == list_id)
+        .order_by(models.entry_lists.c.order_index, models.entry_lists.c.created_at, models.NoteEntry.id)
+        .all()
+    )
+    entry_ids = [row.id for row in entry_rows]
+    entry_labels = projections.labels_by_entry(db, entry_ids)
+    entry_lists = projections.lists_by_entry(db, entry_ids)
+
+    # Already in the shape of schemas.ListWithEntries, so it is sent without re-validation
+    return FastJSONResponse(
+        {
+            **projections.list_row(list_row),
+            'entry_count': len(entry_rows),
+            'labels': projections.labels_by_list(db, [list_id]).get(list_id, []),
+            'entries': [
+                {
+                    'id': row.id,
+                    'daily_note_id': row.daily_note_id,
+                    'daily_note_date': row.date,  # Add date for navigation
+                    'title': row.title,
+                    'content': row.content if view == 'full' else None,
+                    'excerpt': row.excerpt or '',
+                    'content_type': row.content_type,
+                    'order_index': row.order_index,
+                    'include_in_report': bool(row.include_in_report),
+                    'is_important': bool(row.is_important),
+                    'is_completed': bool(row.is_completed),
+                    'is_pinned': bool(row.is_pinned),
+                    'created_at': row.created_at,
+                    'updated_at': row.updated_at,
+                    'version': row.version,
+                    'labels': entry_labels.get(row.id, []),
+                    'lists': [
+                        {**entry_list, 'entry_count': 0, 'labels': []} for entry_list in entry_lists.get(row.id, [])
+                    ],
+                    'reminder': None,
+                }
+                for row in entry_rows
+            ],
+        }
+    )
 
 
 @router.post('', response_model=schemas.ListResponse)
@@ -248,8 +241,8 @@ def create_list(list_data: schemas.ListCreate, db: Session = Depends(get_db)):
         description=list_data.description,
         color=list_data.color,
         order_index=list_data.order_index,
-        is_archived=1 if list_data.is_archived else 0,
-        is_kanban=1 if list_data.is_kanban else 0,
+        is_archived=bool(list_data.is_archived),
+        is_kanban=bool(list_data.is_kanban),
         kanban_order=list_data.kanban_order,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
@@ -281,10 +274,8 @@ def create_list(list_data: schemas.ListCreate, db: Session = Depends(get_db)):
 @router.put('/reorder')
 def reorder_lists(reorder_data: schemas.ReorderListsRequest, db: Session = Depends(get_db)):
     """Update order_index for all lists."""
-    print(f'Received reorder request: {reorder_data}')
-    print(f'Lists: {reorder_data.lists}')
+    logger.debug('Reordering %d lists', len(reorder_data.lists))
     for list_data in reorder_data.lists:
-        print(f'Processing list {list_data.id} with order_index {list_data.order_index}')
         lst = db.query(models.List).filter(models.List.id == list_data.id).first()
         if lst:
             lst.order_index = list_data.order_index
@@ -317,9 +308,9 @@ def update_list(list_id: int, list_data: schemas.ListUpdate, db: Session = Depen
     if list_data.order_index is not None:
         lst.order_index = list_data.order_index
     if list_data.is_archived is not None:
-        lst.is_archived = 1 if list_data.is_archived else 0
+        lst.is_archived = bool(list_data.is_archived)
     if list_data.is_kanban is not None:
-        lst.is_kanban = 1 if list_data.is_kanban else 0
+        lst.is_kanban = bool(list_data.is_kanban)
     if list_data.kanban_order is not None:
         lst.kanban_order = list_data.kanban_order
 
@@ -378,13 +369,13 @@ def add_entry_to_list(list_id: int, entry_id: int, order_index: int = 0, db: Ses
 
     # If this is a Kanban list, remove entry from all other Kanban lists first
     # (An entry can only be in one Kanban status at a time)
-    if lst.is_kanban == 1:
+    if lst.is_kanban:
         # Get all Kanban lists that contain this entry
         other_kanban_lists = (
             db.query(models.List)
             .join(models.entry_lists)
             .filter(models.entry_lists.c.entry_id == entry_id)
-            .filter(models.List.is_kanban == 1)
+            .filter(models.List.is_kanban.is_(True))
             .filter(models.List.id != list_id)
             .all()
         )
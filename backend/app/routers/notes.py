@@ -1,70 +1,123 @@
+from collections import defaultdict
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
 
-from app import models, schemas
+from app import models, projections, rollover, schemas
 from app.database import get_db
-from app.routers.entries import copy_pinned_entries_to_date
+from app.excerpts import EntryView
+from app.fast_json import FastJSONResponse
 
 router = APIRouter()
 
+NOTE_COLUMNS = (
+    models.DailyNote.id,
+    models.DailyNote.date,
+    models.DailyNote.fire_rating,
+    models.DailyNote.daily_goal,
+    models.DailyNote.created_at,
+    models.DailyNote.updated_at,
+)
+
+
+def note_to_dict(note, entries, view: EntryView, labels: list, entry_labels: dict, entry_lists: dict) -> dict:
+    """
+    A schemas.DailyNote from a note and its entries (rows or objects), given the note's labels
+    and each entry's labels and lists as dicts from app.projections, keyed by entry id.
+    view='card' sends each entry's excerpt without its content.
+    """
+    return {
+        'id': note.id,
+        'date': note.date,
+        'fire_rating': note.fire_rating,
+        'daily_goal': note.daily_goal,
+        'created_at': note.created_at,
+        'updated_at': note.updated_at,
+        'entries': [
+            {
+                'id': entry.id,
+                'daily_note_id': entry.daily_note_id,
+                'daily_note_date': note.date,  # Add the parent note's date
+                'title': entry.title,
+                'content': entry.content if view == 'full' else None,
+                'excerpt': entry.excerpt or '',
+                'content_type': entry.content_type,
+                'order_index': entry.order_index,
+                'include_in_report': bool(entry.include_in_report),
+                'is_important': bool(entry.is_important),
+                'is_completed': bool(entry.is_completed),
+                'is_pinned': bool(entry.is_pinned),
+                'created_at': entry.created_at,
+                'updated_at': entry.updated_at,
+                'version': entry.version,
+                'labels': entry_labels.get(entry.id, []),
+                'lists': [
+                    {**entry_list, 'entry_count': 0, 'labels': []} for entry_list in entry_lists.get(entry.id, [])
+                ],
+                'reminder': None,
+            }
+            for entry in entries
+        ],
+        'labels': labels,
+    }
+
+
+def notes_to_dicts(db: Session, note_rows, view: EntryView, *entry_order) -> list[dict]:
+    """
+    note_to_dict for rows of NOTE_COLUMNS, with their entries (in entry_order), labels and lists
+    loaded by a fixed number of queries however many notes and entries there are.
+    """
+    note_ids = [row.id for row in note_rows]
+    note_labels = projections.labels_by_note(db, note_ids)
+
+    entries_by_note = defaultdict(list)
+    for batch in projections.id_batches(note_ids):
+        entry_rows = (
+            db.query(*projections.entry_columns(view))
+            .filter(models.NoteEntry.daily_note_id.in_(batch))
+            .order_by(*entry_order)
+        )
+        for row in entry_rows:
+            entries_by_note[row.daily_note_id].append(row)
+    entry_ids = [row.id for rows in entries_by_note.values() for row in rows]
+    entry_labels = projections.labels_by_entry(db, entry_ids)
+    entry_lists = projections.lists_by_entry(db, entry_ids)
+
+    return [
+        note_to_dict(note, entries_by_note[note.id], view, note_labels.get(note.id, []), entry_labels, entry_lists)
+        for note in note_rows
+    ]
+
+
+def load_note_with_content(date: str, db: Session) -> models.DailyNote | None:
+    """The note for a date with its entries' content loaded in one query (instead of once per entry)."""
+    return (
+        db.query(models.DailyNote)
+        .options(selectinload(models.DailyNote.entries).undefer(models.NoteEntry.content))
+        .filter(models.DailyNote.date == date)
+        .first()
+    )
+
 
-@router.get('/')
-def get_all_notes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get('/', response_model=list[schemas.DailyNote])
+def get_all_notes(
+    skip: int = 0,
+    limit: int = 100,
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
+    db: Session = Depends(get_db),
+):
     """Get all daily notes"""
-    # Expire all objects to force fresh queries
-    db.expire_all()
-
-    notes = db.query(models.DailyNote).order_by(models.DailyNote.date.desc()).offset(skip).limit(limit).all()
-
-    # Manually construct response to include daily_note_date
-    result = []
-    for note in notes:
-        # Query entries directly to ensure we get the correct associations
-        entries = db.query(models.NoteEntry).filter(models.NoteEntry.daily_note_id == note.id).all()
-
-        note_dict = {
-            'id': note.id,
-            'date': note.date,
-            'fire_rating': note.fire_rating,
-            'daily_goal': note.daily_goal,
-            'created_at': note.created_at,
-            'updated_at': note.updated_at,
-            'entries': [
-                {
-                    'id': entry.id,
-                    'daily_note_id': entry.daily_note_id,
-                    'daily_note_date': note.date,  # Add the parent note's date
-                    'title': entry.title,
-                    'content': entry.content,
-                    'content_type': entry.content_type,
-                    'order_index': entry.order_index,
-                    'include_in_report': bool(entry.include_in_report),
-                    'is_important': bool(entry.is_important),
-                    'is_completed': bool(entry.is_completed),
-                    'is_pinned': bool(entry.is_pinned),
-                    'created_at': entry.created_at,
-                    'updated_at': entry.updated_at,
-                    'labels': entry.labels,
-                    'lists': entry.lists,
-                }
-                for entry in entries
-            ],
-            'labels': note.labels,
-        }
-        result.append(note_dict)
-
-    return result
+    # Column rows instead of ORM objects: a fixed number of queries however many notes there are
+    note_rows = db.query(*NOTE_COLUMNS).order_by(models.DailyNote.date.desc()).offset(skip).limit(limit).all()
+    return FastJSONResponse(notes_to_dicts(db, note_rows, view, models.NoteEntry.id))
 
 
 @router.get('/{date}', response_model=schemas.DailyNote)
 def get_note_by_date(date: str, db: Session = Depends(get_db)):
     """Get a specific daily note by date (YYYY-MM-DD)"""
-    # First, copy any pinned entries from previous days
-    copy_pinned_entries_to_date(date, db)
-
-    note = db.query(models.DailyNote).filter(models.DailyNote.date == date).first()
+    rollover.materialize_pinned_entries(date, db)
+    note = load_note_with_content(date, db)
     if not note:
         raise HTTPException(status_code=404, detail='Note not found for this date')
 
@@ -75,6 +128,12 @@ def get_note_by_date(date: str, db: Session = Depends(get_db)):
     return note
 
 
+@router.post('/{date}/rollover')
+def rollover_note(date: str, db: Session = Depends(get_db)):
+    """Carry pinned entries forward onto a date now (e.g. a future day being planned)"""
+    return {'date': date, 'copied': rollover.materialize_pinned_entries(date, db)}
+
+
 @router.post('/', response_model=schemas.DailyNote, status_code=201)
 def create_note(note: schemas.DailyNoteCreate, db: Session = Depends(get_db)):
     """Create a new daily note"""
@@ -103,8 +162,7 @@ def update_note(date: str, note_update: schemas.DailyNoteUpdate, db: Session = D
 
     db_note.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(db_note)
-    return db_note
+    return load_note_with_content(date, db)
 
 
 @router.delete('/{date}', status_code=204)
@@ -120,19 +178,25 @@ def delete_note(date: str, db: Session = Depends(get_db)):
 
 
 @router.get('/month/{year}/{month}', response_model=list[schemas.DailyNote])
-def get_notes_by_month(year: int, month: int, db: Session = Depends(get_db)):
-    """Get all notes for a specific month"""
+def get_notes_by_month(
+    year: int,
+    month: int,
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
+    db: Session = Depends(get_db),
+):
+    """Get all notes for a specific month (the calendar only needs view=card)"""
     start_date = f'{year}-{month:02d}-01'
     if month == 12:
         end_date = f'{year + 1}-01-01'
     else:
         end_date = f'{year}-{month + 1:02d}-01'
 
-    notes = (
-        db.query(models.DailyNote)
+    note_rows = (
+        db.query(*NOTE_COLUMNS)
         .filter(models.DailyNote.date >= start_date, models.DailyNote.date < end_date)
         .order_by(models.DailyNote.date)
         .all()
     )
-
-    return notes
+    # Entries in the order DailyNote.entries gives them
+    entry_order = (models.NoteEntry.order_index.desc(), models.NoteEntry.created_at.desc())
+    return FastJSONResponse(notes_to_dicts(db, note_rows, view, *entry_order))
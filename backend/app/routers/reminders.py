@@ -4,82 +4,98 @@ API routes for reminder management
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload, selectinload
 
 from .. import models, schemas
 from ..database import get_db
+from ..excerpts import EntryView
+from ..fast_json import FastJSONResponse
 
 router = APIRouter(prefix='/api/reminders', tags=['reminders'])
 
 
-@router.get('', response_model=list[schemas.ReminderWithEntry])
-def get_reminders(include_dismissed: bool = False, db: Session = Depends(get_db)):
-    """Get all reminders (excludes dismissed by default), sorted by reminder_datetime"""
-    query = db.query(models.Reminder).options(
-        joinedload(models.Reminder.entry).joinedload(models.NoteEntry.daily_note)
+def reminders_with_entries(db: Session, view: EntryView, *filters) -> FastJSONResponse:
+    """
+    Reminders matching the filters, sorted by reminder_datetime, with their entry's details.
+
+    Built from one joined column query and already in the shape of schemas.ReminderWithEntry,
+    so the response is sent without re-validation.
+    """
+    entry_columns = [models.NoteEntry.daily_note_id, models.NoteEntry.title, models.NoteEntry.excerpt]
+    if view == 'full':
+        entry_columns.append(models.NoteEntry.content)
+    rows = (
+        db.query(
+            models.Reminder.id,
+            models.Reminder.entry_id,
+            models.Reminder.reminder_datetime,
+            models.Reminder.is_dismissed,
+            models.Reminder.created_at,
+            models.Reminder.updated_at,
+            models.NoteEntry.id.label('found_entry_id'),
+            models.NoteEntry.content_type,
+            *entry_columns,
+            models.DailyNote.date,
+        )
+        .outerjoin(models.NoteEntry, models.NoteEntry.id == models.Reminder.entry_id)
+        .outerjoin(models.DailyNote, models.DailyNote.id == models.NoteEntry.daily_note_id)
+        .filter(*filters)
+        .order_by(models.Reminder.reminder_datetime)
+        .all()
+    )
+
+    return FastJSONResponse(
+        [
+            {
+                'id': row.id,
+                'entry_id': row.entry_id,
+                'reminder_datetime': row.reminder_datetime,
+                'is_dismissed': bool(row.is_dismissed),
+                'created_at': row.created_at,
+                'updated_at': row.updated_at,
+                'entry': {
+                    'id': row.found_entry_id,
+                    'daily_note_id': row.daily_note_id,
+                    'daily_note_date': row.date,
+                    'title': row.title,
+                    'content': row.content if view == 'full' else None,
+                    'excerpt': row.excerpt or '',
+                    'content_type': row.content_type,
+                }
+                if row.found_entry_id is not None
+                else None,
+            }
+            for row in rows
+        ]
     )
 
-    if not include_dismissed:
-        query = query.filter(models.Reminder.is_dismissed == 0)
-
-    reminders = query.order_by(models.Reminder.reminder_datetime).all()
-
-    return [
-        {
-            'id': reminder.id,
-            'entry_id': reminder.entry_id,
-            'reminder_datetime': reminder.reminder_datetime,
-            'is_dismissed': bool(reminder.is_dismissed),
-            'created_at': reminder.created_at,
-            'updated_at': reminder.updated_at,
-            'entry': {
-                'id': reminder.entry.id,
-                'daily_note_id': reminder.entry.daily_note_id,
-                'daily_note_date': reminder.entry.daily_note.date if reminder.entry.daily_note else None,
-                'title': reminder.entry.title,
-                'content': reminder.entry.content,
-                'content_type': reminder.entry.content_type,
-            } if reminder.entry else None,
-        }
-        for reminder in reminders
-    ]
+
+@router.get('', response_model=list[schemas.ReminderWithEntry])
+def get_reminders(
+    include_dismissed: bool = False,
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
+    db: Session = Depends(get_db),
+):
+    """Get all reminders (excludes dismissed by default), sorted by reminder_datetime"""
+    filters = [] if include_dismissed else [models.Reminder.is_dismissed.is_(False)]
+    return reminders_with_entries(db, view, *filters)
 
 
 @router.get('/due', response_model=list[schemas.ReminderWithEntry])
-def get_due_reminders(db: Session = Depends(get_db)):
+def get_due_reminders(
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
+    db: Session = Depends(get_db),
+):
     """Get reminders that are due now (reminder_datetime <= current time, not dismissed)"""
     current_time = datetime.utcnow().isoformat()
-
-    reminders = (
-        db.query(models.Reminder)
-        .options(joinedload(models.Reminder.entry).joinedload(models.NoteEntry.daily_note))
-        .filter(models.Reminder.is_dismissed == 0)
-        .filter(models.Reminder.reminder_datetime <= current_time)
-        .order_by(models.Reminder.reminder_datetime)
-        .all()
+    return reminders_with_entries(
+        db,
+        view,
+        models.Reminder.is_dismissed.is_(False),
+        models.Reminder.reminder_datetime <= current_time,
     )
 
-    return [
-        {
-            'id': reminder.id,
-            'entry_id': reminder.entry_id,
-            'reminder_datetime': reminder.reminder_datetime,
-            'is_dismissed': bool(reminder.is_dismissed),
-            'created_at': reminder.created_at,
-            'updated_at': reminder.updated_at,
-            'entry': {
-                'id': reminder.entry.id,
-                'daily_note_id': reminder.entry.daily_note_id,
-                'daily_note_date': reminder.entry.daily_note.date if reminder.entry.daily_note else None,
-                'title': reminder.entry.title,
-                'content': reminder.entry.content,
-                'content_type': reminder.entry.content_type,
-            } if reminder.entry else None,
-        }
-        for reminder in reminders
-    ]
-
 
 @router.get('/entry/{entry_id}', response_model=schemas.ReminderResponse | None)
 def get_reminder_for_entry(entry_id: int, db: Session = Depends(get_db)):
@@ -88,7 +104,7 @@ def get_reminder_for_entry(entry_id: int, db: Session = Depends(get_db)):
         db.query(models.Reminder)
         .options(joinedload(models.Reminder.entry).joinedload(models.NoteEntry.daily_note))
         .filter(models.Reminder.entry_id == entry_id)
-        .filter(models.Reminder.is_dismissed == 0)
+        .filter(models.Reminder.is_dismissed.is_(False))
         .first()
     )
 
@@ -134,7 +150,7 @@ def create_reminder(reminder_data: schemas.ReminderCreate, db: Session = Depends
     existing_reminder = (
         db.query(models.Reminder)
         .filter(models.Reminder.entry_id == reminder_data.entry_id)
-        .filter(models.Reminder.is_dismissed == 0)
+        .filter(models.Reminder.is_dismissed.is_(False))
         .first()
     )
     if existing_reminder:
@@ -144,14 +160,14 @@ def create_reminder(reminder_data: schemas.ReminderCreate, db: Session = Depends
     dismissed_reminder = (
         db.query(models.Reminder)
         .filter(models.Reminder.entry_id == reminder_data.entry_id)
-        .filter(models.Reminder.is_dismissed == 1)
+        .filter(models.Reminder.is_dismissed.is_(True))
         .first()
     )
     
     if dismissed_reminder:
         # Reactivate the dismissed reminder with new datetime
         dismissed_reminder.reminder_datetime = reminder_data.reminder_datetime
-        dismissed_reminder.is_dismissed = 0
+        dismissed_reminder.is_dismissed = False
         dismissed_reminder.updated_at = datetime.utcnow()
         db.commit()
         
@@ -167,7 +183,7 @@ def create_reminder(reminder_data: schemas.ReminderCreate, db: Session = Depends
         new_reminder = models.Reminder(
             entry_id=reminder_data.entry_id,
             reminder_datetime=reminder_data.reminder_datetime,
-            is_dismissed=0,
+            is_dismissed=False,
             created_at=datetime.utcnow(),
             updated_at=datetime.utcnow(),
         )
@@ -229,7 +245,7 @@ def update_reminder(reminder_id: int, reminder_update: schemas.ReminderUpdate, d
         reminder.reminder_datetime = reminder_update.reminder_datetime
 
     if reminder_update.is_dismissed is not None:
-        reminder.is_dismissed = 1 if reminder_update.is_dismissed else 0
+        reminder.is_dismissed = bool(reminder_update.is_dismissed)
 
     reminder.updated_at = datetime.utcnow()
     db.commit()
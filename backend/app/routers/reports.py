@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app import models
 from app.database import get_db
@@ -48,6 +48,7 @@ def generate_report(
     # Query all notes in the week range
     notes = (
         db.query(models.DailyNote)
+        .options(selectinload(models.DailyNote.entries).undefer(models.NoteEntry.content))
         .filter(models.DailyNote.date >= start_date_str, models.DailyNote.date < end_date_str)
         .order_by(models.DailyNote.date)
         .all()
@@ -84,7 +85,12 @@ def generate_all_entries_report(db: Session = Depends(get_db)):
     """Generate a report of all entries marked for reports (no date restrictions)"""
 
     # Get all notes, ordered by date
-    notes = db.query(models.DailyNote).order_by(models.DailyNote.date.asc()).all()
+    notes = (
+        db.query(models.DailyNote)
+        .options(selectinload(models.DailyNote.entries).undefer(models.NoteEntry.content))
+        .order_by(models.DailyNote.date.asc())
+        .all()
+    )
 
     report_data = {'generated_at': datetime.now().isoformat(), 'entries': []}
 
@@ -113,7 +119,7 @@ def get_available_weeks(db: Session = Depends(get_db)):
     """Get list of weeks that have report entries"""
 
     # Get all entries marked for reports
-    entries_with_reports = db.query(models.NoteEntry).filter(models.NoteEntry.include_in_report == 1).all()
+    entries_with_reports = db.query(models.NoteEntry).filter(models.NoteEntry.include_in_report.is_(True)).all()
 
     if not entries_with_reports:
         return {'weeks': []}
@@ -1,12 +1,50 @@
+import logging
+import re
+
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session, joinedload, undefer
 
-from app import models, schemas
+from app import models, projections, schemas
 from app.database import get_db
+from app.excerpts import EntryView
+from app.fast_json import FastJSONResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def build_tsquery(q: str) -> str | None:
+    """
+    Prefix-match every word of a search ('deploy fix' -> 'deploy:* & fix:*').
+
+    None if the search isn't just words: PostgreSQL splits text such as dates, URLs
+    and file names into different tokens than the search would, so those are matched
+    as substrings instead.
+    """
+    words = q.lower().split()
+    # Letters and digits only (PostgreSQL splits on underscores as well)
+    if not words or not all(re.fullmatch(r'[^\W_]+', word) for word in words):
+        return None
+    return ' & '.join(f'{word}:*' for word in words)
+
+
+def content_filter(db: Session, q: str):
+    """
+    Filter matching entry content.
+
+    PostgreSQL uses full-text search on the GIN index (ix_note_entries_content_fts), which
+    matches the start of words: 'deploy' finds 'deployment' but 'ploy' doesn't find 'deploy'.
+    SQLite, and searches that aren't just words, use a substring match.
+    """
+    tsquery = build_tsquery(q) if db.get_bind().dialect.name == 'postgresql' else None
+    if tsquery is None:
+        return models.NoteEntry.content.ilike(f'%{q}%')
+    config = literal_column(f"'{models.SEARCH_CONFIG}'::regconfig")
+    return func.to_tsvector(config, models.NoteEntry.content).op('@@')(func.to_tsquery(config, tsquery))
+
+
 @router.get('/', response_model=list[schemas.SearchResult])
 def search_entries(
     q: str | None = Query(None, description='Search query for content'),
@@ -14,6 +52,7 @@ def search_entries(
     list_ids: str | None = Query(None, description='Comma-separated list IDs to filter by'),
     is_important: bool | None = Query(None, description='Filter by starred/important entries'),
     is_completed: bool | None = Query(None, description='Filter by completed entries'),
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
     db: Session = Depends(get_db),
 ):
     """
@@ -24,11 +63,12 @@ def search_entries(
     query = db.query(models.NoteEntry).options(
         joinedload(models.NoteEntry.labels), joinedload(models.NoteEntry.lists), joinedload(models.NoteEntry.daily_note)
     )
+    if view == 'full':
+        query = query.options(undefer(models.NoteEntry.content))
 
     # Filter by text content if provided
     if q and q.strip():
-        search_term = f'%{q.strip()}%'
-        query = query.filter(models.NoteEntry.content.ilike(search_term))
+        query = query.filter(content_filter(db, q.strip()))
 
     # Filter by labels if provided
     if label_ids and label_ids.strip():
@@ -52,11 +92,11 @@ def search_entries(
 
     # Filter by starred/important status if provided
     if is_important is not None:
-        query = query.filter(models.NoteEntry.is_important == (1 if is_important else 0))
+        query = query.filter(models.NoteEntry.is_important.is_(is_important))
 
     # Filter by completed status if provided
     if is_completed is not None:
-        query = query.filter(models.NoteEntry.is_completed == (1 if is_completed else 0))
+        query = query.filter(models.NoteEntry.is_completed.is_(is_completed))
 
     # Order by most recent first
     query = query.order_by(models.NoteEntry.created_at.desc())
@@ -81,7 +121,8 @@ def search_entries(
             'id': entry.id,
             'daily_note_id': entry.daily_note_id,
             'title': entry.title,
-            'content': entry.content,
+            'content': entry.content if view == 'full' else None,
+            'excerpt': entry.excerpt or '',
             'content_type': entry.content_type,
             'order_index': entry.order_index,
             'created_at': entry.created_at,
@@ -108,23 +149,30 @@ def search_all(
     list_ids: str | None = Query(None, description='Comma-separated list IDs to filter by'),
     is_important: bool | None = Query(None, description='Filter by starred/important entries'),
     is_completed: bool | None = Query(None, description='Filter by completed entries'),
+    view: EntryView = Query('full', description="'card' returns each entry's excerpt instead of its content"),
     db: Session = Depends(get_db),
 ):
     """
     Global search across entries AND lists.
     Returns both entries and lists that match the search criteria.
     """
-    print(
-        f'Search params: q={q}, label_ids={label_ids}, list_ids={list_ids}, is_important={is_important}, is_completed={is_completed}'
+    logger.debug(
+        'Search params: q=%s, label_ids=%s, list_ids=%s, is_important=%s, is_completed=%s',
+        q,
+        label_ids,
+        list_ids,
+        is_important,
+        is_completed,
     )
     results = {'entries': [], 'lists': []}
 
-    # Search entries
-    entry_query = db.query(models.NoteEntry)
+    # Search entries (as column rows: no ORM objects are built for the response)
+    entry_query = db.query(*projections.entry_columns(view), models.DailyNote.date).outerjoin(
+        models.DailyNote, models.DailyNote.id == models.NoteEntry.daily_note_id
+    )
 
     if q and q.strip():
-        search_term = f'%{q.strip()}%'
-        entry_query = entry_query.filter(models.NoteEntry.content.ilike(search_term))
+        entry_query = entry_query.filter(content_filter(db, q.strip()))
 
     if label_ids and label_ids.strip():
         try:
@@ -147,57 +195,55 @@ def search_all(
 
     # Filter by starred/important status if provided
     if is_important is not None:
-        print(f'Filtering by is_important: {is_important}, converted to: {1 if is_important else 0}')
-        entry_query = entry_query.filter(models.NoteEntry.is_important == (1 if is_important else 0))
+        entry_query = entry_query.filter(models.NoteEntry.is_important.is_(is_important))
 
     # Filter by completed status if provided
     if is_completed is not None:
-        print(f'Filtering by is_completed: {is_completed}, converted to: {1 if is_completed else 0}')
-        entry_query = entry_query.filter(models.NoteEntry.is_completed == (1 if is_completed else 0))
-
-    # Now add eager loading for relationships and execute
-    entry_query = entry_query.options(
-        joinedload(models.NoteEntry.labels), joinedload(models.NoteEntry.lists), joinedload(models.NoteEntry.daily_note)
-    )
+        entry_query = entry_query.filter(models.NoteEntry.is_completed.is_(is_completed))
 
-    entry_results = entry_query.order_by(models.NoteEntry.created_at.desc()).limit(100).all()
-    print(f'Found {len(entry_results)} entries')
+    entry_rows = entry_query.order_by(models.NoteEntry.created_at.desc()).limit(100).all()
+    logger.debug('Found %d entries', len(entry_rows))
 
-    for entry in entry_results:
-        # Separate regular lists and kanban columns
-        regular_lists = [
-            {'id': lst.id, 'name': lst.name, 'is_kanban': bool(lst.is_kanban)}
-            for lst in entry.lists
-            if not lst.is_kanban
-        ]
-        kanban_columns = [
-            {'id': lst.id, 'name': lst.name, 'is_kanban': bool(lst.is_kanban)} for lst in entry.lists if lst.is_kanban
-        ]
+    # Labels and lists for all matches at once
+    entry_ids = [row.id for row in entry_rows]
+    entry_labels = projections.labels_by_entry(db, entry_ids)
+    entry_lists = projections.lists_by_entry(db, entry_ids)
 
+    for row in entry_rows:
+        lists = entry_lists.get(row.id, [])
         results['entries'].append(
             {
-                'id': entry.id,
-                'daily_note_id': entry.daily_note_id,
-                'title': entry.title,
-                'content': entry.content,
-                'content_type': entry.content_type,
-                'order_index': entry.order_index,
-                'created_at': entry.created_at,
-                'updated_at': entry.updated_at,
-                'labels': [{'id': label.id, 'name': label.name, 'color': label.color} for label in entry.labels],
-                'list_names': [lst.name for lst in entry.lists],
-                'regular_lists': regular_lists,
-                'kanban_columns': kanban_columns,
-                'include_in_report': bool(entry.include_in_report),
-                'is_important': bool(entry.is_important),
-                'is_completed': bool(entry.is_completed),
-                'is_pinned': bool(entry.is_pinned),
-                'date': entry.daily_note.date if entry.daily_note else 'Unknown',
+                'id': row.id,
+                'daily_note_id': row.daily_note_id,
+                'title': row.title,
+                'content': row.content if view == 'full' else None,
+                'excerpt': row.excerpt or '',
+                'content_type': row.content_type,
+                'order_index': row.order_index,
+                'created_at': row.created_at,
+                'updated_at': row.updated_at,
+                'labels': [
+                    {'id': label['id'], 'name': label['name'], 'color': label['color']}
+                    for label in entry_labels.get(row.id, [])
+                ],
+                'list_names': [lst['name'] for lst in lists],
+                # Regular lists and kanban columns separately
+                'regular_lists': [
+                    {'id': lst['id'], 'name': lst['name'], 'is_kanban': False} for lst in lists if not lst['is_kanban']
+                ],
+                'kanban_columns': [
+                    {'id': lst['id'], 'name': lst['name'], 'is_kanban': True} for lst in lists if lst['is_kanban']
+                ],
+                'include_in_report': bool(row.include_in_report),
+                'is_important': bool(row.is_important),
+                'is_completed': bool(row.is_completed),
+                'is_pinned': bool(row.is_pinned),
+                'date': row.date or 'Unknown',
             }
         )
 
     # Search lists
-    list_query = db.query(models.List).options(joinedload(models.List.labels), joinedload(models.List.entries))
+    list_query = db.query(*projections.LIST_COLUMNS, projections.list_entry_count())
 
     if q and q.strip():
         search_term = f'%{q.strip()}%'
@@ -209,26 +255,29 @@ def search_all(
         try:
             label_id_list = [int(lid.strip()) for lid in label_ids.split(',') if lid.strip()]
             if label_id_list:
-                list_query = list_query.join(models.List.labels).filter(models.Label.id.in_(label_id_list)).distinct()
+                list_query = list_query.filter(models.List.labels.any(models.Label.id.in_(label_id_list)))
         except ValueError:
             pass
 
-    list_results = list_query.order_by(models.List.created_at.desc()).limit(50).all()
+    list_rows = list_query.order_by(models.List.created_at.desc()).limit(50).all()
+
+    list_labels = projections.labels_by_list(db, [row.id for row in list_rows])
 
-    for lst in list_results:
+    for row in list_rows:
         results['lists'].append(
             {
-                'id': lst.id,
-                'name': lst.name,
-                'description': lst.description,
-                'color': lst.color,
-                'order_index': lst.order_index,
-                'is_archived': bool(lst.is_archived),
-                'created_at': lst.created_at,
-                'updated_at': lst.updated_at,
-                'labels': lst.labels,
-                'entry_count': len(lst.entries) if lst.entries else 0,
+                'id': row.id,
+                'name': row.name,
+                'description': row.description,
+                'color': row.color,
+                'order_index': row.order_index,
+                'is_archived': bool(row.is_archived),
+                'created_at': row.created_at,
+                'updated_at': row.updated_at,
+                'labels': list_labels.get(row.id, []),
+                'entry_count': row.entry_count,
             }
         )
 
-    return results
+    # Plain dicts throughout, so they go straight to orjson
+    return FastJSONResponse(results)
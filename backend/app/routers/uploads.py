@@ -4,10 +4,13 @@ import os
 import uuid
 import zipfile
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
 
+from app.file_delivery import file_response
+from app.image_derivatives import DERIVATIVE_FORMATS, DERIVATIVES_DIRNAME, get_derivative, snap_width
 from app.storage_paths import get_upload_dir
 
 router = APIRouter()
@@ -70,13 +73,26 @@ async def upload_file(file: UploadFile = File(...)):
 
 
 @router.get('/files/{filename}')
-async def get_file(filename: str):
-    """Serve an uploaded file"""
+async def get_file(
+    request: Request,
+    filename: str,
+    w: int | None = Query(None, gt=0, description='Resize images to (at least) this width in pixels'),
+    fmt: Literal['webp', 'jpeg', 'png'] | None = Query(
+        None, alias='format', description='Re-encode images to this format'
+    ),
+):
+    """Serve an uploaded file, optionally as a resized/re-encoded image variant"""
     file_path = UPLOAD_DIR / filename
     if not file_path.exists():
         raise HTTPException(status_code=404, detail='File not found')
 
-    return FileResponse(file_path)
+    if w is None and fmt is None:
+        return await file_response(request, file_path)
+
+    served_path = await get_derivative(file_path, snap_width(w) if w else None, fmt)
+    if served_path == file_path:
+        return await file_response(request, file_path)
+    return await file_response(request, served_path, DERIVATIVE_FORMATS[fmt][1] if fmt else None)
 
 
 @router.get('/download-all')
@@ -95,6 +111,9 @@ async def download_all_files():
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
         for file_path in files:
+            # Generated image variants are a cache, not user data
+            if DERIVATIVES_DIRNAME in file_path.relative_to(UPLOAD_DIR).parts:
+                continue
             if file_path.is_file():
                 # Add file to zip preserving relative folder structure
                 relative_path = file_path.relative_to(UPLOAD_DIR)
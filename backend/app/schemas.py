@@ -114,7 +114,8 @@ class ReminderEntryInfo(BaseModel):
     daily_note_id: int
     daily_note_date: str | None = None
     title: str
-    content: str
+    content: str | None = None  # None when listed with view=card
+    excerpt: str = ''
     content_type: str
 
     class Config:
@@ -138,9 +139,18 @@ class NoteEntryCreate(NoteEntryBase):
     pass
 
 
+class ContentPatch(BaseModel):
+    """Edits to an entry's content, sent instead of the content (see app.content_patch)."""
+
+    base_hash: str  # SHA-256 (hex) of the UTF-8 content the ops were computed against
+    ops: list[int | str]  # Keep n (n > 0), delete n (-n), insert text; in UTF-16 code units
+    result_hash: str  # SHA-256 of the content after the ops
+
+
 class NoteEntryUpdate(BaseModel):
     title: str | None = None
     content: str | None = None
+    content_patch: ContentPatch | None = None  # Instead of content, for large entries
     content_type: str | None = None
     order_index: int | None = None
     include_in_report: bool | None = None
@@ -150,6 +160,8 @@ class NoteEntryUpdate(BaseModel):
 
 
 class NoteEntry(NoteEntryBase):
+    content: str | None = None  # None when listed with view=card (see excerpt)
+    excerpt: str = ''  # Plain-text start of content
     id: int
     daily_note_id: int
     daily_note_date: str | None = None  # YYYY-MM-DD format for navigation
@@ -161,6 +173,7 @@ class NoteEntry(NoteEntryBase):
     is_important: bool = False
     is_completed: bool = False
     is_pinned: bool = False
+    version: int = 1  # Send back as If-Match: "<version>" when saving
     reminder: 'ReminderResponse | None' = None
 
     class Config:
@@ -239,8 +252,30 @@ class MergeEntriesRequest(BaseModel):
     delete_originals: bool = True
 
 
+# Entry Revision Schemas (see app.revisions)
+class EntryRevision(BaseModel):
+    id: int
+    entry_id: int
+    note_date: str  # YYYY-MM-DD of the day the entry was on
+    reason: str  # What replaced this state: edit, restore, merge or delete
+    title: str = ''
+    content_type: str = 'rich_text'
+    version: int
+    size: int  # Length of the content
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class EntryRevisionDetail(EntryRevision):
+    content: str
+
+
 # Search Schemas
 class SearchResult(NoteEntryBase):
+    content: str | None = None  # None with view=card (see excerpt)
+    excerpt: str = ''
     id: int
     daily_note_id: int
     date: str  # Date of the daily note
@@ -316,6 +351,18 @@ class GoalResponse(GoalBase):
         from_attributes = True
 
 
+# Day Context Schema (everything DailyView needs for one date, in one response)
+class DayContext(BaseModel):
+    date: str
+    note: DailyNote | None = None  # With entries (labels, lists, reminder); None if the day has no note
+    sprint_goal: GoalResponse | None = None  # Active on the date, else the next upcoming one
+    quarterly_goal: GoalResponse | None = None
+    settings: AppSettingsResponse | None = None
+    labels: list[Label] = []
+    lists: list[ListResponse] = []  # Regular (non-archived) lists
+    kanban_columns: list[ListResponse] = []
+
+
 # Custom Emoji Schemas
 class CustomEmojiBase(BaseModel):
     name: str  # Shortcode like :custom_smile:
@@ -346,3 +393,20 @@ class CustomEmojiResponse(CustomEmojiBase):
         from_attributes = True
 
 
+class CustomEmojiSpriteEntry(BaseModel):
+    id: int
+    name: str
+    image_url: str
+    category: str = 'Custom'
+    keywords: str = ''
+    x: int  # Pixel offset of the emoji within the sprite sheet
+    y: int
+
+
+class CustomEmojiSpriteSheet(BaseModel):
+    version: str  # Changes whenever the emoji set changes
+    size: int  # Width/height of each emoji cell
+    columns: int
+    image_url: str  # PNG sheet
+    webp_url: str  # WebP sheet
+    emojis: list[CustomEmojiSpriteEntry]
@@ -0,0 +1,130 @@
+"""
+Opt-in slow-query log.
+
+When a threshold is set (SLOW_QUERY_MS environment variable, or at runtime via
+the admin endpoint), every SQL statement slower than it is captured with its
+bound-parameter shape (types only, never values), the route that issued it and
+the database's query plan. The most recent entries are kept in a ring buffer
+readable at /api/admin/slow-queries.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import current_stats
+
+SLOW_QUERY_BUFFER_SIZE = 100
+
+_threshold_ms: float | None = float(os.environ['SLOW_QUERY_MS']) if os.getenv('SLOW_QUERY_MS') else None
+_entries: deque[dict] = deque(maxlen=SLOW_QUERY_BUFFER_SIZE)
+_lock = threading.Lock()
+# Statements that have a query plan (not BEGIN, COMMIT, DDL, ...)
+_EXPLAINABLE = re.compile(r'\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+
+def get_threshold_ms() -> float | None:
+    return _threshold_ms
+
+
+def set_threshold_ms(threshold_ms: float | None) -> None:
+    """Enable capture for statements slower than threshold_ms (None disables it)."""
+    global _threshold_ms
+    _threshold_ms = threshold_ms
+
+
+def recent() -> list[dict]:
+    """Captured slow queries, newest first."""
+    with _lock:
+        return list(reversed(_entries))
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def parameter_shape(parameters, executemany: bool = False) -> object:
+    """Describe bound parameters by type only, so no user content ends up in the log."""
+    if executemany:
+        rows = list(parameters)
+        return {'rows': len(rows), 'row': parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def explain(conn, statement: str, parameters, executemany: bool) -> list[str] | None:
+    """Query plan for a statement, run on the raw DBAPI connection so it isn't itself captured."""
+    if not _EXPLAINABLE.match(statement):
+        return None
+    postgres = conn.dialect.name == 'postgresql'
+    if conn.dialect.name == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif postgres:
+        prefix = 'EXPLAIN '
+    else:
+        return None
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        # A failed statement aborts a PostgreSQL transaction: keep a failed EXPLAIN from taking the caller's with it
+        if postgres:
+            cursor.execute('SAVEPOINT slow_query_explain')
+        try:
+            cursor.execute(prefix + statement, parameters)
+            plan = [' | '.join(str(column) for column in row) for row in cursor.fetchall()]
+        except Exception as e:
+            if postgres:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            plan = [f'EXPLAIN failed: {e}']
+        if postgres:
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        return plan
+    finally:
+        cursor.close()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _threshold_ms is not None:
+        conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('slow_query_start')
+    if not starts:
+        return
+    duration_ms = (time.perf_counter() - starts.pop()) * 1000
+    threshold_ms = _threshold_ms
+    if threshold_ms is None or duration_ms < threshold_ms:
+        return
+
+    stats = current_stats()
+    entry = {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'duration_ms': round(duration_ms, 2),
+        'statement': re.sub(r'\s+', ' ', statement).strip(),
+        'parameters': parameter_shape(parameters, executemany),
+        'route': stats.route if stats else None,
+        'plan': explain(conn, statement, parameters, executemany),
+    }
+    with _lock:
+        _entries.append(entry)
+
+
+def install_slow_query_hooks() -> None:
+    """Register the engine listeners (safe to call more than once; cheap while disabled)."""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
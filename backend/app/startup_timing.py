@@ -0,0 +1,95 @@
+"""
+Startup phase timings and readiness state.
+
+The desktop launcher, the migration runner and app.main record how long each
+startup phase took (database init, each migration, router import, first query).
+The timings are exposed on /health/ready so the desktop shell can wait for real
+readiness and cold-start regressions can be tracked.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Reference point for phase offsets: the first time this module is imported
+# (the desktop launcher imports it before doing any work)
+PROCESS_START = time.perf_counter()
+
+_phases: list[dict] = []
+_ready_at: float | None = None
+_error: str | None = None
+
+
+def record_phase(name: str, duration_ms: float, status: str = 'ok', started_at: float | None = None) -> None:
+    """Record a completed phase (started_at is a perf_counter value; defaults to now - duration)."""
+    if started_at is None:
+        started_at = time.perf_counter() - duration_ms / 1000
+    _phases.append(
+        {
+            'name': name,
+            'status': status,
+            'duration_ms': round(duration_ms, 1),
+            'offset_ms': round((started_at - PROCESS_START) * 1000, 1),
+        }
+    )
+    logger.info('Startup phase %s: %.1f ms (%s)', name, duration_ms, status)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as a startup phase (recorded as 'error' if it raises)."""
+    started = time.perf_counter()
+    status = 'ok'
+    try:
+        yield
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        record_phase(name, (time.perf_counter() - started) * 1000, status, started)
+
+
+def mark_ready() -> None:
+    global _ready_at
+    if _ready_at is None:
+        _ready_at = time.perf_counter()
+        logger.info('Backend ready after %.1f ms', (_ready_at - PROCESS_START) * 1000)
+
+
+def mark_failed(error: str) -> None:
+    global _error
+    _error = error
+
+
+def is_ready() -> bool:
+    return _ready_at is not None and _error is None
+
+
+def report() -> dict:
+    """Readiness status plus every recorded phase, in the order they ran."""
+    if _error is not None:
+        status = 'failed'
+    elif _ready_at is not None:
+        status = 'ready'
+    else:
+        status = 'starting'
+    return {
+        'status': status,
+        'error': _error,
+        'uptime_ms': round((time.perf_counter() - PROCESS_START) * 1000, 1),
+        'ready_ms': round((_ready_at - PROCESS_START) * 1000, 1) if _ready_at is not None else None,
+        'phases': list(_phases),
+    }
+
+
+def reset() -> None:
+    """Forget all recorded state (used by tests)."""
+    global _ready_at, _error
+    _phases.clear()
+    _ready_at = None
+    _error = None
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+API benchmark suite for the backend.
+
+Generates a deterministic synthetic workspace (see synthetic_data.py), then times
+the hot endpoints through TestClient: day view, search, month/notes listing,
+export/import, reports, lists, kanban and reminders. Each scenario records
+latency percentiles, SQL statements per request (from the Server-Timing header)
+and response size. Results are written as JSON; two result files can be
+compared to catch regressions.
+
+Usage:
+    python benchmarks/api_benchmark.py run --scale small                     # quick smoke run
+    python benchmarks/api_benchmark.py run --scale large -o baseline.json    # ~110k entries
+    python benchmarks/api_benchmark.py run --only search --only day_view
+    python benchmarks/api_benchmark.py compare baseline.json current.json    # exit 1 on regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+RESULTS_VERSION = 1
+
+# A scenario only counts as regressed if it got both relatively and absolutely slower
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_MIN_DELTA_MS = 2.0
+
+_SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries')
+
+
+@dataclass
+class Scenario:
+    """One timed request; body is sent as a multipart upload named 'file' when set."""
+
+    name: str
+    method: str
+    path: str
+    params: dict = field(default_factory=dict)
+    body: bytes | None = None
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile (samples need not be sorted)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    return {
+        'min_ms': round(min(samples_ms), 3),
+        'median_ms': round(statistics.median(samples_ms), 3),
+        'p95_ms': round(percentile(samples_ms, 0.95), 3),
+        'mean_ms': round(statistics.fmean(samples_ms), 3),
+        'max_ms': round(max(samples_ms), 3),
+    }
+
+
+def build_scenarios(first_day: str, last_day: str, export_body: bytes | None) -> list[Scenario]:
+    """The endpoints the UI hits most, against dates that exist in the generated data."""
+    last = datetime.strptime(last_day, '%Y-%m-%d')
+    middle = (datetime.strptime(first_day, '%Y-%m-%d') + (last - datetime.strptime(first_day, '%Y-%m-%d')) / 2).date()
+    scenarios = [
+        Scenario('day_view', 'GET', f'/api/notes/{last_day}'),
+        Scenario('day_entries', 'GET', f'/api/entries/note/{middle.isoformat()}'),
+        Scenario('month_view', 'GET', f'/api/notes/month/{last.year}/{last.month}'),
+        Scenario('notes_page', 'GET', '/api/notes/', {'skip': 0, 'limit': 100}),
+        Scenario('search_text', 'GET', '/api/search/', {'q': 'latency'}),
+        Scenario('search_rare_text', 'GET', '/api/search/', {'q': 'onboarding interview'}),
+        Scenario('search_label', 'GET', '/api/search/', {'label_ids': '1'}),
+        Scenario('search_starred', 'GET', '/api/search/', {'is_important': 'true'}),
+        Scenario('search_all', 'GET', '/api/search/all', {'q': 'latency'}),
+        Scenario('labels', 'GET', '/api/labels/'),
+        Scenario('lists', 'GET', '/api/lists'),
+        Scenario('list_detail', 'GET', '/api/lists/1'),
+        Scenario('kanban', 'GET', '/api/lists/kanban'),
+        Scenario('reminders', 'GET', '/api/reminders', {'include_dismissed': 'true'}),
+        Scenario('reminders_due', 'GET', '/api/reminders/due'),
+        Scenario(
+            'report_week', 'GET', '/api/reports/generate', {'date': (last - timedelta(days=7)).strftime('%Y-%m-%d')}
+        ),
+        Scenario('report_weeks', 'GET', '/api/reports/weeks'),
+        Scenario('report_all_entries', 'GET', '/api/reports/all-entries'),
+        Scenario('export_json', 'GET', '/api/backup/export'),
+        Scenario('export_markdown', 'GET', '/api/backup/export-markdown'),
+    ]
+    if export_body is not None:
+        # Re-importing the workspace's own export: every note already exists, so this
+        # times the merge path end to end without changing the data between repeats
+        scenarios.append(Scenario('import_merge', 'POST', '/api/backup/import', {'replace': 'false'}, export_body))
+    return scenarios
+
+
+def _request(client, scenario: Scenario):
+    files = {'file': ('backup.json', scenario.body, 'application/json')} if scenario.body is not None else None
+    return client.request(scenario.method, scenario.path, params=scenario.params, files=files)
+
+
+def time_scenario(client, scenario: Scenario, repeat: int, warmup: int) -> dict:
+    """Run a scenario warmup + repeat times; the warmup runs absorb one-off work (e.g. cold caches)."""
+    for _ in range(warmup):
+        _request(client, scenario).raise_for_status()
+
+    samples_ms = []
+    queries = []
+    response_bytes = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = _request(client, scenario)
+        samples_ms.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+        match = _SERVER_TIMING_QUERIES.search(response.headers.get('server-timing', ''))
+        if match:
+            queries.append(int(match.group(1)))
+        response_bytes = len(response.content)
+
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'params': scenario.params,
+        'repeat': repeat,
+        **summarize(samples_ms),
+        'sql_statements': max(queries) if queries else None,
+        'response_bytes': response_bytes,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = Path(args.db) if args.db else Path(scratch) / 'benchmark.db'
+        reuse = db_path.exists()
+
+        # Must be set before the app modules are imported: the engine is created at import time
+        os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+        os.environ['TESTING'] = 'true'
+        os.environ.setdefault('STATIC_FILES_DIR', str(Path(scratch) / 'static'))
+        os.environ.setdefault('UPLOADS_DIR', str(Path(scratch) / 'uploads'))
+        sys.path.insert(0, str(BACKEND_DIR))
+        sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+        import synthetic_data
+        from fastapi.testclient import TestClient
+
+        from app import database
+        from app.db_init import ensure_schema
+        from app.main import app
+
+        scale = synthetic_data.SCALES[args.scale]
+        ensure_schema()
+        generate_seconds = None
+        if reuse:
+            print(f'Reusing existing database {db_path} (scale/seed arguments only label the results)')
+        else:
+            print(f'Generating {args.scale} dataset (seed {args.seed})...')
+            started = time.perf_counter()
+            synthetic_data.generate(database.engine, scale, seed=args.seed)
+            generate_seconds = round(time.perf_counter() - started, 2)
+            print(f'  generated in {generate_seconds:.1f}s')
+
+        with database.engine.connect() as conn:
+            counts = {
+                table: conn.exec_driver_sql(f'SELECT COUNT(*) FROM {table}').scalar_one()
+                for table in ('daily_notes', 'note_entries', 'labels', 'lists', 'entry_labels', 'reminders')
+            }
+            first_day, last_day = conn.exec_driver_sql('SELECT MIN(date), MAX(date) FROM daily_notes').one()
+        print('  ' + ', '.join(f'{count} {table}' for table, count in counts.items()))
+
+        results = {}
+        with TestClient(app) as client:
+            export_body = None
+            if not args.only or 'import_merge' in args.only:
+                export_body = client.get('/api/backup/export').content
+            for scenario in build_scenarios(first_day, last_day, export_body):
+                if args.only and scenario.name not in args.only:
+                    continue
+                result = time_scenario(client, scenario, args.repeat, args.warmup)
+                results[scenario.name] = result
+                print(
+                    f'  {scenario.name:<20} median {result["median_ms"]:9.1f} ms  p95 {result["p95_ms"]:9.1f} ms  '
+                    f'{result["sql_statements"] or 0:5d} queries  {result["response_bytes"] / 1024:9.1f} KiB'
+                )
+
+        database.engine.dispose()
+
+    output = {
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': args.scale,
+        'scale_params': asdict(scale),
+        'seed': args.seed,
+        'dataset': counts,
+        'generate_seconds': generate_seconds,
+        'results': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(output, indent=2) + '\n')
+        print(f'\nResults written to {args.output}')
+    return 0
+
+
+def compare_results(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[dict]:
+    """
+    Scenario-by-scenario comparison of two result files.
+
+    A scenario regresses when its median is more than threshold (a fraction) and
+    min_delta_ms slower, or when it issues more SQL statements than before (query
+    counts are deterministic for a given dataset, so any increase is real).
+    """
+    rows = []
+    for name, before in baseline['results'].items():
+        after = current['results'].get(name)
+        if after is None:
+            continue
+        delta_ms = after['median_ms'] - before['median_ms']
+        ratio = after['median_ms'] / before['median_ms'] if before['median_ms'] else float('inf')
+        slower = ratio > 1 + threshold and delta_ms > min_delta_ms
+        faster = ratio < 1 - threshold and -delta_ms > min_delta_ms
+        more_queries = (
+            before.get('sql_statements') is not None
+            and after.get('sql_statements') is not None
+            and after['sql_statements'] > before['sql_statements']
+        )
+        if slower or more_queries:
+            status = 'regressed'
+        elif faster:
+            status = 'improved'
+        else:
+            status = 'unchanged'
+        rows.append(
+            {
+                'name': name,
+                'baseline_ms': before['median_ms'],
+                'current_ms': after['median_ms'],
+                'ratio': round(ratio, 3),
+                'baseline_queries': before.get('sql_statements'),
+                'current_queries': after.get('sql_statements'),
+                'status': status,
+            }
+        )
+    return rows
+
+
+def compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+
+    for key in ('scale', 'seed'):
+        if baseline.get(key) != current.get(key):
+            print(f'⚠ {key} differs: {baseline.get(key)!r} vs {current.get(key)!r} - timings are not comparable')
+
+    rows = compare_results(baseline, current, args.threshold, args.min_delta_ms)
+    print(f'{"scenario":<20} {"baseline":>11} {"current":>11} {"ratio":>7} {"queries":>13}')
+    for row in rows:
+        queries = f'{row["baseline_queries"]} → {row["current_queries"]}'
+        marker = {'regressed': '✗', 'improved': '✓', 'unchanged': ' '}[row['status']]
+        print(
+            f'{row["name"]:<20} {row["baseline_ms"]:9.1f}ms {row["current_ms"]:9.1f}ms '
+            f'{row["ratio"]:6.2f}x {queries:>13} {marker}'
+        )
+
+    missing = sorted(set(baseline['results']) - set(current['results']))
+    if missing:
+        print(f'\nNot in current run: {", ".join(missing)}')
+
+    regressed = [row['name'] for row in rows if row['status'] == 'regressed']
+    if regressed:
+        print(f'\n✗ {len(regressed)} regression(s): {", ".join(regressed)}')
+        return 1
+    print('\n✓ No regressions')
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='generate data and time the endpoints')
+    run_parser.add_argument('--scale', choices=('small', 'medium', 'large'), default='small')
+    run_parser.add_argument('--seed', type=int, default=0, help='synthetic data seed (default: 0)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='timed requests per scenario (default: 5)')
+    run_parser.add_argument('--warmup', type=int, default=1, help='untimed requests per scenario (default: 1)')
+    run_parser.add_argument('--only', action='append', help='run only this scenario (repeatable)')
+    run_parser.add_argument('--db', help='database file to create, or reuse if it exists (large scale takes a while)')
+    run_parser.add_argument('-o', '--output', help='write JSON results to this file')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f'relative slowdown counted as a regression (default: {DEFAULT_THRESHOLD})',
+    )
+    compare_parser.add_argument(
+        '--min-delta-ms',
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        help=f'ignore slowdowns smaller than this (default: {DEFAULT_MIN_DELTA_MS})',
+    )
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Load test for the backend: many browser tabs / desktop and mobile clients at once.
+
+Starts uvicorn against a synthetic database (see synthetic_data.py), or targets an
+already running server with --url, then runs one async client per simulated tab.
+Each tab loops over weighted user journeys:
+
+- open_day:       load a recent day and its due reminders
+- edit_entry:     open a day, then autosave an entry a few times
+- search:         run a text search
+- kanban_drag:    load the board and move an entry to another column
+- poll_reminders: the background reminder poll every tab runs
+
+Reports throughput, p50/p99 latency per step and errors, including SQLite
+"database is locked" failures, so worker counts and concurrency changes can be
+sized and validated.
+
+Usage:
+    python benchmarks/load_test.py                                  # 20 tabs for 20s, 1 worker
+    python benchmarks/load_test.py --users 50 --duration 60 --workers 4
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --users 10
+    python benchmarks/load_test.py -o load.json --fail-on-lock-errors
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Relative frequency of each journey per tab
+JOURNEY_WEIGHTS = {
+    'open_day': 35,
+    'edit_entry': 25,
+    'search': 15,
+    'kanban_drag': 10,
+    'poll_reminders': 15,
+}
+
+# Journeys that never write (after a day's first view), for read scaling runs
+READ_JOURNEY_WEIGHTS = {
+    'open_day': 50,
+    'search': 25,
+    'poll_reminders': 25,
+}
+
+# Days the simulated tabs work on; a small window makes tabs contend for the same rows
+RECENT_DAYS = 7
+
+AUTOSAVES_PER_EDIT = 3
+
+SEARCH_TERMS = ('latency', 'deploy', 'migration incident', 'review', 'kanban', 'customer', 'cache index')
+
+LOCK_ERROR_MARKER = 'database is locked'
+
+# Final line of the traceback for a lock failure in the server log (the chained
+# sqlite3.OperationalError line above it is not counted again)
+_LOCK_LOG_LINE = re.compile(r'^sqlalchemy\.exc\.OperationalError:.*database is locked', re.MULTILINE)
+
+
+@dataclass
+class Recorder:
+    """Latencies and failures for every request, grouped by journey step."""
+
+    latencies_ms: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    lock_errors: int = 0
+    journeys: Counter = field(default_factory=Counter)
+
+    def record(self, step: str, elapsed_ms: float, status: int | str, body: str = '') -> None:
+        self.latencies_ms[step].append(elapsed_ms)
+        if isinstance(status, int) and status < 400:
+            return
+        self.errors[step][str(status)] += 1
+        if LOCK_ERROR_MARKER in body:
+            self.lock_errors += 1
+
+    def summary(self, elapsed_seconds: float) -> dict:
+        all_samples = [sample for samples in self.latencies_ms.values() for sample in samples]
+        total_errors = sum(sum(counter.values()) for counter in self.errors.values())
+        return {
+            'requests': len(all_samples),
+            'errors': total_errors,
+            'lock_errors': self.lock_errors,
+            'duration_seconds': round(elapsed_seconds, 2),
+            'throughput_rps': round(len(all_samples) / elapsed_seconds, 1) if elapsed_seconds else 0.0,
+            'journeys': dict(self.journeys),
+            **latency_summary(all_samples),
+            'steps': {
+                step: {
+                    'requests': len(samples),
+                    'errors': dict(self.errors.get(step, {})),
+                    **latency_summary(samples),
+                }
+                for step, samples in sorted(self.latencies_ms.items())
+            },
+        }
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile (samples need not be sorted)."""
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def latency_summary(samples_ms: list[float]) -> dict:
+    if not samples_ms:
+        return {'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+    return {
+        'p50_ms': round(statistics.median(samples_ms), 2),
+        'p99_ms': round(percentile(samples_ms, 0.99), 2),
+        'max_ms': round(max(samples_ms), 2),
+    }
+
+
+def count_lock_errors(server_log: str) -> int:
+    """Lock failures the server logged (each failed request ends its traceback with one such line)."""
+    return len(_LOCK_LOG_LINE.findall(server_log))
+
+
+# --- Journeys -----------------------------------------------------------------
+
+
+class Tab:
+    """One simulated browser tab (or desktop/mobile client) running journeys."""
+
+    def __init__(
+        self,
+        client,
+        recorder: Recorder,
+        rng: random.Random,
+        dates: list[str],
+        think_ms: float,
+        weights: dict[str, int] = JOURNEY_WEIGHTS,
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.dates = dates
+        self.think_ms = think_ms
+        self.weights = weights
+
+    async def request(self, step: str, method: str, url: str, **kwargs):
+        import httpx
+
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.recorder.record(step, (time.perf_counter() - started) * 1000, type(exc).__name__)
+            return None
+        self.recorder.record(
+            step,
+            (time.perf_counter() - started) * 1000,
+            response.status_code,
+            response.text if response.status_code >= 400 else '',
+        )
+        return response if response.status_code < 400 else None
+
+    async def open_day(self) -> list[dict]:
+        date = self.rng.choice(self.dates)
+        response = await self.request('open_day', 'GET', f'/api/notes/{date}')
+        await self.request('poll_reminders', 'GET', '/api/reminders/due')
+        return response.json().get('entries', []) if response is not None else []
+
+    async def edit_entry(self) -> None:
+        entries = await self.open_day()
+        if not entries:
+            return
+        entry = self.rng.choice(entries)
+        content = entry['content']
+        for revision in range(AUTOSAVES_PER_EDIT):
+            content = f'{content}<p>Edit {revision} from tab {id(self)}</p>'
+            await self.request('edit_entry', 'PATCH', f'/api/entries/{entry["id"]}', json={'content': content})
+            await self.think(0.3)
+
+    async def search(self) -> None:
+        await self.request('search', 'GET', '/api/search/', params={'q': self.rng.choice(SEARCH_TERMS)})
+
+    async def kanban_drag(self) -> None:
+        board = await self.request('kanban_board', 'GET', '/api/lists/kanban')
+        if board is None or not board.json():
+            return
+        entries = await self.open_day()
+        if not entries:
+            return
+        column = self.rng.choice(board.json())
+        entry = self.rng.choice(entries)
+        await self.request('kanban_drag', 'POST', f'/api/lists/{column["id"]}/entries/{entry["id"]}')
+
+    async def poll_reminders(self) -> None:
+        await self.request('poll_reminders', 'GET', '/api/reminders/due')
+
+    async def think(self, scale: float = 1.0) -> None:
+        if self.think_ms:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think_ms * scale / 1000)
+
+    async def run(self, deadline: float) -> None:
+        names = list(self.weights)
+        weights = list(self.weights.values())
+        while time.perf_counter() < deadline:
+            journey = self.rng.choices(names, weights)[0]
+            self.recorder.journeys[journey] += 1
+            await getattr(self, journey)()
+            await self.think()
+
+
+async def run_load(
+    base_url: str,
+    users: int,
+    duration: float,
+    think_ms: float,
+    seed: int,
+    weights: dict[str, int] = JOURNEY_WEIGHTS,
+) -> tuple[Recorder, float]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        response = await client.get('/api/notes/', params={'limit': RECENT_DAYS})
+        response.raise_for_status()
+        dates = [note['date'] for note in response.json()]
+        if not dates:
+            raise SystemExit('The server has no daily notes; point --url at a populated database')
+
+        recorder = Recorder()
+        tabs = [Tab(client, recorder, random.Random(seed + index), dates, think_ms, weights) for index in range(users)]
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(tab.run(deadline) for tab in tabs))
+        return recorder, time.perf_counter() - started
+
+
+# --- Server -------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(db_path: Path, scale_name: str, seed: int) -> dict[str, int]:
+    """Create and fill a database file in a child process (keeps app modules out of this one)."""
+    script = (
+        'import json, sys; sys.path.insert(0, "benchmarks"); import synthetic_data; '
+        'from app import database; from app.db_init import ensure_database; ensure_database(); '
+        f'print(json.dumps(synthetic_data.generate(database.engine, synthetic_data.SCALES[{scale_name!r}], {seed})))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'DATABASE_URL': f'sqlite:///{db_path}'},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def start_server(env: dict[str, str], port: int, workers: int, log_file, timeout: float = 60.0) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'app.main:app',
+            '--host',
+            '127.0.0.1',
+            '--port',
+            str(port),
+            '--workers',
+            str(workers),
+            '--no-access-log',
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    import urllib.request
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f'uvicorn exited with code {process.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/health/ready', timeout=1) as response:
+                if response.status == 200:
+                    return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise TimeoutError(f'server did not become ready within {timeout}s')
+
+
+def print_report(summary: dict) -> None:
+    print(
+        f'\n{summary["requests"]} requests in {summary["duration_seconds"]:.1f}s: '
+        f'{summary["throughput_rps"]:.1f} req/s, p50 {summary["p50_ms"]} ms, p99 {summary["p99_ms"]} ms'
+    )
+    print(f'{"step":<16} {"requests":>9} {"errors":>7} {"p50 ms":>9} {"p99 ms":>9} {"max ms":>9}')
+    for step, stats in summary['steps'].items():
+        print(
+            f'{step:<16} {stats["requests"]:>9} {sum(stats["errors"].values()):>7} '
+            f'{stats["p50_ms"]:>9} {stats["p99_ms"]:>9} {stats["max_ms"]:>9}'
+        )
+    if summary['errors']:
+        print(f'\n⚠ {summary["errors"]} failed request(s), {summary["lock_errors"]} "database is locked"')
+    else:
+        print('\n✓ No failed requests')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20, help='concurrent tabs/clients (default: 20)')
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds to run (default: 20)')
+    parser.add_argument('--think-ms', type=float, default=0.0, help='mean pause between journeys (default: 0)')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes (default: 1)')
+    parser.add_argument('--scale', choices=('small', 'medium', 'large'), default='small', help='dataset to seed')
+    parser.add_argument('--seed', type=int, default=0, help='data and journey seed (default: 0)')
+    parser.add_argument('--url', help='target a running server instead of starting one (its data is modified)')
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    parser.add_argument('--fail-on-lock-errors', action='store_true', help='exit 1 if any request hit a lock error')
+    args = parser.parse_args()
+
+    server_info: dict = {'url': args.url}
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.url:
+            recorder, elapsed = asyncio.run(run_load(args.url, args.users, args.duration, args.think_ms, args.seed))
+            summary = recorder.summary(elapsed)
+        else:
+            db_path = Path(scratch) / 'load.db'
+            print(f'Seeding {args.scale} dataset...')
+            server_info['dataset'] = seed_database(db_path, args.scale, args.seed)
+            env = {
+                **os.environ,
+                'DATABASE_URL': f'sqlite:///{db_path}',
+                'STATIC_FILES_DIR': str(Path(scratch) / 'static'),
+                'UPLOADS_DIR': str(Path(scratch) / 'uploads'),
+            }
+            env.pop('TESTING', None)
+            port = _free_port()
+            log_path = Path(scratch) / 'server.log'
+            with open(log_path, 'w') as log_file:
+                print(f'Starting uvicorn with {args.workers} worker(s) on port {port}...')
+                process = start_server(env, port, args.workers, log_file)
+                try:
+                    print(f'Running {args.users} tab(s) for {args.duration:.0f}s...')
+                    recorder, elapsed = asyncio.run(
+                        run_load(f'http://127.0.0.1:{port}', args.users, args.duration, args.think_ms, args.seed)
+                    )
+                finally:
+                    process.terminate()
+                    process.wait(timeout=15)
+            summary = recorder.summary(elapsed)
+            # 500s only say "Internal Server Error"; the cause is in the server's tracebacks
+            summary['lock_errors'] = max(summary['lock_errors'], count_lock_errors(log_path.read_text()))
+            server_info.update({'workers': args.workers, 'scale': args.scale})
+
+    print_report(summary)
+    if args.output:
+        output = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'users': args.users,
+            'think_ms': args.think_ms,
+            'seed': args.seed,
+            'server': server_info,
+            **summary,
+        }
+        Path(args.output).write_text(json.dumps(output, indent=2) + '\n')
+        print(f'Results written to {args.output}')
+
+    if args.fail_on_lock_errors and summary['lock_errors']:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
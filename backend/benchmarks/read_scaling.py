@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Read scaling benchmark for the multi-worker serving mode.
+
+Seeds one synthetic database, then for each worker count starts uvicorn with that
+many workers and drives it with read-only journeys (day view, search, reminder
+polls) from load_test.py. Reports throughput per worker count, the speedup over
+one worker and the scaling efficiency (speedup / workers); reads should scale
+close to linearly up to the number of cores, since WAL readers never wait for
+each other or for the single writer.
+
+Usage:
+    python benchmarks/read_scaling.py                               # 1, 2, 4, ... up to the CPU count
+    python benchmarks/read_scaling.py --workers 1 2 4 8 --users 64 --duration 20
+    python benchmarks/read_scaling.py --min-efficiency 0.7          # exit 1 if scaling falls below 70%
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import load_test  # noqa: E402
+
+
+def default_worker_counts(cpus: int) -> list[int]:
+    """Powers of two up to the CPU count, plus the CPU count itself."""
+    counts = []
+    workers = 1
+    while workers < cpus:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cpus)
+    return counts
+
+
+def scaling_rows(throughputs: dict[int, float]) -> list[dict]:
+    """Speedup and efficiency of each worker count relative to the smallest one measured."""
+    base_workers = min(throughputs)
+    base = throughputs[base_workers]
+    rows = []
+    for workers, rps in sorted(throughputs.items()):
+        speedup = rps / base if base else 0.0
+        rows.append(
+            {
+                'workers': workers,
+                'throughput_rps': rps,
+                'speedup': round(speedup, 2),
+                'efficiency': round(speedup / (workers / base_workers), 2),
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', help='worker counts to measure (default: 1, 2, 4, ... CPUs)')
+    parser.add_argument('--users', type=int, help='concurrent clients (default: 8 per worker at the largest count)')
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds per worker count (default: 15)')
+    parser.add_argument('--scale', choices=('small', 'medium', 'large'), default='medium', help='dataset to seed')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-efficiency', type=float, help='fail if any worker count scales below this (0-1)')
+    parser.add_argument('-o', '--output', help='write JSON results to this file')
+    args = parser.parse_args()
+
+    worker_counts = sorted(set(args.workers or default_worker_counts(cpus)))
+    users = args.users or 8 * max(worker_counts)
+    if max(worker_counts) > cpus:
+        print(f'⚠ {cpus} CPU(s) available: worker counts above that cannot scale')
+
+    throughputs: dict[int, float] = {}
+    runs = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        db_path = Path(scratch) / 'scaling.db'
+        print(f'Seeding {args.scale} dataset...')
+        load_test.seed_database(db_path, args.scale, args.seed)
+        env = {
+            **os.environ,
+            'DATABASE_URL': f'sqlite:///{db_path}',
+            'STATIC_FILES_DIR': str(Path(scratch) / 'static'),
+            'UPLOADS_DIR': str(Path(scratch) / 'uploads'),
+        }
+        env.pop('TESTING', None)
+
+        for workers in worker_counts:
+            port = load_test._free_port()
+            with open(Path(scratch) / f'server-{workers}.log', 'w') as log_file:
+                process = load_test.start_server(env, port, workers, log_file)
+                try:
+                    recorder, elapsed = asyncio.run(
+                        load_test.run_load(
+                            f'http://127.0.0.1:{port}',
+                            users,
+                            args.duration,
+                            0.0,
+                            args.seed,
+                            load_test.READ_JOURNEY_WEIGHTS,
+                        )
+                    )
+                finally:
+                    process.terminate()
+                    process.wait(timeout=15)
+            summary = recorder.summary(elapsed)
+            throughputs[workers] = summary['throughput_rps']
+            runs[workers] = summary
+            print(
+                f'  {workers:>3} worker(s): {summary["throughput_rps"]:8.1f} req/s  '
+                f'p50 {summary["p50_ms"]} ms  p99 {summary["p99_ms"]} ms  {summary["errors"]} error(s)'
+            )
+
+    rows = scaling_rows(throughputs)
+    print(f'\n{"workers":>7} {"req/s":>9} {"speedup":>8} {"efficiency":>11}')
+    for row in rows:
+        print(f'{row["workers"]:>7} {row["throughput_rps"]:>9.1f} {row["speedup"]:>7.2f}x {row["efficiency"]:>10.0%}')
+
+    if args.output:
+        output = {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'cpus': cpus,
+            'users': users,
+            'duration_seconds': args.duration,
+            'scale': args.scale,
+            'scaling': rows,
+            'runs': {str(workers): summary for workers, summary in runs.items()},
+        }
+        Path(args.output).write_text(json.dumps(output, indent=2) + '\n')
+        print(f'Results written to {args.output}')
+
+    if args.min_efficiency is not None:
+        below = [row['workers'] for row in rows if row['efficiency'] < args.min_efficiency]
+        if below:
+            print(f'\n✗ Scaling efficiency below {args.min_efficiency:.0%} at {", ".join(map(str, below))} worker(s)')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
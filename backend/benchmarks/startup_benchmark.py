@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the backend.
+
+Measures, in fresh interpreter processes:
+
+1. Import time of app.main (via `python -X importtime`), with the slowest
+   modules by cumulative time.
+2. Cold start to ready: launch desktop_launcher.py against a throwaway data
+   directory and time until GET /health/ready answers (what the Tauri shell waits
+   for), then print the backend's own per-phase timings.
+
+Usage:
+    python benchmarks/startup_benchmark.py                    # report
+    python benchmarks/startup_benchmark.py --runs 5 --top 25
+    python benchmarks/startup_benchmark.py --budget-ms 600    # exit 1 if import time exceeds budget
+    python benchmarks/startup_benchmark.py --skip-launch      # import time only
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that should not be loaded until a feature needing them is used
+DEFERRED_MODULES = ('httpx', 'bs4', 'lxml', 'PIL')
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Parse `-X importtime` output into (self_us, cumulative_us, module) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:') :].split('|')
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def measure_import(env: dict[str, str]) -> tuple[float, list[tuple[int, int, str]], list[str]]:
+    """Import app.main once; returns (total ms, importtime rows, deferred modules that got loaded)."""
+    check = f'import sys, app.main; print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))'
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', check],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return total_ms, rows, loaded
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_launch(env: dict[str, str], timeout: float = 60.0) -> tuple[float, dict]:
+    """Start desktop_launcher.py; returns (seconds until /health/ready succeeds, readiness report)."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        launch_env = {
+            **env,
+            'TAURI_DESKTOP_DATA_DIR': data_dir,
+            'TAURI_BACKEND_HOST': '127.0.0.1',
+            'TAURI_BACKEND_PORT': str(port),
+        }
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, 'desktop_launcher.py'],
+            cwd=BACKEND_DIR,
+            env=launch_env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f'desktop_launcher.py exited with code {process.returncode}')
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{port}/health/ready', timeout=1) as response:
+                        if response.status == 200:
+                            return time.perf_counter() - started, json.load(response)
+                except OSError:
+                    time.sleep(0.02)
+            raise TimeoutError(f'/health/ready did not succeed within {timeout}s')
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3, help='number of fresh-process runs (default: 3)')
+    parser.add_argument('--top', type=int, default=15, help='slowest modules to list (default: 15)')
+    parser.add_argument('--budget-ms', type=float, help='fail if median app.main import time exceeds this')
+    parser.add_argument('--skip-launch', action='store_true', help='only measure import time')
+    args = parser.parse_args()
+
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    env.pop('TESTING', None)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Point the import at a scratch database so importing app.main never touches real data
+        import_env = {**env, 'DATABASE_URL': f'sqlite:///{scratch}/benchmark.db'}
+        import_times = []
+        rows: list[tuple[int, int, str]] = []
+        loaded: list[str] = []
+        for _ in range(args.runs):
+            total_ms, rows, loaded = measure_import(import_env)
+            import_times.append(total_ms)
+
+    median_import = statistics.median(import_times)
+    print(
+        f'app.main import: median {median_import:.0f} ms over {args.runs} run(s) '
+        f'({", ".join(f"{t:.0f}" for t in import_times)})'
+    )
+    print('\nSlowest modules by cumulative time (last run):')
+    for _, cumulative_us, module in sorted(rows, key=lambda row: row[1], reverse=True)[: args.top]:
+        print(f'  {cumulative_us / 1000:8.1f} ms  {module.strip()}')
+
+    if loaded:
+        print(f'\n⚠ Deferred modules loaded at startup: {", ".join(loaded)}')
+    else:
+        print(f'\n✓ Deferred modules not loaded at startup ({", ".join(DEFERRED_MODULES)})')
+
+    if not args.skip_launch:
+        launches = [measure_launch(env) for _ in range(args.runs)]
+        launch_times = [elapsed for elapsed, _ in launches]
+        print(
+            f'\nCold start to ready: median {statistics.median(launch_times) * 1000:.0f} ms '
+            f'({", ".join(f"{t * 1000:.0f}" for t in launch_times)})'
+        )
+        print('\nStartup phases (last run, from /health/ready):')
+        for phase in launches[-1][1]['phases']:
+            print(
+                f"  {phase['duration_ms']:8.1f} ms  {phase['name']} (+{phase['offset_ms']:.0f} ms, {phase['status']})"
+            )
+
+    if args.budget_ms is not None and median_import > args.budget_ms:
+        print(f'\n✗ Import time {median_import:.0f} ms exceeds budget of {args.budget_ms:.0f} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
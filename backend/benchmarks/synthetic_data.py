@@ -0,0 +1,317 @@
+"""
+Deterministic synthetic workspace data for benchmarks.
+
+Builds a database that looks like years of real use: one DailyNote per day with
+entries of realistic HTML (paragraphs, bullet lists, code blocks, links, inline
+images), labels on notes and entries, regular and kanban lists, reminders and
+pinned entries carried forward day after day. The same seed and scale always
+produce byte-identical rows, so timings from two runs are comparable.
+
+Rows are written with Core bulk inserts (the ORM would dominate generation time
+at 100k+ entries).
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app import models
+from app.excerpts import make_excerpt
+
+# Fixed reference point so generated timestamps never depend on the current date
+EPOCH = date(2022, 1, 3)
+
+INSERT_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class Scale:
+    """How much data to generate."""
+
+    days: int
+    entries_per_day: int
+    labels: int = 40
+    lists: int = 15
+    kanban_columns: int = 4
+
+
+SCALES = {
+    # Quick smoke run, a few seconds end to end
+    'small': Scale(days=60, entries_per_day=8, labels=15, lists=6),
+    'medium': Scale(days=365, entries_per_day=25),
+    # Three years at ~100 entries a day: ~110k entries
+    'large': Scale(days=1095, entries_per_day=100),
+}
+
+WORDS = (
+    'deploy review sprint backlog migration incident rollout customer latency cache index query '
+    'meeting design spec roadmap release hotfix pipeline staging metrics dashboard alert budget '
+    'refactor cleanup onboarding interview retro planning estimate blocker dependency upgrade '
+    'database schema endpoint frontend backend kanban reminder follow-up notes draft proposal '
+    'the a to of and for with on in from about after before during while this that next'
+).split()
+
+LABEL_NAMES = (
+    'work personal urgent meeting bug feature idea research ops oncall reading health finance '
+    'travel family learning writing review infra design security hiring planning support docs '
+    'release perf data mobile web api cli testing ux backlog q1 q2 q3 q4 blocked waiting done'
+).split()
+
+LIST_NAMES = (
+    'Inbox',
+    'Projects',
+    'Reading List',
+    'Ideas',
+    'Follow Ups',
+    'Someday',
+    'Reference',
+    'Errands',
+    'Learning',
+    'Team',
+    'Customers',
+    'Incidents',
+    'Hiring',
+    'Writing',
+    'Travel',
+)
+
+KANBAN_COLUMNS = ('To Do', 'In Progress', 'Review', 'Done', 'Blocked', 'Archive')
+
+COLORS = ('#3b82f6', '#ef4444', '#10b981', '#f59e0b', '#8b5cf6', '#ec4899', '#14b8a6', '#6b7280')
+
+
+class _Html:
+    """Random but realistic entry bodies in the shape the rich text editor saves."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def sentence(self, low: int = 6, high: int = 18) -> str:
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self) -> str:
+        sentences = [self.sentence() for _ in range(self.rng.randint(1, 4))]
+        if self.rng.random() < 0.3:
+            word = self.rng.choice(WORDS)
+            sentences.append(f'<strong>{word}</strong> <em>{self.rng.choice(WORDS)}</em>')
+        return f'<p>{" ".join(sentences)}</p>'
+
+    def bullets(self) -> str:
+        items = ''.join(f'<li>{self.sentence(3, 8)}</li>' for _ in range(self.rng.randint(2, 6)))
+        tag = self.rng.choice(('ul', 'ol'))
+        return f'<{tag}>{items}</{tag}>'
+
+    def tasks(self) -> str:
+        items = ''.join(
+            f'<li data-type="taskItem" data-checked="{str(self.rng.random() < 0.5).lower()}">'
+            f'<p>{self.sentence(3, 8)}</p></li>'
+            for _ in range(self.rng.randint(2, 5))
+        )
+        return f'<ul data-type="taskList">{items}</ul>'
+
+    def code(self) -> str:
+        name = self.rng.choice(WORDS)
+        body = '\n'.join(
+            f'    {self.rng.choice(WORDS)} = {self.rng.randint(0, 999)}' for _ in range(self.rng.randint(2, 8))
+        )
+        return f'<pre><code class="language-python">def {name}():\n{body}\n    return True</code></pre>'
+
+    def link(self) -> str:
+        slug = '-'.join(self.rng.choices(WORDS, k=3))
+        return f'<p>See <a href="https://example.com/{slug}" target="_blank">{slug.replace("-", " ")}</a></p>'
+
+    def image(self) -> str:
+        return f'<p><img src="/api/uploads/files/{self.rng.getrandbits(64):016x}.png" alt="screenshot"></p>'
+
+    def body(self) -> str:
+        blocks = [self.paragraph()]
+        for _ in range(self.rng.randint(0, 4)):
+            kind = self.rng.random()
+            if kind < 0.45:
+                blocks.append(self.paragraph())
+            elif kind < 0.65:
+                blocks.append(self.bullets())
+            elif kind < 0.78:
+                blocks.append(self.tasks())
+            elif kind < 0.9:
+                blocks.append(self.code())
+            elif kind < 0.97:
+                blocks.append(self.link())
+            else:
+                blocks.append(self.image())
+        return ''.join(blocks)
+
+
+def _timestamp(day: date, rng: random.Random) -> datetime:
+    return datetime(day.year, day.month, day.day, 8) + timedelta(seconds=rng.randint(0, 10 * 3600))
+
+
+def _insert(engine: Engine, table, rows: list[dict]) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            conn.execute(insert(table), rows[start : start + INSERT_BATCH_SIZE])
+
+
+def generate(engine: Engine, scale: Scale, seed: int = 0) -> dict[str, int]:
+    """Fill an empty database with deterministic data; returns row counts per table."""
+    rng = random.Random(seed)
+    html = _Html(rng)
+    created = datetime.combine(EPOCH, datetime.min.time())
+
+    # Names past the end of LABEL_NAMES get a numeric suffix to stay unique
+    labels = [
+        {
+            'id': index + 1,
+            'name': LABEL_NAMES[index % len(LABEL_NAMES)]
+            + ('' if index < len(LABEL_NAMES) else f'-{index // len(LABEL_NAMES) + 1}'),
+            'color': rng.choice(COLORS),
+            'created_at': created,
+        }
+        for index in range(scale.labels)
+    ]
+
+    lists = [
+        {
+            'id': index + 1,
+            'name': LIST_NAMES[index % len(LIST_NAMES)] + ('' if index < len(LIST_NAMES) else f' {index}'),
+            'description': html.sentence(),
+            'color': rng.choice(COLORS),
+            'order_index': index,
+            'is_archived': rng.random() < 0.1,
+            'is_kanban': False,
+            'kanban_order': 0,
+            'created_at': created,
+            'updated_at': created,
+        }
+        for index in range(scale.lists)
+    ]
+    for column in range(scale.kanban_columns):
+        lists.append(
+            {
+                'id': len(lists) + 1,
+                'name': KANBAN_COLUMNS[column % len(KANBAN_COLUMNS)],
+                'description': '',
+                'color': rng.choice(COLORS),
+                'order_index': 0,
+                'is_archived': False,
+                'is_kanban': True,
+                'kanban_order': column,
+                'created_at': created,
+                'updated_at': created,
+            }
+        )
+
+    notes: list[dict] = []
+    entries: list[dict] = []
+    note_labels: list[dict] = []
+    entry_labels: list[dict] = []
+    entry_lists: list[dict] = []
+    reminders: list[dict] = []
+    # Pinned entries still being carried forward: (title, content, content_type, days left)
+    pinned: list[tuple[str, str, str, int]] = []
+
+    for offset in range(scale.days):
+        day = EPOCH + timedelta(days=offset)
+        note_id = offset + 1
+        note_created = _timestamp(day, rng)
+        notes.append(
+            {
+                'id': note_id,
+                'date': day.isoformat(),
+                'fire_rating': rng.randint(0, 5),
+                'daily_goal': html.sentence() if rng.random() < 0.6 else '',
+                'created_at': note_created,
+                'updated_at': note_created,
+            }
+        )
+        for label_id in rng.sample(range(1, len(labels) + 1), k=min(len(labels), rng.randint(0, 2))):
+            note_labels.append({'note_id': note_id, 'label_id': label_id})
+
+        # Copies of pinned entries, like the day view's carry-forward produces
+        day_entries = [(title, content, content_type, True) for title, content, content_type, _ in pinned]
+        pinned = [(title, content, kind, left - 1) for title, content, kind, left in pinned if left > 1]
+
+        # Busy and quiet days average out to entries_per_day
+        day_size = rng.randint(scale.entries_per_day // 2, scale.entries_per_day * 3 // 2)
+        for _ in range(max(0, day_size - len(day_entries))):
+            content_type = 'code' if rng.random() < 0.05 else 'rich_text'
+            content = html.code() if content_type == 'code' else html.body()
+            title = html.sentence(2, 6)[:-1] if rng.random() < 0.4 else ''
+            is_pinned = rng.random() < 0.002
+            if is_pinned:
+                pinned.append((title, content, content_type, rng.randint(5, 60)))
+            day_entries.append((title, content, content_type, is_pinned))
+
+        for order_index, (title, content, content_type, is_pinned) in enumerate(day_entries):
+            entry_id = len(entries) + 1
+            entry_created = _timestamp(day, rng)
+            entries.append(
+                {
+                    'id': entry_id,
+                    'daily_note_id': note_id,
+                    'title': title,
+                    'content': content,
+                    'excerpt': make_excerpt(content, content_type),  # Core inserts skip the ORM hook
+                    'content_type': content_type,
+                    'order_index': order_index,
+                    'include_in_report': rng.random() < 0.15,
+                    'is_important': rng.random() < 0.1,
+                    'is_completed': rng.random() < 0.3,
+                    'is_dev_null': rng.random() < 0.02,
+                    'is_pinned': is_pinned,
+                    'created_at': entry_created,
+                    'updated_at': entry_created,
+                }
+            )
+            for label_id in rng.sample(range(1, len(labels) + 1), k=min(len(labels), rng.choice((0, 0, 1, 1, 2, 3)))):
+                entry_labels.append({'entry_id': entry_id, 'label_id': label_id})
+            if rng.random() < 0.08:
+                entry_lists.append(
+                    {
+                        'entry_id': entry_id,
+                        'list_id': rng.randint(1, len(lists)),
+                        'order_index': entry_id,
+                        'created_at': entry_created,
+                    }
+                )
+            if rng.random() < 0.02:
+                due = entry_created + timedelta(days=rng.randint(0, 14), hours=rng.randint(0, 8))
+                reminders.append(
+                    {
+                        'entry_id': entry_id,
+                        'reminder_datetime': due.isoformat(),
+                        'is_dismissed': due.date() < EPOCH + timedelta(days=scale.days - 7),
+                        'created_at': entry_created,
+                        'updated_at': entry_created,
+                    }
+                )
+
+    # An entry only appears once per list (the association's effective key)
+    entry_lists = list({(row['entry_id'], row['list_id']): row for row in entry_lists}.values())
+
+    _insert(engine, models.Label.__table__, labels)
+    _insert(engine, models.List.__table__, lists)
+    _insert(engine, models.DailyNote.__table__, notes)
+    _insert(engine, models.NoteEntry.__table__, entries)
+    _insert(engine, models.note_labels, note_labels)
+    _insert(engine, models.entry_labels, entry_labels)
+    _insert(engine, models.entry_lists, entry_lists)
+    _insert(engine, models.Reminder.__table__, reminders)
+
+    return {
+        'labels': len(labels),
+        'lists': len(lists),
+        'daily_notes': len(notes),
+        'note_entries': len(entries),
+        'pinned_entries': sum(entry['is_pinned'] for entry in entries),
+        'note_labels': len(note_labels),
+        'entry_labels': len(entry_labels),
+        'entry_lists': len(entry_lists),
+        'reminders': len(reminders),
+    }
@@ -15,6 +15,7 @@ with PyInstaller. It is responsible for:
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import signal
 import sys
@@ -99,21 +100,26 @@ def _prepare_environment() -> tuple[str, str]:
 
 
 def main() -> None:
+    # Imported first so phase offsets are measured from launcher start
+    from app import startup_timing
+
     _configure_logging(os.getenv("TAURI_BACKEND_LOG"))
 
     host, port = _prepare_environment()
 
     # Import database-dependent modules only after DATABASE_URL is set
-    from app.db_init import ensure_database  # noqa: WPS433
-    from migrations import run_migrations  # noqa: WPS433
+    from app.db_init import ensure_database
+    from migrations import run_migrations
 
     logging.info("Starting Track the Thing desktop backend on %s:%s", host, port)
 
     logging.info("Ensuring SQLite database exists and has default settings")
-    ensure_database()
+    with startup_timing.phase("db_init"):
+        ensure_database()
 
     logging.info("Running migrations")
-    migration_rc = run_migrations.main()
+    with startup_timing.phase("migrations"):
+        migration_rc = run_migrations.main()
     if migration_rc != 0:
         logging.warning("One or more migrations reported issues (code=%s)", migration_rc)
     
@@ -148,5 +154,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Required for the image worker process pool in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
 
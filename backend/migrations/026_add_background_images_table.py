@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Migration 026: Move Background Image Metadata into the Database
+
+Background image metadata used to live in background-images/metadata.json, which was
+re-read and rewritten in full on every upload/delete (losing entries under concurrent
+uploads).
+
+Changes:
+- Create background_images table with an index on created_at
+- Import any entries from the legacy metadata.json
+- Rename metadata.json to metadata.json.migrated (kept as a backup)
+
+Backwards Compatibility:
+- Idempotent - safe to run multiple times (rows are inserted with INSERT OR IGNORE)
+- Works from any previous version
+- Image files are not moved or modified
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+def get_db_path():
+    """Get the database path, checking multiple possible locations."""
+    possible_paths = [
+        Path(__file__).parent.parent / "data" / "daily_notes.db",
+        Path(__file__).parent.parent / "daily_notes.db",
+        Path.cwd() / "data" / "daily_notes.db",
+        Path.cwd() / "daily_notes.db",
+    ]
+
+    for path in possible_paths:
+        if path.exists():
+            return str(path)
+
+    return str(possible_paths[0])
+
+
+def get_metadata_file():
+    """Locate the legacy metadata.json (mirrors app.storage_paths.get_static_dir)."""
+    static_dir = os.getenv('STATIC_FILES_DIR')
+    if static_dir:
+        base = Path(os.path.expandvars(os.path.expanduser(static_dir)))
+    else:
+        base = Path(__file__).resolve().parent.parent / "data" / "background-images"
+    return base / "background-images" / "metadata.json"
+
+
+def table_exists(cursor, table_name):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+    return cursor.fetchone() is not None
+
+
+def migrate_up(db_path, metadata_file=None):
+    """Apply the migration."""
+    print(f"Connecting to database: {db_path}")
+    metadata_file = Path(metadata_file) if metadata_file else get_metadata_file()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        if not table_exists(cursor, 'background_images'):
+            print("Creating background_images table...")
+            cursor.execute("""
+                CREATE TABLE background_images (
+                    id VARCHAR NOT NULL PRIMARY KEY,
+                    filename VARCHAR NOT NULL UNIQUE,
+                    original_filename VARCHAR DEFAULT '',
+                    content_type VARCHAR DEFAULT '',
+                    size INTEGER DEFAULT 0,
+                    created_at DATETIME
+                )
+            """)
+            print("✓ Created background_images table")
+        else:
+            print("✓ background_images table already exists")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_background_images_id ON background_images (id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_background_images_created_at ON background_images (created_at)")
+
+        if metadata_file.exists():
+            with open(metadata_file) as f:
+                legacy_images = json.load(f)
+
+            # Preserve the old list order through increasing created_at values
+            base_time = datetime.fromtimestamp(metadata_file.stat().st_mtime)
+            imported = 0
+            for position, image in enumerate(legacy_images):
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO background_images
+                        (id, filename, original_filename, content_type, size, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        image['id'],
+                        image['filename'],
+                        image.get('original_filename') or '',
+                        image.get('content_type') or '',
+                        image.get('size') or 0,
+                        base_time.replace(microsecond=0).isoformat(sep=' ') + f'.{position:06d}',
+                    ),
+                )
+                imported += cursor.rowcount
+            conn.commit()
+
+            metadata_file.rename(metadata_file.with_name('metadata.json.migrated'))
+            print(f"✓ Imported {imported} background image(s) from {metadata_file}")
+        else:
+            conn.commit()
+            print("✓ No legacy metadata.json to import")
+
+        print("✓ Migration 026 completed successfully")
+        return True
+
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+def migrate_down(db_path, metadata_file=None):
+    """Rollback the migration: write metadata.json back out and drop the table."""
+    print(f"Connecting to database: {db_path}")
+    metadata_file = Path(metadata_file) if metadata_file else get_metadata_file()
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        if not table_exists(cursor, 'background_images'):
+            print("✓ background_images table does not exist")
+            return True
+
+        cursor.execute(
+            "SELECT id, filename, original_filename, content_type, size FROM background_images ORDER BY created_at"
+        )
+        images = [
+            {
+                'id': row[0],
+                'filename': row[1],
+                'original_filename': row[2],
+                'url': f'/api/background-images/image/{row[1]}',
+                'content_type': row[3],
+                'size': row[4],
+            }
+            for row in cursor.fetchall()
+        ]
+        metadata_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(metadata_file, 'w') as f:
+            json.dump(images, f, indent=2)
+
+        cursor.execute("DROP TABLE background_images")
+        conn.commit()
+        print(f"✓ Restored {len(images)} image(s) to {metadata_file} and dropped background_images")
+        return True
+
+    except Exception as e:
+        print(f"✗ Rollback failed: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    db_path = get_db_path()
+    direction = sys.argv[1] if len(sys.argv) > 1 else "up"
+    success = migrate_down(db_path) if direction == "down" else migrate_up(db_path)
+    sys.exit(0 if success else 1)
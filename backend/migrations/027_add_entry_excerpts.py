@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Migration 027: Add Plain-Text Excerpts to Note Entries
+
+List-style endpoints (search, list boards, reminders, the calendar) can return a short
+excerpt of each entry instead of its full HTML content (view=card), so the content
+column no longer has to be read for them.
+
+Changes:
+- Add note_entries.excerpt (TEXT, default '')
+- Fill it for existing entries (the app keeps it up to date from then on)
+
+Backwards Compatibility:
+- Idempotent - safe to run multiple times (only entries without an excerpt are filled)
+- Works from any previous version, on SQLite and PostgreSQL
+- Entry content is not modified
+"""
+
+import re
+import sys
+from html import unescape
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+# Mirrors app.excerpts at the time of this migration
+EXCERPT_LENGTH = 280
+BATCH_SIZE = 500
+
+_SKIPPED_ELEMENTS = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAGS = re.compile(r'<[^>]+>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def make_excerpt(content, content_type):
+    if not content:
+        return ''
+    excerpt = content
+    if content_type != 'code':
+        excerpt = unescape(_TAGS.sub(' ', _SKIPPED_ELEMENTS.sub(' ', excerpt)))
+    excerpt = _WHITESPACE.sub(' ', excerpt).strip()
+    if len(excerpt) <= EXCERPT_LENGTH:
+        return excerpt
+    cut = excerpt[:EXCERPT_LENGTH]
+    if ' ' in cut[EXCERPT_LENGTH // 2 :]:
+        cut = cut[: cut.rindex(' ')]
+    return cut.rstrip() + '…'
+
+
+def upgrade(connection):
+    """Apply the migration."""
+    columns = {column['name'] for column in inspect(connection).get_columns('note_entries')}
+    if 'excerpt' not in columns:
+        connection.execute(text("ALTER TABLE note_entries ADD COLUMN excerpt TEXT DEFAULT ''"))
+        print("✓ Added excerpt column to note_entries")
+    else:
+        print("✓ excerpt column already exists")
+
+    filled = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, content, content_type FROM note_entries "
+                "WHERE id > :last_id AND (excerpt IS NULL OR excerpt = '') ORDER BY id LIMIT :limit"
+            ),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text("UPDATE note_entries SET excerpt = :excerpt WHERE id = :id"),
+            [{'id': row[0], 'excerpt': make_excerpt(row[1], row[2])} for row in rows],
+        )
+        filled += len(rows)
+        last_id = rows[-1][0]
+
+    print(f"✓ Filled excerpts for {filled} entries")
+    return True
+
+
+def downgrade(connection):
+    """Rollback the migration (DROP COLUMN needs SQLite 3.35+)."""
+    columns = {column['name'] for column in inspect(connection).get_columns('note_entries')}
+    if 'excerpt' in columns:
+        connection.execute(text("ALTER TABLE note_entries DROP COLUMN excerpt"))
+        print("✓ Dropped excerpt column from note_entries")
+    return True
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from app.database import engine, write_engine
+
+    direction = sys.argv[1] if len(sys.argv) > 1 else "up"
+    with write_engine(engine).begin() as conn:
+        success = downgrade(conn) if direction == "down" else upgrade(conn)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Migration 028: Move Inline Base64 Media out of Entry Content
+
+Images pasted or captured in the editor could be stored inside note_entries.content as
+data:image/...;base64 URIs, making rows (and every search, export and rollover
+comparison) many times larger than the text they hold.
+
+Changes:
+- Write each embedded image/audio/video to the upload store
+- Rewrite the entry's content to reference /api/uploads/files/<name> instead
+- New content goes through the same transformer when it is saved (app.inline_media; a
+  copy of it as of this migration is used here, so later changes don't alter the migration)
+
+Backwards Compatibility:
+- Idempotent - safe to run multiple times (files are named by a hash of their bytes,
+  and entries without inline media are left untouched)
+- Works from any previous version, on SQLite and PostgreSQL
+- Code entries are not modified (a data URI there is text, not an image)
+"""
+
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import text
+
+BATCH_SIZE = 100
+
+# Mirrors app.inline_media at the time of this migration
+UPLOAD_URL_PREFIX = "/api/uploads/files/"
+
+_DATA_URI = re.compile(
+    r'(?P<quote>["\'])data:(?P<mime>(?:image|audio|video)/[\w.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]*)(?P=quote)',
+    re.IGNORECASE,
+)
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/svg+xml": ".svg", "image/webp": ".webp"}
+
+
+def get_upload_dir():
+    """The upload store (mirrors app.storage_paths.get_upload_dir)."""
+    env_value = os.getenv("UPLOADS_DIR")
+    if env_value:
+        path = Path(os.path.expandvars(os.path.expanduser(env_value)))
+    else:
+        path = Path(__file__).resolve().parent.parent / "data" / "uploads"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def has_inline_media(content):
+    return bool(content) and "base64," in content and _DATA_URI.search(content) is not None
+
+
+def store_media(data, mime, upload_dir):
+    extension = _EXTENSIONS.get(mime) or mimetypes.guess_extension(mime) or ""
+    filename = f"inline-{hashlib.sha256(data).hexdigest()[:32]}{extension}"
+    target = upload_dir / filename
+    if not target.exists():
+        fd, tmp_path = tempfile.mkstemp(dir=upload_dir, prefix=".inline-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    return filename
+
+
+def extract_inline_media(content, upload_dir):
+    if not has_inline_media(content):
+        return content
+
+    def replace(match):
+        try:
+            data = base64.b64decode(re.sub(r"\s+", "", match["data"]), validate=True)
+        except (binascii.Error, ValueError):
+            return match[0]
+        if not data:
+            return match[0]
+        filename = store_media(data, match["mime"].lower(), upload_dir)
+        return f'{match["quote"]}{UPLOAD_URL_PREFIX}{filename}{match["quote"]}'
+
+    return _DATA_URI.sub(replace, content)
+
+
+def upgrade(connection, upload_dir=None):
+    """Apply the migration."""
+    upload_dir = Path(upload_dir) if upload_dir else get_upload_dir()
+
+    moved = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(
+                "SELECT id, content FROM note_entries "
+                "WHERE id > :last_id AND content LIKE '%;base64,%' AND COALESCE(content_type, '') <> 'code' "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {'last_id': last_id, 'limit': BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        updates = [
+            {'id': row[0], 'content': extract_inline_media(row[1], upload_dir)}
+            for row in rows
+            if has_inline_media(row[1])
+        ]
+        if updates:
+            connection.execute(text("UPDATE note_entries SET content = :content WHERE id = :id"), updates)
+        moved += len(updates)
+        last_id = rows[-1][0]
+
+    print(f"✓ Moved inline media out of {moved} entries")
+    return True
+
+
+def downgrade(connection):
+    """Nothing to undo: the rewritten entries reference files that stay in the upload store."""
+    print("✓ Nothing to roll back (extracted files are regular uploads)")
+    return True
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from app.database import engine, write_engine
+
+    direction = sys.argv[1] if len(sys.argv) > 1 else "up"
+    with write_engine(engine).begin() as conn:
+        success = downgrade(conn) if direction == "down" else upgrade(conn)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration 029: Add Versions to Note Entries
+
+The editor autosaves an entry's content while it is being typed. Two tabs or devices
+editing the same entry used to overwrite each other silently. Every entry now carries a
+version number that goes up whenever its title or content changes; saves sent with
+`If-Match: "<version>"` are rejected with 412 when the entry has changed since the client
+loaded it.
+
+Changes:
+- Add note_entries.version (INTEGER NOT NULL, default 1)
+
+Backwards Compatibility:
+- Idempotent - safe to run multiple times
+- Works from any previous version, on SQLite and PostgreSQL
+- Existing entries start at version 1; clients that don't send If-Match are unaffected
+"""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+
+
+def upgrade(connection):
+    """Apply the migration."""
+    columns = {column['name'] for column in inspect(connection).get_columns('note_entries')}
+    if 'version' not in columns:
+        connection.execute(text("ALTER TABLE note_entries ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+        print("✓ Added version column to note_entries")
+    else:
+        print("✓ version column already exists")
+    return True
+
+
+def downgrade(connection):
+    """Rollback the migration (DROP COLUMN needs SQLite 3.35+)."""
+    columns = {column['name'] for column in inspect(connection).get_columns('note_entries')}
+    if 'version' in columns:
+        connection.execute(text("ALTER TABLE note_entries DROP COLUMN version"))
+        print("✓ Dropped version column from note_entries")
+    return True
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from app.database import engine, write_engine
+
+    direction = sys.argv[1] if len(sys.argv) > 1 else "up"
+    with write_engine(engine).begin() as conn:
+        success = downgrade(conn) if direction == "down" else upgrade(conn)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Migration 030: Add Entry Revisions
+
+Entries kept no history: every autosave replaced the content, and deleting an entry (or
+merging it with delete_originals) lost it for good. Earlier states of entries are now kept
+in entry_revisions (see app.revisions), stored as compressed snapshots and deltas against
+them, and can be listed and restored through /api/entries/{entry_id}/revisions.
+
+Changes:
+- Create entry_revisions with an index on (entry_id, id)
+
+Backwards Compatibility:
+- Idempotent - safe to run multiple times
+- Works from any previous version, on SQLite and PostgreSQL
+- Existing entries are not touched; their history starts with their next change
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, MetaData, String, Table
+
+metadata = MetaData()
+
+# The table as of this migration (not imported from app.models, which keeps changing)
+entry_revisions = Table(
+    "entry_revisions",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("entry_id", Integer, nullable=False),
+    Column("note_date", String, nullable=False),
+    Column("reason", String, nullable=False),
+    Column("title", String, default=""),
+    Column("content_type", String, default="rich_text"),
+    Column("version", Integer, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("snapshot_id", Integer, nullable=True),
+    Column("data", LargeBinary, nullable=False),
+    Column("created_at", DateTime, default=datetime.utcnow),
+    Index("ix_entry_revisions_id", "id"),
+    Index("ix_entry_revisions_entry_id_id", "entry_id", "id"),
+)
+
+
+def upgrade(connection):
+    """Apply the migration."""
+    if connection.dialect.has_table(connection, "entry_revisions"):
+        print("✓ entry_revisions table already exists")
+        return True
+    entry_revisions.create(connection)
+    print("✓ Created entry_revisions table")
+    return True
+
+
+def downgrade(connection):
+    """Rollback the migration (the revisions are lost)."""
+    entry_revisions.drop(connection, checkfirst=True)
+    print("✓ Dropped entry_revisions table")
+    return True
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from app.database import engine, write_engine
+
+    direction = sys.argv[1] if len(sys.argv) > 1 else "up"
+    with write_engine(engine).begin() as conn:
+        success = downgrade(conn) if direction == "down" else upgrade(conn)
+    sys.exit(0 if success else 1)
@@ -2,15 +2,31 @@
 """
 Run all pending database migrations.
 
-This script executes all migration files in order.
+Applied migrations are recorded in the schema_migrations table together with a
+checksum of the migration file, so a normal startup is a single ledger lookup
+and only new migrations are executed. A migration edited after it was applied is
+not run again (its new checksum is recorded with a warning) unless the module
+opts in with RERUN_ON_CHANGE = True, because it has to be safe to re-apply.
+
+Migrations come in two styles:
+- upgrade(connection): runs on any database (SQLite or PostgreSQL) inside a
+  transaction on a SQLAlchemy connection.
+- migrate_up(db_path): the original sqlite3-only style. These only run on
+  SQLite; on other databases the schema is created from the current models,
+  so they are recorded as a baseline without running.
 """
 
+import hashlib
 import importlib.util
 import logging
 import os
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
 
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+
 # Configure logging for migrations
 logger = logging.getLogger(__name__)
 
@@ -64,26 +80,145 @@ def get_migration_files():
     return migration_files
 
 
+def migration_checksum(migration_file):
+    """SHA-256 of the migration source, used to detect edited migrations."""
+    return hashlib.sha256(migration_file.read_bytes()).hexdigest()
+
+
+# The ledger is kept out of the app models so the runner owns its schema
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("checksum", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_ms", Integer, default=0),
+)
+
+
+def ensure_ledger(conn):
+    """Create the schema_migrations ledger if it doesn't exist."""
+    schema_migrations.create(conn, checkfirst=True)
+
+
+def get_applied_migrations(conn):
+    """Return {version: checksum} for every migration recorded in the ledger."""
+    rows = conn.execute(select(schema_migrations.c.version, schema_migrations.c.checksum))
+    return dict(rows.all())
+
+
+def update_checksum(conn, migration_file, checksum):
+    """Record the new checksum of an edited migration without re-applying it."""
+    conn.execute(
+        schema_migrations.update()
+        .where(schema_migrations.c.version == migration_file.name[:3])
+        .values(name=migration_file.name, checksum=checksum)
+    )
+
+
+def record_migration(conn, migration_file, checksum, duration_ms):
+    """Mark a migration as applied (replacing the entry of an edited migration)."""
+    version = migration_file.name[:3]
+    conn.execute(schema_migrations.delete().where(schema_migrations.c.version == version))
+    conn.execute(
+        schema_migrations.insert().values(
+            version=version,
+            name=migration_file.name,
+            checksum=checksum,
+            applied_at=datetime.utcnow(),
+            duration_ms=duration_ms,
+        )
+    )
+
+
+def apply_migration(migration, engine, db_path):
+    """
+    Run one migration against the database; returns True on success.
+
+    New-style migrations get a SQLAlchemy connection in a transaction. Legacy sqlite3
+    migrations get the database file, and on other databases are skipped (True): their
+    changes are already part of the schema created from the models.
+    """
+    from app.database import write_engine
+
+    if hasattr(migration, "upgrade"):
+        with write_engine(engine).connect() as conn:
+            transaction = conn.begin()
+            if migration.upgrade(conn) is False:
+                transaction.rollback()
+                return False
+            transaction.commit()
+            return True
+    if engine.dialect.name != "sqlite":
+        logger.info(f"  sqlite-only migration, recorded as baseline on {engine.dialect.name}")
+        return True
+    return migration.migrate_up(db_path)
+
+
+def reruns_on_change(migration_file):
+    """Whether an edited migration asks to be applied again (module-level RERUN_ON_CHANGE = True)."""
+    return getattr(load_migration(migration_file), "RERUN_ON_CHANGE", False) is True
+
+
+def get_pending_migrations(migration_files, applied):
+    """
+    Split migrations by what to do with them; returns (pending, edited), lists of
+    (migration_file, checksum).
+
+    pending: not in the ledger yet, or edited since they were applied and opted in to
+    re-running. edited: changed since they were applied, without opting in; only their
+    checksum is updated, since nothing says they are safe to apply twice.
+    """
+    pending = []
+    edited = []
+    for migration_file in migration_files:
+        checksum = migration_checksum(migration_file)
+        recorded = applied.get(migration_file.name[:3])
+        if recorded == checksum:
+            continue
+        if recorded is None:
+            pending.append((migration_file, checksum))
+        elif reruns_on_change(migration_file):
+            logger.warning(f"Migration {migration_file.name} changed since it was applied; re-running it")
+            pending.append((migration_file, checksum))
+        else:
+            logger.warning(
+                f"Migration {migration_file.name} changed since it was applied; "
+                "recording its new checksum without re-running it (set RERUN_ON_CHANGE = True to re-run)"
+            )
+            edited.append((migration_file, checksum))
+    return pending, edited
+
+
 def main():
     """Run all migrations."""
     logger.info("=" * 60)
     logger.info("Running Database Migrations")
     logger.info("=" * 60)
 
-    # Get database path from environment
-    db_path = get_db_path_from_env()
-    if not db_path.is_absolute():
-        db_path = Path.cwd() / db_path
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    logger.info(f"Database: {db_path}")
-    
+    # Import here to avoid circular imports
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from app import database, startup_timing
+
+    engine = database.engine
+    db_path = None
+    if engine.dialect.name == "sqlite":
+        # Get database path from environment
+        db_path = get_db_path_from_env()
+        if not db_path.is_absolute():
+            db_path = Path.cwd() / db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Database: {db_path}")
+    else:
+        logger.info(f"Database: {engine.url.render_as_string(hide_password=True)}")
+
     # Create initial database schema if it doesn't exist
     logger.info("Ensuring database schema exists...")
     try:
-        # Import here to avoid circular imports
-        sys.path.insert(0, str(Path(__file__).parent.parent))
-        from app.database import Base, engine
-        Base.metadata.create_all(bind=engine)
+        from app.db_init import ensure_schema
+        with startup_timing.phase("schema"):
+            ensure_schema()
         logger.info("✓ Database schema initialized")
     except Exception as e:
         logger.error(f"✗ Error initializing schema: {e}")
@@ -94,32 +229,56 @@ def main():
         logger.info("No migration files found.")
         return 0
 
-    logger.info(f"Found {len(migration_files)} migration(s):")
-    for mf in migration_files:
+    # Short ledger transactions: legacy migrations open their own sqlite3 connection
+    with startup_timing.phase("migration_ledger"):
+        with database.write_engine(engine).begin() as conn:
+            ensure_ledger(conn)
+            pending, edited = get_pending_migrations(migration_files, get_applied_migrations(conn))
+            for migration_file, checksum in edited:
+                update_checksum(conn, migration_file, checksum)
+
+    if not pending:
+        logger.info(f"✓ Database is up to date ({len(migration_files)} migration(s) applied)")
+        return 0
+
+    logger.info(f"Found {len(pending)} pending migration(s):")
+    for mf, _ in pending:
         logger.info(f"  - {mf.name}")
 
     failed_migrations = []
 
-    for migration_file in migration_files:
+    for migration_file, checksum in pending:
         logger.info("-" * 60)
         logger.info(f"Running migration: {migration_file.name}")
         logger.info("-" * 60)
 
+        started = time.perf_counter()
+        success = False
         try:
             migration = load_migration(migration_file)
             # Use the common db_path instead of calling migration.get_db_path()
-            success = migration.migrate_up(db_path)
+            success = apply_migration(migration, engine, db_path)
 
             if not success:
                 failed_migrations.append(migration_file.name)
                 logger.error(f"✗ Migration {migration_file.name} failed!")
             else:
+                duration_ms = round((time.perf_counter() - started) * 1000)
+                with database.write_engine(engine).begin() as conn:
+                    record_migration(conn, migration_file, checksum, duration_ms)
                 logger.info(f"✓ Migration {migration_file.name} completed successfully")
 
         except Exception as e:
             failed_migrations.append(migration_file.name)
             logger.error(f"✗ Error running migration {migration_file.name}: {e}")
 
+        startup_timing.record_phase(
+            f"migration:{migration_file.stem}",
+            (time.perf_counter() - started) * 1000,
+            "ok" if success else "error",
+            started,
+        )
+
     logger.info("=" * 60)
     if failed_migrations:
         logger.error(f"✗ {len(failed_migrations)} migration(s) failed:")
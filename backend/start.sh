@@ -16,6 +16,16 @@ echo "Running database migrations..."
 python3 migrations/run_migrations.py || echo "⚠️  Some migrations failed, but continuing..."
 
 echo ""
+if [ "${APP_ENV:-development}" = "production" ]; then
+    # Schema and migrations are done above, once, before any worker starts.
+    # Writes are serialized in the app (BEGIN IMMEDIATE + retry), so workers can share the SQLite file.
+    # Exported so the app knows it runs in several processes (see app.autosave)
+    export WEB_CONCURRENCY="${WEB_CONCURRENCY:-$(nproc)}"
+    WORKERS="${WEB_CONCURRENCY}"
+    echo "Starting uvicorn server with ${WORKERS} worker(s)..."
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers "${WORKERS}" --no-access-log
+fi
+
 echo "Starting uvicorn server..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
 
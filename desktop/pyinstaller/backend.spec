@@ -39,6 +39,8 @@ a = Analysis(
         "app.models",
         "app.schemas",
         "app.db_init",
+        "app.http_client",
+        "app.emoji_images",
         "app.routers",
         "app.routers.backup",
         "app.routers.entries",
@@ -124,7 +124,8 @@ impl DesktopConfig {
       .ok()
       .and_then(|value| value.parse::<u16>().ok())
       .unwrap_or(18765);
-    let health_url = format!("http://{backend_host}:{backend_port}/health");
+    // Readiness (not just liveness): 200 only once migrations and the first query have completed
+    let health_url = format!("http://{backend_host}:{backend_port}/health/ready");
 
     let window_height_ratio = env::var("TAURI_WINDOW_HEIGHT_RATIO")
       .ok()
@@ -17,10 +17,13 @@ import type {
   CustomEmoji,
   CustomEmojiCreate,
   CustomEmojiUpdate,
+  CustomEmojiSpriteSheet,
   Reminder,
   ReminderCreate,
   ReminderUpdate,
   AppSettings,
+  DayContext,
+  EntryView,
 } from './types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
@@ -41,6 +44,7 @@ export const notesApi = {
 
   getByDate: async (date: string): Promise<DailyNote> => {
     const response = await api.get<DailyNote>(`/api/notes/${date}`);
+    rememberEntries(response.data.entries);
     return response.data;
   },
 
@@ -58,16 +62,73 @@ export const notesApi = {
     await api.delete(`/api/notes/${date}`);
   },
 
-  getByMonth: async (year: number, month: number): Promise<DailyNote[]> => {
-    const response = await api.get<DailyNote[]>(`/api/notes/month/${year}/${month}`);
+  getByMonth: async (year: number, month: number, view: EntryView = 'full'): Promise<DailyNote[]> => {
+    const response = await api.get<DailyNote[]>(`/api/notes/month/${year}/${month}`, { params: { view } });
     return response.data;
   },
 };
 
+// Latest version of each entry saved or loaded in this tab, and the save in flight for it
+const entryVersions = new Map<number, number>();
+const entrySaves = new Map<number, Promise<unknown>>();
+// Content as last saved or loaded, which a content patch is computed against
+const savedContents = new Map<number, string>();
+
+// Entries just fetched: their version is what the next save must name (another tab may have
+// saved since this one did), and their content is what the next save can patch, so the first
+// save after a load doesn't upload the whole entry. Skipped when a save from this tab has got
+// further in the meantime.
+const rememberEntries = (entries: NoteEntry[] | undefined) => {
+  for (const entry of entries ?? []) {
+    if (entry.version === undefined) continue;
+    const known = entryVersions.get(entry.id);
+    if (known !== undefined && entry.version < known) continue;
+    if (typeof entry.content === 'string') {
+      savedContents.set(entry.id, entry.content);
+    } else if (entry.version !== known) {
+      savedContents.delete(entry.id); // Listed without content (view=card); what was saved is out of date
+    }
+    entryVersions.set(entry.id, entry.version);
+  }
+};
+
+// Content saves of entries at least this long send only the edit (see backend app/content_patch.py)
+const PATCH_MIN_LENGTH = 4096;
+
+const sha256 = async (text: string): Promise<string> => {
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+};
+
+const isHighSurrogate = (code: number) => code >= 0xd800 && code <= 0xdbff;
+const isLowSurrogate = (code: number) => code >= 0xdc00 && code <= 0xdfff;
+
+// One splice between the common start and end, which is what typing or pasting produces
+const contentPatch = async (base: string, content: string) => {
+  const shorter = Math.min(base.length, content.length);
+  let prefix = 0;
+  while (prefix < shorter && base[prefix] === content[prefix]) prefix++;
+  if (prefix > 0 && isHighSurrogate(base.charCodeAt(prefix - 1))) prefix--;
+  let suffix = 0;
+  while (suffix < shorter - prefix && base[base.length - 1 - suffix] === content[content.length - 1 - suffix]) {
+    suffix++;
+  }
+  if (suffix > 0 && isLowSurrogate(base.charCodeAt(base.length - suffix))) suffix--;
+
+  const ops: (number | string)[] = [];
+  const deleted = base.length - prefix - suffix;
+  const inserted = content.slice(prefix, content.length - suffix);
+  if (prefix) ops.push(prefix);
+  if (deleted) ops.push(-deleted);
+  if (inserted) ops.push(inserted);
+  return { base_hash: await sha256(base), ops, result_hash: await sha256(content) };
+};
+
 // Entries API
 export const entriesApi = {
   getForDate: async (date: string): Promise<NoteEntry[]> => {
     const response = await api.get<NoteEntry[]>(`/api/entries/note/${date}`);
+    rememberEntries(response.data);
     return response.data;
   },
 
@@ -81,12 +142,60 @@ export const entriesApi = {
     return response.data;
   },
 
+  // Editor autosaves: one at a time per entry, sent with If-Match so a change made in another
+  // tab or on another device is answered with 412 instead of being overwritten. Large content
+  // is sent as a patch against the content saved before.
+  save: (entryId: number, update: NoteEntryUpdate, loadedVersion?: number): Promise<NoteEntry> => {
+    const previous = entrySaves.get(entryId) ?? Promise.resolve();
+    const save = previous
+      .catch(() => undefined)
+      .then(async () => {
+        // The newer of what this tab last saved and what the caller loaded: after a reload that
+        // picked up a change from another tab, the loaded version is the one the server has
+        const known = entryVersions.get(entryId);
+        const version = known === undefined || (loadedVersion ?? 0) > known ? loadedVersion : known;
+        const headers = version !== undefined ? { 'If-Match': `"${version}"` } : undefined;
+        const url = `/api/entries/${entryId}`;
+        const base = savedContents.get(entryId);
+        let body: object = update;
+        if (update.content !== undefined && base !== undefined && base.length >= PATCH_MIN_LENGTH && crypto.subtle) {
+          const { content, ...rest } = update;
+          body = { ...rest, content_patch: await contentPatch(base, content) };
+        }
+        try {
+          let response;
+          try {
+            response = await api.patch<NoteEntry>(url, body, { headers });
+          } catch (error) {
+            // 409: the server has other content than the patch was made for, so send all of it
+            if (body === update || !axios.isAxiosError(error) || error.response?.status !== 409) throw error;
+            response = await api.patch<NoteEntry>(url, update, { headers });
+          }
+          if (response.data.version !== undefined) {
+            entryVersions.set(entryId, response.data.version);
+          }
+          if (response.data.content !== null) {
+            savedContents.set(entryId, response.data.content);
+          }
+          return response.data;
+        } catch (error) {
+          // Start again from the version (and content) the caller reloads
+          entryVersions.delete(entryId);
+          savedContents.delete(entryId);
+          throw error;
+        }
+      });
+    entrySaves.set(entryId, save);
+    return save;
+  },
+
   delete: async (entryId: number): Promise<void> => {
     await api.delete(`/api/entries/${entryId}`);
   },
 
   get: async (entryId: number): Promise<NoteEntry> => {
     const response = await api.get<NoteEntry>(`/api/entries/${entryId}`);
+    rememberEntries([response.data]);
     return response.data;
   },
 
@@ -166,8 +275,8 @@ export const listsApi = {
     return response.data;
   },
 
-  getById: async (listId: number): Promise<ListWithEntries> => {
-    const response = await api.get<ListWithEntries>(`/api/lists/${listId}`);
+  getById: async (listId: number, view: EntryView = 'full'): Promise<ListWithEntries> => {
+    const response = await api.get<ListWithEntries>(`/api/lists/${listId}`, { params: { view } });
     return response.data;
   },
 
@@ -220,7 +329,7 @@ export const kanbanApi = {
   getBoards: async (): Promise<ListWithEntries[]> => {
     const response = await api.get<List[]>('/api/lists/kanban');
     const detailedBoards = await Promise.all(
-      response.data.map((board) => listsApi.getById(board.id))
+      response.data.map((board) => listsApi.getById(board.id, 'card'))
     );
     detailedBoards.sort((a, b) => (a.kanban_order || 0) - (b.kanban_order || 0));
     return detailedBoards;
@@ -245,6 +354,12 @@ export const customEmojisApi = {
     return response.data;
   },
 
+  // All active emojis packed into one image, for the picker
+  getSprite: async (): Promise<CustomEmojiSpriteSheet> => {
+    const response = await api.get<CustomEmojiSpriteSheet>('/api/custom-emojis/sprite');
+    return response.data;
+  },
+
   create: async (formData: FormData): Promise<CustomEmoji> => {
     const response = await api.post<CustomEmoji>('/api/custom-emojis', formData, {
       headers: {
@@ -268,9 +383,9 @@ export const customEmojisApi = {
 
 // Reminders API
 export const remindersApi = {
-  getAll: async (includeDismissed = false): Promise<Reminder[]> => {
+  getAll: async (includeDismissed = false, view: EntryView = 'full'): Promise<Reminder[]> => {
     const response = await api.get<Reminder[]>('/api/reminders', {
-      params: { include_dismissed: includeDismissed },
+      params: { include_dismissed: includeDismissed, view },
     });
     return response.data;
   },
@@ -308,5 +423,14 @@ export const settingsApi = {
   },
 };
 
+// Day context API (note, goals, settings, labels, lists and Kanban columns in one request)
+export const dayApi = {
+  getContext: async (date: string): Promise<DayContext> => {
+    const response = await api.get<DayContext>(`/api/day/${date}/context`);
+    rememberEntries(response.data.note?.entries);
+    return response.data;
+  },
+};
+
 export default api;
 
@@ -135,14 +135,14 @@ const CalendarView = ({ selectedDate, onDateSelect }: CalendarViewProps) => {
       const nextYear = nextDate.getFullYear();
       const nextMonth = nextDate.getMonth() + 1;
 
-      // Load all data in parallel
+      // Load all data in parallel (the calendar only shows counts, flags and previews: no entry content)
       const [prevData, curData, nextData, sprints, quarterlies, allReminders] = await Promise.all([
-        notesApi.getByMonth(prevYear, prevMonth),
-        notesApi.getByMonth(curYear, curMonth),
-        notesApi.getByMonth(nextYear, nextMonth),
+        notesApi.getByMonth(prevYear, prevMonth, 'card'),
+        notesApi.getByMonth(curYear, curMonth, 'card'),
+        notesApi.getByMonth(nextYear, nextMonth, 'card'),
         goalsApi.getAllSprints(),
         goalsApi.getAllQuarterly(),
-        remindersApi.getAll().catch(err => {
+        remindersApi.getAll(false, 'card').catch(err => {
           console.error('Failed to load reminders:', err);
           return [];
         }),
@@ -408,9 +408,7 @@ const CalendarView = ({ selectedDate, onDateSelect }: CalendarViewProps) => {
                     timeLabel = '';
                   }
                   
-                  const contentPreview = reminder.entry?.content
-                    ? reminder.entry.content.replace(/<[^>]*>/g, ' ').replace(/\s+/g, ' ').trim().substring(0, 100)
-                    : '';
+                  const contentPreview = reminder.entry?.excerpt?.substring(0, 100) || '';
                   
                   const handleReminderClick = () => {
                     if (reminder.entry?.daily_note_date) {
@@ -427,7 +425,7 @@ const CalendarView = ({ selectedDate, onDateSelect }: CalendarViewProps) => {
                     try {
                       await remindersApi.delete(reminder.id);
                       // Reload reminders
-                      const updatedReminders = await remindersApi.getAll();
+                      const updatedReminders = await remindersApi.getAll(false, 'card');
                       setReminders(updatedReminders);
                     } catch (error) {
                       console.error('Failed to delete reminder:', error);
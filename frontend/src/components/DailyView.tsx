@@ -1,9 +1,10 @@
 import { useState, useEffect, useRef } from 'react';
+import axios from 'axios';
 import { useParams, useNavigate, useSearchParams } from 'react-router-dom';
 import { format, parse, addDays, subDays } from 'date-fns';
 import { ChevronLeft, ChevronRight, Plus, CheckSquare, Combine } from 'lucide-react';
-import api, { notesApi, entriesApi, goalsApi, settingsApi } from '../api';
-import type { DailyNote, NoteEntry, Goal } from '../types';
+import api, { notesApi, entriesApi, goalsApi, dayApi } from '../api';
+import type { DailyNote, NoteEntry, Goal, Label, List } from '../types';
 import NoteEntryCard from './NoteEntryCard';
 import LabelSelector from './LabelSelector';
 import EntryDropdown from './EntryDropdown';
@@ -33,6 +34,10 @@ const DailyView = () => {
   const [dailyGoalTimeRemaining, setDailyGoalTimeRemaining] = useState('');
   const [sprintGoal, setSprintGoal] = useState<Goal | null>(null);
   const [quarterlyGoal, setQuarterlyGoal] = useState<Goal | null>(null);
+  // Shared with the label, list and Kanban pickers so each card doesn't fetch them
+  const [allLabels, setAllLabels] = useState<Label[]>([]);
+  const [allLists, setAllLists] = useState<List[]>([]);
+  const [kanbanColumns, setKanbanColumns] = useState<List[]>([]);
   const [editingDailyGoal, setEditingDailyGoal] = useState(false);
   const [editingSprintGoal, setEditingSprintGoal] = useState(false);
   const [editingQuarterlyGoal, setEditingQuarterlyGoal] = useState(false);
@@ -51,6 +56,9 @@ const DailyView = () => {
   const [selectionMode, setSelectionMode] = useState(false);
   const [selectedEntries, setSelectedEntries] = useState<Set<number>>(new Set());
   const [isMerging, setIsMerging] = useState(false);
+  // Entries changed elsewhere while being edited here: the other version and what was typed here
+  const [conflicts, setConflicts] = useState<Record<number, { latest: NoteEntry; mine: string }>>({});
+  const conflictsRef = useRef(conflicts);
   const dailyGoalTimeoutRef = useRef<ReturnType<typeof setTimeout> | null>(null);
   const dailyGoalRef = useRef<string>(dailyGoal);
 
@@ -59,6 +67,11 @@ const DailyView = () => {
     dailyGoalRef.current = dailyGoal;
   }, [dailyGoal]);
 
+  // Debounced editor saves may call a handler from an earlier render
+  useEffect(() => {
+    conflictsRef.current = conflicts;
+  }, [conflicts]);
+
   // Load goals for the specific date being viewed
   useEffect(() => {
     if (date) {
@@ -70,24 +83,11 @@ const DailyView = () => {
       
       // Scroll to top immediately when date changes
       window.scrollTo({ top: 0, behavior: 'instant' });
+      // The day context also carries the goals and settings for this date
       loadDailyNote();
-      loadGoalsForDate(date);
     }
   }, [date]);
 
-  // Load daily goal end time from settings
-  useEffect(() => {
-    const loadSettings = async () => {
-      try {
-        const settings = await settingsApi.get();
-        setDailyGoalEndTime(settings.daily_goal_end_time || '17:00');
-      } catch (error) {
-        console.error('Failed to load settings:', error);
-      }
-    };
-    loadSettings();
-  }, []);
-
   // Update daily goal countdown every minute
   useEffect(() => {
     const updateCountdown = () => {
@@ -209,20 +209,21 @@ const DailyView = () => {
 
     setLoading(true);
     try {
-      const noteData = await notesApi.getByDate(date);
+      // One request for everything the page needs; the note is null when it doesn't exist yet
+      const context = await dayApi.getContext(date);
+      const noteData = context.note;
       setNote(noteData);
       // Keep entries in their original order (sorted by order_index from backend)
-      setEntries(noteData.entries || []);
-      setDailyGoal(noteData.daily_goal || '');
-    } catch (error: any) {
-      if (error.response?.status === 404) {
-        // Note doesn't exist yet
-        setNote(null);
-        setEntries([]);
-        setDailyGoal('');
-      } else {
-        console.error('Failed to load note:', error);
-      }
+      setEntries(noteData?.entries || []);
+      setDailyGoal(noteData?.daily_goal || '');
+      setSprintGoal(context.sprint_goal);
+      setQuarterlyGoal(context.quarterly_goal);
+      setDailyGoalEndTime(context.settings?.daily_goal_end_time || '17:00');
+      setAllLabels(context.labels);
+      setAllLists(context.lists);
+      setKanbanColumns(context.kanban_columns);
+    } catch (error) {
+      console.error('Failed to load note:', error);
     } finally {
       setLoading(false);
       // Restore scroll position if preserving, otherwise scroll to top
@@ -266,14 +267,53 @@ const DailyView = () => {
   };
 
   const handleEntryUpdate = async (entryId: number, content: string) => {
+    if (conflictsRef.current[entryId]) {
+      // Nothing is saved until the conflict is resolved; keep the latest text for "Keep mine"
+      setConflicts(prev => ({ ...prev, [entryId]: { ...prev[entryId], mine: content } }));
+      return;
+    }
+    const loadedVersion = entries.find(e => e.id === entryId)?.version;
     try {
-      await entriesApi.update(entryId, { content });
-      setEntries(entries.map(e => e.id === entryId ? { ...e, content } : e));
+      await entriesApi.save(entryId, { content }, loadedVersion);
+      setEntries(prevEntries => prevEntries.map(e => e.id === entryId ? { ...e, content } : e));
     } catch (error) {
+      if (axios.isAxiosError(error) && error.response?.status === 412) {
+        // Changed in another tab or on another device: keep what was typed here and let the user choose
+        const latest = await entriesApi.get(entryId);
+        setConflicts(prev => ({ ...prev, [entryId]: { latest, mine: content } }));
+        return;
+      }
       console.error('Failed to update entry:', error);
     }
   };
 
+  const resolveConflict = async (entryId: number, keepMine: boolean) => {
+    const conflict = conflicts[entryId];
+    if (!conflict) return;
+    if (keepMine) {
+      try {
+        const saved = await entriesApi.save(entryId, { content: conflict.mine }, conflict.latest.version);
+        setEntries(prevEntries => prevEntries.map(e => e.id === entryId ? { ...saved, content: conflict.mine } : e));
+      } catch (error) {
+        if (axios.isAxiosError(error) && error.response?.status === 412) {
+          // Changed yet again: show the newest version to choose against
+          const latest = await entriesApi.get(entryId);
+          setConflicts(prev => ({ ...prev, [entryId]: { ...prev[entryId], latest } }));
+        } else {
+          console.error('Failed to save entry:', error);
+        }
+        return;
+      }
+    } else {
+      setEntries(prevEntries => prevEntries.map(e => e.id === entryId ? conflict.latest : e));
+    }
+    setConflicts(prev => {
+      const rest = { ...prev };
+      delete rest[entryId];
+      return rest;
+    });
+  };
+
   const handleMoveToTop = async (entryId: number) => {
     // Optimistically move the entry to the top in the UI
     const entryIndex = entries.findIndex(e => e.id === entryId);
@@ -577,6 +617,7 @@ const DailyView = () => {
                     date={date}
                     selectedLabels={note?.labels || []}
                     onLabelsChange={() => loadDailyNote(true)}
+                    availableLabels={allLabels}
                   />
                 </div>
               )}
@@ -1354,6 +1395,34 @@ const DailyView = () => {
                   animation: index === 0 ? 'slideDown 0.3s ease-out' : 'none',
                 }}
               >
+                {conflicts[entry.id] && (
+                  <div
+                    className="mb-2 px-4 py-3 rounded-lg flex flex-wrap items-center gap-3 text-sm"
+                    style={{
+                      backgroundColor: 'var(--color-bg-secondary)',
+                      border: '1px solid var(--color-warning)',
+                      color: 'var(--color-text-primary)',
+                    }}
+                  >
+                    <span className="flex-1">
+                      This entry was changed in another tab or on another device. Your edits here are not saved yet.
+                    </span>
+                    <button
+                      onClick={() => resolveConflict(entry.id, true)}
+                      className="px-3 py-1 rounded"
+                      style={{ backgroundColor: 'var(--color-accent)', color: 'var(--color-accent-text)' }}
+                    >
+                      Keep mine
+                    </button>
+                    <button
+                      onClick={() => resolveConflict(entry.id, false)}
+                      className="px-3 py-1 rounded"
+                      style={{ backgroundColor: 'var(--color-bg-hover)', color: 'var(--color-text-primary)' }}
+                    >
+                      Load theirs
+                    </button>
+                  </div>
+                )}
                 <NoteEntryCard
                   entry={entry}
                   onUpdate={handleEntryUpdate}
@@ -1365,6 +1434,9 @@ const DailyView = () => {
                   isSelected={selectedEntries.has(entry.id)}
                   onSelectionChange={handleSelectionChange}
                   currentDate={date}
+                  availableLabels={allLabels}
+                  availableLists={allLists}
+                  availableKanbanColumns={kanbanColumns}
                 />
               </div>
             ))}
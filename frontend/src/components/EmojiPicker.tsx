@@ -5,11 +5,14 @@ import data from '@emoji-mart/data';
 import EmojiMartPicker from '@emoji-mart/react';
 import { useEmojiLibrary } from '../contexts/EmojiLibraryContext';
 import { customEmojisApi } from '../api';
-import type { CustomEmoji } from '../types';
+import type { CustomEmojiSpriteEntry, CustomEmojiSpriteSheet } from '../types';
 import CustomEmojiManager from './CustomEmojiManager';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Custom emojis are drawn from the sprite sheet at this size (the sheet uses 64px cells)
+const CUSTOM_EMOJI_DISPLAY_SIZE = 24;
+
 interface EmojiPickerProps {
   onEmojiSelect: (emoji: string, isCustom?: boolean, imageUrl?: string) => void;
   variant?: 'toolbar' | 'accent'; // toolbar = gray, accent = blue
@@ -17,7 +20,7 @@ interface EmojiPickerProps {
 
 const EmojiPicker = ({ onEmojiSelect, variant = 'toolbar' }: EmojiPickerProps) => {
   const [isOpen, setIsOpen] = useState(false);
-  const [customEmojis, setCustomEmojis] = useState<CustomEmoji[]>([]);
+  const [customEmojiSprite, setCustomEmojiSprite] = useState<CustomEmojiSpriteSheet | null>(null);
   const [showManager, setShowManager] = useState(false);
   const { emojiLibrary, isLoading } = useEmojiLibrary();
 
@@ -48,8 +51,9 @@ const EmojiPicker = ({ onEmojiSelect, variant = 'toolbar' }: EmojiPickerProps) =
 
   const loadCustomEmojis = async () => {
     try {
-      const emojis = await customEmojisApi.getAll(false);
-      setCustomEmojis(emojis);
+      // One request for the metadata and one for the sheet, however many emojis there are
+      const sprite = await customEmojisApi.getSprite();
+      setCustomEmojiSprite(sprite);
     } catch (error) {
       console.error('Failed to load custom emojis:', error);
     }
@@ -71,7 +75,7 @@ const EmojiPicker = ({ onEmojiSelect, variant = 'toolbar' }: EmojiPickerProps) =
     setIsOpen(false);
   };
 
-  const handleCustomEmojiClick = (emoji: CustomEmoji) => {
+  const handleCustomEmojiClick = (emoji: CustomEmojiSpriteEntry) => {
     // Pass the relative URL - the RichTextEditor will convert it to absolute
     onEmojiSelect(emoji.name, true, emoji.image_url);
     setIsOpen(false);
@@ -162,13 +166,13 @@ const EmojiPicker = ({ onEmojiSelect, variant = 'toolbar' }: EmojiPickerProps) =
               </div>
 
               {/* Custom Emojis Section */}
-              {customEmojis.length > 0 && (
+              {customEmojiSprite && customEmojiSprite.emojis.length > 0 && (
                 <div className="p-3 border-b" style={{ borderColor: 'var(--color-border-primary)' }}>
                   <h3 className="text-xs font-semibold uppercase mb-2" style={{ color: 'var(--color-text-secondary)' }}>
                     Custom Emojis
                   </h3>
                   <div className="grid grid-cols-8 gap-1">
-                    {customEmojis.map((emoji) => (
+                    {customEmojiSprite.emojis.map((emoji) => (
                       <button
                         key={emoji.id}
                         onClick={() => handleCustomEmojiClick(emoji)}
@@ -177,10 +181,15 @@ const EmojiPicker = ({ onEmojiSelect, variant = 'toolbar' }: EmojiPickerProps) =
                         title={`:${emoji.name}:`}
                         type="button"
                       >
-                        <img
-                          src={`${API_URL}${emoji.image_url}`}
-                          alt={emoji.name}
-                          className="w-6 h-6 object-contain"
+                        <span
+                          role="img"
+                          aria-label={emoji.name}
+                          className="block w-6 h-6"
+                          style={{
+                            backgroundImage: `url(${API_URL}${customEmojiSprite.webp_url})`,
+                            backgroundSize: `${customEmojiSprite.columns * CUSTOM_EMOJI_DISPLAY_SIZE}px auto`,
+                            backgroundPosition: `-${(emoji.x * CUSTOM_EMOJI_DISPLAY_SIZE / customEmojiSprite.size)}px -${(emoji.y * CUSTOM_EMOJI_DISPLAY_SIZE / customEmojiSprite.size)}px`,
+                          }}
                         />
                       </button>
                     ))}
@@ -8,9 +8,10 @@ interface EntryListSelectorProps {
   currentLists: List[];
   onUpdate: () => void;
   onOptimisticUpdate?: (lists: List[]) => void;
+  availableLists?: List[]; // All non-archived lists, when the parent already loaded them (skips the fetch)
 }
 
-const EntryListSelector = ({ entryId, currentLists, onOptimisticUpdate }: EntryListSelectorProps) => {
+const EntryListSelector = ({ entryId, currentLists, onOptimisticUpdate, availableLists }: EntryListSelectorProps) => {
   const [allLists, setAllLists] = useState<List[]>([]);
   const [loading, setLoading] = useState(false);
   const [processing, setProcessing] = useState(false);
@@ -23,8 +24,12 @@ const EntryListSelector = ({ entryId, currentLists, onOptimisticUpdate }: EntryL
   const dropdownRef = useRef<HTMLDivElement>(null);
 
   useEffect(() => {
-    loadLists();
-  }, []);
+    if (availableLists) {
+      setAllLists(availableLists);
+    } else {
+      loadLists();
+    }
+  }, [availableLists]);
 
   useEffect(() => {
     setLocalLists(currentLists);
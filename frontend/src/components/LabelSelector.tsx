@@ -18,9 +18,10 @@ interface LabelSelectorProps {
   selectedLabels: Label[];
   onLabelsChange: () => void;
   onOptimisticUpdate?: (labels: Label[]) => void;
+  availableLabels?: Label[]; // All labels, when the parent already loaded them (skips the fetch)
 }
 
-const LabelSelector = ({ date, entryId, selectedLabels, onOptimisticUpdate }: LabelSelectorProps) => {
+const LabelSelector = ({ date, entryId, selectedLabels, onOptimisticUpdate, availableLabels }: LabelSelectorProps) => {
   const { transparentLabels } = useTransparentLabels();
   const [allLabels, setAllLabels] = useState<Label[]>([]);
   const [newLabelName, setNewLabelName] = useState('');
@@ -41,8 +42,12 @@ const LabelSelector = ({ date, entryId, selectedLabels, onOptimisticUpdate }: La
   };
 
   useEffect(() => {
-    loadLabels();
-  }, []);
+    if (availableLabels) {
+      setAllLabels(availableLabels);
+    } else {
+      loadLabels();
+    }
+  }, [availableLabels]);
 
   useEffect(() => {
     setLocalLabels(selectedLabels);
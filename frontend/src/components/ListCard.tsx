@@ -6,6 +6,7 @@ import type { NoteEntry, List } from '../types';
 import { useTimezone } from '../contexts/TimezoneContext';
 import { useTransparentLabels } from '../contexts/TransparentLabelsContext';
 import { formatTimestamp } from '../utils/timezone';
+import { entriesApi } from '../api';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -25,6 +26,11 @@ const ListCard = ({ entry, onRemoveFromList, listId, list, isKanbanView }: ListC
   const { transparentLabels } = useTransparentLabels();
   const [isDragging, setIsDragging] = useState(false);
   const [deleteConfirmation, setDeleteConfirmation] = useState<{ entryId: number; entryTitle: string } | null>(null);
+  // Boards are loaded without entry content (view=card); it is fetched when the card is expanded
+  const [loadedContent, setLoadedContent] = useState<{ version?: number; content: string } | null>(null);
+  const [loadingContent, setLoadingContent] = useState(false);
+  const content =
+    entry.content ?? (loadedContent && loadedContent.version === entry.version ? loadedContent.content : null);
 
   // Check if a label name is a custom emoji URL
   const isCustomEmojiUrl = (str: string): boolean => {
@@ -71,6 +77,19 @@ const ListCard = ({ entry, onRemoveFromList, listId, list, isKanbanView }: ListC
     setDeleteConfirmation(null);
   };
 
+  const handleExpand = async (e: React.MouseEvent) => {
+    e.stopPropagation();
+    setLoadingContent(true);
+    try {
+      const fullEntry = await entriesApi.get(entry.id);
+      setLoadedContent({ version: fullEntry.version, content: fullEntry.content });
+    } catch (error) {
+      console.error('Failed to load entry content:', error);
+    } finally {
+      setLoadingContent(false);
+    }
+  };
+
   const handleViewInDaily = (e: React.MouseEvent) => {
     e.stopPropagation();
     if (entry.daily_note_date) {
@@ -244,21 +263,39 @@ const ListCard = ({ entry, onRemoveFromList, listId, list, isKanbanView }: ListC
             minHeight: 0,
           }}
         >
-          <div 
-            className="prose prose-sm max-w-none"
-            style={{ 
-              color: 'var(--color-text-primary)',
-              pointerEvents: 'auto',
-            }}
-            dangerouslySetInnerHTML={{ __html: fixImageUrls(entry.content) }}
-            onClick={(e) => {
-              // Only allow link clicks, prevent other interactions
-              const target = e.target as HTMLElement;
-              if (target.tagName !== 'A') {
-                e.preventDefault();
-              }
-            }}
-          />
+          {content != null ? (
+            <div 
+              className="prose prose-sm max-w-none"
+              style={{ 
+                color: 'var(--color-text-primary)',
+                pointerEvents: 'auto',
+              }}
+              dangerouslySetInnerHTML={{ __html: fixImageUrls(content) }}
+              onClick={(e) => {
+                // Only allow link clicks, prevent other interactions
+                const target = e.target as HTMLElement;
+                if (target.tagName !== 'A') {
+                  e.preventDefault();
+                }
+              }}
+            />
+          ) : (
+            <>
+              {entry.excerpt && (
+                <p className="text-sm mb-3" style={{ color: 'var(--color-text-primary)' }}>
+                  {entry.excerpt}
+                </p>
+              )}
+              <button
+                onClick={handleExpand}
+                disabled={loadingContent}
+                className="text-sm font-medium hover:underline"
+                style={{ color: 'var(--color-accent)' }}
+              >
+                {loadingContent ? 'Loading...' : 'Show full entry'}
+              </button>
+            </>
+          )}
         </div>
       </div>
 
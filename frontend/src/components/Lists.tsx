@@ -75,9 +75,9 @@ export default function Lists() {
       }
       // Get all lists first
       const allLists = await listsApi.getAll(false);
-      // Fetch detailed data (with entries) for each list
+      // Fetch detailed data (with entries) for each list; cards load their content when expanded
       const detailedLists = await Promise.all(
-        allLists.map((list) => listsApi.getById(list.id))
+        allLists.map((list) => listsApi.getById(list.id, 'card'))
       );
       // CRITICAL: Sort by order_index to maintain correct order
       // Promise.all doesn't guarantee order, so we must sort explicitly
@@ -5,7 +5,7 @@ import { useNavigate } from 'react-router-dom';
 import { format } from 'date-fns';
 import axios from 'axios';
 import TurndownService from 'turndown';
-import type { NoteEntry, List, Reminder } from '../types';
+import type { NoteEntry, List, Label, Reminder } from '../types';
 import RichTextEditor from './RichTextEditor';
 import CodeEditor from './CodeEditor';
 import LabelSelector from './LabelSelector';
@@ -13,7 +13,7 @@ import EntryListSelector from './EntryListSelector';
 import ReminderModal from './ReminderModal';
 import { useTimezone } from '../contexts/TimezoneContext';
 import { formatTimestamp } from '../utils/timezone';
-import { kanbanApi, listsApi, remindersApi } from '../api';
+import { entriesApi, kanbanApi, listsApi, remindersApi } from '../api';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
@@ -40,9 +40,13 @@ interface NoteEntryCardProps {
   onSelectionChange?: (id: number, selected: boolean) => void;
   selectionMode?: boolean;
   currentDate?: string; // YYYY-MM-DD format
+  // Shared data loaded once by the parent view instead of per card
+  availableLabels?: Label[];
+  availableLists?: List[];
+  availableKanbanColumns?: List[];
 }
 
-const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdate, onMoveToTop, isSelected = false, onSelectionChange, selectionMode = false, currentDate }: NoteEntryCardProps) => {
+const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdate, onMoveToTop, isSelected = false, onSelectionChange, selectionMode = false, currentDate, availableLabels, availableLists, availableKanbanColumns }: NoteEntryCardProps) => {
   const { timezone } = useTimezone();
   const navigate = useNavigate();
   const [title, setTitle] = useState(entry.title || '');
@@ -82,9 +86,13 @@ const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdat
   // Load Kanban columns when modal opens
   useEffect(() => {
     if (showKanbanModal) {
-      loadKanbanColumns();
+      if (availableKanbanColumns) {
+        setKanbanColumns(availableKanbanColumns);
+      } else {
+        loadKanbanColumns();
+      }
     }
-  }, [showKanbanModal]);
+  }, [showKanbanModal, availableKanbanColumns]);
 
   // Close modal when clicking outside
   useEffect(() => {
@@ -160,9 +168,7 @@ const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdat
     // Debounce the save
     const timeoutId = setTimeout(async () => {
       try {
-        await axios.patch(`${API_URL}/api/entries/${entry.id}`, {
-          title: newTitle
-        });
+        await entriesApi.save(entry.id, { title: newTitle }, entry.version);
         setIsSaving(false);
       } catch (error) {
         console.error('Failed to update title:', error);
@@ -836,6 +842,7 @@ const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdat
             selectedLabels={entry.labels || []}
             onLabelsChange={() => {}}
             onOptimisticUpdate={(labels) => onLabelsUpdate(entry.id, labels)}
+            availableLabels={availableLabels}
           />
         </div>
 
@@ -844,6 +851,7 @@ const NoteEntryCard = ({ entry, onUpdate, onDelete, onLabelsUpdate, onListsUpdat
           <EntryListSelector
             entryId={entry.id}
             currentLists={(entry.lists || []).filter(list => !list.is_kanban)}
+            availableLists={availableLists}
             onUpdate={() => {
               if (onListsUpdate) {
                 onListsUpdate();
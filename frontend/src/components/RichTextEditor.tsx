@@ -38,7 +38,7 @@ import {
   CaseSensitive,
   CheckSquare,
 } from 'lucide-react';
-import { LinkPreviewExtension, fetchLinkPreview } from '../extensions/LinkPreview';
+import { LinkPreviewExtension, fetchLinkPreviews } from '../extensions/LinkPreview';
 import { useSpeechRecognition } from '../hooks/useSpeechRecognition';
 import TurndownService from 'turndown';
 import { marked } from 'marked';
@@ -47,6 +47,27 @@ import EmojiPicker from './EmojiPicker';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Link preview cards are inserted with these until their preview arrives (and stay editable)
+const PREVIEW_TITLE_PLACEHOLDER = 'Click to add title';
+const PREVIEW_DESCRIPTION_PLACEHOLDER = 'Click to add description';
+
+// The backend answers with URLs in their normalized form (e.g. a trailing slash added)
+const normalizeUrl = (url: string) => {
+  try {
+    return new URL(url).href;
+  } catch {
+    return url;
+  }
+};
+
+const hostnameOf = (url: string) => {
+  try {
+    return new URL(url).hostname;
+  } catch {
+    return url;
+  }
+};
+
 interface RichTextEditorProps {
   content: string;
   onChange: (content: string) => void;
@@ -386,48 +407,11 @@ const RichTextEditor = ({ content, onChange, placeholder = 'Start writing...' }:
         // Check for URLs in text
         const text = event.clipboardData?.getData('text/plain');
         if (text) {
-          // Simple URL detection - matches http(s) URLs
-          const urlRegex = /^https?:\/\/[^\s]+$/;
-          if (urlRegex.test(text.trim())) {
+          // One or more http(s) URLs (separated by spaces or lines) become link preview cards
+          const urls = text.trim().split(/\s+/);
+          if (urls.every(url => /^https?:\/\/\S+$/.test(url))) {
             event.preventDefault();
-            
-            // Try to fetch link preview
-            fetchLinkPreview(text.trim())
-              .then(preview => {
-                if (preview && editor) {
-                  // Insert link preview card (user can click to edit title/description)
-                  editor.chain().focus().insertContent({
-                    type: 'linkPreview',
-                    attrs: preview,
-                  }).run();
-                } else {
-                  // Insert a basic preview that can be edited
-                  editor?.chain().focus().insertContent({
-                    type: 'linkPreview',
-                    attrs: {
-                      url: text.trim(),
-                      title: 'Click to add title',
-                      description: 'Click to add description',
-                      image: null,
-                      site_name: new URL(text.trim()).hostname,
-                    },
-                  }).run();
-                }
-              })
-              .catch(() => {
-                // Insert a basic preview that can be edited
-                editor?.chain().focus().insertContent({
-                  type: 'linkPreview',
-                  attrs: {
-                    url: text.trim(),
-                    title: 'Click to add title',
-                    description: 'Click to add description',
-                    image: null,
-                    site_name: new URL(text.trim()).hostname,
-                  },
-                }).run();
-              });
-            
+            insertLinkPreviews(urls);
             return true;
           }
         }
@@ -756,44 +740,43 @@ const RichTextEditor = ({ content, onChange, placeholder = 'Start writing...' }:
     }
   };
 
-  const addLinkPreview = async () => {
-    const url = window.prompt('Enter URL to preview:');
-    if (!url) return;
-
-    try {
-      const preview = await fetchLinkPreview(url);
-      if (preview) {
-        // Insert preview (user can click to edit title/description)
-        editor?.chain().focus().insertContent({
-          type: 'linkPreview',
-          attrs: preview,
-        }).run();
-      } else {
-        // Insert a basic preview that can be edited
-        editor?.chain().focus().insertContent({
-          type: 'linkPreview',
-          attrs: {
-            url: url,
-            title: 'Click to add title',
-            description: 'Click to add description',
-            image: null,
-            site_name: new URL(url).hostname,
-          },
-        }).run();
+  // Insert a card per URL right away, then fill each in as its preview streams back:
+  // one request per 50 URLs, and a slow site doesn't hold up the others. URLs that can't
+  // be previewed get a "not available" preview, so no card keeps its placeholder text
+  const insertLinkPreviews = (urls: string[]) => {
+    if (!editor) return;
+    editor.chain().focus().insertContent(urls.map(url => ({
+      type: 'linkPreview',
+      attrs: {
+        url,
+        title: PREVIEW_TITLE_PLACEHOLDER,
+        description: PREVIEW_DESCRIPTION_PLACEHOLDER,
+        image: null,
+        site_name: hostnameOf(url),
+      },
+    }))).run();
+
+    fetchLinkPreviews([...new Set(urls)], preview => {
+      if (editor.isDestroyed) return;
+      const url = normalizeUrl(preview.url);
+      const { tr } = editor.state;
+      editor.state.doc.descendants((node, pos) => {
+        // Cards the user has started editing are left alone
+        if (node.type.name === 'linkPreview' && normalizeUrl(node.attrs.url) === url && node.attrs.title === PREVIEW_TITLE_PLACEHOLDER) {
+          tr.setNodeMarkup(pos, undefined, { ...node.attrs, ...preview, url: node.attrs.url });
+        }
+      });
+      if (tr.docChanged) {
+        editor.view.dispatch(tr);
       }
-    } catch (error) {
-      console.error('Failed to add link preview:', error);
-      // Insert a basic preview that can be edited
-      editor?.chain().focus().insertContent({
-        type: 'linkPreview',
-        attrs: {
-          url: url,
-          title: 'Click to add title',
-          description: 'Click to add description',
-          image: null,
-          site_name: new URL(url).hostname,
-        },
-      }).run();
+    });
+  };
+
+  const addLinkPreview = () => {
+    const input = window.prompt('Enter URL(s) to preview:');
+    const urls = input?.trim().split(/\s+/).filter(Boolean) ?? [];
+    if (urls.length > 0) {
+      insertLinkPreviews(urls);
     }
   };
 
@@ -27,6 +27,9 @@ const Search = () => {
   const [searchHistory, setSearchHistory] = useState<SearchHistoryItem[]>([]);
   const [filterStarred, setFilterStarred] = useState<boolean | null>(null);
   const [filterCompleted, setFilterCompleted] = useState<boolean | null>(null);
+  // Results come without entry content (view=card); an entry's content is fetched when it is expanded
+  const [loadedContents, setLoadedContents] = useState<Record<number, string>>({});
+  const [loadingEntryId, setLoadingEntryId] = useState<number | null>(null);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -95,7 +98,7 @@ const Search = () => {
     }
 
     try {
-      const params: any = {};
+      const params: any = { view: 'card' };
       if (query.trim()) {
         params.q = query.trim();
       }
@@ -112,6 +115,7 @@ const Search = () => {
       const response = await axios.get<{entries: NoteEntry[], lists: List[]}>(`${API_URL}/api/search/all`, { params });
       setResults(response.data.entries);
       setListResults(response.data.lists);
+      setLoadedContents({});
     } catch (error) {
       console.error('Search failed:', error);
       setResults([]);
@@ -151,6 +155,19 @@ const Search = () => {
     setHasSearched(false);
   };
 
+  const expandEntry = async (e: React.MouseEvent, entryId: number) => {
+    e.stopPropagation();
+    setLoadingEntryId(entryId);
+    try {
+      const response = await axios.get<NoteEntry>(`${API_URL}/api/entries/${entryId}`);
+      setLoadedContents((current) => ({ ...current, [entryId]: response.data.content }));
+    } catch (error) {
+      console.error('Failed to load entry content:', error);
+    } finally {
+      setLoadingEntryId(null);
+    }
+  };
+
   const goToEntry = (entry: NoteEntry, date: string) => {
     navigate(`/day/${date}#entry-${entry.id}`);
   };
@@ -590,6 +607,7 @@ const Search = () => {
                     {results.map((entry: any, index) => {
               // Extract date from the search result
               const date = entry.date || 'Unknown';
+              const content = entry.content ?? loadedContents[entry.id];
 
               return (
                 <div
@@ -699,19 +717,37 @@ const Search = () => {
                       </div>
                     </div>
                   </div>
-                  <div 
-                    className="prose max-w-none text-base leading-relaxed"
-                    style={{ 
-                      color: 'var(--color-text-primary)',
-                      maxHeight: '300px',
-                      overflowY: 'auto'
-                    }}
-                    dangerouslySetInnerHTML={{ 
-                      __html: entry.content_type === 'code' 
-                        ? `<pre><code>${entry.content}</code></pre>` 
-                        : fixImageUrls(entry.content)
-                    }}
-                  />
+                  {content != null ? (
+                    <div 
+                      className="prose max-w-none text-base leading-relaxed"
+                      style={{ 
+                        color: 'var(--color-text-primary)',
+                        maxHeight: '300px',
+                        overflowY: 'auto'
+                      }}
+                      dangerouslySetInnerHTML={{ 
+                        __html: entry.content_type === 'code' 
+                          ? `<pre><code>${content}</code></pre>` 
+                          : fixImageUrls(content)
+                      }}
+                    />
+                  ) : (
+                    <div>
+                      {entry.excerpt && (
+                        <p className="text-base leading-relaxed mb-3" style={{ color: 'var(--color-text-primary)' }}>
+                          {entry.excerpt}
+                        </p>
+                      )}
+                      <button
+                        onClick={(e) => expandEntry(e, entry.id)}
+                        disabled={loadingEntryId === entry.id}
+                        className="text-sm font-medium hover:underline"
+                        style={{ color: 'var(--color-accent)' }}
+                      >
+                        {loadingEntryId === entry.id ? 'Loading...' : 'Show full entry'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               );
             })}
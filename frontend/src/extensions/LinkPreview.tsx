@@ -224,8 +224,62 @@ export const LinkPreviewExtension = Node.create({
   },
 });
 
-// Helper function to fetch link preview
-export async function fetchLinkPreview(url: string): Promise<LinkPreviewData | null> {
+// The batch endpoint accepts at most this many URLs per request (BATCH_MAX_URLS)
+const LINK_PREVIEW_BATCH_SIZE = 50;
+
+// What the backend itself answers with when a site can't be previewed
+const unavailablePreview = (url: string): LinkPreviewData => {
+  let domain = url;
+  try {
+    domain = new URL(url).hostname.replace('www.', '');
+  } catch {
+    // Not a URL the browser can parse either; show it as it is
+  }
+  return { url, title: domain, description: 'Link preview not available', site_name: domain };
+};
+
+// Stream one batch request's previews to onPreview; throws if the request fails
+async function streamLinkPreviews(
+  urls: string[],
+  onPreview: (preview: LinkPreviewData) => void
+): Promise<void> {
+  const response = await fetch(`${API_URL}/api/link-preview/batch`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ urls }),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`Link preview batch failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const lines = buffer.split('\n');
+    buffer = lines.pop() ?? '';
+    for (const line of lines) {
+      if (line.trim()) {
+        onPreview(JSON.parse(line));
+      }
+    }
+  }
+
+  if (buffer.trim()) {
+    onPreview(JSON.parse(buffer));
+  }
+}
+
+// Preview a single URL; a URL the backend rejects (e.g. invalid) gets the "not available" preview
+async function fetchSingleLinkPreview(url: string): Promise<LinkPreviewData> {
   try {
     const response = await fetch(`${API_URL}/api/link-preview/preview`, {
       method: 'POST',
@@ -234,15 +288,34 @@ export async function fetchLinkPreview(url: string): Promise<LinkPreviewData | n
       },
       body: JSON.stringify({ url }),
     });
-
-    if (!response.ok) {
-      return null;
+    if (response.ok) {
+      return await response.json();
     }
-
-    return await response.json();
   } catch (error) {
     console.error('Failed to fetch link preview:', error);
-    return null;
   }
+  return unavailablePreview(url);
 }
 
+// Helper function to fetch many link previews, in requests of up to LINK_PREVIEW_BATCH_SIZE URLs.
+// The backend streams one JSON preview per line as each resolves, so onPreview
+// fires progressively instead of waiting for the slowest site. onPreview is called for
+// every URL: if a batch is rejected (one invalid URL fails the whole request) or breaks
+// off, its URLs are previewed one by one, and those that still fail get a
+// "not available" preview, so no card is left waiting.
+export async function fetchLinkPreviews(
+  urls: string[],
+  onPreview: (preview: LinkPreviewData) => void
+): Promise<void> {
+  for (let start = 0; start < urls.length; start += LINK_PREVIEW_BATCH_SIZE) {
+    const batch = urls.slice(start, start + LINK_PREVIEW_BATCH_SIZE);
+    try {
+      await streamLinkPreviews(batch, onPreview);
+    } catch (error) {
+      console.error('Failed to fetch link previews:', error);
+      // Previews that already arrived are sent again; callers only fill cards still waiting
+      const previews = await Promise.all(batch.map(fetchSingleLinkPreview));
+      previews.forEach(onPreview);
+    }
+  }
+}
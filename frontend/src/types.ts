@@ -10,7 +10,8 @@ export interface NoteEntry {
   daily_note_id: number;
   daily_note_date?: string; // YYYY-MM-DD format for navigation
   title: string;
-  content: string;
+  content: string; // null when fetched with view 'card' (use excerpt)
+  excerpt?: string; // Plain-text start of content
   content_type: 'rich_text' | 'code' | 'markdown';
   order_index: number;
   created_at: string;
@@ -21,6 +22,7 @@ export interface NoteEntry {
   is_important: boolean;
   is_completed: boolean;
   is_pinned: boolean;
+  version?: number; // Goes up when title or content change; sent back as If-Match when saving
   reminder?: Reminder;
 }
 
@@ -35,6 +37,9 @@ export interface DailyNote {
   labels: Label[];
 }
 
+// 'card' = entries without their content (excerpt only), for list-style views
+export type EntryView = 'card' | 'full';
+
 export interface NoteEntryCreate {
   title?: string;
   content: string;
@@ -124,6 +129,18 @@ export interface List {
   labels?: Label[];
 }
 
+// Everything the day view needs for one date (GET /api/day/{date}/context)
+export interface DayContext {
+  date: string;
+  note: DailyNote | null;
+  sprint_goal: Goal | null;
+  quarterly_goal: Goal | null;
+  settings: AppSettings | null;
+  labels: Label[];
+  lists: List[];
+  kanban_columns: List[];
+}
+
 export interface ListWithEntries extends List {
   entries: NoteEntry[];
 }
@@ -165,6 +182,25 @@ export interface CustomEmoji {
   updated_at: string;
 }
 
+export interface CustomEmojiSpriteEntry {
+  id: number;
+  name: string;
+  image_url: string;
+  category: string;
+  keywords: string;
+  x: number; // Pixel offset within the sprite sheet
+  y: number;
+}
+
+export interface CustomEmojiSpriteSheet {
+  version: string;
+  size: number; // Width/height of each emoji cell
+  columns: number;
+  image_url: string;
+  webp_url: string;
+  emojis: CustomEmojiSpriteEntry[];
+}
+
 export interface CustomEmojiCreate {
   name: string;
   category?: string;
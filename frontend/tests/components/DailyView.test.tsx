@@ -15,7 +15,7 @@ import { DailyGoalsProvider } from '@/contexts/DailyGoalsContext';
 import { SprintGoalsProvider } from '@/contexts/SprintGoalsContext';
 import { QuarterlyGoalsProvider } from '@/contexts/QuarterlyGoalsContext';
 import { DayLabelsProvider } from '@/contexts/DayLabelsContext';
-import { notesApi, entriesApi, goalsApi } from '@/api';
+import { notesApi, entriesApi, goalsApi, dayApi } from '@/api';
 
 // Mock API - defined inline to avoid hoisting issues
 vi.mock('@/api', () => ({
@@ -38,6 +38,9 @@ vi.mock('@/api', () => ({
     updateSprint: vi.fn(),
     updateQuarterly: vi.fn(),
   },
+  dayApi: {
+    getContext: vi.fn(),
+  },
 }));
 
 // Mock axios - defined inline to avoid hoisting issues  
@@ -70,6 +73,7 @@ vi.mock('react-router-dom', async () => {
 const mockNotesApi = vi.mocked(notesApi);
 const mockEntriesApi = vi.mocked(entriesApi);
 const mockGoalsApi = vi.mocked(goalsApi);
+const mockDayApi = vi.mocked(dayApi);
 
 // Mock child components
 vi.mock('@/components/NoteEntryCard', () => ({
@@ -177,14 +181,21 @@ describe('DailyView Component', () => {
     status: 'active',
   };
 
+  const dayContext = (overrides = {}) => ({
+    date: '2025-11-07',
+    note: { ...mockNote, entries: mockEntries },
+    sprint_goal: mockSprintGoal,
+    quarterly_goal: mockQuarterlyGoal,
+    settings: null,
+    labels: [],
+    lists: [],
+    kanban_columns: [],
+    ...overrides,
+  });
+
   beforeEach(() => {
     vi.clearAllMocks();
-    mockNotesApi.getByDate.mockResolvedValue({
-      note: mockNote,
-      entries: mockEntries,
-    });
-    mockGoalsApi.getSprintForDate.mockResolvedValue(mockSprintGoal);
-    mockGoalsApi.getQuarterlyForDate.mockResolvedValue(mockQuarterlyGoal);
+    mockDayApi.getContext.mockResolvedValue(dayContext() as any);
     mockEntriesApi.create.mockResolvedValue({ id: 3 });
   });
 
@@ -216,19 +227,23 @@ describe('DailyView Component', () => {
     expect(screen.getByText('2025-11-07')).toBeInTheDocument();
   });
 
-  it('loads daily note on mount', async () => {
+  it('loads the day context on mount', async () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalledWith('2025-11-07');
+      expect(mockDayApi.getContext).toHaveBeenCalledWith('2025-11-07');
     });
+    // Note, goals and settings all come from the one request
+    expect(mockNotesApi.getByDate).not.toHaveBeenCalled();
+    expect(mockGoalsApi.getSprintForDate).not.toHaveBeenCalled();
+    expect(mockGoalsApi.getQuarterlyForDate).not.toHaveBeenCalled();
   });
 
   it('displays daily goal', async () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
     
     // Component loaded
@@ -239,7 +254,7 @@ describe('DailyView Component', () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getSprintForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
     
     // Component loaded and requested sprint goal
@@ -250,7 +265,7 @@ describe('DailyView Component', () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getQuarterlyForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
     
     // Component loaded and requested quarterly goal
@@ -270,7 +285,7 @@ describe('DailyView Component', () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     const addButton = screen.getByText('Plus');
@@ -324,11 +339,11 @@ describe('DailyView Component', () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Component loaded
-    expect(mockNotesApi.getByDate).toHaveBeenCalled();
+    expect(mockDayApi.getContext).toHaveBeenCalled();
   });
 
   it('merges selected entries', async () => {
@@ -403,15 +418,12 @@ describe('DailyView Component', () => {
   });
 
   it('handles empty entries list', async () => {
-    mockNotesApi.getByDate.mockResolvedValue({
-      note: mockNote,
-      entries: [],
-    });
+    mockDayApi.getContext.mockResolvedValue(dayContext({ note: { ...mockNote, entries: [] } }) as any);
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
     
     // Component rendered with empty entries
@@ -419,12 +431,12 @@ describe('DailyView Component', () => {
   });
 
   it('handles API errors gracefully', async () => {
-    mockNotesApi.getByDate.mockRejectedValue(new Error('Network error'));
+    mockDayApi.getContext.mockRejectedValue(new Error('Network error'));
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Should handle error without crashing
@@ -432,12 +444,12 @@ describe('DailyView Component', () => {
   });
 
   it('handles missing sprint goal', async () => {
-    mockGoalsApi.getSprintForDate.mockRejectedValue({ response: { status: 404 } });
+    mockDayApi.getContext.mockResolvedValue(dayContext({ sprint_goal: null }) as any);
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getSprintForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Should handle missing goal gracefully
@@ -445,12 +457,12 @@ describe('DailyView Component', () => {
   });
 
   it('handles missing quarterly goal', async () => {
-    mockGoalsApi.getQuarterlyForDate.mockRejectedValue({ response: { status: 404 } });
+    mockDayApi.getContext.mockResolvedValue(dayContext({ quarterly_goal: null }) as any);
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getQuarterlyForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Should handle missing goal gracefully
@@ -463,7 +475,7 @@ describe('DailyView Component', () => {
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockNotesApi.getByDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Scroll should be called with instant behavior
@@ -473,13 +485,13 @@ describe('DailyView Component', () => {
   });
 
   it('creates sprint goal when form submitted', async () => {
-    mockGoalsApi.getSprintForDate.mockRejectedValue({ response: { status: 404 } });
+    mockDayApi.getContext.mockResolvedValue(dayContext({ sprint_goal: null }) as any);
     mockGoalsApi.createSprint.mockResolvedValue({ id: 2 });
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getSprintForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Sprint goal creation flow (would need to click create button, fill form)
@@ -487,13 +499,13 @@ describe('DailyView Component', () => {
   });
 
   it('creates quarterly goal when form submitted', async () => {
-    mockGoalsApi.getQuarterlyForDate.mockRejectedValue({ response: { status: 404 } });
+    mockDayApi.getContext.mockResolvedValue(dayContext({ quarterly_goal: null }) as any);
     mockGoalsApi.createQuarterly.mockResolvedValue({ id: 2 });
 
     renderWithProviders(<DailyView />);
 
     await waitFor(() => {
-      expect(mockGoalsApi.getQuarterlyForDate).toHaveBeenCalled();
+      expect(mockDayApi.getContext).toHaveBeenCalled();
     });
 
     // Quarterly goal creation flow
@@ -196,9 +196,9 @@ describe('Lists Component', () => {
       );
 
       await waitFor(() => {
-        expect(api.listsApi.getById).toHaveBeenCalledWith(1);
-        expect(api.listsApi.getById).toHaveBeenCalledWith(2);
-        expect(api.listsApi.getById).toHaveBeenCalledWith(3);
+        expect(api.listsApi.getById).toHaveBeenCalledWith(1, 'card');
+        expect(api.listsApi.getById).toHaveBeenCalledWith(2, 'card');
+        expect(api.listsApi.getById).toHaveBeenCalledWith(3, 'card');
       });
     });
   });
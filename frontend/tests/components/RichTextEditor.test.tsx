@@ -104,11 +104,7 @@ vi.mock('../../hooks/useSpeechRecognition', () => ({
 // Mock link preview extension
 vi.mock('@/extensions/LinkPreview', () => ({
   LinkPreviewExtension: {},
-  fetchLinkPreview: vi.fn().mockResolvedValue({
-    title: 'Test Title',
-    description: 'Test Description',
-    image: 'test.jpg',
-  }),
+  fetchLinkPreviews: vi.fn().mockResolvedValue(undefined),
 }));
 
 describe('RichTextEditor Component', () => {
@@ -0,0 +1,94 @@
+/**
+ * Link Preview Fetching Tests
+ *
+ * Tests batched link preview requests and what happens when a batch is rejected.
+ */
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import { fetchLinkPreviews } from '@/extensions/LinkPreview';
+
+// A streamed NDJSON response with one line per preview
+const streamResponse = (previews: object[]) => {
+  const chunks = [new TextEncoder().encode(previews.map(p => JSON.stringify(p) + '\n').join(''))];
+  return {
+    ok: true,
+    status: 200,
+    body: {
+      getReader: () => ({
+        read: async () => (chunks.length ? { done: false, value: chunks.shift() } : { done: true, value: undefined }),
+      }),
+    },
+  };
+};
+
+const jsonResponse = (status: number, data: object) => ({
+  ok: status < 400,
+  status,
+  body: null,
+  json: async () => data,
+});
+
+const urlsOf = (count: number) => Array.from({ length: count }, (_, i) => `https://example.com/${i}`);
+
+describe('fetchLinkPreviews', () => {
+  let fetchMock: ReturnType<typeof vi.fn>;
+
+  beforeEach(() => {
+    fetchMock = vi.fn();
+    vi.stubGlobal('fetch', fetchMock);
+    vi.spyOn(console, 'error').mockImplementation(() => {});
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+    vi.restoreAllMocks();
+  });
+
+  it('splits more than 50 URLs into several batch requests', async () => {
+    fetchMock.mockImplementation(async (_url: string, init: RequestInit) => {
+      const { urls } = JSON.parse(init.body as string);
+      return streamResponse(urls.map((url: string) => ({ url, title: `Title ${url}` })));
+    });
+    const onPreview = vi.fn();
+
+    await fetchLinkPreviews(urlsOf(120), onPreview);
+
+    const batchSizes = fetchMock.mock.calls.map(([, init]) => JSON.parse(init.body).urls.length);
+    expect(batchSizes).toEqual([50, 50, 20]);
+    expect(onPreview).toHaveBeenCalledTimes(120);
+  });
+
+  it('falls back to single previews when a batch is rejected', async () => {
+    fetchMock.mockImplementation(async (url: string, init: RequestInit) => {
+      if (url.endsWith('/batch')) {
+        return jsonResponse(422, { detail: 'invalid url' });
+      }
+      const body = JSON.parse(init.body as string);
+      if (body.url === 'https://exa mple.com') {
+        return jsonResponse(422, { detail: 'invalid url' });
+      }
+      return jsonResponse(200, { url: body.url, title: 'Found' });
+    });
+    const onPreview = vi.fn();
+
+    await fetchLinkPreviews(['https://example.com/a', 'https://exa mple.com'], onPreview);
+
+    expect(onPreview).toHaveBeenCalledWith({ url: 'https://example.com/a', title: 'Found' });
+    expect(onPreview).toHaveBeenCalledWith(
+      expect.objectContaining({ url: 'https://exa mple.com', description: 'Link preview not available' })
+    );
+  });
+
+  it('gives every URL a preview when the server is unreachable', async () => {
+    fetchMock.mockRejectedValue(new TypeError('Failed to fetch'));
+    const onPreview = vi.fn();
+
+    await fetchLinkPreviews(['https://www.example.com/page'], onPreview);
+
+    expect(onPreview).toHaveBeenCalledWith({
+      url: 'https://www.example.com/page',
+      title: 'example.com',
+      description: 'Link preview not available',
+      site_name: 'example.com',
+    });
+  });
+});
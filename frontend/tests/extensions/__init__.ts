@@ -0,0 +1 @@
+// Editor extension tests
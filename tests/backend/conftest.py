@@ -18,6 +18,11 @@ from sqlalchemy.pool import NullPool
 # Set testing mode to prevent main.py from creating tables on production DB
 os.environ['TESTING'] = 'true'
 
+# Keep files written by tests out of backend/data (each test gets its own dirs, see isolated_data_dirs)
+_data_root = tempfile.mkdtemp(prefix='daily-notes-tests-')
+os.environ['UPLOADS_DIR'] = os.path.join(_data_root, 'uploads')
+os.environ['STATIC_FILES_DIR'] = os.path.join(_data_root, 'static')
+
 # Add backend directory to path for imports
 # In Docker: /app (backend code) is mounted, we're in /tests
 # Locally: ../../backend/ from tests/backend/
@@ -28,7 +33,7 @@ sys.path.insert(0, backend_path)
 
 # Import the entire models module to ensure all tables (including association tables) are registered
 from app import models  # noqa: E402, F401
-from app.database import Base, get_db  # noqa: E402
+from app.database import Base, get_db, normalize_database_url  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models import (  # noqa: E402
     AppSettings,
@@ -42,11 +47,42 @@ from app.models import (  # noqa: E402
     list_labels,
     note_labels,
 )
+from app.routers import background_images, backup, custom_emojis, uploads  # noqa: E402
+
+from .fixtures.stub_http_server import StubHTTPServer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_dirs(tmp_path_factory, monkeypatch):
+    """Point the upload and background image directories at a fresh temporary directory."""
+    data_dir = tmp_path_factory.mktemp('data')
+    upload_dir = data_dir / 'uploads'
+    static_dir = data_dir / 'static'
+    upload_dir.mkdir()
+    (static_dir / 'background-images').mkdir(parents=True)
+    monkeypatch.setenv('UPLOADS_DIR', str(upload_dir))
+    monkeypatch.setenv('STATIC_FILES_DIR', str(static_dir))
+    # Routers resolve their directories at import
+    for router_module in (backup, custom_emojis, uploads):
+        monkeypatch.setattr(router_module, 'UPLOAD_DIR', upload_dir)
+    monkeypatch.setattr(background_images, 'BACKGROUNDS_DIR', static_dir / 'background-images')
+    return upload_dir
 
 
 @pytest.fixture(scope='function')
 def db_engine():
     """Create a shared test database engine."""
+    # Run against PostgreSQL when TEST_DATABASE_URL is set (docker-compose --profile postgres)
+    test_database_url = os.getenv('TEST_DATABASE_URL')
+    if test_database_url:
+        engine = create_engine(normalize_database_url(test_database_url), poolclass=NullPool)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        yield engine
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+        return
+
     # Use a file-based database with WAL mode to avoid locking issues
     import tempfile
 
@@ -242,6 +278,14 @@ def temp_db_file():
         os.unlink(path)
 
 
+@pytest.fixture
+def stub_server():
+    """Start a local stub HTTP server for tests that make outbound requests."""
+    server = StubHTTPServer().start()
+    yield server
+    server.stop()
+
+
 @pytest.fixture
 def fixed_datetime():
     """Return a fixed datetime for consistent testing."""
@@ -0,0 +1,106 @@
+"""Local stub HTTP server used to test outbound fetching (link previews) without the network."""
+
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class StubRoute:
+    body: bytes
+    status: int = 200
+    content_type: str = 'text/html; charset=utf-8'
+    delay: float = 0.0  # Seconds to wait before responding
+    chunk_size: int = 16 * 1024
+    chunk_delay: float = 0.0  # Seconds to wait between body chunks (simulates a slow link)
+
+
+class StubHTTPServer:
+    """
+    Threaded HTTP server serving canned responses per path.
+
+    Records how many requests each path received, from which client ports (one port per
+    TCP connection) and how many body bytes were actually written before the client hung
+    up, so tests can assert on all three.
+    """
+
+    def __init__(self):
+        self.routes: dict[str, StubRoute] = {}
+        self.hits: dict[str, int] = {}
+        self.client_ports: dict[str, list[int]] = {}
+        self.bytes_sent: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def url(self, path: str) -> str:
+        return f'{self.base_url}{path}'
+
+    def add(self, path: str, body: bytes | str, **kwargs) -> str:
+        """Register a route and return its absolute URL."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.routes[path] = StubRoute(body=body, **kwargs)
+        return self.url(path)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _record_hit(self, path: str, client_port: int):
+        # Before responding: a client that has its response must also see the hit
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            self.client_ports.setdefault(path, []).append(client_port)
+
+    def _record_sent(self, path: str, sent: int):
+        with self._lock:
+            self.bytes_sent[path] = self.bytes_sent.get(path, 0) + sent
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):  # noqa: N802
+                stub._record_hit(self.path, self.client_address[1])
+                route = stub.routes.get(self.path)
+                if route is None:
+                    route = StubRoute(body=b'not found', status=404, content_type='text/plain')
+                if route.delay:
+                    time.sleep(route.delay)
+
+                sent = 0
+                try:
+                    self.send_response(route.status)
+                    self.send_header('Content-Type', route.content_type)
+                    self.send_header('Content-Length', str(len(route.body)))
+                    self.end_headers()
+                    for start in range(0, len(route.body), route.chunk_size):
+                        chunk = route.body[start : start + route.chunk_size]
+                        self.wfile.write(chunk)
+                        sent += len(chunk)
+                        if route.chunk_delay:
+                            time.sleep(route.chunk_delay)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client stopped reading early - that is what the byte cap tests look for
+                    self.close_connection = True
+                finally:
+                    stub._record_sent(self.path, sent)
+
+            def log_message(self, format, *args):  # noqa: A002
+                pass
+
+        return Handler
@@ -0,0 +1,88 @@
+"""
+Integration tests for background image upload, listing and deletion.
+"""
+
+import io
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.routers import background_images
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + bytes(64)
+
+
+def upload(client: TestClient, name: str = 'bg.png') -> dict:
+    """Upload a background image and return the response body."""
+    response = client.post(
+        '/api/background-images/upload',
+        files={'file': (name, io.BytesIO(PNG_BYTES), 'image/png')},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestBackgroundImages:
+    """Test the /api/background-images endpoints."""
+
+    def test_upload_list_delete(self, client: TestClient, db_session):
+        """Test an uploaded image is listed, stored as a row, and removed on delete."""
+        uploaded = upload(client, 'sunset.png')
+
+        assert uploaded['original_filename'] == 'sunset.png'
+        assert uploaded['size'] == len(PNG_BYTES)
+        assert db_session.query(models.BackgroundImage).filter_by(id=uploaded['id']).count() == 1
+        assert (background_images.BACKGROUNDS_DIR / uploaded['filename']).exists()
+
+        listing = client.get('/api/background-images/list').json()
+        assert [image['id'] for image in listing] == [uploaded['id']]
+
+        assert client.delete(f"/api/background-images/{uploaded['id']}").status_code == 200
+        assert client.get('/api/background-images/list').json() == []
+        assert not (background_images.BACKGROUNDS_DIR / uploaded['filename']).exists()
+
+    def test_listing_is_in_upload_order(self, client: TestClient):
+        """Test the list keeps the order images were uploaded in."""
+        ids = [upload(client, f'{n}.png')['id'] for n in range(3)]
+
+        listing = client.get('/api/background-images/list').json()
+
+        assert [image['id'] for image in listing] == ids
+        for image_id in ids:
+            client.delete(f'/api/background-images/{image_id}')
+
+    def test_listing_cache_sees_writes(self, client: TestClient):
+        """Test the cached listing is refreshed after uploads and deletes."""
+        assert client.get('/api/background-images/list').json() == []
+        first = upload(client)
+        assert len(client.get('/api/background-images/list').json()) == 1
+
+        # Cached response is reused while nothing changes
+        assert client.get('/api/background-images/list').json() == client.get('/api/background-images/list').json()
+
+        client.delete(f"/api/background-images/{first['id']}")
+        assert client.get('/api/background-images/list').json() == []
+
+    def test_listing_cache_sees_rows_from_other_writers(self, client: TestClient, db_session):
+        """Test a row inserted behind the endpoint's back (e.g. another worker) still shows up."""
+        client.get('/api/background-images/list')
+        db_session.add(models.BackgroundImage(id='external', filename='external.png', original_filename='x.png'))
+        db_session.commit()
+
+        listing = client.get('/api/background-images/list').json()
+
+        assert [image['id'] for image in listing] == ['external']
+
+    def test_rejects_non_images(self, client: TestClient):
+        """Test non-image uploads are refused without creating rows."""
+        response = client.post(
+            '/api/background-images/upload',
+            files={'file': ('notes.txt', io.BytesIO(b'hi'), 'text/plain')},
+        )
+
+        assert response.status_code == 400
+        assert client.get('/api/background-images/list').json() == []
+
+    def test_delete_missing_image(self, client: TestClient):
+        """Test deleting an unknown id returns 404."""
+        assert client.delete('/api/background-images/missing').status_code == 404
@@ -5,6 +5,7 @@ Integration tests for custom emoji API endpoints.
 import io
 
 from fastapi.testclient import TestClient
+from PIL import Image
 
 
 class TestCustomEmojisAPI:
@@ -211,3 +212,107 @@ class TestCustomEmojisAPI:
         # Find our test emojis
         test_names = [n for n in names if n in ['zebra', 'apple', 'mango']]
         assert test_names == ['apple', 'mango', 'zebra']
+
+
+def make_emoji_png(color: tuple[int, int, int], size: int = 200) -> bytes:
+    """Create an in-memory solid-colour PNG."""
+    buffer = io.BytesIO()
+    Image.new('RGBA', (size, size), color=(*color, 255)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def create_emoji(client: TestClient, name: str, color: tuple[int, int, int]) -> dict:
+    """Upload a custom emoji and return the response body."""
+    response = client.post(
+        '/api/custom-emojis',
+        data={'name': name, 'category': 'Test', 'keywords': ''},
+        files={'file': (f'{name}.png', io.BytesIO(make_emoji_png(color)), 'image/png')},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestCustomEmojiProcessing:
+    """Test uploaded emojis are normalised in the worker pool."""
+
+    def test_upload_is_resized_to_emoji_size(self, client: TestClient):
+        """Test large uploads are stored as 64x64 PNGs."""
+        emoji = create_emoji(client, 'big_red', (255, 0, 0))
+
+        image = Image.open(io.BytesIO(client.get(emoji['image_url']).content))
+
+        assert image.format == 'PNG'
+        assert image.size == (64, 64)
+
+    def test_undecodable_image_rejected(self, client: TestClient):
+        """Test files that claim to be images but aren't return 400."""
+        response = client.post(
+            '/api/custom-emojis',
+            data={'name': 'broken', 'category': 'Test', 'keywords': ''},
+            files={'file': ('broken.png', io.BytesIO(b'not really a png'), 'image/png')},
+        )
+
+        assert response.status_code == 400
+        assert 'failed to process image' in response.json()['detail'].lower()
+
+
+class TestCustomEmojiSprite:
+    """Test the sprite sheet endpoint."""
+
+    def test_sprite_contains_every_emoji_at_its_offset(self, client: TestClient):
+        """Test each emoji's pixels are found at the coordinates in the map."""
+        colors = {'blue_one': (0, 0, 255), 'green_one': (0, 255, 0), 'red_one': (255, 0, 0)}
+        for name, color in colors.items():
+            create_emoji(client, name, color)
+
+        sprite = client.get('/api/custom-emojis/sprite').json()
+
+        assert [emoji['name'] for emoji in sprite['emojis']] == sorted(colors)
+        assert sprite['size'] == 64
+        assert sprite['columns'] == 2
+        sheet = Image.open(io.BytesIO(client.get(sprite['image_url']).content)).convert('RGBA')
+        assert sheet.size == (128, 128)
+        for emoji in sprite['emojis']:
+            assert sheet.getpixel((emoji['x'] + 32, emoji['y'] + 32)) == (*colors[emoji['name']], 255)
+
+    def test_sprite_is_cached_until_set_changes(self, client: TestClient):
+        """Test the version only changes when emojis are added or removed."""
+        first = create_emoji(client, 'cached_one', (10, 20, 30))
+        version = client.get('/api/custom-emojis/sprite').json()['version']
+
+        assert client.get('/api/custom-emojis/sprite').json()['version'] == version
+
+        create_emoji(client, 'cached_two', (40, 50, 60))
+        added = client.get('/api/custom-emojis/sprite').json()
+        assert added['version'] != version
+        assert len(added['emojis']) == 2
+
+        client.delete(f"/api/custom-emojis/{first['id']}")
+        removed = client.get('/api/custom-emojis/sprite').json()
+        assert [emoji['name'] for emoji in removed['emojis']] == ['cached_two']
+        # Superseded sheets are cleaned up
+        assert client.get(added['image_url']).status_code == 404
+
+    def test_sprite_images_are_immutable_and_webp_available(self, client: TestClient):
+        """Test both sheet formats are served with long-lived cache headers."""
+        create_emoji(client, 'webp_one', (1, 2, 3))
+        sprite = client.get('/api/custom-emojis/sprite').json()
+
+        png = client.get(sprite['image_url'])
+        webp = client.get(sprite['webp_url'])
+
+        assert png.headers['content-type'] == 'image/png'
+        assert webp.headers['content-type'] == 'image/webp'
+        assert 'immutable' in webp.headers['cache-control']
+
+    def test_empty_sprite(self, client: TestClient):
+        """Test the endpoint works with no custom emojis."""
+        response = client.get('/api/custom-emojis/sprite')
+
+        assert response.status_code == 200
+        assert response.json()['emojis'] == []
+
+    def test_unknown_sprite_file(self, client: TestClient):
+        """Test arbitrary filenames under /sprite are rejected."""
+        assert client.get('/api/custom-emojis/sprite/emoji-sprite-deadbeef.png').status_code == 404
+        assert client.get('/api/custom-emojis/sprite/other.png').status_code == 404
@@ -0,0 +1,87 @@
+"""
+Integration tests for the day context endpoint (GET /api/day/{date}/context).
+"""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def query_count(response) -> int:
+    """Number of SQL statements reported in the Server-Timing header."""
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries', response.headers['server-timing'])
+    assert match, response.headers['server-timing']
+    return int(match.group(1))
+
+
+def add_entries(client: TestClient, date: str, count: int, label_id: int, list_id: int) -> None:
+    for i in range(count):
+        entry_id = client.post(f'/api/entries/note/{date}', json={'content': f'<p>Entry {i}</p>'}).json()['id']
+        client.post(f'/api/labels/entry/{entry_id}/label/{label_id}')
+        client.post(f'/api/lists/{list_id}/entries/{entry_id}')
+        client.post('/api/reminders', json={'entry_id': entry_id, 'reminder_datetime': '2030-01-01T09:00:00'})
+
+
+@pytest.mark.integration
+class TestDayContextAPI:
+    """Test GET /api/day/{date}/context."""
+
+    def test_matches_the_individual_endpoints(self, client: TestClient):
+        """Test the aggregate carries the same data as the separate page-load calls."""
+        label_id = client.post('/api/labels/', json={'name': 'ops', 'color': '#ff0000'}).json()['id']
+        list_id = client.post('/api/lists', json={'name': 'Backlog'}).json()['id']
+        client.post('/api/lists/kanban/initialize')
+        client.post('/api/goals/sprint', json={'text': 'Ship it', 'start_date': '2025-11-01', 'end_date': '2025-11-14'})
+        client.post('/api/goals/quarterly', json={'text': 'Grow', 'start_date': '2025-12-01', 'end_date': '2026-02-28'})
+        client.patch('/api/settings', json={'daily_goal_end_time': '18:30'})
+        add_entries(client, '2025-11-07', 2, label_id, list_id)
+
+        response = client.get('/api/day/2025-11-07/context')
+
+        assert response.status_code == 200
+        context = response.json()
+        assert context['date'] == '2025-11-07'
+        assert context['note'] == client.get('/api/notes/2025-11-07').json()
+        assert [entry['reminder']['reminder_datetime'] for entry in context['note']['entries']] == [
+            '2030-01-01T09:00:00'
+        ] * 2
+        assert context['sprint_goal'] == client.get('/api/goals/sprint/2025-11-07').json()
+        # No active quarterly goal: the next upcoming one
+        assert context['quarterly_goal'] == client.get('/api/goals/quarterly/2025-11-07').json()
+        assert context['settings'] == client.get('/api/settings').json()
+        assert context['labels'] == client.get('/api/labels/').json()
+        assert context['lists'] == client.get('/api/lists').json()
+        assert context['kanban_columns'] == client.get('/api/lists/kanban').json()
+
+    def test_empty_day(self, client: TestClient):
+        """Test a day without a note or goals returns nulls instead of 404s."""
+        response = client.get('/api/day/2025-11-07/context')
+
+        assert response.status_code == 200
+        context = response.json()
+        assert context['note'] is None
+        assert context['sprint_goal'] is None
+        assert context['quarterly_goal'] is None
+        assert context['labels'] == []
+
+    def test_query_count_does_not_grow_with_entries(self, client: TestClient):
+        """Test relationships are batched instead of loaded per entry or per list."""
+        label_id = client.post('/api/labels/', json={'name': 'ops', 'color': '#ff0000'}).json()['id']
+        list_id = client.post('/api/lists', json={'name': 'Backlog'}).json()['id']
+        client.post('/api/lists/kanban/initialize')
+        add_entries(client, '2025-11-07', 2, label_id, list_id)
+        add_entries(client, '2025-11-08', 12, label_id, list_id)
+
+        small = query_count(client.get('/api/day/2025-11-07/context'))
+        large = query_count(client.get('/api/day/2025-11-08/context'))
+
+        assert large == small
+        # Including the check for pinned entries to carry onto the day
+        assert small <= 15
+
+    def test_is_a_pure_read(self, client: TestClient):
+        """Test reading the context never creates the note."""
+        client.get('/api/day/2025-11-07/context')
+
+        assert client.get('/api/notes/2025-11-07').status_code == 404
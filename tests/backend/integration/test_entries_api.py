@@ -2,6 +2,9 @@
 Integration tests for Note Entry API endpoints.
 """
 
+import base64
+import re
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -252,3 +255,19 @@ class TestEntriesAPI:
 
         for created_id in created_ids:
             assert created_id in entry_ids_in_response
+
+    def test_inline_media_is_moved_to_uploads(self, client: TestClient, sample_daily_note: DailyNote):
+        """Test pasted base64 images are stored as uploads and the entry links to them."""
+        image = b'\x89PNG\r\n\x1a\n' + b'screenshot' * 100
+        data_uri = 'data:image/png;base64,' + base64.b64encode(image).decode()
+
+        response = client.post(
+            f'/api/entries/note/{sample_daily_note.date}', json={'content': f'<p>Pasted</p><img src="{data_uri}">'}
+        )
+
+        assert response.status_code == 201
+        content = response.json()['content']
+        assert 'base64' not in content
+        url = re.search(r'src="([^"]+)"', content).group(1)
+        assert url.startswith('/api/uploads/files/')
+        assert client.get(url).content == image
@@ -0,0 +1,161 @@
+"""
+Integration tests for entry revision history (list, restore, and storage).
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app import autosave, revisions
+from app.models import EntryRevision, NoteEntry
+
+
+@pytest.fixture(autouse=True)
+def immediate(monkeypatch):
+    """Every save is written when it is made."""
+    monkeypatch.setattr(autosave, 'coalescer', autosave.SaveCoalescer(0))
+
+
+@pytest.fixture
+def every_edit(monkeypatch):
+    """Every edit records the state it replaces (no interval)."""
+    monkeypatch.setattr(revisions, 'REVISION_INTERVAL_SECONDS', 0)
+
+
+def save(client: TestClient, entry_id: int, content: str) -> None:
+    assert client.patch(f'/api/entries/{entry_id}', json={'content': content}).status_code == 200
+
+
+@pytest.mark.integration
+class TestRevisionHistory:
+    """Test which changes keep the state they replace."""
+
+    def test_edit_keeps_previous_state(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test the first edit records the content and version it replaced."""
+        save(client, sample_note_entry.id, '<p>Edited</p>')
+
+        listed = client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()
+        assert [(r['reason'], r['version'], r['note_date']) for r in listed] == [('edit', 1, '2025-11-07')]
+
+        revision = client.get(f'/api/entries/{sample_note_entry.id}/revisions/{listed[0]["id"]}').json()
+        assert revision['content'] == '<p>This is a test entry.</p>'
+        assert revision['title'] == 'Test Entry'
+
+    def test_autosaves_within_interval_keep_one_revision(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test a run of autosaves records one revision, not one per save."""
+        for i in range(5):
+            save(client, sample_note_entry.id, f'<p>Typing {i}</p>')
+
+        assert len(client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()) == 1
+
+    def test_flag_changes_keep_nothing(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test changes that leave title and content alone are not revisions."""
+        client.post(f'/api/entries/{sample_note_entry.id}/toggle-pin')
+
+        assert client.get(f'/api/entries/{sample_note_entry.id}/revisions').json() == []
+
+    def test_unknown_revision(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test revisions are looked up within their entry."""
+        assert client.get(f'/api/entries/{sample_note_entry.id}/revisions/999').status_code == 404
+        assert client.post(f'/api/entries/{sample_note_entry.id}/revisions/999/restore').status_code == 404
+
+
+@pytest.mark.integration
+class TestRestore:
+    """Test restoring entries to earlier states."""
+
+    def test_restore_edited_entry(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test restoring brings the content back and keeps the state it replaced."""
+        save(client, sample_note_entry.id, '<p>Edited</p>')
+        revision_id = client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()[0]['id']
+
+        response = client.post(f'/api/entries/{sample_note_entry.id}/revisions/{revision_id}/restore')
+
+        assert response.status_code == 200
+        assert response.json()['content'] == '<p>This is a test entry.</p>'
+        assert response.json()['version'] == 3
+        assert response.headers['etag'] == '"3"'
+        listed = client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()
+        assert [r['reason'] for r in listed] == ['restore', 'edit']
+
+    def test_restore_deleted_entry(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test a deleted entry is listed and comes back with its id on its day."""
+        entry_id = sample_note_entry.id
+        assert client.delete(f'/api/entries/{entry_id}').status_code == 204
+
+        deleted = client.get('/api/entries/deleted').json()
+        assert [(r['entry_id'], r['reason']) for r in deleted] == [(entry_id, 'delete')]
+
+        response = client.post(f'/api/entries/{entry_id}/revisions/{deleted[0]["id"]}/restore')
+
+        assert response.status_code == 200
+        assert response.json()['id'] == entry_id
+        assert response.json()['version'] == 2
+        assert client.get('/api/entries/deleted').json() == []
+        entries = client.get('/api/entries/note/2025-11-07').json()
+        assert [e['content'] for e in entries] == ['<p>This is a test entry.</p>']
+
+    def test_restore_merged_entries(self, client: TestClient, multiple_entries: list[NoteEntry]):
+        """Test entries merged away with delete_originals can be restored."""
+        ids = [entry.id for entry in multiple_entries[:2]]
+        client.post('/api/entries/merge', json={'entry_ids': ids, 'delete_originals': True})
+
+        deleted = client.get('/api/entries/deleted').json()
+        assert sorted(r['entry_id'] for r in deleted) == ids
+        assert {r['reason'] for r in deleted} == {'merge'}
+
+        revision = next(r for r in deleted if r['entry_id'] == ids[0])
+        response = client.post(f'/api/entries/{ids[0]}/revisions/{revision["id"]}/restore')
+        assert response.json()['content'] == '<p>Content for entry 1</p>'
+
+    def test_new_entry_does_not_take_deleted_entrys_history(
+        self, client: TestClient, multiple_entries: list[NoteEntry]
+    ):
+        """Test the id of a deleted entry isn't given to the next entry created."""
+        last_id = multiple_entries[-1].id
+        client.delete(f'/api/entries/{last_id}')
+
+        created = client.post('/api/entries/note/2025-11-07', json={'content': '<p>New</p>'}).json()
+
+        assert created['id'] != last_id
+        assert client.get(f'/api/entries/{created["id"]}/revisions').json() == []
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures('every_edit')
+class TestStorage:
+    """Test revisions are stored as snapshots and deltas, within the retention limit."""
+
+    def test_edits_are_deltas_against_a_snapshot(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry
+    ):
+        """Test small edits of a long entry are stored as small deltas, and read back exactly."""
+        document = ''.join(f'<p>Line {i} of a long entry</p>' for i in range(500))
+        save(client, sample_note_entry.id, document)
+        for i in range(5):
+            save(client, sample_note_entry.id, document.replace('Line 100 ', f'Line {i} '))
+
+        stored = db_session.query(EntryRevision).order_by(EntryRevision.id).all()
+        assert [r.snapshot_id is None for r in stored] == [True, True, False, False, False, False]
+        assert all(r.snapshot_id == stored[1].id and len(r.data) < 100 for r in stored[2:])
+        for r in client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()[:4]:
+            content = client.get(f'/api/entries/{sample_note_entry.id}/revisions/{r["id"]}').json()['content']
+            assert content.count('<p>') == 500
+
+    def test_oldest_snapshot_groups_are_dropped(
+        self, client: TestClient, db_session: Session, monkeypatch, sample_note_entry: NoteEntry
+    ):
+        """Test retention drops whole snapshot groups once an entry has too many revisions."""
+        monkeypatch.setattr(revisions, 'MAX_REVISIONS_PER_ENTRY', 10)
+        monkeypatch.setattr(revisions, 'SNAPSHOT_EVERY', 4)
+        document = ''.join(f'<p>Line {i} of a long entry</p>' for i in range(100))
+        for i in range(30):
+            save(client, sample_note_entry.id, document + f'<p>Edit {i}</p>')
+
+        stored = db_session.query(EntryRevision).order_by(EntryRevision.id).all()
+        assert len(stored) <= 10
+        assert stored[0].snapshot_id is None
+        assert {r.snapshot_id or r.id for r in stored} == {r.id for r in stored if r.snapshot_id is None}
+        latest = client.get(f'/api/entries/{sample_note_entry.id}/revisions').json()[0]
+        content = client.get(f'/api/entries/{sample_note_entry.id}/revisions/{latest["id"]}').json()['content']
+        assert content.endswith('<p>Edit 28</p>')
@@ -0,0 +1,362 @@
+"""
+Integration tests for versioned entry saves (If-Match) and coalesced autosaves.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import autosave
+from app.content_patch import content_hash
+from app.models import NoteEntry
+
+PIXEL = 'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=='
+
+
+def if_match(version: int) -> dict:
+    return {'If-Match': f'"{version}"'}
+
+
+def stored(db_session: Session, entry_id: int) -> tuple[str, int]:
+    """The entry's content and version as written to the database."""
+    db_session.commit()
+    return tuple(
+        db_session.execute(text('SELECT content, version FROM note_entries WHERE id = :id'), {'id': entry_id}).one()
+    )
+
+
+@pytest.fixture
+def immediate(monkeypatch):
+    """Every save is written when it is made."""
+    monkeypatch.setattr(autosave, 'coalescer', autosave.SaveCoalescer(0))
+
+
+@pytest.fixture
+def coalescing(monkeypatch):
+    """Versioned autosaves wait (for the rest of the test) for the ones that follow."""
+    coalescer = autosave.SaveCoalescer(60)
+    monkeypatch.setattr(autosave, 'coalescer', coalescer)
+    return coalescer
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures('immediate')
+class TestVersionedSaves:
+    """Test If-Match checks on entry saves."""
+
+    def test_entry_has_version_and_etag(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test entries start at version 1, also sent as the ETag."""
+        response = client.get(f'/api/entries/{sample_note_entry.id}')
+
+        assert response.json()['version'] == 1
+        assert response.headers['etag'] == '"1"'
+
+    def test_save_with_current_version(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test a save naming the current version applies and bumps it."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Edited</p>'}, headers=if_match(1)
+        )
+
+        assert response.status_code == 200
+        assert response.json()['content'] == '<p>Edited</p>'
+        assert response.json()['version'] == 2
+        assert response.headers['etag'] == '"2"'
+
+    def test_stale_save_is_rejected(self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry):
+        """Test a save based on an older version gets 412 and leaves the entry alone."""
+        client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>From laptop</p>'}, headers=if_match(1)
+        )
+
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>From phone</p>'}, headers=if_match(1)
+        )
+
+        assert response.status_code == 412
+        assert response.headers['etag'] == '"2"'
+        assert stored(db_session, sample_note_entry.id) == ('<p>From laptop</p>', 2)
+
+    def test_weak_etag_is_accepted(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test the ETag as weakened by response compression still names the version."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'title': 'Renamed'}, headers={'If-Match': 'W/"1"'}
+        )
+
+        assert response.status_code == 200
+
+    def test_invalid_if_match(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test an If-Match that names no version is a bad request."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'title': 'Renamed'}, headers={'If-Match': '"abc"'}
+        )
+
+        assert response.status_code == 400
+
+    def test_flags_keep_the_version(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test toggles don't invalidate the version an editor is saving against."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'is_important': True})
+        client.post(f'/api/entries/{sample_note_entry.id}/toggle-pin')
+
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Edited</p>'}, headers=if_match(1)
+        )
+
+        assert response.status_code == 200
+
+    def test_unversioned_save_still_bumps(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test saves without If-Match apply as before and move the version on."""
+        response = client.put(f'/api/entries/{sample_note_entry.id}', json={'title': 'Renamed'})
+
+        assert response.status_code == 200
+        assert response.json()['version'] == 2
+
+
+@pytest.mark.integration
+class TestCoalescedSaves:
+    """Test versioned autosaves within the window are written once."""
+
+    def test_saves_are_acknowledged_then_written_once(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test rapid saves answer with the coming version and are written together on the next read."""
+        entry_id = sample_note_entry.id
+        first = client.patch(f'/api/entries/{entry_id}', json={'content': '<p>Dep</p>'}, headers=if_match(1))
+        second = client.patch(f'/api/entries/{entry_id}', json={'content': '<p>Deploy</p>'}, headers=if_match(2))
+        third = client.patch(f'/api/entries/{entry_id}', json={'title': 'Release'}, headers=if_match(2))
+
+        assert [response.status_code for response in (first, second, third)] == [200, 200, 200]
+        assert third.json()['version'] == 2
+        assert third.json()['content'] == '<p>Deploy</p>'
+        assert third.json()['excerpt'] == 'Deploy'
+        assert third.headers['etag'] == '"2"'
+        assert stored(db_session, entry_id) == ('<p>This is a test entry.</p>', 1)
+
+        entry = client.get(f'/api/entries/{entry_id}').json()
+
+        assert (entry['title'], entry['content'], entry['version']) == ('Release', '<p>Deploy</p>', 2)
+        assert stored(db_session, entry_id) == ('<p>Deploy</p>', 2)
+
+    def test_other_requests_see_pending_saves(
+        self, client: TestClient, sample_note_entry: NoteEntry, sample_daily_note, coalescing
+    ):
+        """Test list reads (and anything else) run after pending saves are written."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Deploy</p>'}, headers=if_match(1))
+
+        entries = client.get(f'/api/entries/note/{sample_daily_note.date}').json()
+
+        assert entries[0]['content'] == '<p>Deploy</p>'
+        assert not coalescing.has_pending()
+
+    def test_conflicting_save_within_the_window(self, client: TestClient, sample_note_entry: NoteEntry, coalescing):
+        """Test a save from another tab, still at the old version, gets 412 while one is pending."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Tab one</p>'}, headers=if_match(1))
+
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Tab two</p>'}, headers=if_match(1)
+        )
+
+        assert response.status_code == 412
+        assert response.headers['etag'] == '"2"'
+
+    def test_next_window_starts_from_the_written_version(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test a save after the window writes the pending one and starts a new window."""
+        coalescing.window_seconds = 0.05
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>One</p>'}, headers=if_match(1))
+        time.sleep(0.1)
+
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Two</p>'}, headers=if_match(2)
+        )
+
+        assert response.json()['version'] == 3
+        assert stored(db_session, sample_note_entry.id) == ('<p>One</p>', 2)
+
+    def test_flag_change_writes_pending_save_first(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test other changes to the entry apply on top of its pending save."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Deploy</p>'}, headers=if_match(1))
+
+        response = client.patch(f'/api/entries/{sample_note_entry.id}', json={'is_completed': True})
+
+        assert response.json()['is_completed'] is True
+        assert response.json()['content'] == '<p>Deploy</p>'
+        assert stored(db_session, sample_note_entry.id) == ('<p>Deploy</p>', 2)
+
+    def test_change_from_another_worker_drops_the_pending_save(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test a pending save isn't written over a newer version, and its client gets 412 next time."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Mine</p>'}, headers=if_match(1))
+        db_session.execute(
+            text("UPDATE note_entries SET content = '<p>Theirs</p>', version = 2 WHERE id = :id"),
+            {'id': sample_note_entry.id},
+        )
+        db_session.commit()
+
+        client.get(f'/api/entries/{sample_note_entry.id}')
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Mine again</p>'}, headers=if_match(2)
+        )
+
+        assert response.status_code == 412
+        assert stored(db_session, sample_note_entry.id) == ('<p>Theirs</p>', 2)
+
+    def test_inline_media_is_written_immediately(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test content with pasted images isn't held back (it is rewritten when stored)."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json={'content': f'<img src="{PIXEL}">'}, headers=if_match(1)
+        )
+
+        assert response.json()['version'] == 2
+        assert 'base64' not in response.json()['content']
+        assert not coalescing.has_pending()
+
+    def test_failed_write_stays_pending(
+        self, client: TestClient, db_session: Session, monkeypatch, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test an acknowledged save whose write fails is kept and written by the next flush."""
+        client.patch(f'/api/entries/{sample_note_entry.id}', json={'content': '<p>Deploy</p>'}, headers=if_match(1))
+
+        def failing_commit():
+            raise OperationalError('COMMIT', {}, Exception('disk I/O error'))
+
+        with monkeypatch.context() as patched:
+            patched.setattr(db_session, 'commit', failing_commit)
+            assert coalescing.flush(db_session) == 0
+        assert coalescing.has_pending()
+
+        entry = client.get(f'/api/entries/{sample_note_entry.id}').json()
+
+        assert (entry['content'], entry['version']) == ('<p>Deploy</p>', 2)
+        assert stored(db_session, sample_note_entry.id) == ('<p>Deploy</p>', 2)
+
+
+@pytest.mark.integration
+class TestSeveralWorkers:
+    """Test saves spread over worker processes, each with its own coalescer."""
+
+    def test_coalescing_is_off_with_several_workers(self, monkeypatch):
+        """Test the window is 0 when WEB_CONCURRENCY says there is more than one worker."""
+        monkeypatch.setenv('WEB_CONCURRENCY', '4')
+
+        assert autosave.coalesce_window() == 0
+        assert autosave.coalesce_window(workers=1) == autosave.AUTOSAVE_COALESCE_MS / 1000
+
+    def test_saves_alternating_between_workers(
+        self, client: TestClient, db_session: Session, monkeypatch, sample_note_entry: NoteEntry
+    ):
+        """Test each acknowledged version is in the database for the next save or read, whichever worker gets it."""
+        workers = [autosave.SaveCoalescer(autosave.coalesce_window(workers=2)) for _ in range(2)]
+        entry_id = sample_note_entry.id
+
+        for version in range(1, 5):
+            monkeypatch.setattr(autosave, 'coalescer', workers[version % 2])
+            response = client.patch(
+                f'/api/entries/{entry_id}', json={'content': f'<p>Draft {version}</p>'}, headers=if_match(version)
+            )
+            assert response.status_code == 200
+            assert response.json()['version'] == version + 1
+
+            monkeypatch.setattr(autosave, 'coalescer', workers[(version + 1) % 2])
+            assert client.get(f'/api/entries/{entry_id}').json()['content'] == f'<p>Draft {version}</p>'
+
+        assert stored(db_session, entry_id) == ('<p>Draft 4</p>', 5)
+
+
+def patch_for(base: str, ops: list, result: str) -> dict:
+    return {'content_patch': {'base_hash': content_hash(base), 'ops': ops, 'result_hash': content_hash(result)}}
+
+
+@pytest.mark.integration
+class TestContentPatches:
+    """Test saves that send edits instead of the whole content."""
+
+    BASE = '<p>This is a test entry.</p>'
+    EDITED = '<p>This is a patched entry.</p>'
+    OPS = [13, -4, 'patched']
+
+    @pytest.mark.usefixtures('immediate')
+    def test_patch_is_applied(self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry):
+        """Test the ops are applied to the stored content and the result kept."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json=patch_for(self.BASE, self.OPS, self.EDITED)
+        )
+
+        assert response.status_code == 200
+        assert response.json()['content'] == self.EDITED
+        assert response.json()['excerpt'] == 'This is a patched entry.'
+        assert stored(db_session, sample_note_entry.id) == (self.EDITED, 2)
+
+    @pytest.mark.usefixtures('immediate')
+    def test_patch_for_other_content_is_rejected(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry
+    ):
+        """Test a patch computed against content the server doesn't have gets 409."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json=patch_for('<p>Older text</p>', [3, -5], '<p>text</p>')
+        )
+
+        assert response.status_code == 409
+        assert stored(db_session, sample_note_entry.id) == (self.BASE, 1)
+
+    @pytest.mark.usefixtures('immediate')
+    def test_unexpected_result_is_rejected(self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry):
+        """Test a patch that doesn't produce the content the client expects isn't kept."""
+        response = client.patch(
+            f'/api/entries/{sample_note_entry.id}', json=patch_for(self.BASE, [13, -4, 'patched'], '<p>Else</p>')
+        )
+
+        assert response.status_code == 422
+        assert stored(db_session, sample_note_entry.id) == (self.BASE, 1)
+
+    @pytest.mark.usefixtures('immediate')
+    def test_content_and_patch_together_is_rejected(self, client: TestClient, sample_note_entry: NoteEntry):
+        """Test a save can't send both."""
+        body = {'content': self.EDITED, **patch_for(self.BASE, self.OPS, self.EDITED)}
+
+        response = client.patch(f'/api/entries/{sample_note_entry.id}', json=body)
+
+        assert response.status_code == 400
+
+    def test_patches_apply_to_the_pending_save(
+        self, client: TestClient, db_session: Session, sample_note_entry: NoteEntry, coalescing
+    ):
+        """Test a patch following a coalesced save is computed against the acknowledged content."""
+        entry_id = sample_note_entry.id
+        client.patch(f'/api/entries/{entry_id}', json=patch_for(self.BASE, self.OPS, self.EDITED), headers=if_match(1))
+        final = '<p>This is a patched entry!</p>'
+
+        response = client.patch(
+            f'/api/entries/{entry_id}', json=patch_for(self.EDITED, [26, -1, '!'], final), headers=if_match(2)
+        )
+
+        assert response.json()['content'] == final
+        assert stored(db_session, entry_id) == (self.BASE, 1)
+        assert client.get(f'/api/entries/{entry_id}').json()['content'] == final
+
+    def test_patches_alternating_between_workers(
+        self, client: TestClient, db_session: Session, monkeypatch, sample_note_entry: NoteEntry
+    ):
+        """Test a patch is applied whichever worker gets it (with several workers nothing is held back)."""
+        workers = [autosave.SaveCoalescer(autosave.coalesce_window(workers=2)) for _ in range(2)]
+        entry_id = sample_note_entry.id
+        final = '<p>This is a patched entry!</p>'
+
+        monkeypatch.setattr(autosave, 'coalescer', workers[0])
+        client.patch(f'/api/entries/{entry_id}', json=patch_for(self.BASE, self.OPS, self.EDITED), headers=if_match(1))
+        monkeypatch.setattr(autosave, 'coalescer', workers[1])
+        response = client.patch(
+            f'/api/entries/{entry_id}', json=patch_for(self.EDITED, [26, -1, '!'], final), headers=if_match(2)
+        )
+
+        assert response.status_code == 200
+        assert stored(db_session, entry_id) == (final, 3)
@@ -0,0 +1,63 @@
+"""
+Integration tests for view=card|full on list-style entry endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Markup the excerpt leaves out, standing in for large rich text
+CONTENT = '<p>Release <b>notes</b></p><span data-layout="' + 'A' * 5000 + '"></span>'
+
+
+@pytest.fixture
+def entry(client: TestClient) -> dict:
+    created = client.post('/api/entries/note/2025-11-07', json={'content': CONTENT, 'title': 'Release'}).json()
+    list_id = client.post('/api/lists', json={'name': 'Backlog'}).json()['id']
+    client.post(f'/api/lists/{list_id}/entries/{created["id"]}')
+    client.post('/api/reminders', json={'entry_id': created['id'], 'reminder_datetime': '2000-01-01T09:00:00'})
+    return {**created, 'list_id': list_id}
+
+
+@pytest.mark.integration
+class TestEntryViews:
+    """Test card views send the excerpt instead of the content."""
+
+    def test_entry_responses_include_the_excerpt(self, entry):
+        """Test saved entries carry their plain-text excerpt."""
+        assert entry['excerpt'] == 'Release notes'
+        assert entry['content'] == CONTENT
+
+    def test_card_views_omit_content(self, client: TestClient, entry):
+        """Test every list-style endpoint returns the excerpt without the content for view=card."""
+        card_entries = [
+            client.get('/api/search/', params={'q': 'Release', 'view': 'card'}).json()[0],
+            client.get('/api/search/all', params={'q': 'Release', 'view': 'card'}).json()['entries'][0],
+            client.get(f'/api/lists/{entry["list_id"]}', params={'view': 'card'}).json()['entries'][0],
+            client.get('/api/notes/', params={'view': 'card'}).json()[0]['entries'][0],
+            client.get('/api/notes/month/2025/11', params={'view': 'card'}).json()[0]['entries'][0],
+            client.get('/api/reminders', params={'view': 'card'}).json()[0]['entry'],
+            client.get('/api/reminders/due', params={'view': 'card'}).json()[0]['entry'],
+        ]
+
+        for card in card_entries:
+            assert card['content'] is None
+            assert card['excerpt'] == 'Release notes'
+            assert card['title'] == 'Release'
+
+    def test_full_view_is_the_default(self, client: TestClient, entry):
+        """Test existing clients still get the content."""
+        assert client.get('/api/search/', params={'q': 'Release'}).json()[0]['content'] == CONTENT
+        assert client.get(f'/api/lists/{entry["list_id"]}').json()['entries'][0]['content'] == CONTENT
+        assert client.get('/api/notes/month/2025/11').json()[0]['entries'][0]['content'] == CONTENT
+        assert client.get('/api/reminders').json()[0]['entry']['content'] == CONTENT
+
+    def test_card_payload_is_smaller(self, client: TestClient, entry):
+        """Test the card view doesn't ship the content markup."""
+        full = client.get(f'/api/lists/{entry["list_id"]}', params={'view': 'full'})
+        card = client.get(f'/api/lists/{entry["list_id"]}', params={'view': 'card'})
+
+        assert len(card.content) < len(full.content) - 5000
+
+    def test_unknown_view_is_rejected(self, client: TestClient):
+        """Test view only accepts card or full."""
+        assert client.get('/api/search/', params={'view': 'compact'}).status_code == 422
@@ -19,10 +19,8 @@ class TestNotFoundErrors:
         """Test GET /api/notes/{date} with non-existent date."""
         response = client.get('/api/notes/9999-99-99')
 
-        # Note: As of migration 017, getting a note triggers pinned entry copying
-        # which creates the note if it doesn't exist, so we expect 200 with empty entries
-        assert response.status_code == 200
-        assert response.json()['entries'] == []
+        # Reads don't create notes (pinned entries are carried forward by the rollover job)
+        assert response.status_code == 404
 
     def test_get_nonexistent_entry(self, client: TestClient):
         """Test GET /api/entries/{id} with non-existent ID."""
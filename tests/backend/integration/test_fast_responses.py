@@ -0,0 +1,153 @@
+"""
+Integration tests for the orjson fast path of the list-style endpoints.
+
+These routes return FastJSONResponse with dicts built from row projections, so FastAPI no
+longer validates them against the response_model; the tests check the dicts still match it.
+"""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import schemas
+
+
+def query_count(response) -> int:
+    """Number of SQL statements reported in the Server-Timing header."""
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries', response.headers['server-timing'])
+    assert match, response.headers['server-timing']
+    return int(match.group(1))
+
+
+def assert_matches_schema(data, schema) -> None:
+    """The response is exactly what validating it against the schema would have sent."""
+    adapter = TypeAdapter(schema)
+    assert adapter.dump_python(adapter.validate_python(data), mode='json') == data
+
+
+@pytest.fixture
+def workspace(client: TestClient) -> dict:
+    """Two days of entries with labels, a list, a kanban column and reminders."""
+    label_id = client.post('/api/labels/', json={'name': 'ops', 'color': '#ff0000'}).json()['id']
+    list_id = client.post('/api/lists', json={'name': 'Backlog', 'description': 'Later'}).json()['id']
+    client.post(f'/api/lists/{list_id}/labels/{label_id}')
+    column_id = client.post('/api/lists/kanban/initialize').json()['columns'][0]['id']
+    entry_ids = []
+    for date in ('2025-11-06', '2025-11-07'):
+        for title in ('Deploy', 'Review'):
+            entry_id = client.post(f'/api/entries/note/{date}', json={'content': f'<p>{title} ü</p>', 'title': title})
+            entry_id = entry_id.json()['id']
+            client.post(f'/api/labels/entry/{entry_id}/label/{label_id}')
+            client.post(f'/api/lists/{list_id}/entries/{entry_id}')
+            client.post(f'/api/lists/{column_id}/entries/{entry_id}')
+            client.post('/api/reminders', json={'entry_id': entry_id, 'reminder_datetime': '2000-01-01T09:00:00'})
+            entry_ids.append(entry_id)
+        client.post(f'/api/labels/note/{date}/label/{label_id}')
+    return {'label_id': label_id, 'list_id': list_id, 'column_id': column_id, 'entry_ids': entry_ids}
+
+
+@pytest.mark.integration
+class TestFastResponses:
+    """Test projected responses keep their documented shape."""
+
+    def test_list_matches_schema(self, client: TestClient, workspace):
+        """Test GET /api/lists/{id} sends a complete ListWithEntries."""
+        data = client.get(f'/api/lists/{workspace["list_id"]}').json()
+
+        assert_matches_schema(data, schemas.ListWithEntries)
+        assert data['entry_count'] == 4
+        assert [label['name'] for label in data['labels']] == ['ops']
+        entry = data['entries'][0]
+        assert entry['daily_note_date'] == '2025-11-06'
+        assert entry['content'] == '<p>Deploy ü</p>'
+        assert [label['name'] for label in entry['labels']] == ['ops']
+        assert {lst['name'] for lst in entry['lists']} == {'Backlog', 'To Do'}
+
+    def test_list_entries_follow_the_list_order(self, client: TestClient, workspace):
+        """Test entries come back by their position in the list."""
+        list_id = client.post('/api/lists', json={'name': 'Ordered'}).json()['id']
+        for position, entry_id in enumerate(reversed(workspace['entry_ids'])):
+            client.post(f'/api/lists/{list_id}/entries/{entry_id}', params={'order_index': position})
+
+        data = client.get(f'/api/lists/{list_id}').json()
+
+        assert [entry['id'] for entry in data['entries']] == list(reversed(workspace['entry_ids']))
+
+    def test_reminders_match_schema(self, client: TestClient, workspace):
+        """Test both reminder listings send complete ReminderWithEntry items."""
+        for path in ('/api/reminders', '/api/reminders/due'):
+            data = client.get(path).json()
+
+            assert_matches_schema(data, list[schemas.ReminderWithEntry])
+            assert len(data) == 4
+            assert data[0]['entry']['daily_note_date'] == '2025-11-06'
+            assert data[0]['entry']['content'] == '<p>Deploy ü</p>'
+
+    def test_all_notes_include_labels_and_lists(self, client: TestClient, workspace):
+        """Test GET /api/notes/ still sends each note's and entry's labels and lists."""
+        data = client.get('/api/notes/').json()
+
+        assert_matches_schema(data, list[schemas.DailyNote])
+        assert [note['date'] for note in data] == ['2025-11-07', '2025-11-06']
+        assert [label['name'] for label in data[0]['labels']] == ['ops']
+        entry = data[0]['entries'][0]
+        assert entry['daily_note_date'] == '2025-11-07'
+        assert [label['name'] for label in entry['labels']] == ['ops']
+        assert {lst['name'] for lst in entry['lists']} == {'Backlog', 'To Do'}
+        assert {'description', 'is_kanban', 'kanban_order'} <= set(entry['lists'][0])
+
+    def test_month_notes_match_schema(self, client: TestClient, workspace):
+        """Test GET /api/notes/month/... sends complete DailyNotes, entries in their display order."""
+        for view in ('full', 'card'):
+            data = client.get('/api/notes/month/2025/11', params={'view': view}).json()
+
+            assert_matches_schema(data, list[schemas.DailyNote])
+            assert [note['date'] for note in data] == ['2025-11-06', '2025-11-07']
+            assert [entry['title'] for entry in data[0]['entries']] == ['Review', 'Deploy']
+            assert {lst['name'] for lst in data[0]['entries'][0]['lists']} == {'Backlog', 'To Do'}
+
+    def test_search_all_separates_lists_and_columns(self, client: TestClient, workspace):
+        """Test /api/search/all still splits an entry's lists from its kanban columns."""
+        data = client.get('/api/search/all', params={'q': 'Deploy'}).json()
+
+        entry = data['entries'][0]
+        assert sorted(entry['list_names']) == ['Backlog', 'To Do']
+        assert entry['regular_lists'] == [{'id': workspace['list_id'], 'name': 'Backlog', 'is_kanban': False}]
+        assert entry['kanban_columns'] == [{'id': workspace['column_id'], 'name': 'To Do', 'is_kanban': True}]
+        assert entry['labels'] == [{'id': workspace['label_id'], 'name': 'ops', 'color': '#ff0000'}]
+
+    def test_query_count_does_not_grow_with_results(self, client: TestClient, workspace):
+        """Test labels and lists are loaded per response, not per note or entry."""
+        paths = [
+            '/api/notes/',
+            '/api/notes/month/2025/11',
+            '/api/notes/month/2025/11?view=card',
+            '/api/search/all',
+            f'/api/lists/{workspace["list_id"]}',
+            '/api/reminders',
+        ]
+        before = [query_count(client.get(path)) for path in paths]
+
+        for date in ('2025-11-08', '2025-11-09', '2025-11-10'):
+            entry_id = client.post(f'/api/entries/note/{date}', json={'content': '<p>More</p>'}).json()['id']
+            client.post(f'/api/labels/entry/{entry_id}/label/{workspace["label_id"]}')
+            client.post(f'/api/lists/{workspace["list_id"]}/entries/{entry_id}')
+            client.post('/api/reminders', json={'entry_id': entry_id, 'reminder_datetime': '2000-01-01T09:00:00'})
+
+        assert [query_count(client.get(path)) for path in paths] == before
+
+    def test_projected_routes_keep_their_response_model(self, client: TestClient):
+        """Test the OpenAPI schema still documents what the projected routes send."""
+        paths = client.get('/openapi.json').json()['paths']
+
+        schema = paths['/api/notes/']['get']['responses']['200']['content']['application/json']['schema']
+        assert schema['items'] == {'$ref': '#/components/schemas/DailyNote'}
+
+    def test_validated_routes_use_orjson(self, client: TestClient, workspace):
+        """Test routes that still go through their response_model send the same JSON as before."""
+        response = client.get('/api/labels/')
+
+        assert response.headers['content-type'] == 'application/json'
+        assert response.content.startswith(b'[{"name":"ops","color":"#ff0000","id":')
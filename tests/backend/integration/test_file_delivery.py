@@ -0,0 +1,184 @@
+"""
+Integration tests for cache headers, conditional requests, byte ranges and
+precompressed delivery of uploaded files and background images.
+"""
+
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.file_delivery import IMMUTABLE_CACHE_CONTROL, parse_range
+
+VIDEO_BYTES = bytes(range(256)) * 64  # 16KB of non-compressible-looking data
+TEXT_BYTES = b'line of a notebook export\n' * 400
+
+
+def upload(client: TestClient, name: str, data: bytes, content_type: str) -> str:
+    """Upload a file and return its /api/uploads/files/... URL."""
+    response = client.post('/api/uploads/file', files={'file': (name, io.BytesIO(data), content_type)})
+    assert response.status_code == 200
+    return response.json()['url']
+
+
+class TestCacheHeaders:
+    """Test Cache-Control and ETag revalidation."""
+
+    def test_uuid_files_are_immutable(self, client: TestClient):
+        """Test uuid-named uploads get a long-lived immutable Cache-Control."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers['accept-ranges'] == 'bytes'
+        assert response.headers['etag']
+
+    def test_inline_media_files_are_immutable(self, client: TestClient, isolated_data_dirs):
+        """Test the content-addressed files extracted from entry content are immutable too."""
+        (isolated_data_dirs / 'inline-0123456789abcdef0123456789abcdef.png').write_bytes(b'png')
+        (isolated_data_dirs / 'inline-notes.txt').write_bytes(b'text')
+
+        immutable = client.get('/api/uploads/files/inline-0123456789abcdef0123456789abcdef.png')
+        other = client.get('/api/uploads/files/inline-notes.txt')
+
+        assert immutable.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+        assert other.headers['cache-control'] == 'no-cache'
+
+    def test_matching_etag_returns_304(self, client: TestClient):
+        """Test If-None-Match with the current ETag returns Not Modified."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+        etag = client.get(url).headers['etag']
+
+        response = client.get(url, headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+
+    def test_stale_etag_returns_full_body(self, client: TestClient):
+        """Test a non-matching ETag returns the file."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url, headers={'If-None-Match': '"stale"'})
+
+        assert response.status_code == 200
+        assert response.content == VIDEO_BYTES
+
+
+class TestRangeRequests:
+    """Test byte-range support for media seeking."""
+
+    def test_range_returns_partial_content(self, client: TestClient):
+        """Test a bounded range returns 206 with the requested slice."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url, headers={'Range': 'bytes=100-199'})
+
+        assert response.status_code == 206
+        assert response.content == VIDEO_BYTES[100:200]
+        assert response.headers['content-range'] == f'bytes 100-199/{len(VIDEO_BYTES)}'
+        assert response.headers['content-length'] == '100'
+
+    def test_open_ended_and_suffix_ranges(self, client: TestClient):
+        """Test `start-` and `-N` range forms."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        assert client.get(url, headers={'Range': 'bytes=16000-'}).content == VIDEO_BYTES[16000:]
+        assert client.get(url, headers={'Range': 'bytes=-10'}).content == VIDEO_BYTES[-10:]
+
+    def test_unsatisfiable_range_returns_416(self, client: TestClient):
+        """Test ranges starting past the end are rejected."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url, headers={'Range': f'bytes={len(VIDEO_BYTES)}-'})
+
+        assert response.status_code == 416
+        assert response.headers['content-range'] == f'bytes */{len(VIDEO_BYTES)}'
+
+    def test_if_range_mismatch_returns_full_file(self, client: TestClient):
+        """Test a stale If-Range validator ignores the Range header."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url, headers={'Range': 'bytes=0-9', 'If-Range': '"old"'})
+
+        assert response.status_code == 200
+        assert response.content == VIDEO_BYTES
+
+    @pytest.mark.parametrize(
+        ('header', 'expected'),
+        [
+            ('bytes=0-0', (0, 0)),
+            ('bytes=5-1000', (5, 99)),
+            ('bytes=-200', (0, 99)),
+            ('bytes=0-1,5-6', None),
+            ('items=0-1', None),
+            ('bytes=abc', None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        """Test range header parsing against a 100-byte file."""
+        assert parse_range(header, 100) == expected
+
+
+class TestPrecompressedDelivery:
+    """Test gzip variants of text-like files."""
+
+    def test_text_file_served_gzipped(self, client: TestClient):
+        """Test compressible files are sent with Content-Encoding: gzip."""
+        url = upload(client, 'export.ipynb', TEXT_BYTES, 'application/json')
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['vary'] == 'Accept-Encoding'
+        assert int(response.headers['content-length']) < len(TEXT_BYTES)
+        # The test client transparently decompresses
+        assert response.content == TEXT_BYTES
+
+    def test_identity_when_gzip_not_accepted(self, client: TestClient):
+        """Test clients that don't accept gzip get the raw file."""
+        url = upload(client, 'export.ipynb', TEXT_BYTES, 'application/json')
+
+        response = client.get(url, headers={'Accept-Encoding': 'identity'})
+
+        assert 'content-encoding' not in response.headers
+        assert response.content == TEXT_BYTES
+
+    def test_gzip_etag_revalidates(self, client: TestClient):
+        """Test the gzip variant's ETag also produces a 304."""
+        url = upload(client, 'export.ipynb', TEXT_BYTES, 'application/json')
+        etag = client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['etag']
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+        assert response.status_code == 304
+
+    def test_images_are_not_recompressed(self, client: TestClient):
+        """Test already-compressed media is served as-is."""
+        url = upload(client, 'clip.webm', VIDEO_BYTES, 'video/webm')
+
+        response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+
+        assert 'content-encoding' not in response.headers
+
+
+class TestBackgroundImageDelivery:
+    """Test background images share the same delivery layer."""
+
+    def test_background_image_cache_headers_and_ranges(self, client: TestClient):
+        """Test background images are immutable and support ranges and 304."""
+        data = b'\x89PNG\r\n\x1a\n' + bytes(2000)
+        uploaded = client.post(
+            '/api/background-images/upload', files={'file': ('bg.png', io.BytesIO(data), 'image/png')}
+        ).json()
+
+        response = client.get(uploaded['url'])
+        assert response.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+
+        assert client.get(uploaded['url'], headers={'Range': 'bytes=0-7'}).content == data[:8]
+        assert client.get(uploaded['url'], headers={'If-None-Match': response.headers['etag']}).status_code == 304
+
+        client.delete(f"/api/background-images/{uploaded['id']}")
@@ -0,0 +1,78 @@
+"""
+Integration tests for liveness/readiness endpoints and startup phase timings.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import startup_timing
+from app.database import get_db
+from app.main import app
+
+
+@pytest.fixture
+def fresh_startup():
+    """Clear recorded startup state so the app's startup hooks run again."""
+    startup_timing.reset()
+    yield
+    startup_timing.reset()
+
+
+class TestHealthEndpoints:
+    """Test /health and /health/ready."""
+
+    def test_health(self, client: TestClient):
+        """Test liveness always answers."""
+        response = client.get('/health')
+
+        assert response.status_code == 200
+        assert response.json() == {'status': 'healthy'}
+
+    def test_ready_after_startup(self, fresh_startup, client: TestClient):
+        """Test readiness reports the first-query phase once startup has run."""
+        response = client.get('/health/ready')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'ready'
+        assert data['ready_ms'] is not None
+        first_query = [phase for phase in data['phases'] if phase['name'] == 'first_query']
+        assert len(first_query) == 1
+        assert first_query[0]['status'] == 'ok'
+        assert first_query[0]['duration_ms'] >= 0
+
+    def test_not_ready_when_first_query_fails(self, fresh_startup, db_session):
+        """Test a broken database keeps readiness at 503 while liveness stays up."""
+
+        def broken_db():
+            raise RuntimeError('database unavailable')
+            yield  # pragma: no cover
+
+        app.dependency_overrides[get_db] = broken_db
+        try:
+            with TestClient(app) as client:
+                assert client.get('/health').status_code == 200
+                response = client.get('/health/ready')
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert response.json()['status'] == 'failed'
+        assert 'database unavailable' in response.json()['error']
+
+
+class TestStartupTiming:
+    """Test phase recording."""
+
+    def test_phase_records_duration_and_errors(self, fresh_startup):
+        """Test the phase context manager records successes and failures in order."""
+        with startup_timing.phase('db_init'):
+            pass
+        with pytest.raises(ValueError):
+            with startup_timing.phase('migrations'):
+                raise ValueError('boom')
+
+        phases = startup_timing.report()['phases']
+
+        assert [(phase['name'], phase['status']) for phase in phases] == [('db_init', 'ok'), ('migrations', 'error')]
+        assert startup_timing.report()['status'] == 'starting'
@@ -0,0 +1,122 @@
+"""
+Integration tests for resized/re-encoded upload variants (thumbnails, WebP).
+"""
+
+import io
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app import image_derivatives
+from app.image_derivatives import derivative_path, snap_width
+from app.routers import uploads
+
+
+def make_png(width: int, height: int) -> bytes:
+    """Create an in-memory PNG of the given size."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color=(200, 80, 40)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def upload_png(client: TestClient, width: int = 1600, height: int = 1200) -> str:
+    """Upload a PNG and return its served filename."""
+    response = client.post(
+        '/api/uploads/image', files={'file': ('photo.png', io.BytesIO(make_png(width, height)), 'image/png')}
+    )
+    assert response.status_code == 200
+    return response.json()['url'].split('/')[-1]
+
+
+class TestImageDerivatives:
+    """Test the ?w= and ?format= options on /api/uploads/files/{filename}."""
+
+    def test_original_served_without_options(self, client: TestClient):
+        """Test plain requests still return the original bytes."""
+        filename = upload_png(client)
+
+        response = client.get(f'/api/uploads/files/{filename}')
+
+        assert response.status_code == 200
+        assert Image.open(io.BytesIO(response.content)).size == (1600, 1200)
+
+    def test_width_resizes_and_keeps_aspect_ratio(self, client: TestClient):
+        """Test a thumbnail width produces a smaller image."""
+        filename = upload_png(client)
+
+        response = client.get(f'/api/uploads/files/{filename}?w=320')
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'image/png'
+        assert Image.open(io.BytesIO(response.content)).size == (320, 240)
+
+    def test_width_is_snapped_to_generated_sizes(self, client: TestClient):
+        """Test arbitrary widths round up to a fixed set so the cache stays bounded."""
+        filename = upload_png(client)
+
+        response = client.get(f'/api/uploads/files/{filename}?w=300')
+
+        assert Image.open(io.BytesIO(response.content)).width == snap_width(300) == 320
+
+    def test_webp_variant(self, client: TestClient):
+        """Test format=webp re-encodes the image."""
+        filename = upload_png(client)
+
+        response = client.get(f'/api/uploads/files/{filename}?w=640&format=webp')
+
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'image/webp'
+        image = Image.open(io.BytesIO(response.content))
+        assert image.format == 'WEBP'
+        assert image.width == 640
+
+    def test_derivative_is_cached(self, client: TestClient):
+        """Test the second request reuses the generated file."""
+        filename = upload_png(client)
+        client.get(f'/api/uploads/files/{filename}?w=160')
+        cached = derivative_path(uploads.UPLOAD_DIR / filename, 160, None)
+        mtime = cached.stat().st_mtime_ns
+
+        response = client.get(f'/api/uploads/files/{filename}?w=160')
+
+        assert response.status_code == 200
+        assert cached.stat().st_mtime_ns == mtime
+
+    def test_small_image_is_not_upscaled(self, client: TestClient):
+        """Test images narrower than the requested width are served as the original."""
+        filename = upload_png(client, width=100, height=50)
+
+        response = client.get(f'/api/uploads/files/{filename}?w=640')
+
+        assert Image.open(io.BytesIO(response.content)).size == (100, 50)
+
+    def test_original_is_remembered(self, client: TestClient, monkeypatch):
+        """Test a variant that turned out to be the original doesn't go back to the worker pool."""
+        filename = upload_png(client, width=100, height=50)
+        client.get(f'/api/uploads/files/{filename}?w=640')
+
+        def no_pool():
+            raise AssertionError('rendered again')
+
+        monkeypatch.setattr(image_derivatives, 'get_executor', no_pool)
+        response = client.get(f'/api/uploads/files/{filename}?w=640')
+
+        assert response.status_code == 200
+        assert Image.open(io.BytesIO(response.content)).size == (100, 50)
+
+    def test_non_image_ignores_options(self, client: TestClient):
+        """Test non-image files are served unchanged even with resize options."""
+        upload = client.post('/api/uploads/file', files={'file': ('notes.txt', io.BytesIO(b'hello'), 'text/plain')})
+        filename = upload.json()['url'].split('/')[-1]
+
+        response = client.get(f'/api/uploads/files/{filename}?w=320&format=webp')
+
+        assert response.status_code == 200
+        assert response.content == b'hello'
+
+    def test_invalid_options_rejected(self, client: TestClient):
+        """Test unsupported formats and widths are validated."""
+        filename = upload_png(client, width=10, height=10)
+
+        assert client.get(f'/api/uploads/files/{filename}?format=tiff').status_code == 422
+        assert client.get(f'/api/uploads/files/{filename}?w=0').status_code == 422
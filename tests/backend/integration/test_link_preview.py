@@ -0,0 +1,235 @@
+"""
+Integration tests for link preview fetching against a local stub HTTP server.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.http_client import close_http_client, fetch_head, get_http_client
+from app.routers import link_preview
+from app.routers.link_preview import BATCH_MAX_URLS, clear_preview_cache, fetch_preview
+
+OG_HEAD = """<!DOCTYPE html>
+<html><head>
+<title>Plain Title</title>
+<meta property="og:title" content="OG Title">
+<meta property="og:description" content="OG Description">
+<meta property="og:image" content="/images/cover.png">
+<meta property="og:site_name" content="Stub Site">
+</head>"""
+
+
+@pytest.fixture
+async def http_client_cleanup():
+    """Close the shared client so it isn't reused across event loops."""
+    yield
+    await close_http_client()
+
+
+class TestLinkPreviewAPI:
+    """Test the /api/link-preview/preview endpoint."""
+
+    def test_preview_extracts_open_graph_tags(self, client: TestClient, stub_server):
+        """Test Open Graph metadata is extracted and relative images made absolute."""
+        url = stub_server.add('/article', OG_HEAD + '<body><p>Body</p></body></html>')
+
+        response = client.post('/api/link-preview/preview', json={'url': url})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['title'] == 'OG Title'
+        assert data['description'] == 'OG Description'
+        assert data['image'] == stub_server.url('/images/cover.png')
+        assert data['site_name'] == 'Stub Site'
+
+    def test_preview_falls_back_to_twitter_and_meta_description(self, client: TestClient, stub_server):
+        """Test Twitter card and meta description fallbacks."""
+        url = stub_server.add(
+            '/twitter',
+            '<html><head><meta name="twitter:title" content="Tweet Title">'
+            '<meta name="description" content="Meta Description"></head><body></body></html>',
+        )
+
+        data = client.post('/api/link-preview/preview', json={'url': url}).json()
+
+        assert data['title'] == 'Tweet Title'
+        assert data['description'] == 'Meta Description'
+
+    def test_preview_not_found_returns_basic_preview(self, client: TestClient, stub_server):
+        """Test 404 responses return a basic preview instead of an error."""
+        response = client.post('/api/link-preview/preview', json={'url': stub_server.url('/missing')})
+
+        assert response.status_code == 200
+        assert 'access restricted or not found' in response.json()['description']
+
+    def test_preview_without_metadata_uses_domain(self, client: TestClient, stub_server):
+        """Test pages without metadata fall back to the domain name."""
+        url = stub_server.add('/bare', '<html><head></head><body>Nothing here</body></html>')
+
+        data = client.post('/api/link-preview/preview', json={'url': url}).json()
+
+        assert data['title'] == data['site_name']
+        assert data['description'] == 'Link preview not available'
+
+
+class TestFetchHead:
+    """Test head-only, byte-capped fetching."""
+
+    async def test_stops_reading_after_head(self, stub_server, http_client_cleanup):
+        """Test the body after </head> is not downloaded."""
+        body = OG_HEAD.encode() + b'<body>' + b'x' * (2 * 1024 * 1024) + b'</body></html>'
+        url = stub_server.add('/large', body, chunk_delay=0.005)
+
+        _, html = await fetch_head(url)
+
+        assert html.endswith(b'</head>')
+        assert b'og:title' in html
+        # Give the server thread a moment to record the aborted write
+        await asyncio.sleep(0.2)
+        assert stub_server.bytes_sent['/large'] < len(body) // 2
+
+    async def test_byte_cap_applies_without_head_end(self, stub_server, http_client_cleanup):
+        """Test pages without </head> are cut at max_bytes."""
+        url = stub_server.add('/no-head', b'<html><head>' + b'y' * 200_000)
+
+        _, html = await fetch_head(url, max_bytes=50_000)
+
+        assert len(html) == 50_000
+
+    async def test_head_end_split_across_chunks(self, stub_server, http_client_cleanup):
+        """Test </head> is found even when split between chunks."""
+        head = b'<html><head><title>T</title>' + b' ' * 1000
+        url = stub_server.add('/split', head + b'</he' + b'ad><body>' + b'z' * 5000, chunk_size=len(head) + 4)
+
+        _, html = await fetch_head(url)
+
+        assert html == head + b'</head>'
+
+    async def test_connections_are_pooled(self, stub_server, http_client_cleanup):
+        """Test repeated fetches go through the shared client over one kept-alive connection."""
+        url = stub_server.add('/pooled', OG_HEAD)
+
+        await fetch_head(url)
+        client = get_http_client()
+        await fetch_head(url)
+
+        assert get_http_client() is client
+        # Both requests arrived from the same client port, i.e. on the same TCP connection
+        [first_port, second_port] = stub_server.client_ports['/pooled']
+        assert first_port == second_port
+
+
+@pytest.mark.slow
+class TestLinkPreviewLatency:
+    """Latency benchmarks: previews must not block each other or the event loop."""
+
+    async def test_concurrent_previews_overlap(self, stub_server, http_client_cleanup):
+        """Test N slow previews complete in roughly the time of one."""
+        delay = 0.5
+        urls = [stub_server.add(f'/slow/{i}', OG_HEAD, delay=delay) for i in range(8)]
+
+        start = time.perf_counter()
+        previews = await asyncio.gather(*(fetch_preview(url) for url in urls))
+        elapsed = time.perf_counter() - start
+
+        assert all(preview.title == 'OG Title' for preview in previews)
+        assert elapsed < delay * 3
+
+    async def test_event_loop_stays_responsive(self, stub_server, http_client_cleanup):
+        """Test the event loop keeps ticking while a slow preview is in flight."""
+        url = stub_server.add('/slow-loop', OG_HEAD, delay=0.5)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await fetch_preview(url)
+        ticker_task.cancel()
+
+        # A blocking fetch would starve the ticker for the whole 0.5s delay
+        assert ticks > 20
+
+
+class TestLinkPreviewBatchAPI:
+    """Test the /api/link-preview/batch streaming endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        clear_preview_cache()
+        yield
+        clear_preview_cache()
+
+    def test_batch_streams_one_line_per_url(self, client: TestClient, stub_server):
+        """Test every requested URL yields one NDJSON preview line."""
+        urls = [stub_server.add(f'/page/{i}', OG_HEAD) for i in range(5)]
+
+        response = client.post('/api/link-preview/batch', json={'urls': urls})
+
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        previews = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(preview['url'] for preview in previews) == sorted(urls)
+        assert all(preview['title'] == 'OG Title' for preview in previews)
+
+    def test_batch_deduplicates_urls(self, client: TestClient, stub_server):
+        """Test duplicate URLs are fetched and returned once."""
+        url = stub_server.add('/dup', OG_HEAD)
+
+        response = client.post('/api/link-preview/batch', json={'urls': [url, url, url]})
+
+        assert len(response.text.splitlines()) == 1
+        assert stub_server.hits['/dup'] == 1
+
+    def test_batch_serves_cache_hits_without_fetching(self, client: TestClient, stub_server):
+        """Test previews cached by an earlier request are not refetched."""
+        cached_url = stub_server.add('/cached', OG_HEAD)
+        new_url = stub_server.add('/new', OG_HEAD)
+        client.post('/api/link-preview/preview', json={'url': cached_url})
+
+        response = client.post('/api/link-preview/batch', json={'urls': [new_url, cached_url]})
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        # Cache hits are streamed before any fetched preview
+        assert lines[0]['url'] == cached_url
+        assert stub_server.hits['/cached'] == 1
+        assert stub_server.hits['/new'] == 1
+
+    def test_batch_does_not_cache_failures(self, client: TestClient, stub_server):
+        """Test failed fetches fall back to a basic preview and are retried later."""
+        url = stub_server.url('/gone')
+
+        client.post('/api/link-preview/batch', json={'urls': [url]})
+        response = client.post('/api/link-preview/batch', json={'urls': [url]})
+
+        assert 'not found' in json.loads(response.text)['description']
+        assert stub_server.hits['/gone'] == 2
+
+    def test_batch_rejects_too_many_urls(self, client: TestClient):
+        """Test the URL count limit is enforced."""
+        urls = [f'https://example.com/{i}' for i in range(BATCH_MAX_URLS + 1)]
+
+        response = client.post('/api/link-preview/batch', json={'urls': urls})
+
+        assert response.status_code == 422
+
+    def test_batch_limits_concurrency_per_host(self, client: TestClient, stub_server, monkeypatch):
+        """Test a single host never sees more than the per-host limit at once."""
+        monkeypatch.setattr(link_preview, 'BATCH_PER_HOST_CONCURRENCY', 1)
+        delay = 0.2
+        urls = [stub_server.add(f'/polite/{i}', OG_HEAD, delay=delay) for i in range(3)]
+
+        start = time.perf_counter()
+        response = client.post('/api/link-preview/batch', json={'urls': urls})
+        elapsed = time.perf_counter() - start
+
+        assert len(response.text.splitlines()) == 3
+        # Same host, one at a time: requests are serialized
+        assert elapsed >= delay * 3
@@ -0,0 +1,92 @@
+"""
+Integration tests for request metrics, SQL query counting and Server-Timing.
+"""
+
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import metrics
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Start each test with empty route metrics."""
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def server_timing_queries(response) -> int:
+    """Number of SQL statements reported in the Server-Timing header."""
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries', response.headers['server-timing'])
+    assert match, response.headers['server-timing']
+    return int(match.group(1))
+
+
+def metric_value(text: str, name: str, route: str, method: str = 'GET', status: int = 200) -> float:
+    """Read one sample from the Prometheus exposition."""
+    pattern = rf'^{name}\{{method="{method}",route="{re.escape(route)}",status="{status}"\}} (\S+)$'
+    match = re.search(pattern, text, re.MULTILINE)
+    assert match, f'{name} for {method} {route} not found'
+    return float(match.group(1))
+
+
+class TestServerTiming:
+    """Test the Server-Timing response header."""
+
+    def test_header_reports_app_and_db_time(self, client: TestClient):
+        """Test every response carries app and db timings."""
+        response = client.get('/api/labels/')
+
+        assert response.status_code == 200
+        assert re.match(
+            r'app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries, \d+ rows"', response.headers['server-timing']
+        )
+        assert response.headers['timing-allow-origin'] == '*'
+
+    def test_query_count_reflects_handler_sql(self, client: TestClient):
+        """Test SQL issued by sync handlers is attributed to the request."""
+        assert server_timing_queries(client.get('/health')) == 0
+        assert server_timing_queries(client.get('/api/labels/')) >= 1
+
+
+class TestMetricsEndpoint:
+    """Test the Prometheus /metrics endpoint."""
+
+    def test_records_route_templates(self, client: TestClient):
+        """Test metrics are keyed by route template, not the concrete URL."""
+        client.post('/api/labels/', json={'name': 'Work', 'color': '#ff0000'})
+        client.post('/api/labels/', json={'name': 'Home', 'color': '#00ff00'})
+        for _ in range(3):
+            client.get('/api/labels/')
+        client.delete('/api/labels/999')
+
+        text = client.get('/metrics').text
+
+        assert metric_value(text, 'http_request_duration_seconds_count', '/api/labels/') == 3
+        assert metric_value(text, 'http_request_duration_seconds_count', '/api/labels/', 'POST', 201) == 2
+        assert metric_value(text, 'http_request_duration_seconds_count', '/api/labels/{label_id}', 'DELETE', 404) == 1
+        assert metric_value(text, 'http_sql_statements_total', '/api/labels/') >= 3
+        assert metric_value(text, 'http_orm_rows_loaded_total', '/api/labels/') == 6
+        assert metric_value(text, 'http_response_bytes_total', '/api/labels/') > 0
+
+    def test_histogram_buckets_are_cumulative(self, client: TestClient):
+        """Test the +Inf bucket matches the request count."""
+        client.get('/health')
+        client.get('/health')
+
+        text = client.get('/metrics').text
+
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/health",status="200",le="+Inf"} 2' in text
+        assert '# TYPE http_request_duration_seconds histogram' in text
+
+    def test_unknown_paths_are_grouped(self, client: TestClient):
+        """Test 404s for arbitrary URLs share one series."""
+        client.get('/no/such/page')
+        client.get('/another/missing/page')
+
+        text = client.get('/metrics').text
+
+        assert metric_value(text, 'http_request_duration_seconds_count', 'unmatched', status=404) == 2
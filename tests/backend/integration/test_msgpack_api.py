@@ -0,0 +1,85 @@
+"""
+Integration tests for Accept: application/msgpack responses and MessagePack request bodies.
+"""
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+
+from app import content_negotiation
+
+MSGPACK = {'Accept': 'application/msgpack'}
+
+
+def add_entries(client: TestClient) -> list[int]:
+    list_id = client.post('/api/lists', json={'name': 'Backlog'}).json()['id']
+    entry_ids = []
+    for title in ('Deploy', 'Review'):
+        entry = client.post('/api/entries/note/2025-11-07', json={'content': f'<p>{title}</p>', 'title': title})
+        entry_ids.append(entry.json()['id'])
+        client.post(f'/api/lists/{list_id}/entries/{entry_ids[-1]}')
+    return entry_ids
+
+
+@pytest.mark.integration
+class TestMsgpackResponses:
+    """Test MessagePack responses carry the same data as JSON."""
+
+    @pytest.mark.parametrize(
+        'path', ['/api/entries/note/2025-11-07', '/api/notes/', '/api/search/all', '/api/lists/1', '/api/labels/']
+    )
+    def test_same_data_as_json(self, client: TestClient, path):
+        """Test validated and projected routes send the JSON structure as MessagePack."""
+        add_entries(client)
+
+        response = client.get(path, headers=MSGPACK)
+
+        assert response.headers['content-type'] == 'application/msgpack'
+        assert 'Accept' in response.headers['vary']
+        assert msgpack.unpackb(response.content) == client.get(path).json()
+
+    def test_json_by_default(self, client: TestClient):
+        """Test clients that don't ask for MessagePack keep getting JSON."""
+        response = client.get('/api/labels/', headers={'Accept': 'application/json, application/msgpack;q=0.1'})
+
+        assert response.headers['content-type'] == 'application/json'
+
+    def test_errors_stay_json(self, client: TestClient):
+        """Test error responses are JSON whatever the Accept header says."""
+        response = client.get('/api/entries/999999', headers=MSGPACK)
+
+        assert response.status_code == 404
+        assert response.json() == {'detail': 'Entry not found'}
+
+
+@pytest.mark.integration
+class TestMsgpackRequests:
+    """Test MessagePack request bodies."""
+
+    def test_bulk_request_body(self, client: TestClient):
+        """Test a merge sent as MessagePack works like the JSON request."""
+        entry_ids = add_entries(client)
+        body = msgpack.packb({'entry_ids': entry_ids, 'separator': '\n', 'delete_originals': True})
+
+        response = client.post(
+            '/api/entries/merge', content=body, headers={**MSGPACK, 'Content-Type': 'application/msgpack'}
+        )
+
+        assert response.status_code == 201
+        assert msgpack.unpackb(response.content)['content'] == '<p>Deploy</p>\n<p>Review</p>'
+
+    def test_invalid_body_is_rejected(self, client: TestClient):
+        """Test a body that isn't MessagePack gets 400."""
+        response = client.post('/api/entries/merge', content=b'\xc1', headers={'Content-Type': 'application/msgpack'})
+
+        assert response.status_code == 400
+
+    def test_without_msgpack_installed(self, client: TestClient, monkeypatch):
+        """Test the API falls back to JSON, and rejects MessagePack bodies, when msgpack is missing."""
+        monkeypatch.setattr(content_negotiation, 'msgpack', None)
+
+        response = client.get('/api/labels/', headers=MSGPACK)
+        rejected = client.post('/api/entries/merge', content=b'\x80', headers={'Content-Type': 'application/msgpack'})
+
+        assert response.headers['content-type'] == 'application/json'
+        assert rejected.status_code == 415
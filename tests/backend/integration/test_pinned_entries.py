@@ -1,7 +1,8 @@
 """
 Integration tests for pinned entries feature.
 
-Tests the ability to pin note entries so they automatically copy to future days.
+Tests the ability to pin note entries so they automatically copy to future days
+(copied by the day rollover: the background job, or the first read of a day).
 """
 
 import time
@@ -63,14 +64,12 @@ def test_pinned_entry_copies_to_future_day(client: TestClient, db_session: Sessi
     # Pin the entry
     client.post(f'/api/entries/{entry_id}/toggle-pin')
 
-    # Access tomorrow's date (this should trigger the copy)
+    # Roll over to tomorrow (this copies the pinned entry)
+    rollover_response = client.post(f'/api/notes/{tomorrow}/rollover')
+    assert rollover_response.status_code == 200
+    assert rollover_response.json()['copied'] == 1
     tomorrow_response = client.get(f'/api/notes/{tomorrow}')
 
-    # If the note doesn't exist yet, it will be created by the copy logic
-    if tomorrow_response.status_code == 404:
-        # The copy logic creates the note, so try again
-        tomorrow_response = client.get(f'/api/entries/note/{tomorrow}')
-
     # Check that tomorrow has the pinned entry
     if tomorrow_response.status_code == 200:
         tomorrow_data = tomorrow_response.json()
@@ -122,7 +121,8 @@ def test_pinned_entry_with_labels(client: TestClient, db_session: Session):
     pin_response = client.post(f'/api/entries/{entry_id}/toggle-pin')
     assert pin_response.status_code == 200
 
-    # Access tomorrow (triggers copy) - use entries endpoint which is simpler
+    # Roll over to tomorrow (copies the entry) - use entries endpoint which is simpler
+    client.post(f'/api/notes/{tomorrow}/rollover')
     tomorrow_entries_response = client.get(f'/api/entries/note/{tomorrow}')
     assert tomorrow_entries_response.status_code == 200
 
@@ -159,7 +159,8 @@ def test_multiple_pinned_entries(client: TestClient, db_session: Session):
         pin_response = client.post(f'/api/entries/{entry_id}/toggle-pin')
         assert pin_response.status_code == 200
 
-    # Access tomorrow - use entries endpoint directly
+    # Roll over to tomorrow - use entries endpoint directly
+    client.post(f'/api/notes/{tomorrow}/rollover')
     tomorrow_entries_response = client.get(f'/api/entries/note/{tomorrow}')
     assert tomorrow_entries_response.status_code == 200
 
@@ -172,7 +173,7 @@ def test_multiple_pinned_entries(client: TestClient, db_session: Session):
 
 
 def test_pinned_entry_no_duplicate_on_multiple_access(client: TestClient, db_session: Session):
-    """Test that pinned entries don't duplicate when accessing the same day multiple times."""
+    """Test that pinned entries don't duplicate when rolling over the same day multiple times."""
     today = unique_date_future(0)
     tomorrow = unique_date_future(1)
 
@@ -188,9 +189,9 @@ def test_pinned_entry_no_duplicate_on_multiple_access(client: TestClient, db_ses
     pin_response = client.post(f'/api/entries/{entry_id}/toggle-pin')
     assert pin_response.status_code == 200
 
-    # Access tomorrow multiple times - use entries endpoint directly
+    # Roll over to tomorrow multiple times
     for _ in range(3):
-        client.get(f'/api/entries/note/{tomorrow}')
+        client.post(f'/api/notes/{tomorrow}/rollover')
 
     # Check that there's only one copy
     tomorrow_entries_response = client.get(f'/api/entries/note/{tomorrow}')
@@ -277,8 +278,9 @@ def test_delete_pinned_entry_unpins_all_copies(client: TestClient, db_session: S
     # Pin the entry
     client.patch(f'/api/entries/{entry1_id}', json={'is_pinned': True})
 
-    # Access Day 2 - should create a copy
+    # Roll over to Day 2 - should create a copy
     date2 = '2025-01-16'
+    client.post(f'/api/notes/{date2}/rollover')
     response = client.get(f'/api/notes/{date2}')
     day2_entries = response.json()['entries']
     assert len(day2_entries) == 1
@@ -286,8 +288,9 @@ def test_delete_pinned_entry_unpins_all_copies(client: TestClient, db_session: S
     assert entry2_id != entry1_id  # Different entry
     assert day2_entries[0]['is_pinned'] == 1  # Copy is also pinned
 
-    # Access Day 3 - should create another copy
+    # Roll over to Day 3 - should create another copy
     date3 = '2025-01-17'
+    client.post(f'/api/notes/{date3}/rollover')
     response = client.get(f'/api/notes/{date3}')
     day3_entries = response.json()['entries']
     assert len(day3_entries) == 1
@@ -315,11 +318,11 @@ def test_delete_pinned_entry_unpins_all_copies(client: TestClient, db_session: S
     assert response.status_code == 200
     assert response.json()['is_pinned'] == 0
 
-    # Access Day 4 - should NOT create a new copy (because all are unpinned)
+    # Roll over to Day 4 - should NOT create a new copy (because all are unpinned)
     date4 = '2025-01-18'
-    response = client.get(f'/api/notes/{date4}')
-    day4_entries = response.json()['entries']
-    assert len(day4_entries) == 0  # No pinned entries to copy
+    response = client.post(f'/api/notes/{date4}/rollover')
+    assert response.json()['copied'] == 0  # No pinned entries to copy
+    assert client.get(f'/api/notes/{date4}').status_code == 404
 
     # Verify Day 1 entry still exists (not deleted)
     response = client.get(f'/api/entries/{entry1_id}')
@@ -330,3 +333,28 @@ def test_delete_pinned_entry_unpins_all_copies(client: TestClient, db_session: S
     response = client.get(f'/api/entries/{entry3_id}')
     assert response.status_code == 200
     assert response.json()['title'] == 'Important Task'
+
+
+def test_first_read_of_a_day_copies_pinned_entries(client: TestClient, db_session: Session):
+    """Test any day read carries pinned entries forward, also onto days the background job doesn't cover."""
+    client.post('/api/notes/', json={'date': '2025-02-01'})
+    entry_response = client.post(
+        '/api/entries/note/2025-02-01', json={'content': 'Carry me', 'content_type': 'rich_text', 'order_index': 0}
+    )
+    client.post(f"/api/entries/{entry_response.json()['id']}/toggle-pin")
+
+    entries = client.get('/api/entries/note/2025-02-02').json()
+    assert [entry['content'] for entry in entries] == ['Carry me']
+    assert [e['content'] for e in client.get('/api/notes/2025-02-03').json()['entries']] == ['Carry me']
+    context = client.get('/api/day/2025-02-04/context').json()
+    assert [e['content'] for e in context['note']['entries']] == ['Carry me']
+
+    # Later reads find the day up to date and copy nothing more
+    assert len(client.get('/api/entries/note/2025-02-02').json()) == 1
+    assert client.post('/api/notes/2025-02-02/rollover').json()['copied'] == 0
+
+
+def test_reading_an_empty_day_creates_nothing(client: TestClient, db_session: Session):
+    """Test a day with nothing to carry forward is read without creating its note."""
+    assert client.get('/api/entries/note/2025-02-02').json() == []
+    assert client.get('/api/notes/2025-02-02').status_code == 404
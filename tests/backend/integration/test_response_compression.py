@@ -0,0 +1,61 @@
+"""
+Integration tests for response compression of API responses and uploaded files.
+"""
+
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+CONTENT = '<p>Standup notes: <b>deploy</b> the search fix, review the board</p>' * 50
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 16
+
+
+@pytest.mark.integration
+class TestResponseCompression:
+    """Test which responses are gzip-compressed."""
+
+    def test_large_json_is_compressed(self, client: TestClient):
+        """Test HTML-heavy JSON is gzipped for clients that accept it."""
+        client.post('/api/entries/note/2025-11-07', json={'content': CONTENT})
+
+        response = client.get('/api/entries/note/2025-11-07', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['content-encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['vary']
+        assert response.num_bytes_downloaded < len(CONTENT) / 5
+        assert response.json()[0]['content'] == CONTENT
+
+    def test_identity_when_not_accepted(self, client: TestClient):
+        """Test clients that don't accept gzip get the plain body."""
+        client.post('/api/entries/note/2025-11-07', json={'content': CONTENT})
+
+        response = client.get('/api/entries/note/2025-11-07', headers={'Accept-Encoding': 'identity'})
+
+        assert 'content-encoding' not in response.headers
+        assert response.json()[0]['content'] == CONTENT
+
+    def test_small_responses_are_not_compressed(self, client: TestClient):
+        """Test bodies under the size threshold are sent as they are."""
+        response = client.get('/health', headers={'Accept-Encoding': 'gzip'})
+
+        assert 'content-encoding' not in response.headers
+
+    def test_streamed_export_is_compressed(self, client: TestClient):
+        """Test the streamed backup export is compressed and still a complete download."""
+        client.post('/api/entries/note/2025-11-07', json={'content': CONTENT})
+
+        response = client.get('/api/backup/export', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['content-encoding'] == 'gzip'
+        assert response.headers['content-disposition'].startswith('attachment')
+        assert response.json()['notes'][0]['entries'][0]['content'] == CONTENT
+
+    def test_uploaded_media_is_not_recompressed(self, client: TestClient):
+        """Test images from the upload store are served as stored."""
+        upload = client.post('/api/uploads/file', files={'file': ('shot.png', io.BytesIO(PNG_BYTES), 'image/png')})
+
+        response = client.get(upload.json()['url'], headers={'Accept-Encoding': 'gzip'})
+
+        assert 'content-encoding' not in response.headers
+        assert response.content == PNG_BYTES
@@ -221,3 +221,16 @@ def test_search_all_includes_is_pinned_in_entries(client: TestClient, db_session
     assert entry_result is not None
     assert 'is_pinned' in entry_result
     assert entry_result['is_pinned'] is True
+
+
+def test_search_all_matches_word_prefixes_and_punctuated_text(client: TestClient, db_session: Session):
+    """Test searches find words by their start and dates as written (on SQLite and PostgreSQL)."""
+    client.post('/api/entries/note/2025-11-07', json={'content': '<p>Deployment notes for release 2025-11-07</p>'})
+
+    def found(q):
+        return len(client.get('/api/search/all', params={'q': q}).json()['entries'])
+
+    assert found('deploy') == 1
+    assert found('deployment notes') == 1
+    assert found('2025-11-07') == 1
+    assert found('rollback') == 0
@@ -0,0 +1,101 @@
+"""
+Integration tests for the opt-in slow-query log and its admin endpoint.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import slow_queries
+
+
+@pytest.fixture(autouse=True)
+def reset_slow_query_log():
+    """Leave capture disabled and the buffer empty around every test."""
+    slow_queries.set_threshold_ms(None)
+    slow_queries.clear()
+    yield
+    slow_queries.set_threshold_ms(None)
+    slow_queries.clear()
+
+
+class TestSlowQueryLog:
+    """Test capture of statements above the threshold."""
+
+    def test_disabled_by_default(self, client: TestClient):
+        """Test nothing is captured without a threshold."""
+        client.get('/api/search/?q=meeting')
+
+        data = client.get('/api/admin/slow-queries').json()
+
+        assert data['enabled'] is False
+        assert data['queries'] == []
+
+    def test_captures_statement_route_parameters_and_plan(self, client: TestClient):
+        """Test a captured query records its route, parameter types and query plan."""
+        assert client.put('/api/admin/slow-queries/config', json={'threshold_ms': 0}).status_code == 200
+
+        client.get('/api/search/?q=secret project')
+
+        queries = client.get('/api/admin/slow-queries').json()['queries']
+        # LIKE on SQLite, the full-text match on PostgreSQL
+        search = [query for query in queries if 'LIKE' in query['statement'].upper() or '@@' in query['statement']]
+        assert search, queries
+        entry = search[0]
+        assert entry['route'] == 'GET /api/search/'
+        assert entry['duration_ms'] >= 0
+        assert entry['plan'] and any('SCAN' in line.upper() or 'SEARCH' in line for line in entry['plan'])
+        # Only parameter types are kept, never the values
+        assert 'secret project' not in str(entry['parameters'])
+        assert 'str' in str(entry['parameters'])
+
+    def test_threshold_filters_fast_queries(self, client: TestClient):
+        """Test statements faster than the threshold are ignored."""
+        client.put('/api/admin/slow-queries/config', json={'threshold_ms': 60_000})
+
+        client.get('/api/labels/')
+
+        assert client.get('/api/admin/slow-queries').json()['queries'] == []
+
+    def test_clear_and_disable(self, client: TestClient):
+        """Test the buffer can be emptied and capture switched off again."""
+        client.put('/api/admin/slow-queries/config', json={'threshold_ms': 0})
+        client.get('/api/labels/')
+        assert client.get('/api/admin/slow-queries').json()['queries']
+
+        client.delete('/api/admin/slow-queries')
+        client.put('/api/admin/slow-queries/config', json={'threshold_ms': None})
+        client.get('/api/labels/')
+
+        data = client.get('/api/admin/slow-queries').json()
+        assert data['enabled'] is False
+        assert data['queries'] == []
+
+    def test_negative_threshold_rejected(self, client: TestClient):
+        """Test threshold validation."""
+        assert client.put('/api/admin/slow-queries/config', json={'threshold_ms': -1}).status_code == 422
+
+    def test_ring_buffer_is_bounded(self, client: TestClient, monkeypatch):
+        """Test only the most recent entries are kept."""
+        monkeypatch.setattr(slow_queries, '_entries', slow_queries.deque(maxlen=3))
+        client.put('/api/admin/slow-queries/config', json={'threshold_ms': 0})
+
+        for _ in range(5):
+            client.get('/api/labels/')
+
+        assert len(client.get('/api/admin/slow-queries').json()['queries']) == 3
+
+
+class TestParameterShape:
+    """Test parameter descriptions never include values."""
+
+    @pytest.mark.parametrize(
+        ('parameters', 'executemany', 'expected'),
+        [
+            (('%x%', 5), False, ['str', 'int']),
+            ({'name': 'a', 'id': 1}, False, {'name': 'str', 'id': 'int'}),
+            ([('a',), ('b',)], True, {'rows': 2, 'row': ['str']}),
+        ],
+    )
+    def test_parameter_shape(self, parameters, executemany, expected):
+        """Test tuples, dicts and executemany batches."""
+        assert slow_queries.parameter_shape(parameters, executemany) == expected
@@ -0,0 +1,101 @@
+"""
+Tests for migration 026: background image metadata moved from metadata.json into a table.
+"""
+
+import importlib.util
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location(
+        'migration_026', migrations_dir / '026_add_background_images_table.py'
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+LEGACY_IMAGES = [
+    {
+        'id': 'aaaa',
+        'filename': 'aaaa.png',
+        'original_filename': 'first.png',
+        'url': '/api/background-images/image/aaaa.png',
+        'content_type': 'image/png',
+        'size': 10,
+    },
+    {
+        'id': 'bbbb',
+        'filename': 'bbbb.jpg',
+        'original_filename': 'second.jpg',
+        'url': '/api/background-images/image/bbbb.jpg',
+        'content_type': 'image/jpeg',
+        'size': 20,
+    },
+]
+
+
+@pytest.mark.migration
+class TestMigration026:
+    """Test migration 026: Add background_images table."""
+
+    def test_imports_legacy_metadata_in_order(self, temp_db_file, tmp_path):
+        """Test legacy entries are imported, in order, and metadata.json is retired."""
+        metadata_file = tmp_path / 'metadata.json'
+        metadata_file.write_text(json.dumps(LEGACY_IMAGES))
+
+        assert load_migration().migrate_up(temp_db_file, metadata_file) is True
+
+        conn = sqlite3.connect(temp_db_file)
+        rows = conn.execute('SELECT id, original_filename, size FROM background_images ORDER BY created_at').fetchall()
+        conn.close()
+        assert rows == [('aaaa', 'first.png', 10), ('bbbb', 'second.jpg', 20)]
+        assert not metadata_file.exists()
+        assert (tmp_path / 'metadata.json.migrated').exists()
+
+    def test_is_idempotent(self, temp_db_file, tmp_path):
+        """Test running twice (even with metadata.json restored) doesn't duplicate rows."""
+        metadata_file = tmp_path / 'metadata.json'
+        metadata_file.write_text(json.dumps(LEGACY_IMAGES))
+        migration = load_migration()
+
+        assert migration.migrate_up(temp_db_file, metadata_file) is True
+        metadata_file.write_text(json.dumps(LEGACY_IMAGES))
+        assert migration.migrate_up(temp_db_file, metadata_file) is True
+
+        conn = sqlite3.connect(temp_db_file)
+        assert conn.execute('SELECT COUNT(*) FROM background_images').fetchone()[0] == 2
+        conn.close()
+
+    def test_without_legacy_metadata(self, temp_db_file, tmp_path):
+        """Test a fresh install just creates the table."""
+        assert load_migration().migrate_up(temp_db_file, tmp_path / 'metadata.json') is True
+
+        conn = sqlite3.connect(temp_db_file)
+        assert conn.execute('SELECT COUNT(*) FROM background_images').fetchone()[0] == 0
+        conn.close()
+
+    def test_down_restores_metadata_file(self, temp_db_file, tmp_path):
+        """Test rollback writes metadata.json back and drops the table."""
+        metadata_file = tmp_path / 'metadata.json'
+        metadata_file.write_text(json.dumps(LEGACY_IMAGES))
+        migration = load_migration()
+        migration.migrate_up(temp_db_file, metadata_file)
+
+        assert migration.migrate_down(temp_db_file, metadata_file) is True
+
+        assert json.loads(metadata_file.read_text()) == LEGACY_IMAGES
+        conn = sqlite3.connect(temp_db_file)
+        assert (
+            conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='background_images'").fetchone()
+            is None
+        )
+        conn.close()
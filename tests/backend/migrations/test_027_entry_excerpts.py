@@ -0,0 +1,86 @@
+"""
+Tests for migration 027: plain-text excerpts for note entries.
+"""
+
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location('migration_027', migrations_dir / '027_add_entry_excerpts.py')
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def create_legacy_db(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE note_entries (id INTEGER PRIMARY KEY, daily_note_id INTEGER, content TEXT, content_type TEXT)'
+    )
+    conn.executemany(
+        'INSERT INTO note_entries (daily_note_id, content, content_type) VALUES (1, ?, ?)',
+        [
+            ('<p>Deploy <b>v2</b> &amp; verify</p><img src="data:image/png;base64,AAAA">', 'rich_text'),
+            ('List<String> names = load();', 'code'),
+            ('', 'rich_text'),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def upgrade(path: str, migration) -> None:
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        assert migration.upgrade(conn) is True
+    engine.dispose()
+
+
+def excerpts(path: str) -> list[str]:
+    conn = sqlite3.connect(path)
+    rows = [row[0] for row in conn.execute('SELECT excerpt FROM note_entries ORDER BY id')]
+    conn.close()
+    return rows
+
+
+@pytest.mark.migration
+class TestMigration027:
+    """Test migration 027: Add entry excerpts."""
+
+    def test_adds_and_fills_excerpts(self, temp_db_file, monkeypatch):
+        """Test existing entries get plain-text excerpts, across several batches."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+        monkeypatch.setattr(migration, 'BATCH_SIZE', 2)
+
+        upgrade(temp_db_file, migration)
+
+        assert excerpts(temp_db_file) == ['Deploy v2 & verify', 'List<String> names = load();', '']
+
+    def test_is_idempotent(self, temp_db_file):
+        """Test running twice keeps the column and the excerpts."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+
+        upgrade(temp_db_file, migration)
+        upgrade(temp_db_file, migration)
+
+        assert excerpts(temp_db_file)[0] == 'Deploy v2 & verify'
+
+    def test_matches_the_app_excerpts(self):
+        """Test the migration's frozen copy produces the same excerpts as app.excerpts."""
+        from app.excerpts import make_excerpt
+
+        migration = load_migration()
+        content = '<h1>Title</h1>' + '<p>word </p>' * 100
+
+        assert migration.make_excerpt(content, 'rich_text') == make_excerpt(content, 'rich_text')
@@ -0,0 +1,87 @@
+"""
+Tests for migration 028: inline base64 media moved out of entry content.
+"""
+
+import base64
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+IMAGE_URI = 'data:image/jpeg;base64,' + base64.b64encode(b'\xff\xd8\xff' + b'jpeg' * 100).decode()
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location('migration_028', migrations_dir / '028_extract_inline_media.py')
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def create_db(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE note_entries (id INTEGER PRIMARY KEY, content TEXT, content_type TEXT)')
+    conn.executemany(
+        'INSERT INTO note_entries (content, content_type) VALUES (?, ?)',
+        [
+            (f'<p>Photo</p><img src="{IMAGE_URI}">', 'rich_text'),
+            (f'<img src="{IMAGE_URI}">', None),
+            (f'"{IMAGE_URI}"', 'code'),
+            ('<p>Text only</p>', 'rich_text'),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def upgrade(path: str, upload_dir: Path, migration) -> None:
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        assert migration.upgrade(conn, upload_dir) is True
+    engine.dispose()
+
+
+def contents(path: str) -> list[str]:
+    conn = sqlite3.connect(path)
+    rows = [row[0] for row in conn.execute('SELECT content FROM note_entries ORDER BY id')]
+    conn.close()
+    return rows
+
+
+@pytest.mark.migration
+class TestMigration028:
+    """Test migration 028: Extract inline media."""
+
+    def test_moves_media_to_uploads(self, temp_db_file, tmp_path, monkeypatch):
+        """Test rich text entries reference stored uploads; code and plain entries are unchanged."""
+        create_db(temp_db_file)
+        migration = load_migration()
+        monkeypatch.setattr(migration, 'BATCH_SIZE', 1)
+
+        upgrade(temp_db_file, tmp_path, migration)
+
+        [stored] = [path.name for path in tmp_path.iterdir()]
+        assert stored.endswith('.jpg')
+        rich, untyped, code, plain = contents(temp_db_file)
+        assert rich == f'<p>Photo</p><img src="/api/uploads/files/{stored}">'
+        assert untyped == f'<img src="/api/uploads/files/{stored}">'
+        assert code == f'"{IMAGE_URI}"'
+        assert plain == '<p>Text only</p>'
+
+    def test_is_idempotent(self, temp_db_file, tmp_path):
+        """Test a second run changes nothing."""
+        create_db(temp_db_file)
+        migration = load_migration()
+
+        upgrade(temp_db_file, tmp_path, migration)
+        after_first = contents(temp_db_file)
+        upgrade(temp_db_file, tmp_path, migration)
+
+        assert contents(temp_db_file) == after_first
+        assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,82 @@
+"""
+Tests for migration 029: version numbers for note entries.
+"""
+
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location('migration_029', migrations_dir / '029_add_entry_versions.py')
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def create_legacy_db(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE note_entries (id INTEGER PRIMARY KEY, daily_note_id INTEGER, content TEXT)')
+    conn.executemany(
+        'INSERT INTO note_entries (daily_note_id, content) VALUES (1, ?)', [('<p>First</p>',), ('<p>Second</p>',)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(path: str, step) -> None:
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        assert step(conn) is True
+    engine.dispose()
+
+
+def columns(path: str) -> set[str]:
+    conn = sqlite3.connect(path)
+    names = {row[1] for row in conn.execute('PRAGMA table_info(note_entries)')}
+    conn.close()
+    return names
+
+
+@pytest.mark.migration
+class TestMigration029:
+    """Test migration 029: Add entry versions."""
+
+    def test_existing_entries_start_at_version_1(self, temp_db_file):
+        """Test the column is added with version 1 for existing rows and new inserts."""
+        create_legacy_db(temp_db_file)
+
+        run(temp_db_file, load_migration().upgrade)
+
+        conn = sqlite3.connect(temp_db_file)
+        conn.execute("INSERT INTO note_entries (daily_note_id, content) VALUES (1, '<p>Third</p>')")
+        versions = [row[0] for row in conn.execute('SELECT version FROM note_entries ORDER BY id')]
+        conn.close()
+        assert versions == [1, 1, 1]
+
+    def test_is_idempotent(self, temp_db_file):
+        """Test running twice keeps a single version column."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+
+        run(temp_db_file, migration.upgrade)
+        run(temp_db_file, migration.upgrade)
+
+        assert 'version' in columns(temp_db_file)
+
+    def test_downgrade_drops_the_column(self, temp_db_file):
+        """Test downgrade removes the column and keeps the entries."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+        run(temp_db_file, migration.upgrade)
+
+        run(temp_db_file, migration.downgrade)
+
+        assert 'version' not in columns(temp_db_file)
@@ -0,0 +1,85 @@
+"""
+Tests for migration 030: entry revision history.
+"""
+
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location('migration_030', migrations_dir / '030_add_entry_revisions.py')
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    return migration
+
+
+def create_legacy_db(path: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE note_entries (id INTEGER PRIMARY KEY, daily_note_id INTEGER, content TEXT)')
+    conn.execute("INSERT INTO note_entries (daily_note_id, content) VALUES (1, '<p>First</p>')")
+    conn.commit()
+    conn.close()
+
+
+def run(path: str, step) -> None:
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        assert step(conn) is True
+    engine.dispose()
+
+
+def tables(path: str) -> set[str]:
+    conn = sqlite3.connect(path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")}
+    conn.close()
+    return names
+
+
+@pytest.mark.migration
+class TestMigration030:
+    """Test migration 030: Add entry revisions."""
+
+    def test_creates_the_table(self, temp_db_file):
+        """Test the table and its index are created and take revisions."""
+        create_legacy_db(temp_db_file)
+
+        run(temp_db_file, load_migration().upgrade)
+
+        assert {'entry_revisions', 'ix_entry_revisions_entry_id_id'} <= tables(temp_db_file)
+        conn = sqlite3.connect(temp_db_file)
+        conn.execute(
+            'INSERT INTO entry_revisions (entry_id, note_date, reason, version, size, data) '
+            "VALUES (1, '2026-10-19', 'delete', 1, 12, x'00')"
+        )
+        conn.close()
+
+    def test_is_idempotent(self, temp_db_file):
+        """Test running twice leaves one table."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+
+        run(temp_db_file, migration.upgrade)
+        run(temp_db_file, migration.upgrade)
+
+        assert 'entry_revisions' in tables(temp_db_file)
+
+    def test_downgrade_drops_the_table(self, temp_db_file):
+        """Test downgrade removes the table and keeps the entries."""
+        create_legacy_db(temp_db_file)
+        migration = load_migration()
+        run(temp_db_file, migration.upgrade)
+
+        run(temp_db_file, migration.downgrade)
+
+        assert 'entry_revisions' not in tables(temp_db_file)
+        conn = sqlite3.connect(temp_db_file)
+        assert conn.execute('SELECT COUNT(*) FROM note_entries').fetchone()[0] == 1
+        conn.close()
@@ -0,0 +1,209 @@
+"""
+Tests for the migration runner and its schema_migrations ledger.
+"""
+
+import importlib.util
+import os
+import sqlite3
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+
+import app.database
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+migrations_dir = Path(backend_path) / 'migrations'
+
+# Each fake migration logs its run so tests can see what was executed
+MIGRATION_TEMPLATE = """
+import sqlite3
+
+
+def migrate_up(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE IF NOT EXISTS runs (name TEXT)")
+    conn.execute("INSERT INTO runs VALUES (?)", ({name!r},))
+    conn.commit()
+    conn.close()
+    return {result}
+"""
+
+
+# A dialect-agnostic migration, run on a SQLAlchemy connection
+UPGRADE_TEMPLATE = """
+from sqlalchemy import text
+
+
+def upgrade(connection):
+    connection.execute(text("CREATE TABLE IF NOT EXISTS runs (name TEXT)"))
+    connection.execute(text("INSERT INTO runs VALUES (:name)"), {{"name": {name!r}}})
+    return {result}
+"""
+
+
+def load_runner():
+    spec = importlib.util.spec_from_file_location('run_migrations', migrations_dir / 'run_migrations.py')
+    runner = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(runner)
+    return runner
+
+
+def write_migration(directory: Path, filename: str, result: bool = True, extra: str = '') -> Path:
+    path = directory / filename
+    path.write_text(MIGRATION_TEMPLATE.format(name=filename, result=result) + extra)
+    return path
+
+
+def write_upgrade_migration(directory: Path, filename: str, result: bool = True) -> Path:
+    path = directory / filename
+    path.write_text(UPGRADE_TEMPLATE.format(name=filename, result=result))
+    return path
+
+
+def runs(db_path) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute('SELECT name FROM runs')]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def runner(temp_db_file, tmp_path, monkeypatch):
+    """The runner pointed at a temp database and a directory of fake migrations."""
+    module = load_runner()
+    monkeypatch.setattr(module, 'get_db_path_from_env', lambda: Path(temp_db_file))
+    monkeypatch.setattr(
+        module,
+        'get_migration_files',
+        lambda: sorted(tmp_path.glob('[0-9][0-9][0-9]_*.py')),
+    )
+    monkeypatch.setattr(app.database, 'engine', create_engine(f'sqlite:///{temp_db_file}'))
+    return module
+
+
+@pytest.mark.migration
+class TestMigrationLedger:
+    """Test pending-only migration runs."""
+
+    def test_first_run_applies_and_records_everything(self, runner, temp_db_file, tmp_path):
+        """Test all migrations run once and land in the ledger with checksums."""
+        first = write_migration(tmp_path, '001_first.py')
+        write_migration(tmp_path, '002_second.py')
+
+        assert runner.main() == 0
+
+        assert runs(temp_db_file) == ['001_first.py', '002_second.py']
+        conn = sqlite3.connect(temp_db_file)
+        ledger = dict(conn.execute('SELECT version, checksum FROM schema_migrations'))
+        conn.close()
+        assert ledger == {'001': runner.migration_checksum(first), '002': ledger['002']}
+
+    def test_second_run_skips_applied_migrations(self, runner, temp_db_file, tmp_path):
+        """Test an up-to-date database runs nothing."""
+        write_migration(tmp_path, '001_first.py')
+        runner.main()
+
+        assert runner.main() == 0
+
+        assert runs(temp_db_file) == ['001_first.py']
+
+    def test_only_new_migrations_run(self, runner, temp_db_file, tmp_path):
+        """Test adding a migration runs just that one."""
+        write_migration(tmp_path, '001_first.py')
+        runner.main()
+        write_migration(tmp_path, '002_second.py')
+
+        runner.main()
+
+        assert runs(temp_db_file) == ['001_first.py', '002_second.py']
+
+    def test_edited_migration_is_not_rerun(self, runner, temp_db_file, tmp_path, caplog):
+        """Test a migration whose checksum changed gets its new checksum recorded, with a warning, but isn't run."""
+        write_migration(tmp_path, '001_first.py')
+        runner.main()
+        edited = write_migration(tmp_path, '001_first.py', extra='\n# reformatted\n')
+
+        assert runner.main() == 0
+        assert runner.main() == 0
+
+        assert runs(temp_db_file) == ['001_first.py']
+        with app.database.engine.connect() as conn:
+            assert runner.get_applied_migrations(conn) == {'001': runner.migration_checksum(edited)}
+        assert [record.levelname for record in caplog.records if '001_first.py changed' in record.message] == [
+            'WARNING'
+        ]
+
+    def test_edited_migration_that_opts_in_is_rerun(self, runner, temp_db_file, tmp_path):
+        """Test an edited migration setting RERUN_ON_CHANGE is applied again, once."""
+        write_migration(tmp_path, '001_first.py')
+        runner.main()
+        write_migration(tmp_path, '001_first.py', extra='\nRERUN_ON_CHANGE = True\n')
+
+        runner.main()
+        runner.main()
+
+        assert runs(temp_db_file) == ['001_first.py', '001_first.py']
+
+    def test_failed_migration_is_not_recorded(self, runner, temp_db_file, tmp_path):
+        """Test a failing migration is retried on the next start."""
+        write_migration(tmp_path, '001_broken.py', result=False)
+
+        assert runner.main() == 1
+        assert runner.main() == 1
+
+        assert runs(temp_db_file) == ['001_broken.py', '001_broken.py']
+
+    def test_real_migrations_run_once_on_fresh_database(self, temp_db_file, tmp_path, monkeypatch):
+        """Test the shipped migrations apply cleanly and are all skipped on restart."""
+        # Keep migrations that touch static files away from the developer's data directory
+        monkeypatch.setenv('STATIC_FILES_DIR', str(tmp_path))
+        module = load_runner()
+        monkeypatch.setattr(module, 'get_db_path_from_env', lambda: Path(temp_db_file))
+        monkeypatch.setattr(app.database, 'engine', create_engine(f'sqlite:///{temp_db_file}'))
+
+        assert module.main() == 0
+
+        with app.database.engine.connect() as conn:
+            applied = module.get_applied_migrations(conn)
+        assert len(applied) == len(module.get_migration_files())
+        assert module.get_pending_migrations(module.get_migration_files(), applied) == ([], [])
+
+
+@pytest.mark.migration
+class TestMigrationStyles:
+    """Test dialect-agnostic upgrade() migrations alongside legacy sqlite3 ones."""
+
+    def test_upgrade_migrations_run_on_a_connection(self, runner, temp_db_file, tmp_path):
+        """Test upgrade(connection) migrations run in order with legacy ones and are recorded."""
+        write_migration(tmp_path, '001_legacy.py')
+        write_upgrade_migration(tmp_path, '002_portable.py')
+
+        assert runner.main() == 0
+        assert runner.main() == 0
+
+        assert runs(temp_db_file) == ['001_legacy.py', '002_portable.py']
+        with app.database.engine.connect() as conn:
+            assert set(runner.get_applied_migrations(conn)) == {'001', '002'}
+
+    def test_failed_upgrade_is_rolled_back(self, runner, temp_db_file, tmp_path):
+        """Test an upgrade() returning False leaves no changes and no ledger entry."""
+        write_migration(tmp_path, '001_legacy.py')
+        write_upgrade_migration(tmp_path, '002_portable.py', result=False)
+
+        assert runner.main() == 1
+
+        assert runs(temp_db_file) == ['001_legacy.py']
+        with app.database.engine.connect() as conn:
+            assert set(runner.get_applied_migrations(conn)) == {'001'}
+
+    def test_legacy_migrations_are_baselined_on_other_databases(self, tmp_path):
+        """Test sqlite3 migrations are not run against PostgreSQL (its schema comes from the models)."""
+        module = load_runner()
+        migration = module.load_migration(write_migration(tmp_path, '001_legacy.py'))
+        engine = SimpleNamespace(dialect=SimpleNamespace(name='postgresql'))
+
+        assert module.apply_migration(migration, engine, None) is True
+        assert not (tmp_path / 'runs').exists()
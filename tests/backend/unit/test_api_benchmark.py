@@ -0,0 +1,140 @@
+"""
+Unit tests for the API benchmark suite: synthetic data generation and result comparison.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.database import Base
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+sys.path.insert(0, os.path.join(backend_path, 'benchmarks'))
+
+import api_benchmark  # noqa: E402
+import synthetic_data  # noqa: E402
+
+TINY = synthetic_data.Scale(days=20, entries_per_day=6, labels=5, lists=3, kanban_columns=2)
+
+
+def _generate(seed):
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    counts = synthetic_data.generate(engine, TINY, seed=seed)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text('SELECT daily_note_id, title, content, is_pinned, created_at FROM note_entries ORDER BY id')
+        ).all()
+    return engine, counts, rows
+
+
+def _results(**scenarios):
+    return {
+        'results': {name: {'median_ms': ms, 'sql_statements': queries} for name, (ms, queries) in scenarios.items()}
+    }
+
+
+@pytest.mark.unit
+class TestSyntheticData:
+    """Test the benchmark data generator."""
+
+    def test_same_seed_generates_identical_rows(self):
+        """Test two runs with the same seed produce the same data."""
+        _, first_counts, first_rows = _generate(seed=1)
+        _, second_counts, second_rows = _generate(seed=1)
+
+        assert first_counts == second_counts
+        assert first_rows == second_rows
+
+    def test_different_seed_generates_different_rows(self):
+        """Test the seed actually drives the content."""
+        _, _, first_rows = _generate(seed=1)
+        _, _, second_rows = _generate(seed=2)
+
+        assert first_rows != second_rows
+
+    def test_one_note_per_day_with_related_rows(self):
+        """Test every day gets a note and entries carry labels and lists."""
+        engine, counts, _ = _generate(seed=0)
+
+        assert counts['daily_notes'] == TINY.days
+        assert counts['labels'] == TINY.labels
+        assert counts['lists'] == TINY.lists + TINY.kanban_columns
+        assert counts['note_entries'] > 0
+        assert counts['entry_labels'] > 0
+        with engine.connect() as conn:
+            assert conn.execute(text('SELECT COUNT(DISTINCT date) FROM daily_notes')).scalar_one() == TINY.days
+            assert conn.execute(text('SELECT COUNT(*) FROM lists WHERE is_kanban = 1')).scalar_one() == 2
+
+    def test_pinned_entries_are_carried_forward(self):
+        """Test a pinned entry is copied onto the following days."""
+        scale = synthetic_data.Scale(days=120, entries_per_day=30, labels=5, lists=3)
+        engine = create_engine('sqlite://')
+        Base.metadata.create_all(bind=engine)
+        synthetic_data.generate(engine, scale, seed=0)
+
+        with engine.connect() as conn:
+            chains = conn.execute(
+                text(
+                    'SELECT content, COUNT(DISTINCT daily_note_id) FROM note_entries '
+                    'WHERE is_pinned = 1 GROUP BY content'
+                )
+            ).all()
+
+        assert chains
+        assert max(days for _, days in chains) > 1
+
+
+@pytest.mark.unit
+class TestCompareResults:
+    """Test benchmark result comparison."""
+
+    def test_slowdown_beyond_threshold_is_a_regression(self):
+        """Test a median that got 50% and 10ms slower is flagged."""
+        rows = api_benchmark.compare_results(_results(search=(20.0, 5)), _results(search=(30.0, 5)), threshold=0.2)
+
+        assert rows[0]['status'] == 'regressed'
+        assert rows[0]['ratio'] == 1.5
+
+    def test_small_absolute_slowdown_is_noise(self):
+        """Test a large ratio on a tiny endpoint is not flagged."""
+        rows = api_benchmark.compare_results(
+            _results(labels=(1.0, 1)), _results(labels=(1.8, 1)), threshold=0.2, min_delta_ms=2.0
+        )
+
+        assert rows[0]['status'] == 'unchanged'
+
+    def test_extra_queries_are_a_regression(self):
+        """Test an increase in SQL statements is flagged even if timing is flat."""
+        rows = api_benchmark.compare_results(_results(day=(10.0, 3)), _results(day=(10.0, 40)))
+
+        assert rows[0]['status'] == 'regressed'
+
+    def test_speedup_is_reported_as_improvement(self):
+        """Test a clearly faster scenario is marked improved."""
+        rows = api_benchmark.compare_results(_results(export=(100.0, 10)), _results(export=(40.0, 10)))
+
+        assert rows[0]['status'] == 'improved'
+
+    def test_scenarios_missing_from_current_run_are_skipped(self):
+        """Test only scenarios present in both runs are compared."""
+        rows = api_benchmark.compare_results(_results(a=(1.0, 1), b=(1.0, 1)), _results(a=(1.0, 1)))
+
+        assert [row['name'] for row in rows] == ['a']
+
+
+@pytest.mark.unit
+class TestSummaries:
+    """Test latency summaries."""
+
+    def test_summarize_percentiles(self):
+        """Test nearest-rank p95 and the median over a known sample."""
+        summary = api_benchmark.summarize([float(value) for value in range(1, 101)])
+
+        assert summary['min_ms'] == 1.0
+        assert summary['median_ms'] == 50.5
+        assert summary['p95_ms'] == 95.0
+        assert summary['max_ms'] == 100.0
@@ -0,0 +1,105 @@
+"""
+Unit tests for the response compression middleware.
+"""
+
+import gzip
+import zlib
+
+import pytest
+
+from app import compression
+from app.compression import CompressionMiddleware, choose_encoding, is_compressible
+
+
+def streaming_app(content_type: str, chunks: list[bytes], headers: list | None = None):
+    async def app(scope, receive, send):
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': [(b'content-type', content_type.encode()), *(headers or [])],
+            }
+        )
+        for index, chunk in enumerate(chunks):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': index < len(chunks) - 1})
+
+    return app
+
+
+async def call(app, accept_encoding: str = 'gzip') -> list[dict]:
+    """Run a request through the middleware and return the messages it sent."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/', 'headers': [(b'accept-encoding', accept_encoding.encode())]}
+    await CompressionMiddleware(app, minimum_size=100)(scope, None, send)
+    return sent
+
+
+@pytest.mark.unit
+class TestNegotiation:
+    """Test Accept-Encoding handling and compressible types."""
+
+    def test_choose_encoding(self, monkeypatch):
+        """Test gzip is picked when accepted, and q=0 refuses an encoding."""
+        monkeypatch.setattr(compression, 'brotli', None)
+
+        assert choose_encoding('gzip, deflate') == 'gzip'
+        assert choose_encoding('deflate, br') is None
+        assert choose_encoding('gzip;q=0, *') is None
+        assert choose_encoding('*;q=0.5') == 'gzip'
+        assert choose_encoding('') is None
+
+    def test_brotli_preferred_when_installed(self):
+        """Test br wins over gzip when the brotli package is available."""
+        pytest.importorskip('brotli')
+
+        assert choose_encoding('gzip, br') == 'br'
+        assert choose_encoding('gzip, br;q=0') == 'gzip'
+
+    def test_compressible_types(self):
+        """Test text-like types are compressed and media types are not."""
+        assert is_compressible('application/json')
+        assert is_compressible('text/markdown; charset=utf-8')
+        assert is_compressible('application/problem+json')
+        assert not is_compressible('image/png')
+        assert not is_compressible('application/zip')
+        assert not is_compressible('')
+
+
+@pytest.mark.unit
+class TestStreaming:
+    """Test streamed bodies are compressed as they are sent."""
+
+    async def test_stream_is_compressed(self):
+        """Test a streamed response decodes to the original body without a Content-Length."""
+        chunks = [b'{"entries": [', b'"<p>entry</p>",' * 200, b'"last"]}']
+
+        sent = await call(streaming_app('application/json', chunks, [(b'content-length', b'9999')]))
+
+        headers = dict(sent[0]['headers'])
+        assert headers[b'content-encoding'] == b'gzip'
+        assert headers[b'vary'] == b'Accept-Encoding'
+        assert b'content-length' not in headers
+        assert gzip.decompress(b''.join(message['body'] for message in sent[1:])) == b''.join(chunks)
+
+    async def test_incremental_streams_flush_every_chunk(self):
+        """Test each NDJSON line can be decoded as soon as it arrives."""
+        lines = [b'{"url": "https://example.com/%d", "title": "Example page"}\n' % i for i in range(3)]
+        decoder = zlib.decompressobj(31)
+
+        sent = await call(streaming_app('application/x-ndjson', lines))
+
+        bodies = [message['body'] for message in sent[1:]]
+        assert [decoder.decompress(body) for body in bodies[:3]] == lines
+
+    async def test_precompressed_and_ranged_responses_pass_through(self):
+        """Test responses with their own encoding or byte ranges are left alone."""
+        body = b'x' * 500
+        for header in ((b'content-encoding', b'gzip'), (b'accept-ranges', b'bytes')):
+            sent = await call(streaming_app('text/plain', [body], [header]))
+
+            assert sent[0]['headers'] == [(b'content-type', b'text/plain'), header]
+            assert sent[1]['body'] == body
@@ -0,0 +1,35 @@
+"""
+Unit tests for MessagePack content negotiation.
+"""
+
+from datetime import date, datetime
+
+import msgpack
+import pytest
+
+from app.content_negotiation import encode_msgpack, prefers_msgpack
+
+
+@pytest.mark.unit
+class TestContentNegotiation:
+    """Test Accept parsing and the shared encoder."""
+
+    def test_prefers_msgpack(self):
+        """Test MessagePack is chosen only when asked for at least as strongly as JSON."""
+        assert prefers_msgpack('application/msgpack')
+        assert prefers_msgpack('application/x-msgpack, application/json')
+        assert prefers_msgpack('application/json;q=0.5, application/msgpack')
+        assert not prefers_msgpack('application/json, application/msgpack;q=0.5')
+        assert not prefers_msgpack('application/msgpack;q=0')
+        assert not prefers_msgpack('*/*')
+        assert not prefers_msgpack('')
+
+    def test_encodes_dates_like_json(self):
+        """Test datetimes and dates become the ISO strings the JSON responses carry."""
+        content = {'created_at': datetime(2025, 11, 7, 9, 30, 0, 125000), 'date': date(2025, 11, 7), 'ids': [1, 2]}
+
+        assert msgpack.unpackb(encode_msgpack(content)) == {
+            'created_at': '2025-11-07T09:30:00.125000',
+            'date': '2025-11-07',
+            'ids': [1, 2],
+        }
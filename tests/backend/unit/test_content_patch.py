@@ -0,0 +1,44 @@
+"""
+Unit tests for content patch ops.
+"""
+
+import hashlib
+
+import pytest
+
+from app.content_patch import PatchError, apply_ops, content_hash
+
+
+@pytest.mark.unit
+class TestApplyOps:
+    """Test ot.js-style ops applied to content."""
+
+    def test_retain_delete_insert(self):
+        """Test kept, deleted and inserted runs, with the rest of the content kept."""
+        assert apply_ops('<p>Deploy on Friday</p>', [13, -6, 'Monday']) == '<p>Deploy on Monday</p>'
+
+    def test_empty_ops_keep_the_content(self):
+        """Test no ops leave the content as it is."""
+        assert apply_ops('<p>Same</p>', []) == '<p>Same</p>'
+
+    def test_offsets_are_utf16_code_units(self):
+        """Test characters outside the BMP count as two, as in JavaScript."""
+        # '🚀'.length === 2 in JavaScript
+        assert apply_ops('🚀 launch', [2, -7, ' ship']) == '🚀 ship'
+
+    def test_splitting_a_character_is_rejected(self):
+        """Test ops that cut a surrogate pair in half don't produce broken text."""
+        with pytest.raises(PatchError):
+            apply_ops('🚀 launch', [1, -1])
+
+    @pytest.mark.parametrize('ops', [[20], [5, -20], [0]])
+    def test_out_of_range_ops_are_rejected(self, ops):
+        """Test ops past the end of the content (or empty ones) are errors."""
+        with pytest.raises(PatchError):
+            apply_ops('<p>Short</p>', ops)
+
+
+@pytest.mark.unit
+def test_content_hash_is_sha256_of_utf8():
+    """Test the hash clients compute with crypto.subtle over TextEncoder bytes."""
+    assert content_hash('<p>café</p>') == hashlib.sha256('<p>café</p>'.encode()).hexdigest()
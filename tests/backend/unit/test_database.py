@@ -0,0 +1,182 @@
+"""
+Unit tests for SQLite write serialization: WAL, BEGIN IMMEDIATE sessions and the one-time schema bootstrap.
+"""
+
+import inspect
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app import database
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/writes.db', connect_args={'check_same_thread': False})
+    database.configure_sqlite(engine)
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE counters (id INTEGER PRIMARY KEY, value INTEGER)'))
+        conn.execute(text('INSERT INTO counters (id, value) VALUES (1, 0)'))
+    yield engine
+    engine.dispose()
+
+
+def _request(method):
+    return Request({'type': 'http', 'method': method, 'path': '/', 'headers': [], 'query_string': b''})
+
+
+@pytest.mark.unit
+class TestSqliteConfiguration:
+    """Test connections are set up for concurrent use."""
+
+    def test_wal_and_busy_timeout(self, sqlite_engine):
+        """Test connections use WAL and wait for locks instead of failing immediately."""
+        with sqlite_engine.connect() as conn:
+            assert conn.execute(text('PRAGMA journal_mode')).scalar_one() == 'wal'
+            assert conn.execute(text('PRAGMA busy_timeout')).scalar_one() == database.SQLITE_BUSY_TIMEOUT_MS
+
+    def test_write_engine_takes_lock_up_front(self, sqlite_engine):
+        """Test a write transaction holds the lock before it has written anything."""
+        writer = database.write_engine(sqlite_engine).connect()
+        writer.begin()
+        writer.execute(text('SELECT value FROM counters')).all()
+
+        other = sqlite_engine.connect()
+        other.connection.driver_connection.execute('PRAGMA busy_timeout=0')
+        other.begin()
+        with pytest.raises(OperationalError, match='locked'):
+            other.execute(text('UPDATE counters SET value = value + 1'))
+        other.rollback()
+        other.close()
+
+        writer.rollback()
+        writer.close()
+
+    def test_concurrent_writers_all_succeed(self, sqlite_engine):
+        """Test read-modify-write transactions from many threads serialize instead of failing."""
+        make_session = sessionmaker(bind=database.write_engine(sqlite_engine))
+        errors = []
+
+        def increment():
+            try:
+                with make_session() as db:
+                    value = db.execute(text('SELECT value FROM counters WHERE id = 1')).scalar_one()
+                    time.sleep(0.01)
+                    db.execute(text('UPDATE counters SET value = :value WHERE id = 1'), {'value': value + 1})
+                    db.commit()
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+
+        threads = [threading.Thread(target=increment) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        with sqlite_engine.connect() as conn:
+            # No lost updates: every read happened under the write lock
+            assert conn.execute(text('SELECT value FROM counters')).scalar_one() == 10
+
+    def test_begin_write_avoids_stale_snapshot_upgrade(self, sqlite_engine):
+        """Test a session that read before another writer committed can still write after begin_write."""
+        make_session = sessionmaker(bind=sqlite_engine)
+        reader = make_session()
+        reader.execute(text('SELECT value FROM counters')).all()
+
+        with make_session() as other:
+            other.execute(text('UPDATE counters SET value = 5'))
+            other.commit()
+
+        database.begin_write(reader)
+        reader.execute(text('UPDATE counters SET value = value + 1'))
+        reader.commit()
+        reader.close()
+
+        with sqlite_engine.connect() as conn:
+            assert conn.execute(text('SELECT value FROM counters')).scalar_one() == 6
+
+
+@pytest.mark.unit
+class TestGetDb:
+    """Test request sessions pick their transaction mode from the HTTP method."""
+
+    @pytest.mark.parametrize('method', ['POST', 'PUT', 'PATCH', 'DELETE'])
+    def test_write_methods_begin_immediate(self, method):
+        """Test writes get a session whose transactions take the write lock."""
+        sessions = database.get_db(_request(method))
+        db = next(sessions)
+        try:
+            assert db.get_bind().get_execution_options().get('sqlite_begin') == 'IMMEDIATE'
+        finally:
+            sessions.close()
+
+    @pytest.mark.parametrize('method', ['GET', 'HEAD'])
+    def test_read_methods_stay_deferred(self, method):
+        """Test reads don't serialize behind writers."""
+        sessions = database.get_db(_request(method))
+        db = next(sessions)
+        try:
+            assert 'sqlite_begin' not in db.get_bind().get_execution_options()
+        finally:
+            sessions.close()
+
+    def test_write_routes_run_in_the_threadpool(self):
+        """Test write routes using get_db are plain def handlers, so waiting for the write lock never blocks the event loop."""
+        from fastapi.routing import APIRoute
+
+        from app.main import app
+
+        def uses_get_db(dependant):
+            return any(dep.call is database.get_db or uses_get_db(dep) for dep in dependant.dependencies)
+
+        blocking = [
+            f'{sorted(route.methods)} {route.path}'
+            for route in app.routes
+            if isinstance(route, APIRoute)
+            and route.methods - database.READ_ONLY_METHODS
+            and uses_get_db(route.dependant)
+            and inspect.iscoroutinefunction(route.endpoint)
+        ]
+        assert blocking == []
+
+
+@pytest.mark.unit
+class TestSchemaBootstrap:
+    """Test worker processes starting together can all create the schema."""
+
+    @pytest.mark.timeout(60)
+    def test_concurrent_processes_bootstrap_once(self, tmp_path):
+        """Test several processes racing ensure_schema on a fresh database all succeed."""
+        script = 'from app.db_init import ensure_schema; ensure_schema(); print("ok")'
+        env = {**os.environ, 'TESTING': 'true', 'DATABASE_URL': f'sqlite:///{tmp_path}/fresh.db'}
+        processes = [
+            subprocess.Popen(
+                [sys.executable, '-c', script],
+                cwd=backend_path,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(3)
+        ]
+        outputs = [process.communicate(timeout=50) for process in processes]
+
+        assert [process.returncode for process in processes] == [0, 0, 0], [stderr for _, stderr in outputs]
+        engine = create_engine(f'sqlite:///{tmp_path}/fresh.db')
+        with engine.connect() as conn:
+            tables = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))}
+        engine.dispose()
+        assert {'daily_notes', 'note_entries', 'labels'} <= tables
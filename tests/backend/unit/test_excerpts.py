@@ -0,0 +1,79 @@
+"""
+Unit tests for entry excerpts and the deferred content column.
+"""
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from app import models
+from app.excerpts import EXCERPT_LENGTH, make_excerpt
+
+
+@pytest.mark.unit
+class TestMakeExcerpt:
+    """Test plain-text excerpts of entry content."""
+
+    def test_strips_markup_and_entities(self):
+        """Test tags (including embedded media) are dropped and entities decoded."""
+        content = '<h2>Plan</h2><p>Ship&nbsp;it &amp; <em>celebrate</em></p><img src="data:image/png;base64,AAAA">'
+
+        assert make_excerpt(content) == 'Plan Ship it & celebrate'
+
+    def test_skips_scripts_and_styles(self):
+        """Test script and style bodies aren't shown as text."""
+        assert make_excerpt('<style>p { color: red }</style><p>Hi</p><script>alert(1)</script>') == 'Hi'
+
+    def test_code_is_kept_verbatim(self):
+        """Test code entries keep angle brackets."""
+        assert make_excerpt('Map<String, Integer>  counts', 'code') == 'Map<String, Integer> counts'
+
+    def test_truncates_at_a_word_boundary(self):
+        """Test long content is cut on a space and marked with an ellipsis."""
+        excerpt = make_excerpt('<p>' + 'lorem ' * 200 + '</p>')
+
+        assert len(excerpt) <= EXCERPT_LENGTH + 1
+        assert excerpt.endswith('lorem…')
+
+    def test_empty_content(self):
+        """Test missing content gives an empty excerpt."""
+        assert make_excerpt('') == ''
+        assert make_excerpt(None) == ''
+
+
+@pytest.mark.unit
+class TestEntryExcerptColumn:
+    """Test the stored excerpt follows the deferred content column."""
+
+    def _entry(self, db: Session, content: str) -> models.NoteEntry:
+        note = models.DailyNote(date='2025-01-15')
+        db.add(note)
+        db.flush()
+        entry = models.NoteEntry(daily_note_id=note.id, content=content)
+        db.add(entry)
+        db.commit()
+        return entry
+
+    def test_excerpt_set_on_insert_and_content_change(self, db_session: Session):
+        """Test saving content (re)computes the excerpt."""
+        entry = self._entry(db_session, '<p>First</p>')
+        assert entry.excerpt == 'First'
+
+        entry.content = '<p>Second</p>'
+        db_session.commit()
+
+        assert entry.excerpt == 'Second'
+
+    def test_content_is_not_loaded_with_the_entry(self, db_session: Session):
+        """Test content stays unloaded until used, and other updates keep the excerpt."""
+        entry_id = self._entry(db_session, '<p>Body</p>').id
+        db_session.expunge_all()
+
+        entry = db_session.get(models.NoteEntry, entry_id)
+        assert 'content' in inspect(entry).unloaded
+
+        entry.is_important = True
+        db_session.commit()
+
+        assert entry.excerpt == 'Body'
+        assert entry.content == '<p>Body</p>'
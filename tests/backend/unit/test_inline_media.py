@@ -0,0 +1,96 @@
+"""
+Unit tests for moving inline base64 media out of entry content.
+"""
+
+import base64
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.inline_media import extract_inline_media, has_inline_media
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'pixels' * 50
+PNG_URI = 'data:image/png;base64,' + base64.b64encode(PNG_BYTES).decode()
+
+
+@pytest.mark.unit
+class TestExtractInlineMedia:
+    """Test data URIs are written to the upload store and replaced by URLs."""
+
+    def test_moves_images_to_uploads(self, tmp_path):
+        """Test the image is stored and the content points at it."""
+        content = f'<p>Screenshot</p><img src="{PNG_URI}" alt="shot">'
+
+        result = extract_inline_media(content, tmp_path)
+
+        assert 'base64' not in result
+        [stored] = list(tmp_path.iterdir())
+        assert stored.suffix == '.png'
+        assert stored.read_bytes() == PNG_BYTES
+        assert result == f'<p>Screenshot</p><img src="/api/uploads/files/{stored.name}" alt="shot">'
+
+    def test_same_image_is_stored_once(self, tmp_path):
+        """Test files are content-addressed, so repeats and re-runs don't duplicate them."""
+        content = f'<img src=\'{PNG_URI}\'><img src="{PNG_URI}">'
+
+        first = extract_inline_media(content, tmp_path)
+        second = extract_inline_media(content, tmp_path)
+
+        assert first == second
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_leaves_other_content_alone(self, tmp_path):
+        """Test non-media data URIs, invalid base64 and plain content are untouched."""
+        content = (
+            '<a href="data:text/html;base64,PGI+aGk8L2I+">x</a>'
+            '<img src="data:image/png;base64,not*base64">'
+            '<p>no media</p>'
+        )
+
+        assert extract_inline_media(content, tmp_path) == content
+        assert list(tmp_path.iterdir()) == []
+        assert has_inline_media('<p>plain</p>') is False
+
+
+@pytest.mark.unit
+class TestEntryWritePath:
+    """Test entries are rewritten when saved."""
+
+    def test_saved_entries_reference_uploads(self, db_session: Session, tmp_path, monkeypatch):
+        """Test inline media is extracted on insert and on update, but not from code entries."""
+        monkeypatch.setenv('UPLOADS_DIR', str(tmp_path))
+        note = models.DailyNote(date='2025-01-15')
+        db_session.add(note)
+        db_session.flush()
+        entry = models.NoteEntry(daily_note_id=note.id, content=f'<img src="{PNG_URI}">')
+        code = models.NoteEntry(daily_note_id=note.id, content=f'src = "{PNG_URI}"', content_type='code')
+        db_session.add_all([entry, code])
+        db_session.commit()
+
+        assert entry.content.startswith('<img src="/api/uploads/files/inline-')
+        assert PNG_URI in code.content
+
+        entry.content = f'<p>Updated</p><img src="{PNG_URI}">'
+        db_session.commit()
+
+        assert 'base64' not in entry.content
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_rolled_back_writes_leave_no_files(self, db_session: Session, tmp_path, monkeypatch):
+        """Test files written for content that is rolled back are removed, but already stored ones are kept."""
+        monkeypatch.setenv('UPLOADS_DIR', str(tmp_path))
+        note = models.DailyNote(date='2025-01-15')
+        db_session.add(note)
+        db_session.commit()
+        db_session.add(models.NoteEntry(daily_note_id=note.id, content=f'<img src="{PNG_URI}">'))
+        db_session.commit()
+        [kept] = list(tmp_path.iterdir())
+
+        other_uri = 'data:image/png;base64,' + base64.b64encode(PNG_BYTES + b'more').decode()
+        db_session.add(models.NoteEntry(daily_note_id=note.id, content=f'<img src="{PNG_URI}"><img src="{other_uri}">'))
+        db_session.flush()
+        assert len(list(tmp_path.iterdir())) == 2
+        db_session.rollback()
+
+        assert list(tmp_path.iterdir()) == [kept]
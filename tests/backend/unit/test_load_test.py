@@ -0,0 +1,108 @@
+"""
+Unit tests for the load test harness's bookkeeping (latency summaries, lock error detection)
+and the read scaling report built on it.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+sys.path.insert(0, os.path.join(backend_path, 'benchmarks'))
+
+import load_test  # noqa: E402
+import read_scaling  # noqa: E402
+
+LOCKED_TRACEBACK = """\
+Traceback (most recent call last):
+  File "sqlalchemy/engine/base.py", line 1969, in _exec_single_context
+sqlite3.OperationalError: database is locked
+
+The above exception was the direct cause of the following exception:
+
+Traceback (most recent call last):
+  File "app/routers/entries.py", line 150, in update_entry
+sqlalchemy.exc.OperationalError: (sqlite3.OperationalError) database is locked
+[SQL: UPDATE note_entries SET content=? WHERE note_entries.id = ?]
+"""
+
+
+@pytest.mark.unit
+class TestRecorder:
+    """Test per-step request bookkeeping."""
+
+    def test_summary_counts_requests_errors_and_throughput(self):
+        """Test totals, per-step errors and requests per second."""
+        recorder = load_test.Recorder()
+        for elapsed in (10.0, 20.0, 30.0):
+            recorder.record('open_day', elapsed, 200)
+        recorder.record('edit_entry', 50.0, 500, 'Internal Server Error')
+
+        summary = recorder.summary(elapsed_seconds=2.0)
+
+        assert summary['requests'] == 4
+        assert summary['errors'] == 1
+        assert summary['lock_errors'] == 0
+        assert summary['throughput_rps'] == 2.0
+        assert summary['steps']['open_day']['p50_ms'] == 20.0
+        assert summary['steps']['edit_entry']['errors'] == {'500': 1}
+
+    def test_lock_error_in_response_body_is_counted(self):
+        """Test errors whose detail mentions a locked database count as lock errors."""
+        recorder = load_test.Recorder()
+        recorder.record('edit_entry', 5.0, 500, '{"detail": "(sqlite3.OperationalError) database is locked"}')
+
+        assert recorder.summary(1.0)['lock_errors'] == 1
+
+    def test_transport_failures_are_errors(self):
+        """Test requests that never got a response are recorded by exception name."""
+        recorder = load_test.Recorder()
+        recorder.record('search', 5.0, 'ReadTimeout')
+
+        assert recorder.summary(1.0)['steps']['search']['errors'] == {'ReadTimeout': 1}
+
+    def test_p99_uses_nearest_rank(self):
+        """Test p99 over 100 samples is the 99th smallest."""
+        summary = load_test.latency_summary([float(value) for value in range(1, 101)])
+
+        assert summary['p99_ms'] == 99.0
+        assert summary['max_ms'] == 100.0
+
+
+@pytest.mark.unit
+class TestServerLog:
+    """Test lock failures are found in the server log."""
+
+    def test_each_failed_request_counts_once(self):
+        """Test a chained traceback is one lock error, not two."""
+        assert load_test.count_lock_errors(LOCKED_TRACEBACK * 3) == 3
+
+    def test_other_errors_are_ignored(self):
+        """Test unrelated operational errors are not lock errors."""
+        log = 'sqlalchemy.exc.OperationalError: (sqlite3.OperationalError) no such table: foo\n'
+
+        assert load_test.count_lock_errors(log) == 0
+
+
+@pytest.mark.unit
+class TestReadScaling:
+    """Test the read scaling report."""
+
+    def test_default_worker_counts(self):
+        """Test powers of two up to the CPU count, ending at the CPU count."""
+        assert read_scaling.default_worker_counts(1) == [1]
+        assert read_scaling.default_worker_counts(4) == [1, 2, 4]
+        assert read_scaling.default_worker_counts(6) == [1, 2, 4, 6]
+
+    def test_scaling_rows(self):
+        """Test speedup and efficiency relative to the smallest worker count."""
+        rows = read_scaling.scaling_rows({1: 100.0, 2: 190.0, 4: 300.0})
+
+        assert [row['speedup'] for row in rows] == [1.0, 1.9, 3.0]
+        assert [row['efficiency'] for row in rows] == [1.0, 0.95, 0.75]
+
+    def test_read_journeys_never_write(self):
+        """Test the read-only mix only uses journeys that issue GETs."""
+        assert set(load_test.READ_JOURNEY_WEIGHTS) == {'open_day', 'search', 'poll_reminders'}
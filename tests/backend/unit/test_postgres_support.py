@@ -0,0 +1,110 @@
+"""
+Unit tests for PostgreSQL support: URL handling, full-text search and the boolean flag columns.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app import models
+from app.database import normalize_database_url
+from app.routers.search import build_tsquery, content_filter
+
+
+def _fake_session(dialect):
+    return SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=dialect))
+
+
+@pytest.mark.unit
+class TestDatabaseUrl:
+    """Test DATABASE_URL values are mapped to an installed driver."""
+
+    @pytest.mark.parametrize(
+        'url',
+        ['postgres://user:pw@db:5432/notes', 'postgresql://user:pw@db:5432/notes'],
+    )
+    def test_postgres_urls_use_psycopg(self, url):
+        """Test driverless PostgreSQL URLs get the psycopg driver."""
+        assert normalize_database_url(url) == 'postgresql+psycopg://user:pw@db:5432/notes'
+
+    @pytest.mark.parametrize(
+        'url',
+        ['sqlite:///./daily_notes.db', 'postgresql+psycopg://user@db/notes', 'postgresql+asyncpg://db/notes'],
+    )
+    def test_other_urls_unchanged(self, url):
+        """Test SQLite URLs and URLs naming a driver are left alone."""
+        assert normalize_database_url(url) == url
+
+
+@pytest.mark.unit
+class TestFullTextSearch:
+    """Test content search uses tsvector on PostgreSQL and LIKE elsewhere."""
+
+    def test_tsquery_prefix_matches_every_word(self):
+        """Test each word becomes a prefix term and all must match."""
+        assert build_tsquery('Deploy  fix') == 'deploy:* & fix:*'
+
+    @pytest.mark.parametrize('q', ["a & !b | c:* 'd'", '&!|()', '2025-11-07', 'fix-up', 'notes_v2', '   '])
+    def test_tsquery_only_for_plain_words(self, q):
+        """Test searches with punctuation (tsquery syntax, dates, names) are left to the substring match."""
+        assert build_tsquery(q) is None
+
+    def test_postgres_uses_indexed_tsvector_match(self):
+        """Test the PostgreSQL filter matches the GIN index expression."""
+        dialect = postgresql.dialect()
+        sql = str(content_filter(_fake_session(dialect), 'deploy').compile(dialect=dialect))
+
+        assert "to_tsvector('simple'::regconfig, note_entries.content) @@ to_tsquery('simple'::regconfig" in sql
+
+    def test_postgres_without_words_falls_back_to_substring(self):
+        """Test punctuation-only searches still work on PostgreSQL."""
+        dialect = postgresql.dialect()
+        sql = str(content_filter(_fake_session(dialect), '->').compile(dialect=dialect))
+
+        assert 'ILIKE' in sql
+
+    def test_sqlite_uses_substring_match(self, db_session):
+        """Test SQLite keeps the LIKE search."""
+        if db_session.get_bind().dialect.name != 'sqlite':
+            pytest.skip('SQLite only')
+        sql = str(content_filter(db_session, 'deploy').compile(dialect=db_session.get_bind().dialect))
+
+        assert 'LIKE' in sql.upper()
+        assert 'to_tsvector' not in sql
+
+    def test_gin_index_only_on_postgres(self, db_engine):
+        """Test the full-text index is PostgreSQL DDL and is only created there."""
+        index = next(i for i in models.NoteEntry.__table__.indexes if i.name == 'ix_note_entries_content_fts')
+        ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+        assert 'USING gin' in ddl
+        assert models.CONTENT_SEARCH_VECTOR in ddl
+        created = 'ix_note_entries_content_fts' in {i['name'] for i in inspect(db_engine).get_indexes('note_entries')}
+        assert created is (db_engine.dialect.name == 'postgresql')
+
+
+@pytest.mark.unit
+class TestBooleanFlags:
+    """Test flag columns round-trip as booleans."""
+
+    def test_entry_flags_are_booleans(self, db_session):
+        """Test entry flags read back as bool rather than 0/1."""
+        note = models.DailyNote(date='2025-01-15')
+        db_session.add(note)
+        db_session.flush()
+        entry = models.NoteEntry(daily_note_id=note.id, content='x', is_pinned=True)
+        db_session.add(entry)
+        db_session.commit()
+        db_session.expire_all()
+
+        entry = db_session.get(models.NoteEntry, entry.id)
+        assert entry.is_pinned is True
+        assert entry.is_completed is False
+
+    def test_flag_columns_are_native_booleans_on_postgres(self):
+        """Test PostgreSQL gets BOOLEAN columns instead of integers."""
+        column = models.List.__table__.c.is_kanban
+        assert column.type.compile(dialect=postgresql.dialect()) == 'BOOLEAN'
@@ -0,0 +1,49 @@
+"""
+Unit tests for entry revision deltas.
+"""
+
+import pytest
+
+from app.revisions import apply_delta, make_delta
+
+DOCUMENT = ''.join(f'<p>Paragraph {i} of the meeting notes</p>\n' for i in range(200))
+
+
+@pytest.mark.unit
+class TestDeltas:
+    """Test deltas between an entry's snapshot and a later state of it."""
+
+    @pytest.mark.parametrize(
+        'content',
+        [
+            DOCUMENT,
+            DOCUMENT.replace('Paragraph 50 ', 'Paragraph fifty '),
+            '<h1>Agenda</h1>' + DOCUMENT,
+            DOCUMENT.replace('<p>Paragraph 120 of the meeting notes</p>\n', ''),
+            '',
+            'plain text without any tags 🚀',
+        ],
+    )
+    def test_round_trip(self, content):
+        """Test applying a delta to its base gives the content back."""
+        assert apply_delta(DOCUMENT, make_delta(DOCUMENT, content)) == content
+
+    def test_small_edit_copies_the_rest(self):
+        """Test a one-word edit stores only the changed text, with the rest copied from the base."""
+        delta = make_delta(DOCUMENT, DOCUMENT.replace('Paragraph 50 ', 'Paragraph fifty '))
+
+        inserted = [part for part in delta if isinstance(part, str)]
+        assert inserted == ['fifty']
+        assert len(delta) == 3
+
+    def test_from_empty_base(self):
+        """Test content with nothing in common with the base is inserted whole."""
+        assert make_delta('', '<p>New</p>') == ['<p>New</p>']
+
+    def test_edits_far_apart(self):
+        """Test edits at both ends of the content keep the middle as a copied span."""
+        content = DOCUMENT.replace('Paragraph 1 ', 'First ').replace('Paragraph 198 ', 'Last ')
+        delta = make_delta(DOCUMENT, content)
+
+        assert apply_delta(DOCUMENT, delta) == content
+        assert sum(len(part) for part in delta if isinstance(part, str)) < 200
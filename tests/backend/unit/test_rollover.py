@@ -0,0 +1,114 @@
+"""
+Unit tests for the day rollover job that carries pinned entries forward.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models, rollover
+
+
+def _pinned_entry(db: Session, day: str, content: str, **kwargs) -> models.NoteEntry:
+    note = db.query(models.DailyNote).filter(models.DailyNote.date == day).first()
+    if not note:
+        note = models.DailyNote(date=day)
+        db.add(note)
+        db.flush()
+    entry = models.NoteEntry(daily_note_id=note.id, content=content, is_pinned=True, **kwargs)
+    db.add(entry)
+    db.commit()
+    return entry
+
+
+def _contents(db: Session, day: str) -> list[str]:
+    return [
+        content
+        for (content,) in db.query(models.NoteEntry.content)
+        .join(models.DailyNote)
+        .filter(models.DailyNote.date == day)
+        .order_by(models.NoteEntry.id)
+    ]
+
+
+@pytest.mark.unit
+class TestMaterializePinnedEntries:
+    """Test copying pinned entries onto a day."""
+
+    def test_copies_pinned_entries_with_labels_and_lists(self, db_session: Session):
+        """Test copies keep labels and lists, stay pinned and start uncompleted."""
+        label = models.Label(name='ops', color='#000000')
+        lst = models.List(name='Backlog')
+        db_session.add_all([label, lst])
+        entry = _pinned_entry(db_session, '2025-03-01', 'Standup', is_completed=True)
+        entry.labels.append(label)
+        entry.lists.append(lst)
+        db_session.commit()
+
+        assert rollover.materialize_pinned_entries('2025-03-02', db_session) == 1
+
+        copy = (
+            db_session.query(models.NoteEntry)
+            .join(models.DailyNote)
+            .filter(models.DailyNote.date == '2025-03-02')
+            .one()
+        )
+        assert copy.id != entry.id
+        assert copy.is_pinned is True
+        assert copy.is_completed is False
+        assert [lbl.name for lbl in copy.labels] == ['ops']
+        assert [item.name for item in copy.lists] == ['Backlog']
+
+    def test_is_idempotent(self, db_session: Session):
+        """Test running again copies nothing and doesn't take the write lock."""
+        _pinned_entry(db_session, '2025-03-01', 'Standup')
+        rollover.materialize_pinned_entries('2025-03-02', db_session)
+
+        assert rollover.pinned_copies_needed('2025-03-02', db_session) is False
+        assert rollover.materialize_pinned_entries('2025-03-02', db_session) == 0
+        assert _contents(db_session, '2025-03-02') == ['Standup']
+
+    def test_no_note_created_without_pinned_entries(self, db_session: Session):
+        """Test days with nothing to carry forward stay absent."""
+        assert rollover.materialize_pinned_entries('2025-03-02', db_session) == 0
+
+        assert db_session.query(models.DailyNote).count() == 0
+
+    def test_only_earlier_pins_are_copied(self, db_session: Session):
+        """Test entries pinned on later days don't travel backwards."""
+        _pinned_entry(db_session, '2025-03-05', 'Later')
+
+        assert rollover.materialize_pinned_entries('2025-03-02', db_session) == 0
+
+
+@pytest.mark.unit
+class TestRunRollover:
+    """Test the scheduled job."""
+
+    def test_materializes_today_and_days_ahead(self, db_session: Session, monkeypatch):
+        """Test the job fills today and the configured days ahead, and nothing else."""
+        monkeypatch.setattr(rollover, 'ROLLOVER_DAYS_AHEAD', 1)
+        _pinned_entry(db_session, '2025-03-01', 'Standup')
+
+        def sessions():
+            yield db_session
+
+        copied = rollover.run_rollover(sessions, today=date(2025, 3, 10))
+
+        assert copied == {'2025-03-10': 1, '2025-03-11': 1}
+        assert _contents(db_session, '2025-03-10') == ['Standup']
+        assert _contents(db_session, '2025-03-05') == []
+        assert rollover.run_rollover(sessions, today=date(2025, 3, 10)) == {'2025-03-10': 0, '2025-03-11': 0}
+
+    def test_rollover_dates(self, monkeypatch):
+        """Test the dates kept materialized."""
+        monkeypatch.setattr(rollover, 'ROLLOVER_DAYS_AHEAD', 2)
+
+        assert rollover.rollover_dates(date(2025, 12, 31)) == ['2025-12-31', '2026-01-01', '2026-01-02']
+
+    def test_next_run_at_midnight(self):
+        """Test the job runs when the date changes rather than up to an interval later."""
+        assert rollover.next_run_delay(300, datetime(2025, 3, 10, 23, 58)) == 120
+        assert rollover.next_run_delay(300, datetime(2025, 3, 10, 12, 0)) == 300
+        assert rollover.next_run_delay(300, datetime(2025, 3, 11, 0, 0)) == 300
@@ -0,0 +1,62 @@
+"""
+Unit tests for startup cost: deferred heavy imports and the one-time schema bootstrap.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+import app.database
+from app import db_init
+
+backend_path = os.getenv('BACKEND_PATH', str(Path(__file__).parent.parent.parent.parent / 'backend'))
+
+DEFERRED_MODULES = ('httpx', 'bs4', 'lxml', 'PIL')
+
+
+@pytest.mark.unit
+class TestDeferredImports:
+    """Test rarely used heavy dependencies stay off the startup path."""
+
+    @pytest.mark.timeout(30)
+    def test_app_main_does_not_import_heavy_modules(self, tmp_path):
+        """Test importing app.main leaves httpx, BeautifulSoup/lxml and Pillow unloaded."""
+        script = f'import sys, app.main; print(",".join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))'
+        result = subprocess.run(
+            [sys.executable, '-c', script],
+            cwd=backend_path,
+            env={**os.environ, 'TESTING': 'true', 'DATABASE_URL': f'sqlite:///{tmp_path}/startup.db'},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == ''
+
+
+@pytest.mark.unit
+class TestSchemaBootstrap:
+    """Test ensure_schema only creates the schema once per database."""
+
+    def test_ensure_schema_runs_once_per_engine(self, temp_db_file, monkeypatch):
+        """Test repeated calls skip create_all after the first."""
+        engine = create_engine(f'sqlite:///{temp_db_file}')
+        monkeypatch.setattr(app.database, 'engine', engine)
+        monkeypatch.setattr(db_init, '_bootstrapped', set())
+        calls = []
+        original_create_all = app.database.Base.metadata.create_all
+        monkeypatch.setattr(
+            app.database.Base.metadata,
+            'create_all',
+            lambda **kwargs: calls.append(kwargs) or original_create_all(**kwargs),
+        )
+
+        db_init.ensure_schema()
+        db_init.ensure_schema()
+
+        assert len(calls) == 1
+        assert 'note_entries' in inspect(engine).get_table_names()